@@ -9,10 +9,12 @@ for agricultural farms and producers, with integration to ESG-GOLD token issuanc
 
 import math
 import json
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass, asdict
+import hashlib
+from typing import Dict, List, Tuple, Optional, Sequence, Union
+from dataclasses import dataclass, asdict, fields
 from datetime import datetime, timedelta
 import numpy as np
+import pandas as pd
 
 @dataclass
 class ESGScore:
@@ -61,6 +63,126 @@ class FarmData:
     ethical_practices_score: int  # 0-10
     supply_chain_traceability: bool
 
+# Columns consumed by the vectorized batch scorer
+BATCH_NUMERIC_COLUMNS = (
+    'size_hectares', 'water_usage_per_hectare', 'carbon_emissions',
+    'renewable_energy_percentage', 'biodiversity_score', 'soil_health_score',
+    'community_investment_percentage', 'worker_safety_score', 'local_employment_percentage',
+    'transparency_score', 'record_keeping_score', 'stakeholder_engagement_score',
+    'ethical_practices_score'
+)
+BATCH_FLAG_COLUMNS = (
+    'organic_certified', 'fair_wage_certification', 'training_programs', 'healthcare_provided'
+)
+
+CERTIFICATION_LEVELS = ("ESG Platinum", "ESG Gold", "ESG Silver", "ESG Bronze", "ESG Candidate")
+TIER_THRESHOLDS = (90, 80, 70, 60)
+TIER_MULTIPLIERS = (2.0, 1.5, 1.2, 1.0, 0.5)
+
+
+class ESGBatchResult:
+    """
+    Columnar result of ESGCalculator.calculate_scores_batch
+
+    Scores, certification levels and token amounts are NumPy arrays aligned with
+    the input rows. Detailed breakdowns and recommendation strings are only built
+    (through the scalar calculate_score path) when score()/breakdown() is called.
+    """
+
+    def __init__(self, calculator: 'ESGCalculator', farms: pd.DataFrame,
+                 trade_volume: np.ndarray, environmental: np.ndarray, social: np.ndarray,
+                 governance: np.ndarray, overall: np.ndarray, certification_level: np.ndarray,
+                 esg_gold_tokens: np.ndarray, calculated_at: datetime):
+        self._calculator = calculator
+        self._farms = farms
+        self._trade_volume = trade_volume
+        self.farm_ids = farms['farm_id'].to_numpy()
+        self.environmental_score = environmental
+        self.social_score = social
+        self.governance_score = governance
+        self.overall_score = overall
+        self.certification_level = certification_level
+        self.esg_gold_tokens = esg_gold_tokens
+        self.calculated_at = calculated_at.isoformat()
+        self.valid_until = (calculated_at + timedelta(days=calculator.score_validity_days)).isoformat()
+        self._positions = None
+
+    def __len__(self) -> int:
+        return len(self.farm_ids)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Per-farm summary (scores rounded like ESGScore)"""
+        return pd.DataFrame({
+            'farm_id': self.farm_ids,
+            'environmental_score': np.round(self.environmental_score, 2),
+            'social_score': np.round(self.social_score, 2),
+            'governance_score': np.round(self.governance_score, 2),
+            'overall_score': np.round(self.overall_score, 2),
+            'certification_level': self.certification_level,
+            'esg_gold_tokens': self.esg_gold_tokens
+        })
+
+    def to_records(self) -> List[Dict]:
+        """Plain-Python summary rows (JSON serializable)"""
+        frame = self.to_frame()
+        frame['calculated_at'] = self.calculated_at
+        frame['valid_until'] = self.valid_until
+        return frame.to_dict(orient='records')
+
+    def summary(self) -> Dict:
+        """Aggregate view equivalent to compare_farms without building ESGScore objects"""
+        if not len(self):
+            return {}
+        levels, counts = np.unique(self.certification_level, return_counts=True)
+        return {
+            'farm_count': len(self),
+            'average_scores': {
+                'environmental': float(np.mean(np.round(self.environmental_score, 2))),
+                'social': float(np.mean(np.round(self.social_score, 2))),
+                'governance': float(np.mean(np.round(self.governance_score, 2))),
+                'overall': float(np.mean(np.round(self.overall_score, 2)))
+            },
+            'certification_distribution': dict(zip(levels.tolist(), counts.tolist())),
+            'total_esg_tokens': int(self.esg_gold_tokens.sum())
+        }
+
+    def position(self, farm_id: str) -> int:
+        if self._positions is None:
+            self._positions = {fid: i for i, fid in enumerate(self.farm_ids)}
+        return self._positions[farm_id]
+
+    def score(self, farm: Union[int, str]) -> 'ESGScore':
+        """Materialize the full ESGScore (with breakdown) for one farm by row index or farm_id"""
+        index = farm if isinstance(farm, (int, np.integer)) else self.position(farm)
+        row = self._farms.iloc[index]
+        values = {}
+        for field in fields(FarmData):
+            value = row.get(field.name, _FARM_DATA_FALLBACKS.get(field.name))
+            values[field.name] = value.item() if isinstance(value, np.generic) else value
+        trade_volume = self._trade_volume[index]
+        return self._calculator.calculate_score(
+            FarmData(**values), float(trade_volume) if trade_volume else None)
+
+    def breakdown(self, farm: Union[int, str]) -> Dict:
+        """Detailed score breakdown for one farm"""
+        return self.score(farm).score_breakdown
+
+
+def farm_data_frame(farms: List[FarmData]) -> pd.DataFrame:
+    """Columnar batch input from FarmData objects"""
+    return pd.DataFrame([asdict(farm) for farm in farms])
+
+
+# Values for FarmData fields that do not affect the score when absent from a batch
+_FARM_DATA_FALLBACKS = {
+    'farm_name': '',
+    'location': '',
+    'waste_management_score': 0,
+    'certifications': [],
+    'supply_chain_traceability': False
+}
+
+
 class ESGCalculator:
     """
     Comprehensive ESG Score Calculator for Agricultural Farms
@@ -110,6 +232,7 @@ class ESGCalculator:
 
         self.token_multiplier_base = 1000  # Base tokens per ESG point
         self.size_factor_threshold = 10    # hectares
+        self.score_validity_days = 365     # ESGScore.valid_until window
 
     def calculate_environmental_score(self, farm_data: FarmData) -> Tuple[float, Dict]:
         """Calculate Environmental (E) score"""
@@ -435,7 +558,7 @@ class ESGCalculator:
 
         # Create ESG Score object
         now = datetime.now()
-        valid_until = now + timedelta(days=365)  # Valid for 1 year
+        valid_until = now + timedelta(days=self.score_validity_days)  # Valid for 1 year
 
         esg_score = ESGScore(
             farm_id=farm_data.farm_id,
@@ -452,6 +575,123 @@ class ESGCalculator:
 
         return esg_score
 
+    def scoring_version(self) -> str:
+        """Fingerprint of the scoring rules (weights, mappings, token factors)"""
+        rules = {
+            'scoring_weights': self.scoring_weights,
+            'environmental_weights': self.environmental_weights,
+            'social_weights': self.social_weights,
+            'governance_weights': self.governance_weights,
+            'certification_mapping': self.certification_mapping,
+            'token_multiplier_base': self.token_multiplier_base,
+            'size_factor_threshold': self.size_factor_threshold,
+            'score_validity_days': self.score_validity_days
+        }
+        payload = json.dumps(rules, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    def calculate_scores_batch(self, farms: Union[pd.DataFrame, Dict[str, Sequence]],
+                               trade_volume: Optional[Union[float, Sequence[float]]] = None
+                               ) -> ESGBatchResult:
+        """
+        Vectorized ESG scoring for many farms
+
+        Produces the same scores, certification levels and token amounts as
+        calculate_score applied row by row, computed as NumPy array operations.
+
+        Args:
+            farms: DataFrame or dict of columns named after FarmData fields. Requires
+                farm_id, BATCH_NUMERIC_COLUMNS, BATCH_FLAG_COLUMNS and either
+                certifications (list per farm) or certification_points.
+            trade_volume: Optional scalar or per-farm trade volume for the token bonus
+
+        Returns:
+            ESGBatchResult with per-farm arrays (breakdowns built on demand)
+        """
+        frame = farms if isinstance(farms, pd.DataFrame) else pd.DataFrame(farms)
+        frame = frame.reset_index(drop=True)
+        count = len(frame)
+
+        def column(name: str) -> np.ndarray:
+            return frame[name].to_numpy(dtype=np.float64)
+
+        def flag(name: str) -> np.ndarray:
+            return frame[name].fillna(False).to_numpy(dtype=bool)
+
+        # Environmental (same term order as calculate_environmental_score)
+        ew = self.environmental_weights
+        water = column('water_usage_per_hectare')
+        carbon = column('carbon_emissions')
+        environmental = (
+            np.where(flag('organic_certified'), 100.0, 0.0) * ew['organic_certification']
+            + np.clip(100 - ((water - 5000) / 150), 0, 100) * ew['water_efficiency']
+            + np.clip(100 - ((carbon - 2) * 16.67), 0, 100) * ew['carbon_footprint']
+            + column('renewable_energy_percentage') * ew['renewable_energy']
+            + column('biodiversity_score') * 10 * ew['biodiversity']
+            + column('soil_health_score') * 10 * ew['soil_health']
+        )
+
+        # Social
+        sw = self.social_weights
+        social = (
+            np.where(flag('fair_wage_certification'), 100.0, 0.0) * sw['fair_wage']
+            + np.minimum(100, column('community_investment_percentage') * 10) * sw['community_investment']
+            + column('worker_safety_score') * 10 * sw['worker_safety']
+            + column('local_employment_percentage') * sw['local_employment']
+            + (flag('training_programs') * 50.0 + flag('healthcare_provided') * 50.0)
+            * sw['training_healthcare']
+        )
+
+        # Governance
+        gw = self.governance_weights
+        governance = (
+            column('transparency_score') * 10 * gw['transparency']
+            + self._certification_points(frame) * gw['certifications']
+            + column('record_keeping_score') * 10 * gw['record_keeping']
+            + column('stakeholder_engagement_score') * 10 * gw['stakeholder_engagement']
+            + column('ethical_practices_score') * 10 * gw['ethical_practices']
+        )
+
+        overall = (
+            environmental * self.scoring_weights['environmental']
+            + social * self.scoring_weights['social']
+            + governance * self.scoring_weights['governance']
+        )
+
+        # Tiers / certification levels
+        tier_conditions = [overall >= threshold for threshold in TIER_THRESHOLDS]
+        tier_multiplier = np.select(tier_conditions, TIER_MULTIPLIERS[:-1], TIER_MULTIPLIERS[-1])
+        certification_level = np.select(tier_conditions, CERTIFICATION_LEVELS[:-1],
+                                        CERTIFICATION_LEVELS[-1]).astype(object)
+
+        # ESG-GOLD tokens (same factors as calculate_esg_gold_tokens)
+        size = column('size_hectares')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            size_factor = np.where(size <= self.size_factor_threshold, 1.0,
+                                   1.0 + np.log10(size / self.size_factor_threshold) * 0.5)
+        volumes = np.nan_to_num(np.broadcast_to(
+            np.asarray(trade_volume if trade_volume is not None else 0.0, dtype=np.float64),
+            (count,)))
+        volume_bonus = np.where(volumes != 0, np.minimum(2.0, 1.0 + (volumes / 1000000)), 1.0)
+        tokens = np.trunc(overall * self.token_multiplier_base * size_factor
+                          * tier_multiplier * volume_bonus).astype(np.int64)
+
+        return ESGBatchResult(self, frame, volumes, environmental, social, governance, overall,
+                              certification_level, tokens, datetime.now())
+
+    def _certification_points(self, frame: pd.DataFrame) -> np.ndarray:
+        """Capped certification points per farm from certification_points or certification lists"""
+        if 'certification_points' in frame:
+            points = frame['certification_points'].to_numpy(dtype=np.float64)
+        elif 'certifications' in frame and len(frame):
+            names = frame['certifications'].explode().dropna().astype(str)
+            mapped = names.str.lower().str.replace(' ', '_').map(self.certification_mapping)
+            points = mapped.groupby(level=0).sum().reindex(frame.index, fill_value=0)
+            points = points.to_numpy(dtype=np.float64)
+        else:
+            points = np.zeros(len(frame))
+        return np.minimum(100, points)
+
     def generate_improvement_recommendations(self, esg_score: ESGScore) -> Dict[str, List[str]]:
         """Generate specific improvement recommendations based on ESG score"""
         recommendations = {
@@ -8,7 +8,7 @@ Integrated PAM-TALK Simulator
 import json
 import sys
 import os
-from typing import Dict
+from typing import Callable, Dict, Optional
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -35,8 +35,16 @@ class IntegratedSimulator:
         self.carbon = CarbonCalculator(population=population)
         self.economic = EconomicAnalyzer(population=population)
 
-    def run_full_simulation(self) -> Dict:
-        """전체 시뮬레이션 실행"""
+    def run_full_simulation(self, progress: Optional[Callable[[int, int, str], None]] = None) -> Dict:
+        """
+        전체 시뮬레이션 실행
+
+        Args:
+            progress: 단계 진행 콜백 (완료 단계 수, 전체 단계 수, 단계 이름)
+        """
+        def report(step: int, stage: str):
+            if progress:
+                progress(step, 4, stage)
 
         print("\n" + "=" * 70)
         print("PAM-TALK 플랫폼 효과 시뮬레이션")
@@ -48,14 +56,17 @@ class IntegratedSimulator:
         # 1. 유통 구조 시뮬레이션
         print("\n[1/4] 유통 구조 효과 분석 중...")
         distribution_results = self.distribution.run_simulation()
+        report(1, "distribution")
 
         # 2. 탄소 절감 계산
         print("[2/4] 탄소 절감 효과 계산 중...")
         carbon_results = self.carbon.run_calculation()
+        report(2, "carbon")
 
         # 3. 경제 효과 분석
         print("[3/4] 경제적 효과 분석 중...")
         economic_results = self.economic.run_analysis()
+        report(3, "economic")
 
         # 4. LSTM 수요 예측 효과 (distribution에 포함)
         print("[4/4] 종합 분석 중...")
@@ -82,6 +93,7 @@ class IntegratedSimulator:
                 economic_results
             )
         }
+        report(4, "summary")
 
         return integrated_results
 
@@ -131,6 +143,24 @@ class IntegratedSimulator:
             ]
         }
 
+    def run_monte_carlo(self, scenarios: Optional[Dict[str, Dict]] = None, draws: int = 5000,
+                        engine=None, **kwargs) -> Dict:
+        """
+        몬테카를로 시나리오 분석 (ai_models.scenario_engine)
+
+        Args:
+            scenarios: 시나리오 이름 -> 파라미터 명세 (기본: 현재 인구 + 기본 불확실성 가정)
+            draws: 시나리오당 추출 수
+            engine: 사용할 ScenarioEngine (기본: 프로세스 공유 엔진)
+            **kwargs: ScenarioEngine.run 인자 (seed, percentiles, keep_samples, force)
+        """
+        from ai_models.scenario_engine import DEFAULT_UNCERTAINTY, get_scenario_engine
+
+        if scenarios is None:
+            scenarios = {"baseline": dict(DEFAULT_UNCERTAINTY, population=self.population)}
+        engine = engine or get_scenario_engine()
+        return engine.run(scenarios, draws=draws, **kwargs)
+
     def export_full_results(self, filepath: str = "data/simulation/integrated_results.json"):
         """통합 결과를 JSON으로 저장"""
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
@@ -253,13 +253,15 @@ class LSTMDemandPredictor:
 
         return model
 
-    def train(self, product_name: str, save_model: bool = True) -> Dict:
+    def train(self, product_name: str, save_model: bool = True,
+              extra_callbacks: Optional[List] = None) -> Dict:
         """
         Train LSTM model on product data
 
         Args:
             product_name: Name of the product to train on
             save_model: Whether to save the trained model
+            extra_callbacks: Additional Keras callbacks (e.g. epoch progress reporting)
 
         Returns:
             Training history and metrics
@@ -312,6 +314,8 @@ class LSTMDemandPredictor:
                 verbose=1
             )
         ]
+        if extra_callbacks:
+            callbacks.extend(extra_callbacks)
 
         # Train model
         print(f"\n🎓 모델 학습 시작...")
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PAM LSTM Model Server
+워커 프로세스에 상주하는 LSTM 수요 예측 서버
+
+요청마다 LSTMDemandPredictor를 새로 만들면 설정 로드, .h5 모델 로드, 학습 데이터
+생성이 매번 반복되어 예측 한 번에 수 초가 걸립니다. 이 모듈은 제품별 모델 핸들을
+한 번만 로드해 두고, 동시에 들어온 예측 요청을 배처 스레드 하나가 모아서 처리합니다.
+
+- 제품별 핸들: 모델, 학습 때와 같은 방식으로 맞춘 스케일러, 최근 lookback 구간(컨텍스트)
+- 마이크로 배칭: 같은 제품 요청은 가장 긴 days_ahead 기준 롤아웃 한 번으로 처리
+- 예측 캐시: 컨텍스트가 같으면 예측이 결정적이므로 롤아웃 결과를 재사용 (날짜가 바뀌면 갱신)
+- 타임아웃: 제한 시간 안에 결과가 없으면 PredictionTimeout (요청 경로에서 학습하지 않음)
+"""
+
+import os
+import json
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "ai_models/lstm_config.json"
+DEFAULT_MODEL_PATH = "data/models"
+
+_DEFAULT_TIMEOUT = object()
+
+
+class ModelServerError(Exception):
+    """모델 서버 오류 기본 클래스"""
+
+
+class ModelNotReady(ModelServerError):
+    """제품의 학습된 모델이 없음 (먼저 /api/lstm/train 필요)"""
+
+
+class ModelServerBusy(ModelServerError):
+    """대기열이 가득 차 요청을 받을 수 없음"""
+
+
+class PredictionTimeout(ModelServerError):
+    """제한 시간 안에 예측이 끝나지 않음"""
+
+
+class _ModelHandle:
+    """제품 하나의 상주 모델과 롤아웃 상태"""
+
+    def __init__(self, product: str, model, scaler: MinMaxScaler, context: np.ndarray,
+                 last_date, target_idx: int):
+        self.product = product
+        self.model = model
+        self.scaler = scaler
+        self.context = context
+        self.context_day = datetime.now().date()
+        self.last_date = last_date
+        self.target_idx = target_idx
+        self.loaded_at = time.time()
+        # 롤아웃 상태 (컨텍스트에서 시작해 예측값으로 한 칸씩 밀어낸 시퀀스)
+        self.sequence = context.copy()
+        self.forecast: List[float] = []
+
+
+class _Request:
+    __slots__ = ('product', 'days_ahead', 'future')
+
+    def __init__(self, product: str, days_ahead: int):
+        self.product = product
+        self.days_ahead = days_ahead
+        self.future = Future()
+
+
+class LSTMModelServer:
+    """
+    상주 LSTM 예측 서버 (워커당 하나)
+
+    Usage:
+        server = get_model_server()
+        server.warmup()                       # 시작 시 모델 로드
+        df = server.predict('tomatoes', 7)    # date, predicted_demand
+    """
+
+    def __init__(self, config: Optional[Dict] = None, config_path: str = DEFAULT_CONFIG_PATH,
+                 model_path: str = DEFAULT_MODEL_PATH,
+                 model_loader: Optional[Callable[[str], object]] = None,
+                 history_source: Optional[Callable[[str], pd.DataFrame]] = None,
+                 max_batch_size: int = 64, max_wait: float = 0.005,
+                 request_timeout: float = 2.0, max_queue: int = 1024,
+                 max_days_ahead: int = 90):
+        """
+        Args:
+            config: LSTM 설정 (없으면 config_path에서 로드)
+            model_loader: 모델 파일 경로 -> 모델 (기본: keras.models.load_model)
+            history_source: 제품명 -> 최근 데이터 DataFrame (기본: LSTMDemandPredictor.generate_training_data)
+            max_batch_size: 배처가 한 번에 모으는 최대 요청 수
+            max_wait: 첫 요청 이후 같은 배치로 모으기 위해 기다리는 시간 (초)
+            request_timeout: predict() 기본 제한 시간 (초)
+            max_queue: 대기열 최대 길이 (넘으면 ModelServerBusy)
+        """
+        self.config_path = config_path
+        self.config = config if config is not None else self._load_config(config_path)
+        self.model_path = model_path
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.request_timeout = request_timeout
+        self.max_days_ahead = max_days_ahead
+
+        self._model_loader = model_loader or self._load_keras_model
+        self._history_source = history_source or self._generate_history
+        self._data_predictor = None
+
+        self._lock = threading.Lock()
+        self._handles: Dict[str, _ModelHandle] = {}
+        self._queue: "queue.Queue[_Request]" = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._stopped = False
+        self._stats = {
+            'requests': 0,
+            'cache_hits': 0,
+            'batches': 0,
+            'batched_requests': 0,
+            'model_calls': 0,
+            'models_loaded': 0,
+            'timeouts': 0,
+            'rejected': 0
+        }
+
+    # ------------------------------------------------------------------
+    # 설정 / 기본 로더
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _load_config(config_path: str) -> Dict:
+        if os.path.exists(config_path):
+            with open(config_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        # 설정 파일이 없으면 예측기가 만드는 기본 설정 사용
+        from ai_models.lstm_demand_predictor import LSTMDemandPredictor
+        return LSTMDemandPredictor(config_path).config
+
+    @staticmethod
+    def _load_keras_model(model_file: str):
+        from tensorflow import keras
+        return keras.models.load_model(model_file, compile=False)
+
+    def _generate_history(self, product: str) -> pd.DataFrame:
+        if self._data_predictor is None:
+            from ai_models.lstm_demand_predictor import LSTMDemandPredictor
+            self._data_predictor = LSTMDemandPredictor(self.config_path)
+            self._data_predictor.config = self.config
+        return self._data_predictor.generate_training_data(product)
+
+    @property
+    def products(self) -> List[str]:
+        return list(self.config['products'].keys())
+
+    # ------------------------------------------------------------------
+    # 모델 핸들
+    # ------------------------------------------------------------------
+
+    def _model_file(self, product: str) -> str:
+        return os.path.join(self.model_path, f"lstm_{product}.h5")
+
+    def _get_handle(self, product: str) -> _ModelHandle:
+        """핸들 조회 (없으면 로드, 날짜가 바뀌었으면 컨텍스트 갱신) - 배처/워밍업 스레드에서 호출"""
+        with self._lock:
+            handle = self._handles.get(product)
+        if handle is not None and handle.context_day == datetime.now().date():
+            return handle
+
+        model = handle.model if handle is not None else self._load_model(product)
+        handle = self._build_handle(product, model)
+        with self._lock:
+            self._handles[product] = handle
+        return handle
+
+    def _load_model(self, product: str):
+        model_file = self._model_file(product)
+        if not os.path.exists(model_file):
+            raise ModelNotReady(f"'{product}' 학습된 모델이 없습니다: {model_file}")
+
+        started = time.perf_counter()
+        model = self._model_loader(model_file)
+        with self._lock:
+            self._stats['models_loaded'] += 1
+        logger.info(f"LSTM 모델 로드: {product} ({time.perf_counter() - started:.2f}s)")
+        return model
+
+    def _build_handle(self, product: str, model) -> _ModelHandle:
+        """학습 때(prepare_sequences)와 같은 방식으로 스케일러를 맞추고 최근 구간을 컨텍스트로 보관"""
+        lookback = self.config['model_parameters']['lookback_period']
+        features = self.config['data_parameters']['features']
+        target_idx = features.index(self.config['data_parameters']['target'])
+
+        history = self._history_source(product)
+        scaler = MinMaxScaler(feature_range=(0, 1))
+        scaled = scaler.fit_transform(history[features].values)
+
+        return _ModelHandle(product, model, scaler, scaled[-lookback:].copy(),
+                            history['date'].max(), target_idx)
+
+    def reload(self, product: Optional[str] = None):
+        """모델 핸들 폐기 (재학습 후 호출하면 다음 요청에서 새 모델을 로드)"""
+        with self._lock:
+            if product is None:
+                self._handles.clear()
+            else:
+                self._handles.pop(product, None)
+
+    def warmup(self, products: Optional[Iterable[str]] = None, days_ahead: int = 7,
+               background: bool = False):
+        """
+        모델 로드와 첫 추론을 미리 수행 (첫 요청이 로드/그래프 생성 비용을 내지 않도록)
+
+        Returns:
+            background=False: {제품: 'ready' 또는 오류 메시지}
+            background=True: 워밍업 스레드
+        """
+        targets = list(products) if products is not None else self.products
+
+        if background:
+            thread = threading.Thread(target=self.warmup, args=(targets, days_ahead),
+                                      name="lstm-warmup", daemon=True)
+            thread.start()
+            return thread
+
+        status = {}
+        for product in targets:
+            try:
+                self.predict(product, days_ahead, timeout=None)
+                status[product] = 'ready'
+            except Exception as e:
+                status[product] = str(e)
+                logger.warning(f"LSTM 워밍업 실패 ({product}): {str(e)}")
+        return status
+
+    # ------------------------------------------------------------------
+    # 예측
+    # ------------------------------------------------------------------
+
+    def predict(self, product: str, days_ahead: int = 7,
+                timeout=_DEFAULT_TIMEOUT) -> pd.DataFrame:
+        """
+        수요 예측 (LSTMDemandPredictor.predict와 같은 형식의 DataFrame)
+
+        Args:
+            timeout: 제한 시간 (초). 기본값은 request_timeout, None이면 무제한
+
+        Raises:
+            ValueError: 설정에 없는 제품 또는 잘못된 days_ahead
+            ModelNotReady: 학습된 모델 없음
+            ModelServerBusy: 대기열 가득 참
+            PredictionTimeout: 제한 시간 초과
+        """
+        if product not in self.config['products']:
+            raise ValueError(f"Product '{product}' not configured")
+        days_ahead = int(days_ahead)
+        if not 1 <= days_ahead <= self.max_days_ahead:
+            raise ValueError(f"days_ahead는 1~{self.max_days_ahead} 사이여야 합니다")
+        if timeout is _DEFAULT_TIMEOUT:
+            timeout = self.request_timeout
+
+        with self._lock:
+            self._stats['requests'] += 1
+            handle = self._handles.get(product)
+            if (handle is not None and len(handle.forecast) >= days_ahead
+                    and handle.context_day == datetime.now().date()):
+                self._stats['cache_hits'] += 1
+                return self._to_frame(handle, days_ahead)
+
+        request = _Request(product, days_ahead)
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            with self._lock:
+                self._stats['rejected'] += 1
+            raise ModelServerBusy("예측 대기열이 가득 찼습니다")
+
+        try:
+            return request.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # 배처는 계속 처리하므로 결과는 캐시에 남아 다음 요청이 사용
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise PredictionTimeout(f"'{product}' 예측이 {timeout}초 안에 끝나지 않았습니다")
+
+    def _to_frame(self, handle: _ModelHandle, days_ahead: int) -> pd.DataFrame:
+        pred_dates = pd.date_range(start=handle.last_date + timedelta(days=1),
+                                   periods=days_ahead, freq='D')
+        return pd.DataFrame({
+            'date': pred_dates,
+            'predicted_demand': handle.forecast[:days_ahead]
+        })
+
+    # ------------------------------------------------------------------
+    # 배처 스레드
+    # ------------------------------------------------------------------
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._stopped:
+                raise ModelServerError("모델 서버가 중지되었습니다")
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="lstm-model-server",
+                                                daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._process_batch(batch)
+
+    def _process_batch(self, batch: List[_Request]):
+        """제품별로 묶어 가장 긴 요청 기준으로 한 번만 롤아웃"""
+        by_product: Dict[str, List[_Request]] = {}
+        for request in batch:
+            by_product.setdefault(request.product, []).append(request)
+
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['batched_requests'] += len(batch)
+
+        for product, requests in by_product.items():
+            try:
+                handle = self._get_handle(product)
+                self._extend_forecast(handle, max(r.days_ahead for r in requests))
+                for request in requests:
+                    request.future.set_result(self._to_frame(handle, request.days_ahead))
+            except Exception as e:
+                if not isinstance(e, ModelServerError):
+                    logger.error(f"LSTM 예측 오류 ({product}): {str(e)}")
+                for request in requests:
+                    request.future.set_exception(e)
+
+    def _extend_forecast(self, handle: _ModelHandle, days_ahead: int):
+        """이전 롤아웃이 멈춘 지점부터 days_ahead까지 이어서 예측"""
+        target_idx = handle.target_idx
+        n_features = handle.sequence.shape[1]
+        sequence = handle.sequence
+        forecast = list(handle.forecast)
+
+        while len(forecast) < days_ahead:
+            X_pred = sequence.reshape(1, sequence.shape[0], n_features)
+            pred_scaled = float(self._infer(handle.model, X_pred)[0])
+
+            # 다음 입력: 마지막 행을 복사해 수요만 예측값으로 교체 (LSTMDemandPredictor.predict와 동일)
+            next_input = sequence[-1].copy()
+            next_input[target_idx] = pred_scaled
+            sequence = np.vstack([sequence[1:], next_input])
+
+            full_features = np.zeros((1, n_features))
+            full_features[0, target_idx] = pred_scaled
+            forecast.append(float(handle.scaler.inverse_transform(full_features)[0, target_idx]))
+
+        with self._lock:
+            handle.sequence = sequence
+            handle.forecast = forecast
+
+    def _infer(self, model, X: np.ndarray) -> np.ndarray:
+        with self._lock:
+            self._stats['model_calls'] += 1
+        # predict_on_batch는 predict보다 호출당 오버헤드가 작음
+        if hasattr(model, 'predict_on_batch'):
+            output = model.predict_on_batch(X)
+        else:
+            output = model.predict(X)
+        return np.asarray(output).reshape(len(X), -1)[:, 0]
+
+    # ------------------------------------------------------------------
+    # 관리
+    # ------------------------------------------------------------------
+
+    def stop(self):
+        """배처 중지 (대기 중인 요청은 취소)"""
+        self._stopped = True
+        while True:
+            try:
+                self._queue.get_nowait().future.cancel()
+            except queue.Empty:
+                break
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['loaded_products'] = sorted(self._handles.keys())
+        stats['queue_size'] = self._queue.qsize()
+        return stats
+
+
+_server: Optional[LSTMModelServer] = None
+_server_lock = threading.Lock()
+
+
+def get_model_server() -> LSTMModelServer:
+    """워커 프로세스 공유 모델 서버 (환경 변수로 조정)"""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = LSTMModelServer(
+                config_path=os.environ.get('LSTM_CONFIG_PATH', DEFAULT_CONFIG_PATH),
+                model_path=os.environ.get('LSTM_MODEL_PATH', DEFAULT_MODEL_PATH),
+                max_wait=float(os.environ.get('LSTM_BATCH_WAIT', '0.005')),
+                request_timeout=float(os.environ.get('LSTM_PREDICT_TIMEOUT', '2.0'))
+            )
+        return _server
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    server = get_model_server()
+    print(json.dumps(server.warmup(), ensure_ascii=False, indent=2))
+
+    started = time.perf_counter()
+    print(server.predict('tomatoes', days_ahead=7).to_string(index=False))
+    print(f"예측 시간: {(time.perf_counter() - started) * 1000:.1f}ms")
+    print(server.get_stats())
@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PAM-TALK Scenario Engine
+통합 시뮬레이터 몬테카를로 시나리오 엔진
+
+IntegratedSimulator는 고정 파라미터로 유통/탄소/경제 계산기를 한 번 실행합니다.
+이 모듈은 같은 계산식을 NumPy 배열 연산으로 옮겨, 시나리오마다 수천 개의 파라미터
+추출(draw)을 한 번에 평가하고 지표별 분포(평균, 표준편차, 백분위수)를 돌려줍니다.
+
+- 파라미터: 인구, 참여자 수, 참여율, 배출 계수, 산업연관 승수 등 (기본값은 각 계산기에서 읽음)
+- 분포 지정: 상수 또는 {'dist': 'uniform' | 'normal' | 'triangular' | 'lognormal', ...}
+- 병렬 처리: 캐시에 없는 시나리오가 여러 개면 프로세스 풀에서 시나리오별로 실행
+- 결과 캐시: 파라미터 해시 키로 메모리(LRU) + 디스크(JSON) 캐시, 같은 키는 같은 난수열
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import itertools
+import logging
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_models.carbon_calculator import CarbonCalculator
+from ai_models.distribution_simulator import DistributionSimulator
+from ai_models.economic_analyzer import EconomicAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# 계산식 또는 파라미터 의미가 바뀌면 올려서 기존 캐시를 무효화
+ENGINE_VERSION = 1
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_CACHE_DIR = "data/simulation/scenario_cache"
+
+# 계산기 메서드 안에 상수로 들어 있는 가정값 (carbon_calculator / economic_analyzer 참조)
+FIXED_ASSUMPTIONS = {
+    "purchases_per_consumer": 4,         # 소비자 1인당 월 구매 횟수
+    "packaging_per_purchase_kg": 0.2,    # 구매 1건당 포장재 (kg)
+    "esg_reduction_per_capita_kg": 40.0, # ESG 활동 참여자 1인당 연간 절감량 (kg CO₂e)
+    "baseline_emissions_ton": 298.0,     # 기준 배출량 (톤 CO₂e)
+    "car_annual_emissions_ton": 2.3,     # 승용차 1대당 연간 배출량 (톤)
+    "baseline_local_ratio": 0.23,        # 로컬푸드 비중 (기준)
+    "improved_local_ratio": 0.70,        # 로컬푸드 비중 (개선)
+    "producer_price_increase_rate": 0.28,
+    "producer_revenue_share": 0.6,       # 가맹점 매출 중 생산자 몫
+    "store_revenue_increase_rate": 0.15
+}
+
+METRICS = (
+    "food_mileage_reduction_ton",
+    "packaging_reduction_ton",
+    "esg_activity_reduction_ton",
+    "infrastructure_reduction_ton",
+    "carbon_reduction_ton",
+    "carbon_reduction_pct",
+    "car_equivalent",
+    "direct_effect_billion",
+    "indirect_effect_billion",
+    "value_added_billion",
+    "total_impact_billion",
+    "per_capita_benefit_krw",
+    "jobs_created",
+    "stage_reduction_pct",
+    "margin_reduction_pp"
+)
+
+# 파라미터 불확실성 기본 가정 (IntegratedSimulator.run_monte_carlo 기본값)
+DEFAULT_UNCERTAINTY = {
+    "monthly_transport_ton": {"dist": "triangular", "low": 220.0, "mode": 280.0, "high": 330.0},
+    "improved_food_mileage_km": {"dist": "triangular", "low": 15.0, "mode": 25.0, "high": 50.0},
+    "truck_transport": {"dist": "triangular", "low": 0.070, "mode": 0.082, "high": 0.095},
+    "improved_packaging_rate": {"dist": "uniform", "low": 30.0, "high": 55.0},
+    "plastic_packaging": {"dist": "normal", "mean": 3.2, "std": 0.3, "min": 0.0},
+    "improved_esg_participation": {"dist": "uniform", "low": 20.0, "high": 45.0},
+    "consumers": {"dist": "normal", "mean": 2000, "std": 300, "min": 0},
+    "consumer_monthly_spending": {"dist": "lognormal", "median": 150000, "sigma": 0.2},
+    "production_multiplier": {"dist": "triangular", "low": 1.9, "mode": 2.2, "high": 2.5},
+    "value_added_multiplier": {"dist": "triangular", "low": 1.5, "mode": 1.8, "high": 2.1}
+}
+
+
+def default_parameters() -> Dict[str, float]:
+    """각 계산기의 현재 기본값으로 파라미터 점 추정치 구성"""
+    carbon = CarbonCalculator()
+    economic = EconomicAnalyzer()
+    distribution = DistributionSimulator()
+
+    params = {
+        "population": float(carbon.population),
+        "consumers": float(carbon.participants["consumers"]),
+        "stores": float(economic.participants["stores"]),
+        # 탄소
+        "monthly_transport_ton": carbon.baseline["monthly_transport"],
+        "baseline_food_mileage_km": carbon.baseline["avg_food_mileage"],
+        "improved_food_mileage_km": carbon.improved["avg_food_mileage"],
+        "baseline_packaging_rate": carbon.baseline["packaging_rate"],
+        "improved_packaging_rate": carbon.improved["packaging_rate"],
+        "baseline_esg_participation": carbon.baseline["esg_participation"],
+        "improved_esg_participation": carbon.improved["esg_participation"],
+        "monthly_ev_charging": float(carbon.improved["monthly_ev_charging"]),
+        "monthly_eco_packaging": float(carbon.improved["monthly_eco_packaging"]),
+        "truck_transport": carbon.emission_factor.truck_transport,
+        "plastic_packaging": carbon.emission_factor.plastic_packaging,
+        "ev_charging_reduction": carbon.emission_factor.ev_charging_reduction,
+        "eco_packaging_reduction": carbon.emission_factor.eco_packaging_reduction,
+        # 경제
+        "consumer_monthly_spending": float(economic.transaction["avg_monthly_per_consumer"]),
+        "store_monthly_revenue": float(economic.transaction["avg_monthly_per_store"]),
+        "production_multiplier": economic.multiplier.production,
+        "value_added_multiplier": economic.multiplier.value_added,
+        "employment_multiplier": economic.multiplier.employment,
+        # 유통
+        "baseline_stages": float(distribution.baseline.stages),
+        "improved_stages": float(distribution.improved.stages),
+        "baseline_margin_min": distribution.baseline.margin_min,
+        "baseline_margin_max": distribution.baseline.margin_max,
+        "improved_margin_min": distribution.improved.margin_min,
+        "improved_margin_max": distribution.improved.margin_max
+    }
+    params.update({name: float(value) for name, value in FIXED_ASSUMPTIONS.items()})
+    return params
+
+
+ParameterSpec = Union[float, int, Dict[str, Any]]
+
+
+def _validate_spec(name: str, spec: ParameterSpec):
+    if isinstance(spec, (int, float)) and not isinstance(spec, bool):
+        return
+    if not isinstance(spec, dict):
+        raise ValueError(f"Invalid spec for '{name}': {spec!r}")
+
+    required = {
+        "uniform": ("low", "high"),
+        "normal": ("mean", "std"),
+        "triangular": ("low", "mode", "high"),
+        "lognormal": ("median", "sigma")
+    }
+    kind = spec.get("dist")
+    if kind not in required:
+        raise ValueError(f"Unknown distribution for '{name}': {kind!r}")
+    missing = [key for key in required[kind] if key not in spec]
+    if missing:
+        raise ValueError(f"Distribution '{kind}' for '{name}' requires {missing}")
+
+
+def resolve_parameters(overrides: Optional[Dict[str, ParameterSpec]] = None) -> Dict[str, ParameterSpec]:
+    """기본값에 시나리오 지정값을 덮어쓴 전체 파라미터 명세 (알 수 없는 이름은 ValueError)"""
+    params: Dict[str, ParameterSpec] = dict(default_parameters())
+    for name, spec in (overrides or {}).items():
+        if name not in params:
+            raise ValueError(f"Unknown scenario parameter: {name}")
+        _validate_spec(name, spec)
+        params[name] = spec if isinstance(spec, dict) else float(spec)
+    return params
+
+
+def scenario_key(params: Dict[str, ParameterSpec], draws: int, seed: int,
+                 percentiles: Sequence[float]) -> str:
+    """전체 파라미터 명세 + 실행 설정 해시 (캐시 키이자 난수 시드)"""
+    payload = json.dumps({
+        "version": ENGINE_VERSION,
+        "params": params,
+        "draws": int(draws),
+        "seed": int(seed),
+        "percentiles": [float(p) for p in percentiles]
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def sample_parameters(params: Dict[str, ParameterSpec], draws: int,
+                      rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """파라미터 명세를 draws 길이 배열로 추출 (이름 순서대로 추출해 재현성 유지)"""
+    samples = {}
+    for name in sorted(params):
+        spec = params[name]
+        if not isinstance(spec, dict):
+            samples[name] = np.full(draws, float(spec))
+            continue
+
+        kind = spec["dist"]
+        if kind == "uniform":
+            values = rng.uniform(spec["low"], spec["high"], draws)
+        elif kind == "normal":
+            values = rng.normal(spec["mean"], spec["std"], draws)
+        elif kind == "triangular":
+            values = rng.triangular(spec["low"], spec["mode"], spec["high"], draws)
+        else:
+            values = rng.lognormal(np.log(spec["median"]), spec["sigma"], draws)
+
+        if "min" in spec or "max" in spec:
+            values = np.clip(values, spec.get("min", -np.inf), spec.get("max", np.inf))
+        samples[name] = values
+    return samples
+
+
+def evaluate(p: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    유통/탄소/경제 계산식의 벡터화 버전
+
+    계산기 메서드와 같은 식이지만 중간 반올림을 하지 않으므로, 점 추정치에서
+    계산기 출력과 반올림 오차(0.1 단위) 범위 안에서 일치합니다.
+    """
+    # 탄소 - 푸드 마일리지 (kg CO₂e)
+    annual_transport = p["monthly_transport_ton"] * 12
+    food_mileage = (annual_transport *
+                    (p["baseline_food_mileage_km"] - p["improved_food_mileage_km"]) *
+                    p["truck_transport"])
+
+    # 탄소 - 포장재
+    annual_packaging = (p["consumers"] * p["purchases_per_consumer"] * 12 *
+                        p["packaging_per_purchase_kg"])
+    packaging = (annual_packaging *
+                 (p["baseline_packaging_rate"] - p["improved_packaging_rate"]) / 100 *
+                 p["plastic_packaging"])
+
+    # 탄소 - 소비자 ESG 활동 (참여자 수는 정수로 절사)
+    baseline_participants = np.floor(p["consumers"] * p["baseline_esg_participation"] / 100)
+    improved_participants = np.floor(p["consumers"] * p["improved_esg_participation"] / 100)
+    esg_activity = (improved_participants - baseline_participants) * p["esg_reduction_per_capita_kg"]
+
+    # 탄소 - 대기업 인프라
+    infrastructure = (p["monthly_ev_charging"] * 12 * p["ev_charging_reduction"] +
+                      p["monthly_eco_packaging"] * 12 * p["eco_packaging_reduction"])
+
+    carbon_total = (food_mileage + packaging + esg_activity + infrastructure) / 1000
+
+    # 경제 - 직접 효과 (원)
+    local_consumption = (p["consumers"] * p["consumer_monthly_spending"] * 12 *
+                         (p["improved_local_ratio"] - p["baseline_local_ratio"]))
+    annual_store_revenue = p["stores"] * p["store_monthly_revenue"] * 12
+    producer_income = (annual_store_revenue * p["producer_revenue_share"] *
+                       p["producer_price_increase_rate"])
+    store_revenue = annual_store_revenue * p["store_revenue_increase_rate"]
+    direct = local_consumption + producer_income + store_revenue
+
+    # 경제 - 간접 효과 (산업연관 승수)
+    production_induced = direct * p["production_multiplier"]
+    total_impact = direct + production_induced
+
+    # 유통 구조
+    stage_reduction = (p["baseline_stages"] - p["improved_stages"]) / p["baseline_stages"] * 100
+    margin_reduction = ((p["baseline_margin_min"] + p["baseline_margin_max"]) / 2 -
+                        (p["improved_margin_min"] + p["improved_margin_max"]) / 2)
+
+    return {
+        "food_mileage_reduction_ton": food_mileage / 1000,
+        "packaging_reduction_ton": packaging / 1000,
+        "esg_activity_reduction_ton": esg_activity / 1000,
+        "infrastructure_reduction_ton": infrastructure / 1000,
+        "carbon_reduction_ton": carbon_total,
+        "carbon_reduction_pct": carbon_total / p["baseline_emissions_ton"] * 100,
+        "car_equivalent": carbon_total / p["car_annual_emissions_ton"],
+        "direct_effect_billion": direct / 100000000,
+        "indirect_effect_billion": production_induced / 100000000,
+        "value_added_billion": direct * p["value_added_multiplier"] / 100000000,
+        "total_impact_billion": total_impact / 100000000,
+        "per_capita_benefit_krw": total_impact / p["population"],
+        "jobs_created": direct * p["employment_multiplier"],
+        "stage_reduction_pct": stage_reduction,
+        "margin_reduction_pp": margin_reduction
+    }
+
+
+def summarize(values: np.ndarray, percentiles: Sequence[float]) -> Dict[str, Any]:
+    """지표 하나의 분포 요약"""
+    points = np.percentile(values, percentiles)
+    return {
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "percentiles": {f"p{p:g}": float(v) for p, v in zip(percentiles, points)}
+    }
+
+
+def run_scenario(params: Dict[str, ParameterSpec], draws: int, key: str,
+                 percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                 keep_samples: bool = False) -> Dict[str, Any]:
+    """
+    시나리오 하나 실행 (워커 프로세스로 전달되므로 모듈 최상위 함수)
+
+    난수 시드는 시나리오 키에서 만들어 실행 순서나 프로세스와 관계없이 같은 결과를 냅니다.
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(int(key[:16], 16))
+    metrics = evaluate(sample_parameters(params, draws, rng))
+
+    result = {
+        "key": key,
+        "draws": int(draws),
+        "parameters": params,
+        "metrics": {name: summarize(metrics[name], percentiles) for name in METRICS},
+        "elapsed_seconds": round(time.perf_counter() - started, 4)
+    }
+    if keep_samples:
+        result["samples"] = {name: metrics[name] for name in METRICS}
+    return result
+
+
+def scenario_grid(axes: Dict[str, Iterable[ParameterSpec]],
+                  base: Optional[Dict[str, ParameterSpec]] = None) -> Dict[str, Dict[str, ParameterSpec]]:
+    """
+    파라미터 축의 모든 조합으로 시나리오 생성
+
+    예: scenario_grid({'population': [50000, 100000]}, base=DEFAULT_UNCERTAINTY)
+        -> {'population=50000': {...}, 'population=100000': {...}}
+    """
+    names = list(axes)
+    scenarios = {}
+    for combo in itertools.product(*(list(axes[name]) for name in names)):
+        label = ",".join(f"{name}={json.dumps(value, sort_keys=True) if isinstance(value, dict) else value}"
+                         for name, value in zip(names, combo))
+        scenario = dict(base or {})
+        scenario.update(zip(names, combo))
+        scenarios[label] = scenario
+    return scenarios
+
+
+class ScenarioEngine:
+    """몬테카를로 시나리오 엔진 (프로세스 풀 + 파라미터 해시 캐시)"""
+
+    def __init__(self, max_workers: Optional[int] = None, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 max_cached: int = 256, mp_context: str = 'spawn'):
+        """
+        Args:
+            max_workers: 시나리오 병렬 실행 프로세스 수 (기본: CPU 코어 수 - 1, 1이면 현재 프로세스에서 실행)
+            cache_dir: 결과 JSON 캐시 디렉토리 (None이면 메모리 캐시만 사용)
+            max_cached: 메모리 캐시 최대 항목 수
+            mp_context: 워커 시작 방식
+        """
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.cache_dir = cache_dir
+        self.max_cached = max_cached
+        self._context = multiprocessing.get_context(mp_context)
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._stats = {'scenarios': 0, 'memory_hits': 0, 'disk_hits': 0,
+                       'computed': 0, 'draws_evaluated': 0}
+
+    def run(self, scenarios: Dict[str, Dict[str, ParameterSpec]], draws: int = 5000, seed: int = 42,
+            percentiles: Sequence[float] = DEFAULT_PERCENTILES, keep_samples: bool = False,
+            force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        시나리오 묶음 실행
+
+        Args:
+            scenarios: 시나리오 이름 -> 기본값에 덮어쓸 파라미터 명세
+            draws: 시나리오당 몬테카를로 추출 수
+            seed: 기본 시드 (시나리오 키에 포함)
+            percentiles: 요약할 백분위수
+            keep_samples: 지표별 원본 표본 배열 포함 여부 (디스크 캐시에는 저장하지 않음)
+            force: 캐시 무시하고 다시 계산
+
+        Returns:
+            시나리오 이름 -> 결과 (metrics, parameters, key, cached 등)
+        """
+        if draws < 1:
+            raise ValueError("draws must be positive")
+        percentiles = tuple(float(p) for p in percentiles)
+
+        jobs = {}
+        for name, overrides in scenarios.items():
+            params = resolve_parameters(overrides)
+            key = scenario_key(params, draws, seed, percentiles)
+            # 표본 포함 결과는 요약과 같은 난수열을 쓰되 캐시 항목은 따로 보관
+            jobs[name] = (params, f"{key}-samples" if keep_samples else key)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Dict[str, ParameterSpec]] = {}
+        for name, (params, key) in jobs.items():
+            cached = None if force else self._lookup(key)
+            if cached is not None:
+                results[name] = dict(cached, scenario=name, cached=True)
+            else:
+                pending.setdefault(key, params)
+
+        computed = self._compute(pending, draws, percentiles, keep_samples)
+        for name, (params, key) in jobs.items():
+            if name not in results:
+                results[name] = dict(computed[key], scenario=name, cached=False)
+
+        with self._lock:
+            self._stats['scenarios'] += len(jobs)
+        return {name: results[name] for name in scenarios}
+
+    def _compute(self, pending: Dict[str, Dict], draws: int, percentiles: Sequence[float],
+                 keep_samples: bool) -> Dict[str, Dict]:
+        if not pending:
+            return {}
+
+        if self.max_workers == 1 or len(pending) == 1:
+            computed = {key: run_scenario(params, draws, key, percentiles, keep_samples)
+                        for key, params in pending.items()}
+        else:
+            executor = self._get_executor()
+            futures = {key: executor.submit(run_scenario, params, draws, key, percentiles, keep_samples)
+                       for key, params in pending.items()}
+            computed = {key: future.result() for key, future in futures.items()}
+
+        for key, result in computed.items():
+            self._store(key, result, persist=not keep_samples)
+        with self._lock:
+            self._stats['computed'] += len(computed)
+            self._stats['draws_evaluated'] += len(computed) * draws
+        return computed
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     mp_context=self._context)
+            return self._executor
+
+    # ------------------------------------------------------------------
+    # 캐시
+    # ------------------------------------------------------------------
+
+    def _cache_path(self, key: str) -> Optional[str]:
+        return os.path.join(self.cache_dir, f"{key}.json") if self.cache_dir else None
+
+    def _lookup(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return self._cache[key]
+
+        path = self._cache_path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable scenario cache {path}: {e}")
+            return None
+
+        self._store(key, result, persist=False)
+        with self._lock:
+            self._stats['disk_hits'] += 1
+        return result
+
+    def _store(self, key: str, result: Dict, persist: bool):
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+
+        path = self._cache_path(key)
+        if persist and path:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+    def clear_cache(self):
+        """메모리 캐시 비우기 (디스크 캐시는 유지)"""
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cached_in_memory'] = len(self._cache)
+        stats['max_workers'] = self.max_workers
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_engine: Optional[ScenarioEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_scenario_engine() -> ScenarioEngine:
+    """프로세스 공유 시나리오 엔진 (환경 변수로 조정)"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ScenarioEngine(
+                max_workers=int(os.environ.get('SCENARIO_WORKERS', '0')) or None,
+                cache_dir=os.environ.get('SCENARIO_CACHE_DIR', DEFAULT_CACHE_DIR) or None
+            )
+        return _engine
+
+
+if __name__ == "__main__":
+    engine = ScenarioEngine(cache_dir=None)
+    scenarios = scenario_grid({"population": [50000, 100000, 200000]}, base=DEFAULT_UNCERTAINTY)
+
+    started = time.perf_counter()
+    results = engine.run(scenarios, draws=20000)
+    elapsed = time.perf_counter() - started
+
+    print("=" * 70)
+    print("PAM-TALK 몬테카를로 시나리오 분석")
+    print("=" * 70)
+    for name, result in results.items():
+        carbon = result["metrics"]["carbon_reduction_ton"]
+        benefit = result["metrics"]["per_capita_benefit_krw"]
+        print(f"\n[{name}] {result['draws']:,}회 추출")
+        print(f"  탄소 절감량: 평균 {carbon['mean']:.1f}톤 "
+              f"(90% 구간 {carbon['percentiles']['p5']:.1f} ~ {carbon['percentiles']['p95']:.1f})")
+        print(f"  1인당 편익: 중앙값 {benefit['percentiles']['p50']:,.0f}원")
+    print(f"\n실행 시간: {elapsed:.2f}초")
+    engine.shutdown()
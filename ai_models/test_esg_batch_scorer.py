@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PAM-TALK ESG Batch Scorer Tests
+
+Checks that the vectorized batch scorer matches calculate_score row by row
+and that breakdowns are only materialized on request.
+"""
+
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_models.esg_calculator import ESGCalculator, FarmData, farm_data_frame
+
+CERTIFICATIONS = ['organic', 'fair_trade', 'Carbon Neutral', 'rainforest_alliance',
+                  'global_gap', 'iso_14001', 'social_accountability', 'unknown_label']
+
+
+def random_farm(rng, index):
+    return FarmData(
+        farm_id=f"FARM_{index:05d}", farm_name=f"Farm {index}", location="Korea",
+        # Include the exact benchmark boundaries of each piecewise rule
+        size_hectares=rng.choice([1.0, 10.0, 25.0, rng.uniform(0.5, 500)]),
+        organic_certified=rng.random() < 0.5,
+        water_usage_per_hectare=rng.choice([5000.0, 20000.0, rng.uniform(0, 30000)]),
+        carbon_emissions=rng.choice([2.0, 8.0, rng.uniform(0, 10)]),
+        renewable_energy_percentage=rng.uniform(0, 100),
+        biodiversity_score=rng.randint(0, 10), soil_health_score=rng.randint(0, 10),
+        waste_management_score=rng.randint(0, 10),
+        fair_wage_certification=rng.random() < 0.5,
+        community_investment_percentage=rng.uniform(0, 15),
+        worker_safety_score=rng.randint(0, 10),
+        local_employment_percentage=rng.uniform(0, 100),
+        training_programs=rng.random() < 0.5, healthcare_provided=rng.random() < 0.5,
+        transparency_score=rng.randint(0, 10),
+        certifications=rng.sample(CERTIFICATIONS, rng.randint(0, 5)),
+        record_keeping_score=rng.randint(0, 10), stakeholder_engagement_score=rng.randint(0, 10),
+        ethical_practices_score=rng.randint(0, 10), supply_chain_traceability=rng.random() < 0.5
+    )
+
+
+@pytest.fixture(scope="module")
+def farms():
+    rng = random.Random(42)
+    return [random_farm(rng, i) for i in range(2000)]
+
+
+@pytest.mark.parametrize("trade_volume", [None, 350000.0])
+def test_batch_matches_scalar_scores(farms, trade_volume):
+    calculator = ESGCalculator()
+    batch = calculator.calculate_scores_batch(farm_data_frame(farms), trade_volume=trade_volume)
+    frame = batch.to_frame()
+
+    for i, farm in enumerate(farms):
+        expected = calculator.calculate_score(farm, trade_volume)
+        row = frame.iloc[i]
+        assert row['farm_id'] == expected.farm_id
+        assert row['environmental_score'] == expected.environmental_score
+        assert row['social_score'] == expected.social_score
+        assert row['governance_score'] == expected.governance_score
+        assert row['overall_score'] == expected.overall_score
+        assert row['certification_level'] == expected.certification_level
+        assert row['esg_gold_tokens'] == expected.esg_gold_tokens
+
+
+def test_per_farm_trade_volume_and_certification_points():
+    calculator = ESGCalculator()
+    farms = farm_data_frame([random_farm(random.Random(i), i) for i in range(3)])
+    volumes = [0.0, 500000.0, 5000000.0]
+
+    batch = calculator.calculate_scores_batch(farms, trade_volume=volumes)
+    for i, volume in enumerate(volumes):
+        expected = calculator.calculate_score(random_farm(random.Random(i), i), volume or None)
+        assert batch.esg_gold_tokens[i] == expected.esg_gold_tokens
+
+    # Precomputed certification points replace the per-farm certification lists
+    points = farms.drop(columns=['certifications'])
+    points['certification_points'] = [
+        sum(calculator.certification_mapping.get(c.lower().replace(' ', '_'), 0) for c in certs)
+        for certs in farms['certifications']
+    ]
+    again = calculator.calculate_scores_batch(points, trade_volume=volumes)
+    assert np.array_equal(again.governance_score, batch.governance_score)
+
+
+def test_breakdowns_are_materialized_on_request(farms):
+    calculator = ESGCalculator()
+    batch = calculator.calculate_scores_batch(farm_data_frame(farms[:50]))
+
+    score = batch.score("FARM_00007")
+    expected = calculator.calculate_score(farms[7])
+    assert score.score_breakdown == expected.score_breakdown
+    assert batch.breakdown(7) == expected.score_breakdown
+
+    summary = batch.summary()
+    assert summary['farm_count'] == 50
+    assert summary['total_esg_tokens'] == sum(calculator.calculate_score(f).esg_gold_tokens
+                                              for f in farms[:50])
+
+
+def test_empty_batch():
+    batch = ESGCalculator().calculate_scores_batch(farm_data_frame([]).reindex(
+        columns=list(FarmData.__dataclass_fields__)))
+    assert len(batch) == 0
+    assert batch.summary() == {}
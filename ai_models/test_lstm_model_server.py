@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LSTM Model Server Tests
+
+상주 모델 핸들, 마이크로 배칭, 예측 캐시, 타임아웃 경로 테스트 (TensorFlow 없이 가짜 모델 사용)
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_models.lstm_model_server import (
+    LSTMModelServer, ModelNotReady, PredictionTimeout
+)
+
+FEATURES = ['demand', 'price', 'day_of_week', 'month', 'is_weekend', 'is_holiday']
+
+CONFIG = {
+    'model_parameters': {'lookback_period': 5},
+    'data_parameters': {'features': FEATURES, 'target': 'demand'},
+    'products': {
+        'tomatoes': {'base_demand': 1000},
+        'cabbage': {'base_demand': 800},
+        'rice': {'base_demand': 2000}
+    }
+}
+
+
+class FakeModel:
+    """Keeps the scaled demand drifting upward so each step is distinguishable"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def predict_on_batch(self, X):
+        self.calls += 1
+        time.sleep(self.delay)
+        return X[:, -1, :1] * 0.9 + 0.1
+
+
+def history(product):
+    dates = pd.date_range(end='2026-10-17', periods=30, freq='D')
+    base = CONFIG['products'][product]['base_demand']
+    return pd.DataFrame({
+        'date': dates,
+        'demand': base + np.arange(30) * 10.0,
+        'price': 5000 - np.arange(30) * 5.0,
+        'day_of_week': dates.dayofweek,
+        'month': dates.month,
+        'is_weekend': dates.dayofweek.isin([5, 6]).astype(int),
+        'is_holiday': np.zeros(30, dtype=int)
+    })
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    for product in ('tomatoes', 'cabbage'):
+        (tmp_path / f"lstm_{product}.h5").write_bytes(b"")
+    return str(tmp_path)
+
+
+def make_server(model_dir, model_factory=FakeModel, **kwargs):
+    loaded = []
+
+    def loader(model_file):
+        loaded.append(os.path.basename(model_file))
+        return model_factory()
+
+    server = LSTMModelServer(config=CONFIG, model_path=model_dir, model_loader=loader,
+                             history_source=history, **kwargs)
+    return server, loaded
+
+
+def test_models_load_once_and_predictions_are_cached(model_dir):
+    server, loaded = make_server(model_dir)
+    assert server.warmup(['tomatoes', 'cabbage']) == {'tomatoes': 'ready', 'cabbage': 'ready'}
+
+    first = server.predict('tomatoes', days_ahead=7)
+    shorter = server.predict('tomatoes', days_ahead=3)
+    server.stop()
+
+    assert loaded == ['lstm_tomatoes.h5', 'lstm_cabbage.h5']
+    assert list(first.columns) == ['date', 'predicted_demand']
+    assert str(first['date'].iloc[0].date()) == '2026-10-18'
+    assert first['predicted_demand'].is_monotonic_increasing
+    assert shorter['predicted_demand'].tolist() == first['predicted_demand'].head(3).tolist()
+
+    stats = server.get_stats()
+    assert stats['cache_hits'] == 2
+    # Warmup rolled out 7 days per product; cached requests made no model calls
+    assert stats['model_calls'] == 14
+
+
+def test_concurrent_requests_share_one_rollout(model_dir):
+    server, _ = make_server(model_dir, model_factory=lambda: FakeModel(delay=0.002),
+                            max_wait=0.05)
+    results = {}
+
+    def request(i):
+        results[i] = server.predict('tomatoes', days_ahead=5 + i % 10)
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(30)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.stop()
+
+    longest = results[9]['predicted_demand'].tolist()
+    assert all(results[i]['predicted_demand'].tolist() == longest[:5 + i % 10] for i in range(30))
+    # One rollout up to the longest horizon, not one per request
+    assert server.get_stats()['model_calls'] <= 14 + 14
+
+
+def test_missing_model_and_unknown_product(model_dir):
+    server, loaded = make_server(model_dir)
+
+    with pytest.raises(ModelNotReady):
+        server.predict('rice', days_ahead=7)
+    with pytest.raises(ValueError):
+        server.predict('durian', days_ahead=7)
+    with pytest.raises(ValueError):
+        server.predict('tomatoes', days_ahead=0)
+    server.stop()
+
+    # Nothing is trained on the request path
+    assert loaded == []
+
+
+def test_slow_prediction_times_out_and_result_is_kept(model_dir):
+    server, _ = make_server(model_dir, model_factory=lambda: FakeModel(delay=0.02))
+
+    with pytest.raises(PredictionTimeout):
+        server.predict('cabbage', days_ahead=10, timeout=0.05)
+
+    # The batcher finishes the rollout, so the next request is served from cache
+    time.sleep(0.4)
+    assert len(server.predict('cabbage', days_ahead=10)) == 10
+    server.stop()
+
+    stats = server.get_stats()
+    assert stats['timeouts'] == 1
+    assert stats['cache_hits'] == 1
+
+
+def test_reload_picks_up_retrained_model(model_dir):
+    server, loaded = make_server(model_dir)
+    server.predict('tomatoes', days_ahead=2)
+    server.reload('tomatoes')
+    server.predict('tomatoes', days_ahead=2)
+    server.stop()
+
+    assert loaded == ['lstm_tomatoes.h5', 'lstm_tomatoes.h5']
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PAM-TALK Scenario Engine Tests
+
+Checks that the vectorized formulas agree with the scalar calculators at point
+parameters, that sampling is reproducible per scenario, and that results are
+cached by parameter hash and computed across worker processes.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_models.integrated_simulator import IntegratedSimulator
+from ai_models.scenario_engine import (
+    METRICS, ScenarioEngine, default_parameters, evaluate, resolve_parameters, scenario_grid
+)
+
+
+def point(**overrides):
+    params = resolve_parameters(overrides)
+    return {name: float(v[0]) for name, v in evaluate({k: np.array([v]) for k, v in params.items()}).items()}
+
+
+def test_point_estimate_matches_integrated_simulator():
+    simulator = IntegratedSimulator(population=100000)
+    results = simulator.run_full_simulation()
+    metrics = point()
+
+    carbon = results['carbon']
+    assert metrics['carbon_reduction_ton'] == pytest.approx(carbon['total']['total_reduction_ton'], abs=0.2)
+    assert metrics['carbon_reduction_pct'] == pytest.approx(carbon['total']['reduction_pct'], abs=0.1)
+    assert metrics['food_mileage_reduction_ton'] == pytest.approx(
+        carbon['details']['food_mileage']['reduction']['annual_reduction_ton'], abs=0.05)
+    assert metrics['esg_activity_reduction_ton'] == pytest.approx(
+        carbon['details']['esg_activity']['reduction']['annual_reduction_ton'], abs=0.05)
+
+    economic = results['economic']['total_impact']
+    assert metrics['direct_effect_billion'] == pytest.approx(economic['direct_total_billion'], abs=0.05)
+    assert metrics['total_impact_billion'] == pytest.approx(economic['total_impact_billion'], abs=0.2)
+    assert metrics['per_capita_benefit_krw'] == pytest.approx(economic['per_capita_benefit_krw'], rel=0.01)
+
+    improvements = results['distribution']['overall']['improvements']
+    assert metrics['stage_reduction_pct'] == improvements['stage_reduction_pct']
+    assert metrics['margin_reduction_pp'] == improvements['margin_reduction_pp']
+
+
+def test_overrides_follow_the_scalar_calculators():
+    simulator = IntegratedSimulator(population=50000)
+    simulator.carbon.emission_factor.truck_transport = 0.1
+    simulator.carbon.participants['consumers'] = 3333
+    simulator.economic.participants['consumers'] = 3333
+    simulator.economic.multiplier.production = 2.5
+    results = simulator.run_full_simulation()
+
+    metrics = point(population=50000, truck_transport=0.1, consumers=3333, production_multiplier=2.5)
+    assert metrics['carbon_reduction_ton'] == pytest.approx(
+        results['carbon']['total']['total_reduction_ton'], abs=0.2)
+    assert metrics['esg_activity_reduction_ton'] == pytest.approx(
+        results['carbon']['details']['esg_activity']['reduction']['annual_reduction_ton'], abs=0.05)
+    assert metrics['total_impact_billion'] == pytest.approx(
+        results['economic']['total_impact']['total_impact_billion'], abs=0.2)
+
+
+def test_unknown_parameters_and_distributions_are_rejected():
+    with pytest.raises(ValueError):
+        resolve_parameters({'populaton': 1})
+    with pytest.raises(ValueError):
+        resolve_parameters({'consumers': {'dist': 'beta', 'a': 1}})
+    with pytest.raises(ValueError):
+        resolve_parameters({'consumers': {'dist': 'normal', 'mean': 2000}})
+    assert set(default_parameters()) == set(resolve_parameters())
+
+
+def test_distributions_are_summarized_and_reproducible():
+    engine = ScenarioEngine(max_workers=1, cache_dir=None)
+    scenario = {'mc': {'improved_esg_participation': {'dist': 'uniform', 'low': 20, 'high': 45},
+                       'consumers': {'dist': 'normal', 'mean': 2000, 'std': 300, 'min': 0}}}
+
+    result = engine.run(scenario, draws=4000, keep_samples=True)['mc']
+    carbon = result['metrics']['carbon_reduction_ton']
+    samples = result['samples']['carbon_reduction_ton']
+
+    assert set(result['metrics']) == set(METRICS)
+    assert len(samples) == 4000 and samples.std() > 0
+    assert carbon['percentiles']['p5'] < carbon['percentiles']['p50'] < carbon['percentiles']['p95']
+    assert carbon['mean'] == pytest.approx(float(samples.mean()))
+
+    # Same parameters give the same draws in a fresh engine; samples share the summary stream
+    again = ScenarioEngine(max_workers=1, cache_dir=None).run(scenario, draws=4000)['mc']
+    assert again['metrics'] == result['metrics']
+    assert 'samples' not in again
+
+
+def test_results_are_cached_by_parameter_hash(tmp_path):
+    engine = ScenarioEngine(max_workers=1, cache_dir=str(tmp_path))
+    scenarios = scenario_grid({'population': [50000, 100000]},
+                              base={'truck_transport': {'dist': 'triangular', 'low': 0.07,
+                                                        'mode': 0.082, 'high': 0.095}})
+
+    first = engine.run(scenarios, draws=1000)
+    assert not any(r['cached'] for r in first.values())
+
+    # Renamed scenario with identical parameters hits the memory cache
+    renamed = engine.run({'alias': scenarios['population=50000'], 'other': {'population': 50000.0}},
+                         draws=1000)
+    assert renamed['alias']['cached'] and renamed['alias']['key'] == first['population=50000']['key']
+    assert not renamed['other']['cached']
+
+    # A new engine reads the JSON cache from disk
+    fresh = ScenarioEngine(max_workers=1, cache_dir=str(tmp_path))
+    reloaded = fresh.run(scenarios, draws=1000)
+    assert all(r['cached'] for r in reloaded.values())
+    assert reloaded['population=100000']['metrics'] == first['population=100000']['metrics']
+    assert fresh.get_stats()['disk_hits'] == 2
+
+    assert not engine.run(scenarios, draws=1000, force=True)['population=50000']['cached']
+    assert not engine.run(scenarios, draws=2000)['population=50000']['cached']
+
+
+def test_scenarios_run_across_worker_processes():
+    scenarios = scenario_grid({'population': [50000, 100000, 200000]},
+                              base={'production_multiplier': {'dist': 'uniform', 'low': 1.9, 'high': 2.5}})
+    engine = ScenarioEngine(max_workers=2, cache_dir=None)
+    try:
+        parallel = engine.run(scenarios, draws=2000)
+    finally:
+        engine.shutdown()
+    inline = ScenarioEngine(max_workers=1, cache_dir=None).run(scenarios, draws=2000)
+
+    assert list(parallel) == list(scenarios)
+    for name in scenarios:
+        assert parallel[name]['metrics'] == inline[name]['metrics']
+    # Per-capita benefit shrinks as the same impact is spread over more people
+    medians = [parallel[name]['metrics']['per_capita_benefit_krw']['percentiles']['p50'] for name in scenarios]
+    assert medians == sorted(medians, reverse=True)
+
+
+def test_integrated_simulator_monte_carlo_defaults():
+    engine = ScenarioEngine(max_workers=1, cache_dir=None)
+    results = IntegratedSimulator(population=80000).run_monte_carlo(draws=500, engine=engine)
+
+    baseline = results['baseline']
+    assert baseline['parameters']['population'] == 80000.0
+    assert baseline['metrics']['carbon_reduction_ton']['std'] > 0
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PAM Chat Message Bus
+실시간 채팅 브로드캐스트를 워커 프로세스 간에 분배하는 pub/sub 계층
+
+Socket.IO 룸 브로드캐스트는 기본적으로 하나의 프로세스 안에서만 전달됩니다.
+이 모듈은 브로드캐스트를 메시지 버스로 발행하고, 각 워커가 자신에게 연결된
+클라이언트에게만 전달하도록 하여 같은 노드에서 여러 워커를 실행할 수 있게 합니다.
+
+Backends:
+    - memory: 단일 프로세스용 (기본값, 테스트용)
+    - local:  Unix 도메인 데이터그램 소켓 기반 (같은 노드의 여러 워커)
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import logging
+import threading
+from collections import deque, OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_DIR = os.path.join(os.environ.get('TMPDIR', '/tmp'), 'pam-chat-bus')
+MAX_DATAGRAM_SIZE = 64 * 1024
+
+
+class MessageBus:
+    """
+    Pub/sub 메시지 버스 인터페이스
+
+    발행된 봉투(envelope)는 자신을 포함한 모든 구독 워커에 전달됩니다.
+    """
+
+    def __init__(self):
+        self._handlers: List[Callable[[Dict], None]] = []
+
+    def subscribe(self, handler: Callable[[Dict], None]):
+        """수신 봉투 처리 핸들러 등록"""
+        self._handlers.append(handler)
+
+    def publish(self, envelope: Dict):
+        """봉투 발행"""
+        raise NotImplementedError
+
+    def start(self, start_background_task: Optional[Callable] = None):
+        """수신 루프 시작 (필요한 백엔드만)"""
+
+    def close(self):
+        """버스 종료"""
+
+    def _dispatch(self, envelope: Dict):
+        for handler in self._handlers:
+            try:
+                handler(envelope)
+            except Exception as e:
+                logger.error(f"Message bus handler error: {e}")
+
+
+class InProcessMessageBus(MessageBus):
+    """단일 프로세스 메시지 버스 - 발행 즉시 로컬 핸들러에 전달"""
+
+    def publish(self, envelope: Dict):
+        self._dispatch(envelope)
+
+
+class LocalSocketMessageBus(MessageBus):
+    """
+    Unix 도메인 데이터그램 소켓 기반 멀티프로세스 메시지 버스
+
+    각 워커는 공유 디렉토리에 자신의 소켓 파일을 바인딩하고, 발행 시 디렉토리의
+    다른 모든 피어 소켓으로 데이터그램을 전송합니다. 중앙 브로커가 필요 없으며,
+    종료된 워커의 소켓 파일은 전송 실패 시 자동으로 정리됩니다.
+    """
+
+    def __init__(self, socket_dir: str = DEFAULT_SOCKET_DIR, peer_refresh_interval: float = 1.0):
+        super().__init__()
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError("LocalSocketMessageBus requires Unix domain socket support")
+
+        self.socket_dir = socket_dir
+        self.peer_refresh_interval = peer_refresh_interval
+        os.makedirs(socket_dir, exist_ok=True)
+
+        self.node_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.path = os.path.join(socket_dir, f"{self.node_id}.sock")
+
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        self._send_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        # 느린 피어 하나 때문에 모든 발행이 멈추지 않도록 논블로킹 전송
+        self._send_sock.setblocking(False)
+
+        self._peers: List[str] = []
+        self._peers_loaded_at = 0.0
+        self._send_lock = threading.Lock()
+        self._running = False
+
+        self.stats = {'sent': 0, 'received': 0, 'send_errors': 0, 'dropped_full': 0,
+                      'stale_peers_removed': 0}
+
+    def _get_peers(self) -> List[str]:
+        now = time.monotonic()
+        if now - self._peers_loaded_at >= self.peer_refresh_interval:
+            try:
+                self._peers = [
+                    os.path.join(self.socket_dir, name)
+                    for name in os.listdir(self.socket_dir)
+                    if name.endswith('.sock') and name != os.path.basename(self.path)
+                ]
+            except FileNotFoundError:
+                self._peers = []
+            self._peers_loaded_at = now
+        return self._peers
+
+    def publish(self, envelope: Dict):
+        data = json.dumps(envelope, ensure_ascii=False).encode('utf-8')
+        if len(data) > MAX_DATAGRAM_SIZE:
+            raise ValueError(f"Envelope too large for local bus: {len(data)} bytes")
+
+        # 자신에게는 소켓을 거치지 않고 직접 전달
+        self._dispatch(envelope)
+
+        with self._send_lock:
+            for peer in list(self._get_peers()):
+                try:
+                    self._send_sock.sendto(data, peer)
+                    self.stats['sent'] += 1
+                except (ConnectionRefusedError, FileNotFoundError):
+                    self._remove_peer(peer)
+                except BlockingIOError:
+                    # 수신 버퍼가 가득 찬 피어 (읽지 않는 워커) - 이 메시지만 버리고 다음 피어로
+                    self.stats['dropped_full'] += 1
+                except OSError as e:
+                    self.stats['send_errors'] += 1
+                    logger.warning(f"Local bus send to {peer} failed: {e}")
+
+    def _remove_peer(self, peer: str):
+        try:
+            os.unlink(peer)
+        except OSError:
+            pass
+        if peer in self._peers:
+            self._peers.remove(peer)
+        self.stats['stale_peers_removed'] += 1
+
+    def receive_once(self, timeout: Optional[float] = None) -> bool:
+        """데이터그램 하나를 수신하여 전달 (테스트 및 수신 루프용)"""
+        self._sock.settimeout(timeout)
+        try:
+            data = self._sock.recv(MAX_DATAGRAM_SIZE)
+        except socket.timeout:
+            return False
+        except OSError:
+            return False
+
+        try:
+            envelope = json.loads(data.decode('utf-8'))
+        except ValueError as e:
+            logger.warning(f"Dropping malformed bus message: {e}")
+            return False
+
+        self.stats['received'] += 1
+        self._dispatch(envelope)
+        return True
+
+    def _receive_loop(self):
+        while self._running:
+            self.receive_once(timeout=0.5)
+
+    def start(self, start_background_task: Optional[Callable] = None):
+        if self._running:
+            return
+        self._running = True
+        if start_background_task is not None:
+            start_background_task(self._receive_loop)
+        else:
+            threading.Thread(target=self._receive_loop, daemon=True,
+                             name='chat-bus-receiver').start()
+
+    def close(self):
+        self._running = False
+        for sock in (self._sock, self._send_sock):
+            try:
+                sock.close()
+            except OSError:
+                pass
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class TypingThrottle:
+    """
+    타이핑 이벤트 병합/스로틀링
+
+    같은 방의 같은 사용자에 대해 interval 안에 들어온 타이핑 이벤트는 하나로 병합됩니다.
+    키 입력마다 발생하는 이벤트가 모든 워커로 팬아웃되는 것을 방지합니다.
+    """
+
+    def __init__(self, interval: float = 1.0, max_entries: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.interval = interval
+        self.max_entries = max_entries
+        self.clock = clock
+        self._last_sent: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def allow(self, room_id: str, username: str) -> bool:
+        """이 이벤트를 전달해야 하면 True"""
+        key = (room_id, username)
+        now = self.clock()
+        with self._lock:
+            last = self._last_sent.get(key)
+            if last is not None and now - last < self.interval:
+                self.coalesced += 1
+                return False
+
+            self._last_sent[key] = now
+            self._last_sent.move_to_end(key)
+            while len(self._last_sent) > self.max_entries:
+                self._last_sent.popitem(last=False)
+            return True
+
+
+class ChatFanout:
+    """
+    룸 브로드캐스트 팬아웃
+
+    발행된 이벤트는 메시지 버스를 통해 모든 워커에 전달되고, 각 워커에서는 방별
+    제한 큐에 쌓인 뒤 라운드 로빈으로 로컬 클라이언트에 전달됩니다.
+
+    방별 백프레셔:
+        큐가 max_pending_per_room에 도달하면 먼저 버릴 수 있는(droppable) 이벤트
+        (타이핑 등)를 버리고, 그래도 가득 차면 가장 오래된 이벤트를 버립니다.
+        한 방의 폭주가 다른 방의 전달이나 메모리를 잠식하지 않습니다.
+    """
+
+    def __init__(self, bus: MessageBus, deliver: Callable[..., None],
+                 max_pending_per_room: int = 256, drain_batch_per_room: int = 32,
+                 typing_interval: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        self.bus = bus
+        self.deliver = deliver
+        self.max_pending_per_room = max_pending_per_room
+        self.drain_batch_per_room = drain_batch_per_room
+        self.typing = TypingThrottle(interval=typing_interval, clock=clock)
+
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._running = False
+
+        self.stats = {
+            'published': 0,
+            'delivered': 0,
+            'dropped': 0,
+            'dropped_droppable': 0,
+            'delivery_errors': 0,
+        }
+
+        self.bus.subscribe(self._enqueue)
+
+    def publish(self, event: str, payload: Dict, room: str,
+                skip_sid: Optional[str] = None, droppable: bool = False):
+        """룸 브로드캐스트 발행"""
+        envelope = {
+            'event': event,
+            'payload': payload,
+            'room': room,
+            'skip_sid': skip_sid,
+            'droppable': droppable,
+        }
+        self.stats['published'] += 1
+        self.bus.publish(envelope)
+
+    def publish_typing(self, room: str, username: str, payload: Dict,
+                       skip_sid: Optional[str] = None) -> bool:
+        """타이핑 이벤트 발행 (스로틀링 적용). 발행되었으면 True"""
+        if not self.typing.allow(room, username):
+            return False
+        self.publish('user_typing', payload, room, skip_sid=skip_sid, droppable=True)
+        return True
+
+    def _enqueue(self, envelope: Dict):
+        room = envelope.get('room')
+        if not room:
+            return
+
+        with self._lock:
+            queue = self._queues.get(room)
+            if queue is None:
+                queue = deque()
+                self._queues[room] = queue
+
+            if len(queue) >= self.max_pending_per_room:
+                if envelope.get('droppable'):
+                    self.stats['dropped_droppable'] += 1
+                    return
+                self._evict_one(queue)
+
+            queue.append(envelope)
+
+    def _evict_one(self, queue: deque):
+        for i, pending in enumerate(queue):
+            if pending.get('droppable'):
+                del queue[i]
+                self.stats['dropped_droppable'] += 1
+                return
+        queue.popleft()
+        self.stats['dropped'] += 1
+
+    def pending(self, room: Optional[str] = None) -> int:
+        """대기 중인 이벤트 수"""
+        with self._lock:
+            if room is not None:
+                queue = self._queues.get(room)
+                return len(queue) if queue else 0
+            return sum(len(q) for q in self._queues.values())
+
+    def drain(self) -> int:
+        """
+        각 방에서 최대 drain_batch_per_room개씩 라운드 로빈으로 전달
+
+        Returns:
+            전달한 이벤트 수
+        """
+        batch = []
+        with self._lock:
+            for room in list(self._queues.keys()):
+                queue = self._queues[room]
+                for _ in range(min(self.drain_batch_per_room, len(queue))):
+                    batch.append(queue.popleft())
+                if not queue:
+                    del self._queues[room]
+
+        for envelope in batch:
+            try:
+                self.deliver(envelope['event'], envelope['payload'],
+                             room=envelope['room'], skip_sid=envelope.get('skip_sid'))
+                self.stats['delivered'] += 1
+            except Exception as e:
+                self.stats['delivery_errors'] += 1
+                logger.error(f"Chat delivery error: {e}")
+
+        return len(batch)
+
+    def _drain_loop(self, sleep: Callable[[float], None], idle_interval: float):
+        while self._running:
+            if self.drain() == 0:
+                sleep(idle_interval)
+
+    def start(self, start_background_task: Optional[Callable] = None,
+              sleep: Callable[[float], None] = time.sleep, idle_interval: float = 0.01):
+        """버스 수신 및 전달 루프 시작"""
+        if self._running:
+            return
+        self._running = True
+        self.bus.start(start_background_task)
+        if start_background_task is not None:
+            start_background_task(self._drain_loop, sleep, idle_interval)
+        else:
+            threading.Thread(target=self._drain_loop, args=(sleep, idle_interval),
+                             daemon=True, name='chat-fanout').start()
+
+    def stop(self):
+        self._running = False
+        self.bus.close()
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        stats['pending'] = self.pending()
+        stats['typing_coalesced'] = self.typing.coalesced
+        if hasattr(self.bus, 'stats'):
+            stats['bus'] = dict(self.bus.stats)
+        return stats
+
+
+def create_message_bus(backend: Optional[str] = None, **kwargs) -> MessageBus:
+    """
+    설정에 따라 메시지 버스 생성
+
+    Args:
+        backend: 'memory' 또는 'local' (기본값: CHAT_BUS_BACKEND 환경변수, 없으면 'memory')
+    """
+    backend = (backend or os.environ.get('CHAT_BUS_BACKEND', 'memory')).lower()
+
+    if backend == 'memory':
+        return InProcessMessageBus()
+    if backend == 'local':
+        socket_dir = kwargs.get('socket_dir') or os.environ.get('CHAT_BUS_SOCKET_DIR', DEFAULT_SOCKET_DIR)
+        return LocalSocketMessageBus(socket_dir=socket_dir)
+
+    raise ValueError(f"Unknown chat bus backend: {backend}")
@@ -63,9 +63,8 @@ def verify_transaction(tx_id: str) -> Optional[Dict]:
         if tx_info.get('confirmed-round', 0) > 0:
             return tx_info
 
-        # 대기 중이면 확인 대기
-        wait_for_confirmation(algod_client, tx_id, 4)
-        return algod_client.pending_transaction_info(tx_id)
+        # 대기 중이면 확인 대기 (확인된 트랜잭션 정보를 그대로 반환 - 재조회 불필요)
+        return wait_for_confirmation(algod_client, tx_id, 4)
     except Exception as e:
         logger.error(f"Transaction verification failed: {e}")
         return None
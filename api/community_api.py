@@ -18,6 +18,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from api.community_manager import CommunityManager
 from api.coupon_manager import CouponManager
+from api.chat_bus import ChatFanout, create_message_bus
 
 # Configure logging
 logging.basicConfig(
@@ -38,9 +39,26 @@ CORS(app, origins="*", methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
 # Socket.IO for real-time chat
 socketio = SocketIO(app, cors_allowed_origins="*")
 
+# 모델 작업 프로세스(spawn)는 이 모듈을 __mp_main__으로 다시 import하므로
+# 버스 연결, 백그라운드 작업, 모델 워밍업은 API 서버 프로세스에서만 수행
+IS_JOB_WORKER = __name__ == '__mp_main__'
+
+# 룸 브로드캐스트 팬아웃 (CHAT_BUS_BACKEND=local 이면 같은 노드의 워커 간 공유)
+chat_fanout = ChatFanout(
+    bus=create_message_bus('memory' if IS_JOB_WORKER else None),
+    deliver=lambda event, payload, room, skip_sid=None: socketio.emit(
+        event, payload, to=room, skip_sid=skip_sid),
+    max_pending_per_room=int(os.environ.get('CHAT_MAX_PENDING_PER_ROOM', '256')),
+    typing_interval=float(os.environ.get('CHAT_TYPING_INTERVAL', '1.0'))
+)
+if not IS_JOB_WORKER:
+    chat_fanout.start(start_background_task=socketio.start_background_task, sleep=socketio.sleep)
+
 # Global community manager instance
 community_manager = None
 coupon_manager = None
+lstm_server = None
+model_jobs = None
 
 
 def get_community_manager():
@@ -61,6 +79,51 @@ def get_coupon_manager():
     return coupon_manager
 
 
+def get_lstm_server():
+    """Get or create the resident LSTM model server for this worker"""
+    global lstm_server
+    if lstm_server is None:
+        from ai_models.lstm_model_server import get_model_server
+        lstm_server = get_model_server()
+        # 시작 시 모델 로드/첫 추론을 백그라운드로 미리 수행
+        if os.environ.get('LSTM_WARMUP', '1') == '1':
+            lstm_server.warmup(background=True)
+    return lstm_server
+
+
+def get_model_jobs():
+    """Get or create the model job manager (LSTM training / simulation process pool)"""
+    global model_jobs
+    if model_jobs is None:
+        from api.model_jobs import create_model_job_manager
+        model_jobs = create_model_job_manager()
+        model_jobs.on_complete('lstm_train', _reload_trained_model)
+    return model_jobs
+
+
+def _reload_trained_model(params: dict, result: dict):
+    """학습이 끝나면 상주 모델 서버가 새 모델을 로드하도록 핸들 폐기"""
+    if lstm_server is not None:
+        lstm_server.reload(params['product'])
+
+
+def _job_response(job: dict, wait: float = 0):
+    """작업 상태 응답 (wait 초 안에 끝나면 결과 포함 200, 아니면 202)"""
+    if wait and job['status'] not in ('COMPLETED', 'FAILED'):
+        job = dict(get_model_jobs().wait(job['job_id'], timeout=min(float(wait), 60.0)),
+                   coalesced=job.get('coalesced', False))
+    status_code = 200 if job['status'] in ('COMPLETED', 'FAILED') else 202
+    return jsonify(create_success_response(job)), status_code
+
+
+# 워커 시작 시 LSTM 모델 서버 준비 (LSTM_WARMUP=0 이면 첫 요청 때)
+if os.environ.get('LSTM_WARMUP', '1') == '1' and not IS_JOB_WORKER:
+    try:
+        get_lstm_server()
+    except Exception as e:
+        logger.warning(f"LSTM model server unavailable at startup: {e}")
+
+
 def _initialize_sample_data():
     """샘플 데이터 초기화"""
     manager = community_manager
@@ -696,7 +759,7 @@ def on_join(data):
 
     if room_id:
         join_room(room_id)
-        emit('user_joined', {
+        chat_fanout.publish('user_joined', {
             'username': username,
             'message': f'{username}님이 입장했습니다.',
             'timestamp': datetime.now().isoformat()
@@ -711,7 +774,7 @@ def on_leave(data):
 
     if room_id:
         leave_room(room_id)
-        emit('user_left', {
+        chat_fanout.publish('user_left', {
             'username': username,
             'message': f'{username}님이 퇴장했습니다.',
             'timestamp': datetime.now().isoformat()
@@ -739,7 +802,7 @@ def on_send_message(data):
         )
 
         if message:
-            emit('new_message', message.to_dict(), room=room_id)
+            chat_fanout.publish('new_message', message.to_dict(), room=room_id)
         else:
             emit('error', {'message': '메시지 전송 실패'})
 
@@ -755,10 +818,10 @@ def on_typing(data):
     username = data.get('username')
 
     if room_id:
-        emit('user_typing', {
+        chat_fanout.publish_typing(room_id, username, {
             'username': username,
             'timestamp': datetime.now().isoformat()
-        }, room=room_id, include_self=False)
+        }, skip_sid=request.sid)
 
 
 # =============================================================================
@@ -965,23 +1028,30 @@ def get_profile():
 
 @app.route('/api/lstm/predict', methods=['POST'])
 def lstm_predict():
-    """LSTM 수요 예측 실행"""
+    """LSTM 수요 예측 실행 (워커 상주 모델 서버 사용)"""
     try:
         data = request.get_json()
         product_name = data.get('product', 'tomatoes')
         days_ahead = data.get('days_ahead', 7)
 
-        # LSTM predictor import
         try:
-            sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            from ai_models.lstm_demand_predictor import LSTMDemandPredictor
+            from ai_models.lstm_model_server import (
+                ModelNotReady, ModelServerBusy, PredictionTimeout
+            )
+            server = get_lstm_server()
         except ImportError as e:
             logger.error(f"LSTM import error: {e}")
             return jsonify(create_error_response("LSTM 모델을 불러올 수 없습니다.")), 500
 
         # 예측 실행
-        predictor = LSTMDemandPredictor()
-        predictions = predictor.predict(product_name, days_ahead=days_ahead)
+        try:
+            predictions = server.predict(product_name, days_ahead=days_ahead)
+        except ValueError as e:
+            return jsonify(create_error_response(str(e))), 400
+        except (ModelNotReady, ModelServerBusy) as e:
+            return jsonify(create_error_response(str(e), 503)), 503
+        except PredictionTimeout as e:
+            return jsonify(create_error_response(str(e), 504)), 504
 
         # DataFrame을 dict로 변환
         predictions_dict = predictions.to_dict(orient='records')
@@ -999,38 +1069,24 @@ def lstm_predict():
 
 @app.route('/api/lstm/train', methods=['POST'])
 def lstm_train():
-    """LSTM 모델 학습 실행"""
+    """LSTM 모델 학습 작업 제출 (작업 풀에서 실행, /api/jobs/<job_id>로 진행률 조회)"""
     try:
         data = request.get_json()
         product_name = data.get('product', 'tomatoes')
-        epochs = data.get('epochs', 20)
-        training_days = data.get('training_days', 90)
+        epochs = int(data.get('epochs', 20))
+        training_days = int(data.get('training_days', 90))
 
-        # LSTM predictor import
-        try:
-            sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            from ai_models.lstm_demand_predictor import LSTMDemandPredictor
-        except ImportError as e:
-            logger.error(f"LSTM import error: {e}")
-            return jsonify(create_error_response("LSTM 모델을 불러올 수 없습니다.")), 500
+        if product_name not in get_lstm_server().config['products']:
+            return jsonify(create_error_response(f"Product '{product_name}' not configured")), 400
 
-        # 모델 학습
-        predictor = LSTMDemandPredictor()
-        predictor.config['training_parameters']['epochs'] = epochs
-        predictor.config['data_parameters']['training_days'] = training_days
-
-        results = predictor.train(product_name, save_model=True)
-
-        return jsonify(create_success_response({
+        # 같은 파라미터의 실행 중 작업은 합치고, 완료 결과는 재사용 (force=true면 재학습)
+        job = get_model_jobs().submit('lstm_train', {
             "product": product_name,
-            "training_results": {
-                "test_loss": float(results['test_loss']),
-                "test_mae": float(results['test_mae']),
-                "test_mape": float(results['test_mape']),
-                "epochs_trained": int(results['epochs_trained']),
-                "training_time": float(results['training_time'])
-            }
-        }))
+            "epochs": epochs,
+            "training_days": training_days
+        }, force=bool(data.get('force', False)))
+
+        return _job_response(job, wait=data.get('wait', 0))
 
     except Exception as e:
         logger.error(f"LSTM training error: {e}")
@@ -1041,11 +1097,7 @@ def lstm_train():
 def lstm_products():
     """사용 가능한 제품 목록 조회"""
     try:
-        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        from ai_models.lstm_demand_predictor import LSTMDemandPredictor
-
-        predictor = LSTMDemandPredictor()
-        products = predictor.config['products']
+        products = get_lstm_server().config['products']
 
         product_list = []
         for name, config in products.items():
@@ -1523,32 +1575,46 @@ def clear_cart(user_address):
 
 @app.route('/api/simulation/run', methods=['POST'])
 def run_simulation():
-    """통합 시뮬레이션 실행"""
+    """통합 시뮬레이션 작업 제출 (작업 풀에서 실행, /api/jobs/<job_id>로 진행률 조회)"""
     try:
         data = request.get_json()
-        population = data.get('population', 100000)
+        population = int(data.get('population', 100000))
 
-        # 시뮬레이터 import
-        try:
-            sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            from ai_models.integrated_simulator import IntegratedSimulator
-        except ImportError as e:
-            logger.error(f"Simulator import error: {e}")
-            return jsonify(create_error_response("시뮬레이터를 불러올 수 없습니다.")), 500
+        job = get_model_jobs().submit('simulation', {"population": population},
+                                      force=bool(data.get('force', False)))
 
-        # 시뮬레이션 실행
-        simulator = IntegratedSimulator(population=population)
-        results = simulator.run_full_simulation()
-
-        return jsonify(create_success_response({
-            "simulation_results": results
-        }))
+        return _job_response(job, wait=data.get('wait', 0))
 
     except Exception as e:
         logger.error(f"Simulation error: {e}")
         return jsonify(create_error_response(f"시뮬레이션 실패: {str(e)}")), 500
 
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_model_job(job_id):
+    """
+    모델 작업 상태/진행률/결과 조회
+
+    작업 상태는 제출을 받은 웹 워커 프로세스에만 있으므로, 다른 워커로 라우팅된 조회나
+    워커 재시작 후의 조회는 404입니다 (model_jobs 참고).
+    """
+    job = get_model_jobs().get(job_id)
+    if job is None:
+        return jsonify(create_error_response(
+            "작업을 찾을 수 없습니다 (보관 시간이 지났거나 다른 서버 워커에서 제출된 작업)", 404)), 404
+    return jsonify(create_success_response(job))
+
+
+@app.route('/api/jobs', methods=['GET'])
+def list_model_jobs():
+    """최근 모델 작업 목록"""
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify(create_success_response({
+        "jobs": get_model_jobs().list_jobs(limit=limit),
+        "stats": get_model_jobs().get_stats()
+    }))
+
+
 @app.route('/api/simulation/distribution', methods=['POST'])
 def run_distribution_simulation():
     """유통 구조 시뮬레이션"""
@@ -1625,7 +1691,8 @@ def health_check():
 
         return jsonify(create_success_response({
             "status": "healthy",
-            "statistics": stats
+            "statistics": stats,
+            "chat_fanout": chat_fanout.get_stats()
         }))
 
     except Exception as e:
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PAM Model Job Manager
+LSTM 학습/통합 시뮬레이션을 HTTP 요청 스레드 밖에서 실행하는 비동기 작업 계층
+
+- 제출하면 즉시 job_id 반환, 작업은 프로세스 풀에서 실행
+- 동시 실행 수는 CPU 코어 수 기준 (작업 종류별 한도 추가 적용)
+- 진행률/에폭 지표는 워커 프로세스에서 큐로 전달되어 상태 조회에 반영
+- 같은 입력 파라미터의 결과는 캐시(종류별 설정), 실행 중인 동일 요청은 같은 작업으로 합침
+- 작업 상태/결과는 작업을 받은 웹 워커 프로세스의 메모리에만 있음 (영속화하지 않음)
+  여러 웹 워커로 배포하면 다른 워커에 도착한 /api/jobs/<job_id> 조회는 404가 되므로
+  같은 워커로 라우팅(스티키 세션)하거나 작업 API는 단일 워커에서 제공해야 함
+"""
+
+import os
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_EPOCH_HISTORY = 200
+
+
+class JobStatus:
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class JobKind:
+    """
+    작업 종류 정의
+
+    Args:
+        func: 모듈 최상위 함수 (params, report) -> 결과 dict (워커 프로세스로 전달되므로 pickle 가능해야 함)
+        max_concurrent: 이 종류의 동시 실행 한도 (None이면 풀 크기)
+        cache_results: 같은 파라미터의 완료 결과 재사용 여부
+    """
+
+    def __init__(self, func: Callable[[Dict, Callable[..., None]], Dict],
+                 max_concurrent: Optional[int] = None, cache_results: bool = True):
+        self.func = func
+        self.max_concurrent = max_concurrent
+        self.cache_results = cache_results
+
+
+def default_pool_size() -> int:
+    """웹 워커가 쓸 코어 하나를 남기고 나머지를 작업 풀에 사용"""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def params_key(kind: str, params: Dict) -> str:
+    """작업 종류 + 파라미터로 캐시/합치기 키 생성"""
+    payload = json.dumps({'kind': kind, 'params': params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# ----------------------------------------------------------------------
+# 워커 프로세스 측
+# ----------------------------------------------------------------------
+
+_progress_queue = None
+
+
+def _init_worker(progress_queue, threads_per_worker: int):
+    """워커 프로세스 초기화 - 진행 큐 연결, 수치 라이브러리 스레드 수를 코어 배분에 맞춤"""
+    global _progress_queue
+    _progress_queue = progress_queue
+    for name in ('OMP_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS', 'TF_NUM_INTEROP_THREADS'):
+        os.environ.setdefault(name, str(threads_per_worker))
+
+
+def _execute(func, job_id: str, params: Dict) -> Dict:
+    def report(**fields):
+        if _progress_queue is not None:
+            _progress_queue.put((job_id, fields))
+
+    report(pid=os.getpid())
+    return func(params, report)
+
+
+# ----------------------------------------------------------------------
+# 작업 관리자 (웹 워커 프로세스)
+# ----------------------------------------------------------------------
+
+class ModelJobManager:
+    """
+    프로세스 풀 기반 모델 작업 관리자
+
+    작업 목록, 합치기/캐시 키는 이 프로세스 안에서만 유효합니다. 웹 워커마다 별도의
+    관리자와 풀이 생기며, 워커가 재시작되면 진행 중이던 작업과 결과도 사라집니다.
+    """
+
+    def __init__(self, kinds: Dict[str, JobKind], max_workers: Optional[int] = None,
+                 result_ttl: float = 3600, mp_context: str = 'spawn'):
+        """
+        Args:
+            kinds: 작업 종류 이름 -> JobKind
+            max_workers: 프로세스 풀 크기 (기본: CPU 코어 수 - 1)
+            result_ttl: 완료된 작업/캐시 결과 보관 시간 (초)
+            mp_context: 워커 시작 방식 (TensorFlow는 fork 안전하지 않으므로 기본 spawn)
+        """
+        self.kinds = kinds
+        self.max_workers = max_workers or default_pool_size()
+        self.result_ttl = result_ttl
+        self._context = multiprocessing.get_context(mp_context)
+        self._threads_per_worker = max(1, (os.cpu_count() or 1) // self.max_workers)
+
+        # 완료 콜백이 제출 중에 바로 실행될 수도 있으므로 재진입 가능 락
+        self._lock = threading.RLock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._active_by_key: Dict[str, str] = {}     # 실행 대기/중 작업 (합치기)
+        self._completed_by_key: Dict[str, str] = {}  # 완료 작업 (결과 캐시)
+        self._pending = deque()
+        self._running: Dict[str, int] = {name: 0 for name in kinds}
+        self._hooks: Dict[str, List[Callable[[Dict, Dict], None]]] = {}
+        self._done_events: Dict[str, threading.Event] = {}
+        self._stats = {'submitted': 0, 'coalesced': 0, 'cache_hits': 0,
+                       'completed': 0, 'failed': 0}
+
+        self._progress_queue = None
+        self._executor = None
+        self._listener = None
+        self._stopped = False
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+
+    def on_complete(self, kind: str, hook: Callable[[Dict, Dict], None]):
+        """작업 완료 후 웹 워커 프로세스에서 실행할 콜백 등록 (params, result)"""
+        self._hooks.setdefault(kind, []).append(hook)
+
+    def submit(self, kind: str, params: Dict, force: bool = False) -> Dict:
+        """
+        작업 제출
+
+        Args:
+            force: True면 캐시된 결과를 무시하고 새로 실행 (실행 중인 동일 작업과는 합침)
+
+        Returns:
+            작업 상태 (coalesced: 실행 중인 작업에 합쳐짐, cached: 캐시된 결과)
+        """
+        if kind not in self.kinds:
+            raise ValueError(f"알 수 없는 작업 종류: {kind}")
+
+        key = params_key(kind, params)
+        with self._lock:
+            self._prune()
+
+            job_id = self._active_by_key.get(key)
+            if job_id is not None:
+                self._stats['coalesced'] += 1
+                return dict(self._snapshot(job_id), coalesced=True)
+
+            job_id = self._completed_by_key.get(key)
+            if job_id is not None and not force and self.kinds[kind].cache_results:
+                self._stats['cache_hits'] += 1
+                return dict(self._snapshot(job_id), cached=True)
+
+            job_id = f"{kind}-{uuid.uuid4().hex[:12]}"
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'kind': kind,
+                'params': params,
+                'key': key,
+                'status': JobStatus.PENDING,
+                'progress': 0.0,
+                'stage': None,
+                'metrics': {},
+                'epochs': [],
+                'result': None,
+                'error': None,
+                'created_at': time.time(),
+                'started_at': None,
+                'finished_at': None
+            }
+            self._done_events[job_id] = threading.Event()
+            self._active_by_key[key] = job_id
+            self._pending.append(job_id)
+            self._stats['submitted'] += 1
+            self._dispatch()
+            return self._snapshot(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            if job_id not in self._jobs:
+                return None
+            return self._snapshot(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """작업이 끝날 때까지(또는 timeout 초) 대기 후 상태 반환"""
+        event = self._done_events.get(job_id)
+        if event is not None:
+            event.wait(timeout)
+        return self.get(job_id)
+
+    def list_jobs(self, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            job_ids = sorted(self._jobs, key=lambda j: self._jobs[j]['created_at'], reverse=True)
+            return [self._snapshot(job_id, include_result=False) for job_id in job_ids[:limit]]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+            stats['running'] = dict(self._running)
+            stats['max_workers'] = self.max_workers
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            self._stopped = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+        if self._progress_queue is not None:
+            self._progress_queue.put(None)
+        if self._listener is not None and wait:
+            self._listener.join(timeout=5)
+
+    # ------------------------------------------------------------------
+    # 스케줄링
+    # ------------------------------------------------------------------
+
+    def _ensure_executor(self):
+        if self._executor is None:
+            self._progress_queue = self._context.Queue()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self._context,
+                initializer=_init_worker,
+                initargs=(self._progress_queue, self._threads_per_worker)
+            )
+            self._listener = threading.Thread(target=self._listen, args=(self._progress_queue,),
+                                              name="model-job-progress", daemon=True)
+            self._listener.start()
+        return self._executor
+
+    def _dispatch(self):
+        """종류별 한도 안에서 대기 작업을 풀에 넘김 (lock 보유 상태에서 호출)"""
+        if self._stopped:
+            return
+        total_running = sum(self._running.values())
+        deferred = deque()
+        while self._pending and total_running < self.max_workers:
+            job_id = self._pending.popleft()
+            job = self._jobs[job_id]
+            kind = self.kinds[job['kind']]
+            limit = kind.max_concurrent or self.max_workers
+            if self._running[job['kind']] >= limit:
+                deferred.append(job_id)
+                continue
+
+            self._running[job['kind']] += 1
+            total_running += 1
+            job['status'] = JobStatus.RUNNING
+            job['started_at'] = time.time()
+            try:
+                future = self._ensure_executor().submit(_execute, kind.func, job_id, job['params'])
+            except BrokenProcessPool as e:
+                self._executor = None
+                self._running[job['kind']] -= 1
+                self._finish(job_id, error=f"작업 풀 오류: {str(e)}")
+                self._done_events[job_id].set()
+                continue
+            future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+        deferred.extend(self._pending)
+        self._pending = deferred
+
+    def _on_done(self, job_id: str, future):
+        try:
+            result, error = future.result(), None
+        except BrokenProcessPool as e:
+            result, error = None, f"워커 프로세스 비정상 종료: {str(e)}"
+            with self._lock:
+                self._executor = None  # 다음 제출 때 새 풀 생성
+        except Exception as e:
+            result, error = None, str(e)
+
+        with self._lock:
+            job = self._jobs[job_id]
+            self._running[job['kind']] -= 1
+            self._finish(job_id, result=result, error=error)
+            self._dispatch()
+            hooks = list(self._hooks.get(job['kind'], [])) if error is None else []
+            params = job['params']
+
+        for hook in hooks:
+            try:
+                hook(params, result)
+            except Exception as e:
+                logger.error(f"작업 완료 콜백 오류 ({job_id}): {str(e)}")
+        # 완료 콜백(모델 재로드 등)까지 끝난 뒤 대기자에게 알림
+        self._done_events[job_id].set()
+
+    def _finish(self, job_id: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        job = self._jobs[job_id]
+        job['finished_at'] = time.time()
+        self._active_by_key.pop(job['key'], None)
+        if error is None:
+            job['status'] = JobStatus.COMPLETED
+            job['progress'] = 1.0
+            job['result'] = result
+            self._completed_by_key[job['key']] = job_id
+            self._stats['completed'] += 1
+        else:
+            job['status'] = JobStatus.FAILED
+            job['error'] = error
+            self._stats['failed'] += 1
+            logger.error(f"모델 작업 실패 ({job_id}): {error}")
+
+    # ------------------------------------------------------------------
+    # 진행률 수신
+    # ------------------------------------------------------------------
+
+    def _listen(self, progress_queue):
+        while True:
+            message = progress_queue.get()
+            if message is None:
+                return
+            job_id, fields = message
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    continue
+                # 큐 메시지는 완료 알림보다 늦게 올 수 있으므로 지표는 완료 후에도 반영
+                epoch = fields.pop('epoch', None)
+                if epoch is not None:
+                    job['epochs'].append(dict(epoch))
+                    del job['epochs'][:-MAX_EPOCH_HISTORY]
+                metrics = fields.pop('metrics', None)
+                if metrics:
+                    job['metrics'].update(metrics)
+                if job['finished_at'] is None:
+                    job.update(fields)
+
+    # ------------------------------------------------------------------
+    # 내부
+    # ------------------------------------------------------------------
+
+    def _snapshot(self, job_id: str, include_result: bool = True) -> Dict:
+        job = self._jobs[job_id]
+        snapshot = {k: v for k, v in job.items() if k != 'key'}
+        snapshot['metrics'] = dict(job['metrics'])
+        snapshot['epochs'] = list(job['epochs'])
+        if not include_result:
+            snapshot.pop('result')
+        return snapshot
+
+    def _prune(self):
+        """보관 시간이 지난 완료 작업 정리 (lock 보유 상태에서 호출)"""
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['finished_at'] is not None and job['finished_at'] < cutoff]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            self._done_events.pop(job_id, None)
+            if self._completed_by_key.get(job['key']) == job_id:
+                del self._completed_by_key[job['key']]
+
+
+# ----------------------------------------------------------------------
+# 작업 함수 (워커 프로세스에서 실행)
+# ----------------------------------------------------------------------
+
+def run_lstm_training(params: Dict, report: Callable[..., None]) -> Dict:
+    """LSTM 학습 - 에폭마다 손실/지표 보고"""
+    from tensorflow import keras
+    from ai_models.lstm_demand_predictor import LSTMDemandPredictor
+
+    epochs = int(params['epochs'])
+
+    class EpochReporter(keras.callbacks.Callback):
+        def on_epoch_end(self, epoch, logs=None):
+            metrics = {k: float(v) for k, v in (logs or {}).items()}
+            report(progress=(epoch + 1) / epochs, stage="training",
+                   epoch=dict(metrics, epoch=epoch + 1), metrics=metrics)
+
+    report(stage="preparing")
+    predictor = LSTMDemandPredictor()
+    predictor.config['training_parameters']['epochs'] = epochs
+    predictor.config['data_parameters']['training_days'] = int(params['training_days'])
+
+    results = predictor.train(params['product'], save_model=True, extra_callbacks=[EpochReporter()])
+    return {
+        "product": params['product'],
+        "training_results": {
+            "test_loss": float(results['test_loss']),
+            "test_mae": float(results['test_mae']),
+            "test_mape": float(results['test_mape']),
+            "epochs_trained": int(results['epochs_trained']),
+            "training_time": float(results.get('training_time', 0.0))
+        }
+    }
+
+
+def run_integrated_simulation(params: Dict, report: Callable[..., None]) -> Dict:
+    """통합 시뮬레이션 - 단계마다 진행률 보고"""
+    from ai_models.integrated_simulator import IntegratedSimulator
+
+    simulator = IntegratedSimulator(population=int(params['population']))
+    results = simulator.run_full_simulation(
+        progress=lambda done, total, stage: report(progress=done / total, stage=stage))
+    return {"simulation_results": results}
+
+
+def create_model_job_manager() -> ModelJobManager:
+    """API 서버용 기본 작업 관리자 (환경 변수로 조정, 웹 워커 프로세스마다 하나)"""
+    max_workers = int(os.environ.get('MODEL_JOB_WORKERS', '0')) or None
+    return ModelJobManager(
+        kinds={
+            # TensorFlow 학습은 자체적으로 여러 코어를 쓰므로 동시 1개
+            # 학습은 모델 파일을 새로 저장하고 데이터도 매번 달라지므로 결과를 캐시하지 않음
+            # (같은 요청이 실행 중이면 합치기만 함)
+            'lstm_train': JobKind(run_lstm_training,
+                                  max_concurrent=int(os.environ.get('LSTM_TRAIN_CONCURRENCY', '1')),
+                                  cache_results=False),
+            'simulation': JobKind(run_integrated_simulation)
+        },
+        max_workers=max_workers,
+        result_ttl=float(os.environ.get('MODEL_JOB_RESULT_TTL', '3600'))
+    )
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PAM Chat Message Bus Tests
+
+메시지 버스 팬아웃, 타이핑 스로틀링, 방별 백프레셔 테스트
+"""
+
+import os
+import sys
+import socket
+import tempfile
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.chat_bus import (
+    ChatFanout, InProcessMessageBus, LocalSocketMessageBus, TypingThrottle, create_message_bus
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_fanout(bus=None, **kwargs):
+    delivered = []
+
+    def deliver(event, payload, room, skip_sid=None):
+        delivered.append((event, payload, room, skip_sid))
+
+    fanout = ChatFanout(bus or InProcessMessageBus(), deliver, **kwargs)
+    return fanout, delivered
+
+
+def test_in_process_publish_and_drain():
+    fanout, delivered = make_fanout()
+    fanout.publish('new_message', {'content': 'hi'}, room='ROOM_1')
+
+    assert fanout.pending('ROOM_1') == 1
+    assert fanout.drain() == 1
+    assert delivered == [('new_message', {'content': 'hi'}, 'ROOM_1', None)]
+    assert fanout.pending() == 0
+
+
+def test_typing_throttle_coalesces_within_interval():
+    clock = FakeClock()
+    throttle = TypingThrottle(interval=1.0, clock=clock)
+
+    assert throttle.allow('ROOM_1', 'alice')
+    assert not throttle.allow('ROOM_1', 'alice')
+    assert throttle.allow('ROOM_1', 'bob')
+    clock.now = 1.5
+    assert throttle.allow('ROOM_1', 'alice')
+    assert throttle.coalesced == 1
+
+
+def test_room_backpressure_drops_typing_before_messages():
+    fanout, delivered = make_fanout(max_pending_per_room=3, typing_interval=0)
+    fanout.publish('user_typing', {}, room='ROOM_1', droppable=True)
+    fanout.publish('new_message', {'n': 1}, room='ROOM_1')
+    fanout.publish('new_message', {'n': 2}, room='ROOM_1')
+    fanout.publish('new_message', {'n': 3}, room='ROOM_1')
+    fanout.publish('new_message', {'n': 4}, room='ROOM_1')
+
+    fanout.drain()
+    assert [p['n'] for _, p, _, _ in delivered] == [2, 3, 4]
+    assert fanout.stats['dropped_droppable'] == 1
+    assert fanout.stats['dropped'] == 1
+
+
+def test_busy_room_does_not_starve_other_rooms():
+    fanout, delivered = make_fanout(drain_batch_per_room=2)
+    for i in range(10):
+        fanout.publish('new_message', {'n': i}, room='BUSY')
+    fanout.publish('new_message', {'n': 0}, room='QUIET')
+
+    fanout.drain()
+    rooms = [room for _, _, room, _ in delivered]
+    assert rooms.count('BUSY') == 2
+    assert 'QUIET' in rooms
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="requires Unix domain sockets")
+def test_local_socket_bus_fans_out_across_nodes():
+    with tempfile.TemporaryDirectory() as socket_dir:
+        bus_a = LocalSocketMessageBus(socket_dir=socket_dir, peer_refresh_interval=0)
+        bus_b = LocalSocketMessageBus(socket_dir=socket_dir, peer_refresh_interval=0)
+        try:
+            fanout_a, delivered_a = make_fanout(bus_a)
+            fanout_b, delivered_b = make_fanout(bus_b)
+
+            fanout_a.publish('new_message', {'content': '안녕하세요'}, room='ROOM_1')
+            assert bus_b.receive_once(timeout=1.0)
+
+            fanout_a.drain()
+            fanout_b.drain()
+            assert delivered_a == delivered_b
+            assert delivered_b[0][1] == {'content': '안녕하세요'}
+        finally:
+            bus_a.close()
+            bus_b.close()
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="requires Unix domain sockets")
+def test_local_socket_bus_removes_stale_peers():
+    with tempfile.TemporaryDirectory() as socket_dir:
+        stale = os.path.join(socket_dir, 'dead-worker.sock')
+        dead = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        dead.bind(stale)
+        dead.close()
+
+        bus = LocalSocketMessageBus(socket_dir=socket_dir, peer_refresh_interval=0)
+        try:
+            bus.publish({'room': 'ROOM_1', 'event': 'x', 'payload': {}})
+            assert not os.path.exists(stale)
+            assert bus.stats['stale_peers_removed'] == 1
+        finally:
+            bus.close()
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="requires Unix domain sockets")
+def test_local_socket_bus_drops_messages_for_peer_that_never_reads():
+    with tempfile.TemporaryDirectory() as socket_dir:
+        stalled = LocalSocketMessageBus(socket_dir=socket_dir, peer_refresh_interval=0)
+        bus = LocalSocketMessageBus(socket_dir=socket_dir, peer_refresh_interval=0)
+        try:
+            # The stalled peer's receive queue fills up after a handful of datagrams;
+            # publishing must keep returning instead of blocking on it
+            for i in range(200):
+                bus.publish({'room': 'ROOM_1', 'event': 'x', 'payload': {'i': i}})
+
+            assert bus.stats['dropped_full'] > 0
+            assert bus.stats['sent'] + bus.stats['dropped_full'] == 200
+            assert os.path.exists(stalled.path)
+        finally:
+            bus.close()
+            stalled.close()
+
+
+def test_create_message_bus_rejects_unknown_backend():
+    assert isinstance(create_message_bus('memory'), InProcessMessageBus)
+    with pytest.raises(ValueError):
+        create_message_bus('carrier-pigeon')
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PAM Model Job Manager Tests
+
+프로세스 풀 실행, 진행률 전달, 동일 요청 합치기, 결과 캐시, 종류별 동시 실행 한도 테스트
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.model_jobs import JobKind, JobStatus, ModelJobManager
+
+
+# 작업 함수는 워커 프로세스로 전달되므로 모듈 최상위에 정의
+def epoch_task(params, report):
+    for epoch in range(1, params['epochs'] + 1):
+        time.sleep(params.get('delay', 0.05))
+        loss = 1.0 / epoch
+        report(progress=epoch / params['epochs'], stage="training",
+               epoch={'epoch': epoch, 'loss': loss}, metrics={'loss': loss})
+    return {'pid': os.getpid(), 'final_loss': 1.0 / params['epochs']}
+
+
+def failing_task(params, report):
+    raise RuntimeError("simulation exploded")
+
+
+@pytest.fixture
+def manager():
+    manager = ModelJobManager(
+        kinds={
+            'train': JobKind(epoch_task, max_concurrent=1),
+            'simulate': JobKind(epoch_task),
+            'retrain': JobKind(epoch_task, cache_results=False),
+            'broken': JobKind(failing_task)
+        },
+        max_workers=2
+    )
+    yield manager
+    manager.shutdown()
+
+
+def test_job_runs_in_worker_process_and_reports_epochs(manager):
+    job = manager.submit('train', {'epochs': 4})
+    assert job['status'] in (JobStatus.PENDING, JobStatus.RUNNING)
+
+    done = manager.wait(job['job_id'], timeout=30)
+    assert done['status'] == JobStatus.COMPLETED
+    assert done['progress'] == 1.0
+    assert done['result']['pid'] != os.getpid()
+    assert done['result']['final_loss'] == pytest.approx(0.25)
+
+    # Progress messages may trail the completion callback briefly
+    deadline = time.time() + 2
+    while len(manager.get(job['job_id'])['epochs']) < 4 and time.time() < deadline:
+        time.sleep(0.01)
+    assert [e['epoch'] for e in manager.get(job['job_id'])['epochs']] == [1, 2, 3, 4]
+
+
+def test_identical_submissions_coalesce_and_results_are_cached(manager):
+    first = manager.submit('simulate', {'epochs': 3, 'delay': 0.2})
+    second = manager.submit('simulate', {'delay': 0.2, 'epochs': 3})
+    assert second['job_id'] == first['job_id']
+    assert second['coalesced']
+
+    manager.wait(first['job_id'], timeout=30)
+    cached = manager.submit('simulate', {'epochs': 3, 'delay': 0.2})
+    assert cached['job_id'] == first['job_id']
+    assert cached['cached']
+    assert cached['status'] == JobStatus.COMPLETED
+
+    rerun = manager.submit('simulate', {'epochs': 3, 'delay': 0.2}, force=True)
+    assert rerun['job_id'] != first['job_id']
+    assert manager.wait(rerun['job_id'], timeout=30)['status'] == JobStatus.COMPLETED
+
+    stats = manager.get_stats()
+    assert (stats['submitted'], stats['coalesced'], stats['cache_hits']) == (2, 1, 1)
+
+
+def test_uncached_kind_coalesces_in_flight_but_reruns_after_completion(manager):
+    first = manager.submit('retrain', {'epochs': 2, 'delay': 0.2})
+    second = manager.submit('retrain', {'epochs': 2, 'delay': 0.2})
+    assert second['job_id'] == first['job_id']
+    assert second['coalesced']
+
+    manager.wait(first['job_id'], timeout=30)
+    rerun = manager.submit('retrain', {'epochs': 2, 'delay': 0.2})
+    assert rerun['job_id'] != first['job_id']
+    assert not rerun.get('cached')
+    assert manager.wait(rerun['job_id'], timeout=30)['status'] == JobStatus.COMPLETED
+
+
+def test_lstm_training_results_are_not_cached():
+    from api.model_jobs import create_model_job_manager
+
+    default = create_model_job_manager()
+    try:
+        assert default.kinds['lstm_train'].cache_results is False
+        assert default.kinds['simulation'].cache_results is True
+    finally:
+        default.shutdown()
+
+
+def test_kind_concurrency_limit_queues_extra_jobs(manager):
+    first = manager.submit('train', {'epochs': 5, 'delay': 0.1})
+    second = manager.submit('train', {'epochs': 1})
+
+    assert manager.get(second['job_id'])['status'] == JobStatus.PENDING
+    assert manager.get_stats()['running']['train'] == 1
+
+    manager.wait(second['job_id'], timeout=30)
+    first_done = manager.get(first['job_id'])
+    second_done = manager.get(second['job_id'])
+    assert second_done['status'] == JobStatus.COMPLETED
+    assert second_done['started_at'] >= first_done['finished_at']
+
+
+def test_failure_is_reported_and_hooks_only_run_on_success(manager):
+    finished = []
+    manager.on_complete('train', lambda params, result: finished.append(params['epochs']))
+    manager.on_complete('broken', lambda params, result: finished.append('broken'))
+
+    broken = manager.submit('broken', {})
+    ok = manager.submit('train', {'epochs': 1})
+
+    failed = manager.wait(broken['job_id'], timeout=30)
+    manager.wait(ok['job_id'], timeout=30)
+    assert failed['status'] == JobStatus.FAILED
+    assert 'simulation exploded' in failed['error']
+    assert finished == [1]
+
+    # Failed jobs are not cached
+    assert manager.submit('broken', {})['job_id'] != broken['job_id']
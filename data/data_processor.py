@@ -40,6 +40,31 @@ class FarmInfo:
     created_at: str
     updated_at: str
 
+# Defaults for farm ESG data fields that have not been reported yet
+ESG_DATA_DEFAULTS = {
+    # Environmental
+    'organic_certified': False,
+    'water_usage_per_hectare': 10000,
+    'carbon_emissions': 5.0,
+    'renewable_energy_percentage': 20.0,
+    'biodiversity_score': 6,
+    'soil_health_score': 6,
+    'waste_management_score': 6,
+    # Social
+    'fair_wage_certification': False,
+    'community_investment_percentage': 1.0,
+    'worker_safety_score': 6,
+    'local_employment_percentage': 70.0,
+    'training_programs': False,
+    'healthcare_provided': False,
+    # Governance
+    'transparency_score': 6,
+    'record_keeping_score': 6,
+    'stakeholder_engagement_score': 6,
+    'ethical_practices_score': 6,
+    'supply_chain_traceability': False
+}
+
 @dataclass
 class ProcessingResult:
     """Data processing result structure"""
@@ -67,6 +92,7 @@ class DataProcessor:
         self.transactions_file = os.path.join(self.base_path, "transactions", "transaction_history.json")
         self.daily_reports_path = os.path.join(self.base_path, "daily_reports")
         self.backups_path = os.path.join(self.base_path, "backups")
+        self.esg_cache_file = os.path.join(self.base_path, "ai_results", "esg_score_cache.json")
 
         # Initialize AI models
         self.demand_predictor = None
@@ -409,85 +435,169 @@ class DataProcessor:
             logger.error(f"Demand prediction generation failed: {e}")
             return {'success': False, 'error': str(e)}
 
-    def update_esg_scores(self, farms: Dict[str, FarmInfo]) -> Dict:
-        """Update ESG scores for all farms"""
+    def load_esg_cache(self) -> Dict[str, Dict]:
+        """Load last ESG scores with their input fingerprints"""
+        if os.path.exists(self.esg_cache_file):
+            try:
+                with open(self.esg_cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.error(f"Failed to load ESG score cache: {e}")
+        return {}
+
+    def save_esg_cache(self, cache: Dict[str, Dict]):
+        """Save last ESG scores with their input fingerprints"""
+        try:
+            with open(self.esg_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"Failed to save ESG score cache: {e}")
+
+    @staticmethod
+    def esg_input_fingerprint(inputs: Dict) -> str:
+        """Fingerprint of the values that feed a farm's ESG score"""
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _esg_reuse_reason(self, entry: Optional[Dict], fingerprint: str, scoring_version: str,
+                          now: datetime) -> Optional[str]:
+        """Why a farm's cached score cannot be reused (None if it can)"""
+        if not entry:
+            return 'new'
+        if entry.get('scoring_version') != scoring_version:
+            return 'scoring_changed'
+        if entry.get('fingerprint') != fingerprint:
+            return 'inputs_changed'
+        max_age = timedelta(days=self.config['esg_update_threshold_days'])
+        if (now >= datetime.fromisoformat(entry['valid_until'])
+                or now - datetime.fromisoformat(entry['calculated_at']) >= max_age):
+            return 'expired'
+        return None
+
+    def update_esg_scores(self, farms: Dict[str, FarmInfo], force: bool = False) -> Dict:
+        """
+        Update ESG scores for farms whose inputs changed
+
+        Each farm's ESG inputs are fingerprinted and compared with the last stored
+        score. Only new or changed farms, farms whose score expired (valid_until or
+        esg_update_threshold_days) and all farms after a scoring rule change are
+        recomputed, together in one vectorized batch; the rest reuse their stored
+        score. force=True recomputes every farm.
+        """
         if not self.esg_calculator:
             return {'success': False, 'error': 'ESG calculator not initialized'}
 
         try:
+            from ai_models.esg_calculator import BATCH_FLAG_COLUMNS, BATCH_NUMERIC_COLUMNS
+
             esg_result = {
                 'farms_processed': 0,
                 'scores_updated': 0,
+                'scores_recomputed': 0,
+                'scores_reused': 0,
+                'recompute_reasons': {},
                 'total_esg_tokens': 0,
                 'esg_scores': {},
                 'errors': []
             }
 
-            for farm_id, farm_info in farms.items():
-                try:
-                    # Convert farm info to ESG calculator format
-                    from ai_models.esg_calculator import FarmData
-
-                    farm_data = FarmData(
-                        farm_id=farm_id,
-                        farm_name=farm_info.farm_name,
-                        location=farm_info.location,
-                        size_hectares=farm_info.size_hectares,
-
-                        # Environmental data from farm ESG data
-                        organic_certified=farm_info.esg_data.get('organic_certified', False),
-                        water_usage_per_hectare=farm_info.esg_data.get('water_usage_per_hectare', 10000),
-                        carbon_emissions=farm_info.esg_data.get('carbon_emissions', 5.0),
-                        renewable_energy_percentage=farm_info.esg_data.get('renewable_energy_percentage', 20.0),
-                        biodiversity_score=farm_info.esg_data.get('biodiversity_score', 6),
-                        soil_health_score=farm_info.esg_data.get('soil_health_score', 6),
-                        waste_management_score=farm_info.esg_data.get('waste_management_score', 6),
-
-                        # Social data
-                        fair_wage_certification=farm_info.esg_data.get('fair_wage_certification', False),
-                        community_investment_percentage=farm_info.esg_data.get('community_investment_percentage', 1.0),
-                        worker_safety_score=farm_info.esg_data.get('worker_safety_score', 6),
-                        local_employment_percentage=farm_info.esg_data.get('local_employment_percentage', 70.0),
-                        training_programs=farm_info.esg_data.get('training_programs', False),
-                        healthcare_provided=farm_info.esg_data.get('healthcare_provided', False),
-
-                        # Governance data
-                        transparency_score=farm_info.esg_data.get('transparency_score', 6),
-                        certifications=farm_info.certifications,
-                        record_keeping_score=farm_info.esg_data.get('record_keeping_score', 6),
-                        stakeholder_engagement_score=farm_info.esg_data.get('stakeholder_engagement_score', 6),
-                        ethical_practices_score=farm_info.esg_data.get('ethical_practices_score', 6),
-                        supply_chain_traceability=farm_info.esg_data.get('supply_chain_traceability', False)
-                    )
-
-                    # Calculate ESG score
-                    esg_score = self.esg_calculator.calculate_score(farm_data)
-
-                    esg_result['esg_scores'][farm_id] = {
-                        'overall_score': esg_score.overall_score,
-                        'environmental_score': esg_score.environmental_score,
-                        'social_score': esg_score.social_score,
-                        'governance_score': esg_score.governance_score,
-                        'certification_level': esg_score.certification_level,
-                        'esg_gold_tokens': esg_score.esg_gold_tokens,
-                        'calculated_at': esg_score.calculated_at
+            # Convert farm info to one columnar batch (missing ESG fields use defaults)
+            frame = pd.DataFrame([
+                {
+                    **ESG_DATA_DEFAULTS,
+                    **{key: value for key, value in farm_info.esg_data.items() if key in ESG_DATA_DEFAULTS},
+                    'farm_id': farm_id,
+                    'farm_name': farm_info.farm_name,
+                    'location': farm_info.location,
+                    'size_hectares': farm_info.size_hectares,
+                    'certifications': farm_info.certifications or []
+                }
+                for farm_id, farm_info in farms.items()
+            ], columns=['farm_id', 'farm_name', 'location', 'size_hectares', 'certifications',
+                        *ESG_DATA_DEFAULTS])
+
+            # Rows with non-numeric values are reported instead of failing the whole batch
+            numeric = frame[list(BATCH_NUMERIC_COLUMNS)].apply(pd.to_numeric, errors='coerce')
+            invalid = numeric.isna().any(axis=1)
+            for farm_id, row in zip(frame['farm_id'][invalid], numeric[invalid].itertuples(index=False)):
+                bad_columns = [col for col, value in zip(BATCH_NUMERIC_COLUMNS, row) if pd.isna(value)]
+                logger.error(f"Failed to calculate ESG score for {farm_id}: invalid {bad_columns}")
+                esg_result['errors'].append(f"{farm_id}: invalid ESG data {bad_columns}")
+            frame[list(BATCH_NUMERIC_COLUMNS)] = numeric
+            frame = frame[~invalid].reset_index(drop=True)
+
+            # Decide per farm whether the stored score is still valid
+            cache = self.load_esg_cache()
+            scoring_version = self.esg_calculator.scoring_version()
+            now = datetime.now()
+            fingerprints = {}
+            recompute = []
+            # Only fields the score depends on, normalized so dtype changes do not alter the hash
+            for record in frame.to_dict(orient='records'):
+                farm_id = record['farm_id']
+                inputs = {column: float(record[column]) for column in BATCH_NUMERIC_COLUMNS}
+                inputs.update({column: bool(record[column]) for column in BATCH_FLAG_COLUMNS})
+                inputs['certifications'] = sorted(record['certifications'])
+                fingerprints[farm_id] = self.esg_input_fingerprint(inputs)
+                reason = 'forced' if force else self._esg_reuse_reason(
+                    cache.get(farm_id), fingerprints[farm_id], scoring_version, now)
+                recompute.append(reason is not None)
+                if reason is not None:
+                    reasons = esg_result['recompute_reasons']
+                    reasons[reason] = reasons.get(reason, 0) + 1
+
+            # Calculate ESG scores for changed farms only
+            changed = frame[recompute]
+            if len(changed):
+                batch = self.esg_calculator.calculate_scores_batch(changed)
+                for record in batch.to_records():
+                    farm_id = record['farm_id']
+                    cache[farm_id] = {
+                        'fingerprint': fingerprints[farm_id],
+                        'scoring_version': scoring_version,
+                        'overall_score': record['overall_score'],
+                        'environmental_score': record['environmental_score'],
+                        'social_score': record['social_score'],
+                        'governance_score': record['governance_score'],
+                        'certification_level': record['certification_level'],
+                        'esg_gold_tokens': record['esg_gold_tokens'],
+                        'calculated_at': record['calculated_at'],
+                        'valid_until': record['valid_until']
                     }
 
-                    esg_result['farms_processed'] += 1
-                    esg_result['scores_updated'] += 1
-                    esg_result['total_esg_tokens'] += esg_score.esg_gold_tokens
-
                     # Update farm with new ESG data
-                    farms[farm_id].esg_data['last_esg_score'] = esg_score.overall_score
-                    farms[farm_id].esg_data['last_esg_update'] = datetime.now().isoformat()
-                    farms[farm_id].updated_at = datetime.now().isoformat()
-
-                except Exception as e:
-                    logger.error(f"Failed to calculate ESG score for {farm_id}: {e}")
-                    esg_result['errors'].append(f"{farm_id}: {str(e)}")
-
-            # Save updated farms
-            self.save_farms_registry(farms)
+                    farms[farm_id].esg_data['last_esg_score'] = record['overall_score']
+                    farms[farm_id].esg_data['last_esg_update'] = record['calculated_at']
+                    farms[farm_id].updated_at = record['calculated_at']
+
+            for farm_id, recomputed in zip(frame['farm_id'], recompute):
+                entry = cache[farm_id]
+                esg_result['esg_scores'][farm_id] = {
+                    'overall_score': entry['overall_score'],
+                    'environmental_score': entry['environmental_score'],
+                    'social_score': entry['social_score'],
+                    'governance_score': entry['governance_score'],
+                    'certification_level': entry['certification_level'],
+                    'esg_gold_tokens': entry['esg_gold_tokens'],
+                    'calculated_at': entry['calculated_at'],
+                    'recomputed': recomputed
+                }
+                esg_result['total_esg_tokens'] += entry['esg_gold_tokens']
+
+            esg_result['farms_processed'] = len(frame)
+            esg_result['scores_recomputed'] = len(changed)
+            esg_result['scores_reused'] = len(frame) - len(changed)
+            esg_result['scores_updated'] = len(changed)
+
+            # Forget farms that left the registry, then persist
+            for farm_id in set(cache) - set(farms):
+                del cache[farm_id]
+            self.save_esg_cache(cache)
+            if len(changed):
+                self.save_farms_registry(farms)
+
+            logger.info(f"ESG scores: {esg_result['scores_recomputed']} recomputed, "
+                        f"{esg_result['scores_reused']} reused")
 
             # Save ESG results
             esg_file = os.path.join(self.base_path, "ai_results",
@@ -625,6 +735,7 @@ class DataProcessor:
         farms_processed = 0
         predictions_generated = 0
         esg_scores_updated = 0
+        esg_scores_reused = 0
         anomalies_detected = 0
         blockchain_records = 0
 
@@ -658,7 +769,8 @@ class DataProcessor:
             esg_result = self.update_esg_scores(farms)
             if esg_result['success']:
                 esg_scores_updated = esg_result['result']['scores_updated']
-                logger.info(f"Updated {esg_scores_updated} ESG scores")
+                esg_scores_reused = esg_result['result']['scores_reused']
+                logger.info(f"Updated {esg_scores_updated} ESG scores ({esg_scores_reused} unchanged)")
             else:
                 errors.append(f"ESG update failed: {esg_result['error']}")
 
@@ -685,6 +797,8 @@ class DataProcessor:
                 "farms_processed": farms_processed,
                 "predictions_generated": predictions_generated,
                 "esg_scores_updated": esg_scores_updated,
+                "esg_scores_recomputed": esg_scores_updated,
+                "esg_scores_reused": esg_scores_reused,
                 "anomalies_detected": anomalies_detected,
                 "blockchain_records_synced": blockchain_records,
                 "processing_time_minutes": round(processing_time / 60, 2),
@@ -8,6 +8,9 @@ This script tests and demonstrates the integrated data processing functionality.
 
 import sys
 import os
+import atexit
+import shutil
+import tempfile
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data.data_processor import DataProcessor, FarmInfo, ProcessingResult
@@ -15,6 +18,12 @@ import json
 import time
 from datetime import datetime, timedelta
 
+# Run against a throwaway directory so test runs never rewrite the fixtures under data/
+TEST_ROOT = tempfile.mkdtemp(prefix="pam_data_processor_")
+TEST_DATA_PATH = os.path.join(TEST_ROOT, "test_processing")
+DEMO_DATA_PATH = os.path.join(TEST_ROOT, "demo_processing")
+atexit.register(shutil.rmtree, TEST_ROOT, True)
+
 def print_header(title):
     """Print a formatted header"""
     print(f"\n{'=' * 70}")
@@ -50,19 +59,19 @@ def test_directory_setup():
     """Test directory structure setup"""
     print_header("Directory Setup Test")
 
-    processor = DataProcessor(base_data_path="data/test_processing")
+    processor = DataProcessor(base_data_path=TEST_DATA_PATH)
     processor.setup_directories()
 
     print(">> Checking directory structure...")
 
     required_dirs = [
-        "data/test_processing/farms",
-        "data/test_processing/transactions",
-        "data/test_processing/daily_reports",
-        "data/test_processing/backups",
-        "data/test_processing/ai_results",
-        "data/test_processing/blockchain_sync",
-        "data/test_processing/logs"
+        f"{TEST_DATA_PATH}/farms",
+        f"{TEST_DATA_PATH}/transactions",
+        f"{TEST_DATA_PATH}/daily_reports",
+        f"{TEST_DATA_PATH}/backups",
+        f"{TEST_DATA_PATH}/ai_results",
+        f"{TEST_DATA_PATH}/blockchain_sync",
+        f"{TEST_DATA_PATH}/logs"
     ]
 
     all_dirs_exist = True
@@ -79,7 +88,7 @@ def test_farm_management():
     """Test farm registration and management"""
     print_header("Farm Management Test")
 
-    processor = DataProcessor(base_data_path="data/test_processing")
+    processor = DataProcessor(base_data_path=TEST_DATA_PATH)
 
     print(">> Creating sample farms...")
 
@@ -114,7 +123,7 @@ def test_transaction_management():
     """Test transaction storage and retrieval"""
     print_header("Transaction Management Test")
 
-    processor = DataProcessor(base_data_path="data/test_processing")
+    processor = DataProcessor(base_data_path=TEST_DATA_PATH)
 
     print(">> Adding sample transactions...")
 
@@ -178,7 +187,7 @@ def test_blockchain_sync():
     """Test blockchain synchronization"""
     print_header("Blockchain Synchronization Test")
 
-    processor = DataProcessor(base_data_path="data/test_processing")
+    processor = DataProcessor(base_data_path=TEST_DATA_PATH)
 
     print(">> Testing blockchain initialization...")
     models_initialized = processor.initialize_models()
@@ -205,7 +214,7 @@ def test_ai_model_integration():
     """Test AI model integration"""
     print_header("AI Model Integration Test")
 
-    processor = DataProcessor(base_data_path="data/test_processing")
+    processor = DataProcessor(base_data_path=TEST_DATA_PATH)
 
     print(">> Initializing AI models...")
     if not processor.initialize_models():
@@ -286,7 +295,7 @@ def test_daily_processing():
     """Test complete daily data processing"""
     print_header("Daily Data Processing Test")
 
-    processor = DataProcessor(base_data_path="data/test_processing")
+    processor = DataProcessor(base_data_path=TEST_DATA_PATH)
 
     print(">> Running complete daily processing...")
     start_time = time.time()
@@ -316,7 +325,7 @@ def test_backup_and_restore():
     """Test data backup and restoration"""
     print_header("Backup and Restore Test")
 
-    processor = DataProcessor(base_data_path="data/test_processing")
+    processor = DataProcessor(base_data_path=TEST_DATA_PATH)
 
     # Ensure we have some data to backup
     processor.create_sample_farms()
@@ -363,7 +372,7 @@ def test_statistics_and_reporting():
     """Test processing statistics and reporting"""
     print_header("Statistics and Reporting Test")
 
-    processor = DataProcessor(base_data_path="data/test_processing")
+    processor = DataProcessor(base_data_path=TEST_DATA_PATH)
 
     # Run a processing cycle to generate some data
     processor.process_daily_data()
@@ -397,7 +406,7 @@ def test_configuration_and_settings():
     """Test configuration and settings management"""
     print_header("Configuration and Settings Test")
 
-    processor = DataProcessor(base_data_path="data/test_processing")
+    processor = DataProcessor(base_data_path=TEST_DATA_PATH)
 
     print(">> Current configuration:")
     for key, value in processor.config.items():
@@ -419,7 +428,7 @@ def test_error_handling():
     """Test error handling and recovery"""
     print_header("Error Handling Test")
 
-    processor = DataProcessor(base_data_path="data/test_processing")
+    processor = DataProcessor(base_data_path=TEST_DATA_PATH)
 
     print(">> Testing error scenarios...")
 
@@ -441,7 +450,7 @@ def run_comprehensive_demo():
     """Run a comprehensive demonstration of the data processing system"""
     print_header("PAM-TALK Data Processing System Demonstration")
 
-    processor = DataProcessor(base_data_path="data/demo_processing")
+    processor = DataProcessor(base_data_path=DEMO_DATA_PATH)
 
     print(">> STEP 1: Initialize system and create sample data")
     processor.create_sample_farms()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PAM-TALK Incremental ESG Update Tests
+
+Checks that update_esg_scores only recomputes farms whose ESG inputs changed,
+whose stored score expired, or after a scoring rule change.
+"""
+
+import os
+import sys
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.data_processor import DataProcessor, FarmInfo
+from ai_models.esg_calculator import ESGCalculator
+
+
+def make_farm(farm_id, **esg_data):
+    return FarmInfo(
+        farm_id=farm_id, farm_name=f"{farm_id} farm", owner_name="owner", location="Jeju",
+        size_hectares=12.0, established_date="2020-01-01", contact_info={},
+        certifications=['organic', 'global_gap'], products=['tomatoes'], esg_data=dict(esg_data),
+        blockchain_address="", status="active", created_at="2024-01-01", updated_at="2024-01-01"
+    )
+
+
+@pytest.fixture
+def processor(tmp_path):
+    processor = DataProcessor(str(tmp_path))
+    processor.esg_calculator = ESGCalculator()
+    return processor
+
+
+@pytest.fixture
+def farms():
+    return {
+        'FARM_A': make_farm('FARM_A', organic_certified=True, carbon_emissions=1.5),
+        'FARM_B': make_farm('FARM_B', biodiversity_score=9),
+        'FARM_C': make_farm('FARM_C')
+    }
+
+
+def run(processor, farms, **kwargs):
+    result = processor.update_esg_scores(farms, **kwargs)
+    assert result['success']
+    return result['result']
+
+
+def test_unchanged_farms_reuse_stored_scores(processor, farms):
+    first = run(processor, farms)
+    assert (first['scores_recomputed'], first['scores_reused']) == (3, 0)
+    assert first['recompute_reasons'] == {'new': 3}
+
+    stamped = {farm_id: farm.updated_at for farm_id, farm in farms.items()}
+    second = run(processor, farms)
+
+    assert (second['scores_recomputed'], second['scores_reused']) == (0, 3)
+    assert second['esg_scores']['FARM_A']['overall_score'] == first['esg_scores']['FARM_A']['overall_score']
+    assert second['total_esg_tokens'] == first['total_esg_tokens']
+    assert {farm_id: farm.updated_at for farm_id, farm in farms.items()} == stamped
+
+
+def test_only_changed_farm_is_recomputed(processor, farms):
+    run(processor, farms)
+
+    # Bookkeeping fields and certification order do not affect the score
+    farms['FARM_B'].esg_data['last_audit'] = '2026-10-01'
+    farms['FARM_C'].certifications.reverse()
+    farms['FARM_A'].esg_data['carbon_emissions'] = 6.0
+
+    result = run(processor, farms)
+    assert result['recompute_reasons'] == {'inputs_changed': 1}
+    assert [f for f, s in result['esg_scores'].items() if s['recomputed']] == ['FARM_A']
+    assert result['esg_scores']['FARM_A']['overall_score'] == farms['FARM_A'].esg_data['last_esg_score']
+
+
+def test_expired_scores_and_rule_changes_force_recompute(processor, farms):
+    run(processor, farms)
+
+    cache = processor.load_esg_cache()
+    cache['FARM_B']['valid_until'] = (datetime.now() - timedelta(days=1)).isoformat()
+    old = (datetime.now() - timedelta(days=processor.config['esg_update_threshold_days'])).isoformat()
+    cache['FARM_C']['calculated_at'] = old
+    with open(processor.esg_cache_file, 'w') as f:
+        json.dump(cache, f)
+
+    assert run(processor, farms)['recompute_reasons'] == {'expired': 2}
+
+    processor.esg_calculator.social_weights['fair_wage'] = 0.30
+    assert run(processor, farms)['recompute_reasons'] == {'scoring_changed': 3}
+    assert run(processor, farms, force=True)['recompute_reasons'] == {'forced': 3}
+
+
+def test_removed_farms_leave_the_cache(processor, farms):
+    run(processor, farms)
+    del farms['FARM_C']
+    run(processor, farms)
+    assert set(processor.load_esg_cache()) == {'FARM_A', 'FARM_B'}
@@ -170,20 +170,8 @@ def get_queue_info():
 def list_recent_jobs():
     """최근 배치 작업 목록 조회"""
     try:
-        # 최근 50개 작업 조회 (실제로는 DB나 Redis에서)
-        jobs = []
-        for job_id, job in batch_service.processor.jobs_storage.items():
-            jobs.append({
-                "job_id": job.job_id,
-                "job_type": job.job_type,
-                "status": job.status,
-                "created_at": job.created_at.isoformat(),
-                "priority": job.priority
-            })
-
-        # 최신순 정렬
-        jobs.sort(key=lambda x: x['created_at'], reverse=True)
-        jobs = jobs[:50]  # 최근 50개만
+        # 최근 50개 작업 조회 (영속 작업 큐, 최신순)
+        jobs = batch_service.list_jobs(limit=50, status=request.args.get("status"))
 
         return jsonify({
             "success": True,
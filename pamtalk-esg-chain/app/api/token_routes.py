@@ -44,7 +44,7 @@ def mint_token_route():
             }), 400
 
         # 쿠폰 생성 함수 호출
-        create_initial_coupons(
+        report = create_initial_coupons(
             amount=amount,
             description=description or f"{unit_name} 쿠폰 발행",
             issued_by=issued_by,
@@ -59,7 +59,9 @@ def mint_token_route():
             "unit_name": unit_name,
             "asset_id": ASA_ID,
             "asset_name": ASSET_NAME,
-            "amount": amount
+            "amount": amount,
+            "mint_history_id": report['mint_history_id'],
+            "rows_per_second": round(report['rows_per_second'])
         }), 200
 
     except Exception as e:
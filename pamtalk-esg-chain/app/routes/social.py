@@ -44,17 +44,19 @@ async def get_user_timeline(user_id):
     try:
         page = int(request.args.get('page', 1))
         limit = min(int(request.args.get('limit', 20)), 50)
+        cursor = request.args.get('cursor')
 
-        posts = await feed_service.get_timeline_feed(user_id, page, limit)
+        feed = feed_service.get_user_feed(user_id, page, limit, 'timeline', cursor=cursor)
 
         return jsonify({
             'success': True,
             'data': {
-                'posts': posts,
+                'posts': feed['posts'],
                 'pagination': {
                     'page': page,
                     'limit': limit,
-                    'has_more': len(posts) == limit
+                    'next_cursor': feed['next_cursor'],
+                    'has_more': feed['has_more']
                 }
             }
         })
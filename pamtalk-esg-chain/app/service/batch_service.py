@@ -5,61 +5,151 @@ Redis 기반 큐 시스템을 활용한 비동기 처리
 """
 
 import json
+import os
 import time
+import uuid
 import logging
 import threading
 from datetime import datetime
-from queue import Queue
 from typing import List, Dict, Optional
 
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
-from app.config import DB_HOST, DB_NAME, DB_USER, DB_PASSWORD
-from app.service.coupon_service import create_initial_coupons
+from app.config import DB_HOST, DB_NAME, DB_USER, DB_PASSWORD, HCF_MNEMONIC, ASA_ID
+from app.service.batch_transfer_engine import BatchTransferEngine, MAX_GROUP_SIZE
+from app.service.coupon_service import (
+    create_initial_coupons, resume_coupon_mint, CouponMintError
+)
+from app.service.coupon_stats_service import coupon_stats_service
+from app.service.social_side_effect_pipeline import post_side_effect_pipeline
+from app.utils.algorand_utils import get_algod_client
+from app.utils.job_queue import PersistentJobQueue, JobState, default_worker_id
+from app.utils.wallet_utils import get_wallet_keys
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# 작업 큐 설정 (여러 프로세스가 같은 파일을 공유하면 작업을 나눠 처리)
+BATCH_QUEUE_DB = os.getenv("BATCH_QUEUE_DB", "batch_jobs.db")
+BATCH_VISIBILITY_TIMEOUT = float(os.getenv("BATCH_VISIBILITY_TIMEOUT", "300"))
+BATCH_FINISHED_TTL = float(os.getenv("BATCH_FINISHED_TTL", str(7 * 24 * 3600)))
+
+
 class BatchJobStatus:
     """배치 작업 상태"""
-    PENDING = "PENDING"
-    PROCESSING = "PROCESSING"
-    COMPLETED = "COMPLETED"
-    FAILED = "FAILED"
+    PENDING = JobState.PENDING
+    PROCESSING = JobState.PROCESSING
+    COMPLETED = JobState.COMPLETED
+    FAILED = JobState.FAILED
 
 
 class BatchJob:
     """배치 작업 객체"""
 
-    def __init__(self, job_id: str, job_type: str, parameters: dict, priority: int = 5):
+    def __init__(self, job_id: str, job_type: str, parameters: dict, priority: int = 5,
+                 max_attempts: int = 3):
         self.job_id = job_id
         self.job_type = job_type
         self.parameters = parameters
         self.priority = priority
+        self.max_attempts = max_attempts
+        self.attempts = 0
         self.status = BatchJobStatus.PENDING
         self.created_at = datetime.now()
         self.started_at = None
         self.completed_at = None
         self.error_message = None
         self.result = None
+        self.progress = 0.0
+        self.progress_message = None
+        self._parameters_dirty = False
+
+    @classmethod
+    def from_record(cls, record: Dict) -> 'BatchJob':
+        """작업 큐 레코드로 복원"""
+        job = cls(record['job_id'], record['job_type'], record['parameters'],
+                  record['priority'], record['max_attempts'])
+        job.attempts = record['attempts']
+        job.status = record['status']
+        job.created_at = datetime.fromtimestamp(record['created_at'])
+        job.started_at = datetime.fromtimestamp(record['started_at']) if record['started_at'] else None
+        job.completed_at = datetime.fromtimestamp(record['completed_at']) if record['completed_at'] else None
+        job.error_message = record['error_message']
+        job.result = record['result']
+        job.progress = record['progress']
+        job.progress_message = record['progress_message']
+        return job
+
+    def report_progress(self, fraction: float, message: Optional[str] = None):
+        """진행률 기록 (0~1, 다음 하트비트 때 큐에 반영)"""
+        self.progress = max(0.0, min(1.0, fraction))
+        if message is not None:
+            self.progress_message = message
+
+    def update_parameters(self, **changes):
+        """재시도 시 이어서 처리할 정보 기록 (다음 하트비트 때 큐에 저장)"""
+        self.parameters.update(changes)
+        self._parameters_dirty = True
+
+
+class _LeaseKeeper(threading.Thread):
+    """처리 중인 작업의 임대를 주기적으로 연장하고 진행률을 큐에 반영"""
+
+    def __init__(self, job_queue: PersistentJobQueue, job: BatchJob, owner: str, interval: float):
+        super().__init__(name=f"batch-lease-{job.job_id}", daemon=True)
+        self.job_queue = job_queue
+        self.job = job
+        self.owner = owner
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        job = self.job
+        parameters = job.parameters if job._parameters_dirty else None
+        job._parameters_dirty = False
+        try:
+            if not self.job_queue.heartbeat(job.job_id, self.owner, job.progress,
+                                            job.progress_message, parameters):
+                logger.warning(f"작업 임대 상실: {job.job_id} (다른 워커가 가져갔거나 종료됨)")
+        except Exception as e:
+            job._parameters_dirty = job._parameters_dirty or parameters is not None
+            logger.error(f"작업 하트비트 실패: {job.job_id} - {str(e)}")
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
 
 
 class BatchProcessor:
     """배치 작업 처리기"""
 
-    def __init__(self, worker_count: int = 3):
+    def __init__(self, worker_count: int = 3, job_queue: Optional[PersistentJobQueue] = None,
+                 poll_interval: float = 1.0, cleanup_interval: float = 3600.0):
         self.worker_count = worker_count
-        self.job_queue = Queue()
+        self.job_queue = job_queue or PersistentJobQueue(
+            BATCH_QUEUE_DB,
+            visibility_timeout=BATCH_VISIBILITY_TIMEOUT,
+            finished_ttl=BATCH_FINISHED_TTL
+        )
+        self.poll_interval = poll_interval
+        self.cleanup_interval = cleanup_interval
         self.workers = []
         self.running = False
-        self.jobs_storage = {}  # 실제 환경에서는 Redis 등 사용
+        self._stop_event = threading.Event()
+        self._cleanup_lock = threading.Lock()
+        self._last_cleanup = 0.0
 
     def start(self):
         """배치 프로세서 시작"""
         self.running = True
+        self._stop_event.clear()
 
         for i in range(self.worker_count):
             worker = threading.Thread(target=self._worker_loop, args=(i,))
@@ -70,68 +160,99 @@ class BatchProcessor:
         logger.info(f"배치 프로세서 시작: {self.worker_count}개 워커")
 
     def stop(self):
-        """배치 프로세서 중지"""
+        """배치 프로세서 중지 (처리 중인 작업은 임대 만료 후 다른 워커가 이어받음)"""
         self.running = False
+        self._stop_event.set()
         logger.info("배치 프로세서 중지")
 
     def submit_job(self, job: BatchJob) -> str:
         """작업 큐에 추가"""
-        self.jobs_storage[job.job_id] = job
-        self.job_queue.put(job)
-        logger.info(f"배치 작업 추가: {job.job_id} ({job.job_type})")
+        self.job_queue.enqueue(job.job_id, job.job_type, job.parameters,
+                               priority=job.priority, max_attempts=job.max_attempts)
+        logger.info(f"배치 작업 추가: {job.job_id} ({job.job_type}, 우선순위 {job.priority})")
         return job.job_id
 
     def get_job_status(self, job_id: str) -> Optional[BatchJob]:
         """작업 상태 조회"""
-        return self.jobs_storage.get(job_id)
+        record = self.job_queue.get(job_id)
+        return BatchJob.from_record(record) if record else None
 
     def _worker_loop(self, worker_id: int):
         """워커 루프"""
         logger.info(f"배치 워커 {worker_id} 시작")
+        owner = default_worker_id(worker_id)
 
         while self.running:
             try:
-                # 작업 가져오기 (타임아웃 1초)
-                job = self.job_queue.get(timeout=1)
-
-                logger.info(f"워커 {worker_id}가 작업 처리 시작: {job.job_id}")
-
-                # 작업 처리
-                self._process_job(job, worker_id)
-
-                self.job_queue.task_done()
+                self._cleanup_if_due()
+                record = self.job_queue.lease(owner)
+            except Exception as e:
+                logger.error(f"작업 임대 실패 (워커 {worker_id}): {str(e)}")
+                record = None
 
-            except:
-                # 타임아웃이나 기타 예외 발생 시 계속 진행
+            if record is None:
+                self._stop_event.wait(self.poll_interval)
                 continue
 
-    def _process_job(self, job: BatchJob, worker_id: int):
+            job = BatchJob.from_record(record)
+            logger.info(f"워커 {worker_id}가 작업 처리 시작: {job.job_id} "
+                        f"(시도 {job.attempts}/{job.max_attempts})")
+            self._process_job(job, worker_id, owner)
+
+    def _cleanup_if_due(self):
+        """TTL이 지난 완료/실패 작업 정리 (cleanup_interval마다 워커 하나만 수행)"""
+        if time.time() - self._last_cleanup < self.cleanup_interval:
+            return
+        if not self._cleanup_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_cleanup = time.time()
+            removed = self.job_queue.cleanup()
+            if removed:
+                logger.info(f"만료된 배치 작업 {removed}건 정리")
+        finally:
+            self._cleanup_lock.release()
+
+    def _process_job(self, job: BatchJob, worker_id: int, owner: str):
         """작업 처리"""
         job.status = BatchJobStatus.PROCESSING
-        job.started_at = datetime.now()
+        job.started_at = job.started_at or datetime.now()
+
+        keeper = _LeaseKeeper(self.job_queue, job, owner,
+                              interval=min(self.job_queue.visibility_timeout / 3, 5.0))
+        keeper.start()
 
         try:
             if job.job_type == "MASS_TOKEN_MINT":
-                result = self._process_mass_mint(job, worker_id)
+                result = self._process_mass_mint(job, worker_id, owner)
             elif job.job_type == "BATCH_TRANSFER":
                 result = self._process_batch_transfer(job, worker_id)
+            elif job.job_type == "RECONCILE_COUPON_STATS":
+                result = self._process_reconcile_stats(job, worker_id)
+            elif job.job_type == "RECOMPUTE_SOCIAL_COUNTERS":
+                result = self._process_recompute_social_counters(job, worker_id)
             else:
                 raise Exception(f"알 수 없는 작업 타입: {job.job_type}")
 
-            job.status = BatchJobStatus.COMPLETED
-            job.result = result
-            job.completed_at = datetime.now()
-
-            logger.info(f"작업 완료: {job.job_id} (워커 {worker_id})")
-
         except Exception as e:
-            job.status = BatchJobStatus.FAILED
-            job.error_message = str(e)
-            job.completed_at = datetime.now()
+            keeper.stop()
+            state = self.job_queue.fail(job.job_id, owner, str(e),
+                                        parameters=job.parameters if job._parameters_dirty else None)
 
-            logger.error(f"작업 실패: {job.job_id} - {str(e)}")
+            if state == BatchJobStatus.PENDING:
+                logger.warning(f"작업 실패, 재시도 예정: {job.job_id} "
+                               f"(시도 {job.attempts}/{job.max_attempts}) - {str(e)}")
+            else:
+                logger.error(f"작업 실패: {job.job_id} - {str(e)}")
+            return
+
+        keeper.stop()
+        if self.job_queue.complete(job.job_id, owner, result):
+            logger.info(f"작업 완료: {job.job_id} (워커 {worker_id})")
+        else:
+            logger.warning(f"작업 완료 기록 실패 (임대 상실): {job.job_id}")
 
-    def _process_mass_mint(self, job: BatchJob, worker_id: int) -> Dict:
+    def _process_mass_mint(self, job: BatchJob, worker_id: int, owner: str) -> Dict:
         """대량 토큰 발행 처리"""
         params = job.parameters
         amount = params['amount']
@@ -146,56 +267,115 @@ class BatchProcessor:
 
         logger.info(f"대량 발행 시작: {amount}개, 배치 크기: {batch_size}")
 
+        def on_progress(mint_history_id: int, inserted: int, total: int):
+            job.report_progress(inserted / total, f"{inserted:,} / {total:,}개 적재")
+            if params.get('mint_history_id') != mint_history_id:
+                # 시리얼 예약 직후, 첫 COPY 전에 발행 이력을 큐에 바로 기록
+                # (다음 하트비트까지 기다리다 워커가 죽으면 재시도가 이력 없이 새 구간을 예약해
+                # 이미 커밋된 쿠폰을 중복 발행함. 여기서 기록에 실패하면 적재 없이 중단하므로
+                # 남는 것은 쿠폰이 없는 예약뿐)
+                params['mint_history_id'] = mint_history_id
+                if not self.job_queue.heartbeat(job.job_id, owner, job.progress,
+                                                job.progress_message, params):
+                    raise Exception(f"작업 임대를 잃어 적재를 시작하지 않습니다: {job.job_id}")
+
         try:
-            # 기존 coupon_service 활용하여 발행
-            create_initial_coupons(
-                amount=amount,
-                description=description,
-                issued_by=issued_by,
-                asset_id=asset_id,
-                asset_name=asset_name,
-                unit_name=unit_name
-            )
+            # COPY 기반 발행 - batch_size마다 체크포인트 커밋
+            # 이전 시도가 중단된 작업이면 같은 발행 이력에서 이어서 적재
+            if params.get('mint_history_id'):
+                report = resume_coupon_mint(params['mint_history_id'], checkpoint_size=batch_size,
+                                            progress=on_progress)
+            else:
+                report = create_initial_coupons(
+                    amount=amount,
+                    description=description,
+                    issued_by=issued_by,
+                    asset_id=asset_id,
+                    asset_name=asset_name,
+                    unit_name=unit_name,
+                    checkpoint_size=batch_size,
+                    progress=on_progress
+                )
+            job.update_parameters(mint_history_id=report['mint_history_id'])
 
             return {
-                'issued_amount': amount,
+                **report,
                 'batch_size': batch_size,
                 'worker_id': worker_id,
                 'processing_time': (datetime.now() - job.started_at).total_seconds()
             }
 
+        except CouponMintError as e:
+            job.update_parameters(mint_history_id=e.mint_history_id)
+            raise Exception(f"대량 발행 실패 ({e.inserted}/{amount}개 적재, "
+                            f"발행 이력 {e.mint_history_id}에서 재개 가능): {str(e)}")
         except Exception as e:
             raise Exception(f"대량 발행 실패: {str(e)}")
 
     def _process_batch_transfer(self, job: BatchJob, worker_id: int) -> Dict:
-        """배치 전송 처리"""
+        """배치 전송 처리 (최대 16건씩 원자 그룹으로 묶어 파이프라인 제출)"""
         params = job.parameters
         transfers = params['transfers']  # [{'recipient': 'addr', 'amount': 100}, ...]
 
         logger.info(f"배치 전송 시작: {len(transfers)}개 전송")
 
-        success_count = 0
-        failed_transfers = []
+        sender_address, sender_private_key = get_wallet_keys(HCF_MNEMONIC)
+        engine = BatchTransferEngine(
+            client=get_algod_client(),
+            sender_address=sender_address,
+            sender_private_key=sender_private_key,
+            asset_id=params.get('asset_id') or ASA_ID,
+            group_size=params.get('group_size', MAX_GROUP_SIZE)
+        )
+        report = engine.run(
+            transfers,
+            note_prefix=job.job_id,
+            progress=lambda done, total: job.report_progress(done / total, f"{done:,} / {total:,}건 처리")
+        )
 
-        for transfer in transfers:
-            try:
-                # 실제 전송 로직 구현 (token_service 활용)
-                # 여기서는 로깅만 수행
-                logger.info(f"전송: {transfer['recipient']} <- {transfer['amount']}")
-                success_count += 1
+        logger.info(f"배치 전송 완료: 성공 {report['success_count']}건, 실패 {report['failed_count']}건, "
+                    f"미확인 {report['unconfirmed_count']}건 "
+                    f"({report['group_count']}개 그룹, {report['rounds_waited']} 라운드)")
 
-            except Exception as e:
-                failed_transfers.append({
-                    'recipient': transfer['recipient'],
-                    'amount': transfer['amount'],
-                    'error': str(e)
-                })
+        return {
+            **report,
+            'worker_id': worker_id
+        }
+
+    def _process_reconcile_stats(self, job: BatchJob, worker_id: int) -> Dict:
+        """쿠폰 통계 롤업 검증/복구 처리"""
+        params = job.parameters
+
+        report = coupon_stats_service.reconcile(repair=params.get('repair', True))
+        compacted_rows = coupon_stats_service.compact() if params.get('compact', True) else None
+
+        logger.info(f"롤업 검증 완료: 불일치 {len(report['mismatches'])}건, "
+                    f"복구 자산 {len(report['repaired_assets'])}개")
+
+        return {
+            'mismatch_count': len(report['mismatches']),
+            'mismatches': report['mismatches'][:100],
+            'repaired_assets': report['repaired_assets'],
+            'compacted_rows': compacted_rows,
+            'elapsed_seconds': report['elapsed_seconds'],
+            'worker_id': worker_id
+        }
+
+    def _process_recompute_social_counters(self, job: BatchJob, worker_id: int) -> Dict:
+        """소셜 프로필 카운터 재계산 처리 (부가 작업 파이프라인에서 유실된 증분 보정)"""
+        params = job.parameters
+
+        report = post_side_effect_pipeline.recompute_profile_counters(repair=params.get('repair', True))
+
+        logger.info(f"프로필 카운터 재계산 완료: 불일치 {len(report['mismatches'])}건, "
+                    f"복구 {len(report['repaired_users'])}건")
 
         return {
-            'total_transfers': len(transfers),
-            'success_count': success_count,
-            'failed_count': len(failed_transfers),
-            'failed_transfers': failed_transfers,
+            'mismatch_count': len(report['mismatches']),
+            'mismatches': report['mismatches'][:100],
+            'repaired_users': report['repaired_users'][:1000],
+            'repaired_count': len(report['repaired_users']),
+            'elapsed_seconds': report['elapsed_seconds'],
             'worker_id': worker_id
         }
 
@@ -207,12 +387,17 @@ class BatchService:
         self.processor = BatchProcessor(worker_count=3)
         self.processor.start()
 
+    @staticmethod
+    def _new_job_id(*parts) -> str:
+        """작업 ID (영속 큐에서 겹치지 않도록 임의 접미사 추가)"""
+        return "_".join(str(part) for part in parts + (int(time.time()), uuid.uuid4().hex[:8]))
+
     def create_mass_mint_job(self, amount: int, description: str, issued_by: str,
                            asset_id: int, asset_name: str, unit_name: str,
                            priority: int = 5) -> str:
         """대량 발행 작업 생성"""
 
-        job_id = f"mint_{int(time.time())}_{amount}"
+        job_id = self._new_job_id("mint", amount)
 
         job = BatchJob(
             job_id=job_id,
@@ -226,7 +411,8 @@ class BatchService:
                 'unit_name': unit_name,
                 'batch_size': min(amount, 5000)  # 최대 배치 크기
             },
-            priority=priority
+            priority=priority,
+            max_attempts=3  # 체크포인트부터 이어서 적재하므로 재시도 안전
         )
 
         return self.processor.submit_job(job)
@@ -234,12 +420,42 @@ class BatchService:
     def create_batch_transfer_job(self, transfers: List[Dict], priority: int = 5) -> str:
         """배치 전송 작업 생성"""
 
-        job_id = f"transfer_{int(time.time())}_{len(transfers)}"
+        job_id = self._new_job_id("transfer", len(transfers))
 
         job = BatchJob(
             job_id=job_id,
             job_type="BATCH_TRANSFER",
             parameters={'transfers': transfers},
+            priority=priority,
+            max_attempts=1  # 온체인 전송은 재시도 시 중복 송금될 수 있으므로 자동 재시도하지 않음
+        )
+
+        return self.processor.submit_job(job)
+
+    def create_reconcile_stats_job(self, repair: bool = True, compact: bool = True,
+                                   priority: int = 5) -> str:
+        """쿠폰 통계 롤업 검증 작업 생성 (주기적으로 실행)"""
+
+        job_id = self._new_job_id("reconcile")
+
+        job = BatchJob(
+            job_id=job_id,
+            job_type="RECONCILE_COUPON_STATS",
+            parameters={'repair': repair, 'compact': compact},
+            priority=priority
+        )
+
+        return self.processor.submit_job(job)
+
+    def create_recompute_social_counters_job(self, repair: bool = True, priority: int = 5) -> str:
+        """소셜 프로필 카운터 재계산 작업 생성 (주기적으로 실행)"""
+
+        job_id = self._new_job_id("social_counters")
+
+        job = BatchJob(
+            job_id=job_id,
+            job_type="RECOMPUTE_SOCIAL_COUNTERS",
+            parameters={'repair': repair},
             priority=priority
         )
 
@@ -259,19 +475,50 @@ class BatchService:
             'created_at': job.created_at.isoformat(),
             'started_at': job.started_at.isoformat() if job.started_at else None,
             'completed_at': job.completed_at.isoformat() if job.completed_at else None,
+            'priority': job.priority,
+            'attempts': job.attempts,
+            'max_attempts': job.max_attempts,
+            'progress': job.progress,
+            'progress_message': job.progress_message,
             'error_message': job.error_message,
             'result': job.result
         }
 
+    def list_jobs(self, limit: int = 50, status: Optional[str] = None) -> List[Dict]:
+        """최근 작업 목록 (생성 역순)"""
+        return [
+            {
+                'job_id': record['job_id'],
+                'job_type': record['job_type'],
+                'status': record['status'],
+                'created_at': datetime.fromtimestamp(record['created_at']).isoformat(),
+                'priority': record['priority'],
+                'attempts': record['attempts'],
+                'progress': record['progress']
+            }
+            for record in self.processor.job_queue.list_jobs(limit=limit, status=status)
+        ]
+
     def get_queue_info(self) -> Dict:
         """큐 정보 조회"""
+        stats = self.processor.job_queue.get_stats()
         return {
-            'queue_size': self.processor.job_queue.qsize(),
+            'queue_size': stats[BatchJobStatus.PENDING],
+            'ready': stats['ready'],
+            'processing': stats[BatchJobStatus.PROCESSING],
+            'completed': stats[BatchJobStatus.COMPLETED],
+            'failed': stats[BatchJobStatus.FAILED],
             'worker_count': self.processor.worker_count,
             'running': self.processor.running,
-            'total_jobs': len(self.processor.jobs_storage)
+            'total_jobs': sum(stats[state] for state in (
+                BatchJobStatus.PENDING, BatchJobStatus.PROCESSING,
+                BatchJobStatus.COMPLETED, BatchJobStatus.FAILED))
         }
 
+    def cleanup_finished_jobs(self, ttl: Optional[float] = None) -> int:
+        """완료/실패 후 TTL이 지난 작업 삭제"""
+        return self.processor.job_queue.cleanup(ttl)
+
     def shutdown(self):
         """서비스 종료"""
         self.processor.stop()
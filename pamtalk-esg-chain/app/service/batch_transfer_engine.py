@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+"""
+원자 그룹 기반 배치 토큰 전송 엔진
+BatchProcessor의 BATCH_TRANSFER 작업이 사용
+
+- 전송을 최대 16건씩 원자 그룹으로 묶어 그룹 단위로 서명/제출
+- suggested_params는 라운드 창 동안 재사용 (전송마다 조회하지 않음)
+- 그룹 서명은 스레드 풀에서 병렬 처리하고, 서명이 끝난 그룹부터 확인을 기다리지 않고 연속 제출
+- 확인은 라운드마다 미확정 그룹을 한꺼번에 조회 (그룹은 함께 확정되므로 그룹당 1건만 조회)
+- 확정/거부가 아닌 그룹은 유효 라운드(last_valid)가 지나야 실패로 판정
+  (그 전에 대기를 끊으면 UNKNOWN - 아직 확정될 수 있으므로 재전송하면 안 됨)
+"""
+
+import base64
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from algosdk import transaction
+from algosdk.error import AlgodHTTPError
+
+logger = logging.getLogger(__name__)
+
+# Algorand 원자 그룹 최대 트랜잭션 수
+MAX_GROUP_SIZE = 16
+
+
+class TransferStatus:
+    """개별 전송 상태"""
+    PENDING = "PENDING"
+    SUBMITTED = "SUBMITTED"
+    CONFIRMED = "CONFIRMED"
+    FAILED = "FAILED"
+    # 확인 대기를 중단했지만 유효 라운드가 남아 있어 나중에 확정될 수 있음 (재전송 금지, TX ID로 재확인)
+    UNKNOWN = "UNKNOWN"
+
+
+class SuggestedParamsWindow:
+    """
+    suggested_params 재사용 창
+
+    한 번 조회한 파라미터를 window_rounds 라운드(또는 max_age초) 동안 모든 그룹에
+    재사용합니다. 현재 라운드는 확인 루프가 observe_round로 알려 줍니다.
+    """
+
+    def __init__(self, client, window_rounds: int = 10, max_age: float = 30.0, fee: int = 1000):
+        self.client = client
+        self.window_rounds = window_rounds
+        self.max_age = max_age
+        self.fee = fee
+        self._lock = threading.Lock()
+        self._params = None
+        self._fetched_at = 0.0
+        self._latest_round = 0
+        self.fetches = 0
+        self.reuses = 0
+
+    def get(self) -> transaction.SuggestedParams:
+        with self._lock:
+            if self._is_stale():
+                params = self.client.suggested_params()
+                params.flat_fee = True
+                params.fee = self.fee
+                self._params = params
+                self._fetched_at = time.monotonic()
+                self._latest_round = max(self._latest_round, params.first)
+                self.fetches += 1
+            else:
+                self.reuses += 1
+            return self._params
+
+    def observe_round(self, current_round: int):
+        """확인 루프에서 본 최신 라운드 기록"""
+        with self._lock:
+            self._latest_round = max(self._latest_round, current_round)
+
+    def invalidate(self):
+        with self._lock:
+            self._params = None
+
+    def _is_stale(self) -> bool:
+        if self._params is None:
+            return True
+        if time.monotonic() - self._fetched_at > self.max_age:
+            return True
+        return self._latest_round >= self._params.first + self.window_rounds
+
+
+class TransferGroup:
+    """원자 그룹 하나 (전송 최대 16건)"""
+
+    def __init__(self, items: List[Dict]):
+        self.items = items  # [{'position': 원래 순서, 'recipient': ..., 'amount': ...}, ...]
+        self.signed = []
+        self.tx_ids = []
+        self.group_id = None
+        self.last_valid = 0
+        self.submitted_round = 0
+        self.attempts = 0
+        self.status = TransferStatus.PENDING
+        self.confirmed_round = None
+        self.error = None
+
+    @property
+    def key(self) -> str:
+        """확인 조회에 쓰는 대표 트랜잭션 ID"""
+        return self.tx_ids[0]
+
+
+class BatchTransferEngine:
+    """원자 그룹 배치 전송기 (한 번의 run 호출이 전송 목록 하나를 끝까지 처리)"""
+
+    def __init__(self, client, sender_address: str, sender_private_key: str, asset_id: int,
+                 group_size: int = MAX_GROUP_SIZE, sign_workers: int = 4, max_in_flight: int = 64,
+                 confirm_rounds: Optional[int] = None,
+                 params_window: Optional[SuggestedParamsWindow] = None):
+        """
+        Args:
+            confirm_rounds: 제출 후 이 라운드 수만큼만 확인을 기다리고 남은 그룹은 UNKNOWN 처리
+                            (None이면 유효 라운드가 지날 때까지 기다려 확정/실패를 가림)
+        """
+        if not 1 <= group_size <= MAX_GROUP_SIZE:
+            raise ValueError(f"그룹 크기는 1~{MAX_GROUP_SIZE} 사이여야 합니다: {group_size}")
+
+        self.client = client
+        self.sender_address = sender_address
+        self.sender_private_key = sender_private_key
+        self.asset_id = int(asset_id)
+        self.group_size = group_size
+        self.sign_workers = sign_workers
+        self.max_in_flight = max_in_flight
+        self.confirm_rounds = confirm_rounds
+        self.params_window = params_window or SuggestedParamsWindow(client)
+        self._round = 0
+
+    def run(self, transfers: List[Dict], note_prefix: str = "",
+            progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """
+        전송 목록 처리
+
+        Args:
+            transfers: [{'recipient': 주소, 'amount': 수량}, ...]
+            note_prefix: 트랜잭션 note 접두사 (작업 ID 등) - 같은 수신자/수량도 서로 다른 트랜잭션이 되도록
+                         note에 원래 순서를 붙입니다
+            progress: 확인 라운드마다 (처리 끝난 전송 수, 전체 수)로 호출
+
+        Returns:
+            전송 요약 (성공/실패 건수, 실패 목록, 그룹별 결과)
+        """
+        started = time.perf_counter()
+        self._note_prefix = note_prefix
+        self._progress = progress
+        self._total = len(transfers)
+        self._round = self.client.status()['last-round']
+        self.params_window.observe_round(self._round)
+
+        items = [
+            {'position': position, 'recipient': transfer['recipient'], 'amount': int(transfer['amount'])}
+            for position, transfer in enumerate(transfers)
+        ]
+        groups = [TransferGroup(items[i:i + self.group_size])
+                  for i in range(0, len(items), self.group_size)]
+
+        finished: List[TransferGroup] = []
+        rounds_waited = self._pipeline(groups, finished)
+
+        return self._summarize(transfers, finished, rounds_waited, time.perf_counter() - started)
+
+    # ------------------------------------------------------------------
+    # 서명 / 제출 / 확인
+    # ------------------------------------------------------------------
+
+    def _pipeline(self, groups: List[TransferGroup], finished: List[TransferGroup]) -> int:
+        """서명된 그룹부터 제출하고, 더 제출할 수 없으면 다음 라운드를 기다려 한꺼번에 확인"""
+        in_flight: Dict[str, TransferGroup] = {}
+        retry = deque()
+        rounds_waited = 0
+
+        with ThreadPoolExecutor(max_workers=self.sign_workers,
+                                thread_name_prefix="batch-transfer-sign") as executor:
+            signing = deque(executor.submit(self._prepare, group) for group in groups)
+
+            while signing or retry or in_flight:
+                while (signing or retry) and len(in_flight) < self.max_in_flight:
+                    group = retry.popleft() if retry else signing.popleft().result()
+                    if group.status == TransferStatus.FAILED and len(group.items) > 1:
+                        # 그룹 안의 한 건 때문에 만들 수 없으면 단건으로 나눠 나머지를 살림
+                        retry.extend(self._prepare(TransferGroup([item])) for item in group.items)
+                    elif group.status == TransferStatus.FAILED:
+                        finished.append(group)
+                    else:
+                        self._submit(group, in_flight, retry, finished)
+
+                if in_flight:
+                    self._wait_next_round()
+                    rounds_waited += 1
+                    self._poll_confirmations(in_flight, finished)
+                    if self._progress:
+                        self._progress(sum(len(group.items) for group in finished), self._total)
+
+        return rounds_waited
+
+    def _prepare(self, group: TransferGroup) -> TransferGroup:
+        """서명 (잘못된 주소 등으로 트랜잭션을 만들 수 없으면 그룹을 실패 처리)"""
+        try:
+            return self._build_and_sign(group)
+        except Exception as e:
+            group.status = TransferStatus.FAILED
+            group.error = str(e)
+            return group
+
+    def _build_and_sign(self, group: TransferGroup) -> TransferGroup:
+        params = self.params_window.get()
+        txns = [
+            transaction.AssetTransferTxn(
+                sender=self.sender_address,
+                sp=params,
+                receiver=item['recipient'],
+                amt=item['amount'],
+                index=self.asset_id,
+                note=f"{self._note_prefix}:{item['position']}".encode()
+            )
+            for item in group.items
+        ]
+        if len(txns) > 1:
+            txns = transaction.assign_group_id(txns)
+            group.group_id = base64.b64encode(txns[0].group).decode()
+        else:
+            group.group_id = None
+
+        group.signed = [txn.sign(self.sender_private_key) for txn in txns]
+        group.tx_ids = [txn.get_txid() for txn in txns]
+        group.last_valid = params.last
+        return group
+
+    def _submit(self, group: TransferGroup, in_flight: Dict, retry: deque, finished: List):
+        group.attempts += 1
+        try:
+            self.client.send_transactions(group.signed)
+        except AlgodHTTPError as e:
+            message = str(e)
+            if 'txn dead' in message and group.attempts == 1:
+                # 재사용하던 파라미터의 유효 라운드가 지남 - 새 파라미터로 한 번 더
+                self.params_window.invalidate()
+                retry.append(self._prepare(group))
+            elif len(group.items) > 1:
+                # 그룹은 한 건만 실패해도 전체가 거부되므로 단건으로 나눠 나머지를 살림
+                logger.warning(f"그룹 {group.group_id} 거부 ({message}) → 단건 {len(group.items)}개로 재제출")
+                for item in group.items:
+                    retry.append(self._prepare(TransferGroup([item])))
+            else:
+                group.status = TransferStatus.FAILED
+                group.error = message
+                finished.append(group)
+            return
+
+        group.status = TransferStatus.SUBMITTED
+        group.submitted_round = self._round
+        in_flight[group.key] = group
+
+    def _poll_confirmations(self, in_flight: Dict[str, TransferGroup], finished: List[TransferGroup]):
+        """미확정 그룹을 한꺼번에 조회 (그룹당 대표 트랜잭션 1건)"""
+        for key, group in list(in_flight.items()):
+            try:
+                info = self.client.pending_transaction_info(key)
+            except AlgodHTTPError as e:
+                if e.code != 404:
+                    raise
+                info = {}
+
+            if info.get('confirmed-round', 0) > 0:
+                group.status = TransferStatus.CONFIRMED
+                group.confirmed_round = info['confirmed-round']
+            elif info.get('pool-error'):
+                group.status = TransferStatus.FAILED
+                group.error = info['pool-error']
+            elif self._round > group.last_valid:
+                group.status = TransferStatus.FAILED
+                group.error = f"유효 라운드({group.last_valid}) 만료"
+            elif self.confirm_rounds is not None and \
+                    self._round - group.submitted_round > self.confirm_rounds:
+                # 유효 라운드 전이라 아직 확정될 수 있음 - 실패로 보고 재전송하면 이중 전송
+                group.status = TransferStatus.UNKNOWN
+                group.error = (f"{self.confirm_rounds} 라운드 안에 확인되지 않음 "
+                               f"(라운드 {group.last_valid}까지 확정 가능, 재전송 금지 - TX ID로 재확인)")
+            else:
+                continue
+
+            del in_flight[key]
+            finished.append(group)
+
+    def _wait_next_round(self):
+        status = self.client.status_after_block(self._round)
+        self._round = status['last-round']
+        self.params_window.observe_round(self._round)
+
+    def _summarize(self, transfers: List[Dict], groups: List[TransferGroup],
+                   rounds_waited: int, elapsed: float) -> Dict:
+        failed_transfers = []
+        unconfirmed_transfers = []
+        success_count = 0
+
+        for group in groups:
+            for index, item in enumerate(group.items):
+                if group.status == TransferStatus.CONFIRMED:
+                    success_count += 1
+                    continue
+                entry = {
+                    'index': item['position'],
+                    'recipient': item['recipient'],
+                    'amount': item['amount'],
+                    'tx_id': group.tx_ids[index] if index < len(group.tx_ids) else None,
+                    'error': group.error
+                }
+                if group.status == TransferStatus.UNKNOWN:
+                    entry['last_valid'] = group.last_valid
+                    unconfirmed_transfers.append(entry)
+                else:
+                    failed_transfers.append(entry)
+
+        return {
+            'total_transfers': len(transfers),
+            'success_count': success_count,
+            'failed_count': len(failed_transfers),
+            'failed_transfers': sorted(failed_transfers, key=lambda t: t['index']),
+            # 재전송 대상 아님 - last_valid 이후 TX ID로 확정 여부 확인
+            'unconfirmed_count': len(unconfirmed_transfers),
+            'unconfirmed_transfers': sorted(unconfirmed_transfers, key=lambda t: t['index']),
+            'groups': [
+                {
+                    'group_id': group.group_id,
+                    'tx_ids': group.tx_ids,
+                    'status': group.status,
+                    'confirmed_round': group.confirmed_round
+                }
+                for group in sorted(groups, key=lambda g: g.items[0]['position'])
+            ],
+            'group_count': len(groups),
+            'params_fetches': self.params_window.fetches,
+            'rounds_waited': rounds_waited,
+            'elapsed_seconds': round(elapsed, 3)
+        }
@@ -7,6 +7,7 @@ Algorand 블록체인에 검증 데이터 저장 및 위조 방지
 import logging
 import json
 import hashlib
+import os
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from algosdk import account, encoding
@@ -20,7 +21,17 @@ from algosdk.transaction import (
     PaymentTxn
 )
 
+from ..utils.cached_algod import CachedAlgodClient
+from ..utils.tx_submitter import RateLimitedSubmitter
 from .committee_verification_workflow import VerificationResult
+from .merkle_anchoring import (
+    ANCHOR_NOTE_TYPE,
+    ANCHOR_NOTE_VERSION,
+    MERKLE_PROOF_DB,
+    MerkleProofStore,
+    MerkleTree,
+    verify_inclusion
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,16 +40,35 @@ class BlockchainVerificationService:
     """블록체인 검증 기록 서비스"""
 
     def __init__(self, algod_endpoint: str = "https://testnet-api.algonode.cloud",
-                 creator_private_key: Optional[str] = None):
+                 creator_private_key: Optional[str] = None, client=None,
+                 proof_store: Optional[MerkleProofStore] = None,
+                 submitter: Optional[RateLimitedSubmitter] = None):
         """
         Args:
             algod_endpoint: Algorand 노드 엔드포인트
             creator_private_key: 스마트 계약 생성자 private key
+            client: 사용할 algod 클라이언트 (없으면 algod_endpoint로 생성)
+            proof_store: Merkle 포함 증명 저장소 (없으면 처음 사용할 때 MERKLE_PROOF_DB로 생성)
+            submitter: 일괄 저장용 속도 제한 제출기 (없으면 처음 사용할 때 기본 설정으로 생성)
         """
         self.algod_token = ""
         self.algod_address = algod_endpoint
-        self.client = algod.AlgodClient(self.algod_token, self.algod_address)
+        self.client = CachedAlgodClient(client or algod.AlgodClient(self.algod_token, self.algod_address))
         self.creator_private_key = creator_private_key
+        self._proof_store = proof_store
+        self._submitter = submitter
+
+    @property
+    def submitter(self) -> RateLimitedSubmitter:
+        if self._submitter is None:
+            self._submitter = RateLimitedSubmitter(self.client)
+        return self._submitter
+
+    @property
+    def proof_store(self) -> MerkleProofStore:
+        if self._proof_store is None:
+            self._proof_store = MerkleProofStore(MERKLE_PROOF_DB)
+        return self._proof_store
 
     def store_verification_on_chain(self, verification_result: VerificationResult,
                                    verifier_private_key: str) -> Dict:
@@ -58,23 +88,8 @@ class BlockchainVerificationService:
             }
         """
         try:
-            # 검증 데이터 해시 생성
-            verification_hash = self._generate_verification_hash(verification_result)
-
-            # 검증 데이터를 JSON으로 직렬화
-            verification_data = {
-                'result_id': verification_result.result_id,
-                'measurement_id': verification_result.measurement_id,
-                'approved': verification_result.approved,
-                'carbon_verified': verification_result.carbon_savings_verified,
-                'dc_verified': verification_result.dc_units_verified,
-                'verified_by': verification_result.verified_by,
-                'verified_at': verification_result.verified_at,
-                'verification_hash': verification_hash
-            }
-
-            # Note 필드에 JSON 데이터 저장 (최대 1KB)
-            note_json = json.dumps(verification_data)
+            # 검증 데이터 해시 생성 + Note용 JSON 직렬화
+            verification_hash, note_json = self._build_verification_note(verification_result)
 
             # 트랜잭션 파라미터
             params = self.client.suggested_params()
@@ -121,6 +136,26 @@ class BlockchainVerificationService:
                 'error': str(e)
             }
 
+    def _build_verification_note(self, verification_result: VerificationResult) -> Tuple[str, str]:
+        """
+        검증 결과 Note 데이터
+
+        Returns:
+            (검증 해시, Note JSON 문자열 - 최대 1KB)
+        """
+        verification_hash = self._generate_verification_hash(verification_result)
+        verification_data = {
+            'result_id': verification_result.result_id,
+            'measurement_id': verification_result.measurement_id,
+            'approved': verification_result.approved,
+            'carbon_verified': verification_result.carbon_savings_verified,
+            'dc_verified': verification_result.dc_units_verified,
+            'verified_by': verification_result.verified_by,
+            'verified_at': verification_result.verified_at,
+            'verification_hash': verification_hash
+        }
+        return verification_hash, json.dumps(verification_data)
+
     def retrieve_verification_from_chain(self, tx_id: str) -> Optional[Dict]:
         """
         블록체인에서 검증 기록 조회
@@ -295,29 +330,164 @@ class BlockchainVerificationService:
             }
 
     def batch_store_verifications(self, verification_results: List[VerificationResult],
-                                 verifier_private_key: str) -> List[Dict]:
+                                 verifier_private_key: str, mode: str = "individual") -> List[Dict]:
         """
         여러 검증 결과 일괄 저장
 
         Args:
             verification_results: 검증 결과 목록
             verifier_private_key: 검증자 private key
+            mode: "individual" (검증 결과마다 트랜잭션) 또는
+                  "merkle" (Merkle 루트 하나만 기록, anchor_verifications_merkle 참고)
 
         Returns:
             저장 결과 목록
         """
-        results = []
+        if mode == "merkle":
+            return self.anchor_verifications_merkle(verification_results, verifier_private_key)['results']
+        if mode != "individual":
+            raise ValueError(f"지원하지 않는 저장 방식입니다: {mode}")
+
+        verifier_address = account.address_from_private_key(verifier_private_key)
 
-        for verification in verification_results:
-            result = self.store_verification_on_chain(verification, verifier_private_key)
-            results.append(result)
+        def note_payment(note: str):
+            return lambda params: PaymentTxn(sender=verifier_address, sp=params,
+                                             receiver=verifier_address, amt=0, note=note.encode())
 
-            # Rate limiting (초당 최대 2 TPS)
-            import time
-            time.sleep(0.5)
+        # 토큰 버킷 속도 제한으로 여러 건을 동시에 서명/전송/확인
+        hashes, jobs = [], []
+        for index, verification in enumerate(verification_results):
+            verification_hash, note_json = self._build_verification_note(verification)
+            hashes.append(verification_hash)
+            jobs.append({'key': index, 'build': note_payment(note_json),
+                         'private_key': verifier_private_key})
+
+        results = []
+        for verification, verification_hash, submitted in zip(
+                verification_results, hashes, self.submitter.submit_all(jobs)):
+            if not submitted['success']:
+                logger.error(f"Failed to store verification on-chain: {submitted['error']}")
+                results.append({'success': False, 'error': submitted['error']})
+                continue
+
+            tx_id = submitted['tx_id']
+            verification.blockchain_tx_id = tx_id
+            results.append({
+                'success': True,
+                'tx_id': tx_id,
+                'block': submitted['confirmed_round'],
+                'verification_hash': verification_hash,
+                'explorer_url': f"https://testnet.algoexplorer.io/tx/{tx_id}"
+            })
 
         return results
 
+    def anchor_verifications_merkle(self, verification_results: List[VerificationResult],
+                                    verifier_private_key: str) -> Dict:
+        """
+        검증 결과 배치를 Merkle 루트 하나로 블록체인에 앵커링
+
+        검증 해시들로 Merkle 트리를 만들어 루트와 배치 정보만 트랜잭션 하나의 Note에 기록하고,
+        기록별 포함 증명은 로컬 저장소에 보관합니다 (검증 N건 = 트랜잭션 1건).
+
+        Args:
+            verification_results: 검증 결과 목록
+            verifier_private_key: 검증자 private key
+
+        Returns:
+            {
+                'success': bool,
+                'batch_id': str,
+                'merkle_root': str,
+                'leaf_count': int,
+                'tx_id': str,
+                'block': int,
+                'results': [기록별 저장 결과, ...]
+            }
+        """
+        if not verification_results:
+            return {'success': True, 'leaf_count': 0, 'results': []}
+
+        hashes = [self._generate_verification_hash(v) for v in verification_results]
+        tree = MerkleTree(hashes)
+        anchored_at = datetime.now().isoformat()
+        batch_id = f"MAB-{datetime.now().strftime('%Y%m%d%H%M%S')}-{tree.root[:8]}"
+
+        try:
+            verifier_address = account.address_from_private_key(verifier_private_key)
+            anchor_note = {
+                'type': ANCHOR_NOTE_TYPE,
+                'version': ANCHOR_NOTE_VERSION,
+                'batch_id': batch_id,
+                'merkle_root': tree.root,
+                'leaf_count': len(tree),
+                'hash_algorithm': 'sha256',
+                'anchored_at': anchored_at,
+                'anchored_by': verifier_address
+            }
+
+            txn = PaymentTxn(
+                sender=verifier_address,
+                sp=self.client.suggested_params(),
+                receiver=verifier_address,
+                amt=0,
+                note=json.dumps(anchor_note).encode()
+            )
+            tx_id = self.client.send_transaction(txn.sign(verifier_private_key))
+            confirmed_txn = wait_for_confirmation(self.client, tx_id, 4)
+
+            inclusions = [{
+                'result_id': verification.result_id,
+                'leaf_index': index,
+                'verification_hash': verification_hash,
+                'proof': tree.proof(index)
+            } for index, (verification, verification_hash) in enumerate(zip(verification_results, hashes))]
+
+            self.proof_store.save_batch({
+                'batch_id': batch_id,
+                'merkle_root': tree.root,
+                'leaf_count': len(tree),
+                'tx_id': tx_id,
+                'confirmed_round': confirmed_txn['confirmed-round'],
+                'anchored_at': anchored_at
+            }, inclusions)
+
+        except Exception as e:
+            logger.error(f"Failed to anchor verification batch on-chain: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'leaf_count': len(tree),
+                'results': [{'success': False, 'error': str(e)} for _ in verification_results]
+            }
+
+        logger.info(f"Verification batch anchored on-chain: {tx_id}, "
+                    f"Batch ID: {batch_id}, Records: {len(tree)}")
+
+        results = []
+        for verification, inclusion in zip(verification_results, inclusions):
+            verification.blockchain_tx_id = tx_id
+            results.append({
+                'success': True,
+                'tx_id': tx_id,
+                'block': confirmed_txn['confirmed-round'],
+                'verification_hash': inclusion['verification_hash'],
+                'batch_id': batch_id,
+                'merkle_root': tree.root,
+                'leaf_index': inclusion['leaf_index'],
+                'explorer_url': f"https://testnet.algoexplorer.io/tx/{tx_id}"
+            })
+
+        return {
+            'success': True,
+            'batch_id': batch_id,
+            'merkle_root': tree.root,
+            'leaf_count': len(tree),
+            'tx_id': tx_id,
+            'block': confirmed_txn['confirmed-round'],
+            'results': results
+        }
+
     def generate_proof_of_verification(self, verification_result: VerificationResult) -> Dict:
         """
         검증 증명서 생성 (블록체인 기반)
@@ -356,19 +526,44 @@ class BlockchainVerificationService:
             'verifier_comments': verification_result.verifier_comments
         }
 
+        # Merkle 앵커링된 결과는 포함 증명 첨부 (신뢰할 수 있는 루트가 있으면 오프라인 검증 가능)
+        inclusion = self._find_inclusion(verification_result.result_id)
+        if inclusion and inclusion['verification_hash'] == verification_hash:
+            proof['proof_version'] = '1.1'
+            proof['blockchain_record']['merkle_inclusion'] = {
+                'batch_id': inclusion['batch_id'],
+                'merkle_root': inclusion['merkle_root'],
+                'leaf_index': inclusion['leaf_index'],
+                'leaf_count': inclusion['leaf_count'],
+                'proof': inclusion['proof'],
+                'anchor_tx_id': inclusion['tx_id'],
+                'anchored_round': inclusion['confirmed_round']
+            }
+
         return proof
 
-    def verify_proof_authenticity(self, proof: Dict) -> Tuple[bool, str]:
+    def verify_proof_authenticity(self, proof: Dict, check_anchor: bool = True,
+                                  trusted_root: Optional[str] = None) -> Tuple[bool, str]:
         """
         증명서 진위 확인
 
+        Merkle 포함 증명이 있는 증명서는 증명서 내용으로 검증 해시를 재계산하고 포함 증명으로
+        루트를 재계산한 뒤, 그 루트와 잎 개수가 블록체인 앵커 기록과 같은지 확인합니다.
+        증명서에 적힌 루트만으로는 위조를 막을 수 없으므로(자기 잎 해시를 루트로 쓰면 항상
+        통과), 앵커를 확인하지 않는 경우에는 호출자가 신뢰하는 루트가 있어야 진짜로 판정합니다.
+
         Args:
             proof: 증명서 데이터
+            check_anchor: Merkle 증명서를 블록체인의 앵커 기록과 대조할지 여부
+            trusted_root: 호출자가 별도로 확인한 Merkle 루트 (앵커 없이 오프라인 검증할 때)
 
         Returns:
             (진위 여부, 메시지)
         """
         try:
+            if proof['blockchain_record'].get('merkle_inclusion'):
+                return self._verify_merkle_proof(proof, check_anchor, trusted_root)
+
             # 블록체인에서 데이터 조회
             tx_id = proof['blockchain_record']['tx_id']
             if not tx_id:
@@ -395,6 +590,59 @@ class BlockchainVerificationService:
         except Exception as e:
             return False, f"검증 실패: {e}"
 
+    def _find_inclusion(self, result_id: str) -> Optional[Dict]:
+        """저장된 포함 증명 조회 (앵커링한 적이 없으면 저장소를 만들지 않음)"""
+        if self._proof_store is None and not os.path.exists(MERKLE_PROOF_DB):
+            return None
+        return self.proof_store.get_inclusion(result_id)
+
+    def _verify_merkle_proof(self, proof: Dict, check_anchor: bool,
+                             trusted_root: Optional[str]) -> Tuple[bool, str]:
+        """Merkle 포함 증명서 검증"""
+        record = proof['blockchain_record']
+        inclusion = record['merkle_inclusion']
+        summary = proof['verification_summary']
+        details = proof['verification_details']
+
+        # 증명서 내용이 검증 해시와 일치하는지 확인
+        data_for_hash = {
+            'result_id': summary['result_id'],
+            'measurement_id': summary['measurement_id'],
+            'approved': summary['approved'],
+            'carbon_verified': summary['carbon_savings_verified'],
+            'dc_verified': summary['dc_units_verified'],
+            'verified_by': details['verified_by'],
+            'verified_at': details['verified_at']
+        }
+        calculated_hash = hashlib.sha256(json.dumps(data_for_hash, sort_keys=True).encode()).hexdigest()
+        if calculated_hash != record['verification_hash']:
+            return False, "증명서 내용이 검증 해시와 일치하지 않습니다"
+
+        if not verify_inclusion(calculated_hash, inclusion['proof'], inclusion['merkle_root']):
+            return False, "Merkle 포함 증명이 유효하지 않습니다"
+
+        if not 0 <= inclusion['leaf_index'] < inclusion['leaf_count']:
+            return False, "잎 인덱스가 배치 범위를 벗어났습니다"
+
+        if trusted_root is not None and inclusion['merkle_root'] != trusted_root:
+            return False, "신뢰하는 Merkle 루트와 일치하지 않습니다"
+
+        if check_anchor:
+            chain_data = self.retrieve_verification_from_chain(inclusion['anchor_tx_id'])
+            if not chain_data or chain_data.get('type') != ANCHOR_NOTE_TYPE:
+                return False, "블록체인에서 앵커 기록을 찾을 수 없습니다"
+            if chain_data.get('merkle_root') != inclusion['merkle_root']:
+                return False, "블록체인의 Merkle 루트와 일치하지 않습니다"
+            if chain_data.get('leaf_count') != inclusion['leaf_count']:
+                return False, "블록체인의 앵커 잎 개수와 일치하지 않습니다"
+            return True, "증명서가 진짜이며 변조되지 않았습니다 (Merkle 포함 증명)"
+
+        if trusted_root is None:
+            # 증명서가 스스로 제시한 루트만으로는 진위를 판정하지 않음
+            return False, "포함 증명은 유효하나 블록체인 앵커를 확인하지 않았습니다"
+
+        return True, "신뢰하는 Merkle 루트에 포함된 증명서입니다 (블록체인 앵커 미확인)"
+
     def get_verification_audit_trail(self, measurement_id: str) -> List[Dict]:
         """
         측정 데이터의 전체 감사 추적 조회
@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+"""
+탄소 발자국 배치 계산
+CarbonCalculationEngine.calculate_carbon_footprint_batch / get_carbon_statistics가 사용
+
+- 활동을 열(column) 단위로 받아 운송/생산/포장/기준 배출량, 절약량, 토큰 보상,
+  ESG-GOLD 변환을 NumPy 배열 연산으로 한 번에 계산
+- 문자열 열(지역, 제품명, 농법, 운송 수단, 포장재)은 고유값으로 인코딩한 뒤
+  지역은 거리 행렬 인덱스로, 제품명은 분류기로 고유값마다 한 번만 변환
+- 결과는 배열로 보관하고, CarbonCalculationResult는 요청한 행만 만듦
+- 계산 순서는 단건 계산과 같아 반올림 전 값이 비트 단위로 일치
+"""
+
+import time
+from itertools import repeat
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .carbon_calculation_engine import (
+    ActivityType,
+    BASELINE_SCENARIO,
+    CarbonActivity,
+    CarbonCalculationResult,
+    ESG_GOLD_ACTIVITY_MULTIPLIERS,
+    MAX_DAILY_REWARD,
+    MIN_SAVINGS_FOR_REWARD,
+    PACKAGING_WEIGHT_RATIO,
+    TOKEN_REWARD_MULTIPLIERS
+)
+
+BATCH_COLUMNS = (
+    'activity_type', 'product_name', 'quantity', 'origin_region',
+    'destination_region', 'farming_method', 'transport_method', 'packaging_type'
+)
+
+
+def _factorize(values: Iterable) -> Tuple[np.ndarray, List]:
+    """값 목록을 (코드 배열, 고유값 목록)으로 인코딩 (처음 나온 순서 유지)"""
+    if not hasattr(values, '__len__'):
+        values = list(values)
+    index: Dict = {value: code for code, value in enumerate(dict.fromkeys(values))}
+    codes = np.fromiter(map(index.__getitem__, values), dtype=np.int64, count=len(values))
+    return codes, list(index)
+
+
+def _round(values: np.ndarray, digits: int) -> np.ndarray:
+    """
+    파이썬 round와 같은 반올림
+
+    np.round는 .5 경계 근처 값에서 결과가 다를 수 있으므로, 경계 근처 값만 파이썬 round로 다시 계산
+    """
+    rounded = np.round(values, digits)
+    scaled = values * 10 ** digits
+    near_tie = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    if len(near_tie):
+        rounded[near_tie] = list(map(round, values[near_tie].tolist(), repeat(digits, len(near_tie))))
+    return rounded
+
+
+class CarbonActivityBatch:
+    """
+    열 단위 활동 묶음
+
+    문자열 열은 생성 시점에 코드 배열 + 고유값 목록으로 인코딩됩니다.
+    user_id 등 계산에 쓰지 않는 열은 보관만 합니다.
+    """
+
+    def __init__(self, activity_type: Sequence, product_name: Sequence, quantity: Sequence,
+                 origin_region: Sequence, destination_region: Sequence, farming_method: Sequence,
+                 transport_method: Sequence, packaging_type: Sequence,
+                 user_id: Optional[Sequence] = None):
+        self.quantity = np.asarray(quantity, dtype=np.float64)
+        size = len(self.quantity)
+
+        self.activity_type, types = _factorize(activity_type)
+        # 문자열 값도 허용 (잘못된 값은 ValueError)
+        self.activity_types = [t if isinstance(t, ActivityType) else ActivityType(t) for t in types]
+        self.product_name, self.products = _factorize(product_name)
+        self.origin_region, self.origins = _factorize(origin_region)
+        self.destination_region, self.destinations = _factorize(destination_region)
+        self.farming_method, self.farming_methods = _factorize(farming_method)
+        self.transport_method, self.transport_methods = _factorize(transport_method)
+        self.packaging_type, self.packaging_types = _factorize(packaging_type)
+        self.user_id = list(user_id) if user_id is not None else None
+
+        for name in BATCH_COLUMNS[:2] + BATCH_COLUMNS[3:]:
+            if len(getattr(self, name)) != size:
+                raise ValueError(f"Column '{name}' has {len(getattr(self, name))} rows, expected {size}")
+
+    @classmethod
+    def from_activities(cls, activities: Sequence[CarbonActivity]) -> 'CarbonActivityBatch':
+        """CarbonActivity 목록을 열 단위로 변환"""
+        return cls(
+            activity_type=[a.activity_type for a in activities],
+            product_name=[a.product_name for a in activities],
+            quantity=[a.quantity for a in activities],
+            origin_region=[a.origin_region for a in activities],
+            destination_region=[a.destination_region for a in activities],
+            farming_method=[a.farming_method for a in activities],
+            transport_method=[a.transport_method for a in activities],
+            packaging_type=[a.packaging_type for a in activities],
+            user_id=[a.user_id for a in activities]
+        )
+
+    @classmethod
+    def from_columns(cls, columns) -> 'CarbonActivityBatch':
+        """열 이름 -> 값 목록 매핑 (dict, DataFrame 등)으로 생성"""
+        missing = [name for name in BATCH_COLUMNS if name not in columns]
+        if missing:
+            raise ValueError(f"Missing activity columns: {missing}")
+        user_id = columns['user_id'] if 'user_id' in columns else None
+        return cls(user_id=user_id, **{name: columns[name] for name in BATCH_COLUMNS})
+
+    def __len__(self) -> int:
+        return len(self.quantity)
+
+
+class CarbonBatchResult:
+    """배치 계산 결과 (반올림 전 배열)"""
+
+    def __init__(self, batch: CarbonActivityBatch, **arrays: np.ndarray):
+        self.batch = batch
+        self.transport_emissions = arrays['transport_emissions']
+        self.production_emissions = arrays['production_emissions']
+        self.packaging_emissions = arrays['packaging_emissions']
+        self.total_emissions = arrays['total_emissions']
+        self.baseline_emissions = arrays['baseline_emissions']
+        self.carbon_savings = arrays['carbon_savings']
+        self.reduction_percentage = arrays['reduction_percentage']
+        self.token_reward_eligible = arrays['token_reward_eligible']
+        self.reward_amount = arrays['reward_amount']
+        self.digital_carbon_units = arrays['digital_carbon_units']
+        self.esg_gold_amount = arrays['esg_gold_amount']
+        self.esg_gold_actual = arrays['esg_gold_actual']
+        self.elapsed = 0.0
+
+    def __len__(self) -> int:
+        return len(self.carbon_savings)
+
+    def result(self, i: int) -> CarbonCalculationResult:
+        """행 하나를 단건 계산과 같은 형식(같은 반올림)으로 변환"""
+        return CarbonCalculationResult(
+            total_emissions=round(float(self.total_emissions[i]), 3),
+            transport_emissions=round(float(self.transport_emissions[i]), 3),
+            production_emissions=round(float(self.production_emissions[i]), 3),
+            packaging_emissions=round(float(self.packaging_emissions[i]), 3),
+            carbon_savings=round(float(self.carbon_savings[i]), 3),
+            baseline_emissions=round(float(self.baseline_emissions[i]), 3),
+            reduction_percentage=round(float(self.reduction_percentage[i]), 2),
+            token_reward_eligible=bool(self.token_reward_eligible[i]),
+            reward_amount=int(self.reward_amount[i]),
+            digital_carbon_units=round(float(self.digital_carbon_units[i]), 3),
+            esg_gold_amount=int(self.esg_gold_amount[i]),
+            esg_gold_actual=round(float(self.esg_gold_actual[i]), 6)
+        )
+
+    def results(self) -> List[CarbonCalculationResult]:
+        return [self.result(i) for i in range(len(self))]
+
+    def statistics(self) -> Dict:
+        """get_carbon_statistics와 같은 형식의 통계"""
+        if len(self) == 0:
+            return {
+                'total_activities': 0,
+                'total_carbon_savings': 0,
+                'average_reduction_percentage': 0,
+                'total_token_rewards': 0,
+                'by_activity_type': {}
+            }
+
+        savings = _round(self.carbon_savings, 3)
+        codes = self.batch.activity_type
+        type_count = len(self.batch.activity_types)
+        counts = np.bincount(codes, minlength=type_count)
+        type_savings = np.bincount(codes, weights=savings, minlength=type_count)
+        type_tokens = np.bincount(codes, weights=self.reward_amount, minlength=type_count)
+
+        by_activity = {}
+        for code, activity_type in enumerate(self.batch.activity_types):
+            entry = by_activity.setdefault(activity_type.value,
+                                           {'count': 0, 'total_savings': 0, 'total_tokens': 0})
+            entry['count'] += int(counts[code])
+            entry['total_savings'] += float(type_savings[code])
+            entry['total_tokens'] += int(type_tokens[code])
+
+        return {
+            'total_activities': len(self),
+            'total_carbon_savings': round(float(savings.sum()), 3),
+            'average_reduction_percentage': round(float(_round(self.reduction_percentage, 2).mean()), 2),
+            'total_token_rewards': int(self.reward_amount.sum()),
+            'by_activity_type': by_activity
+        }
+
+
+def calculate_batch(engine, activities: Union[CarbonActivityBatch, Sequence[CarbonActivity], Dict]) -> CarbonBatchResult:
+    """
+    엔진 설정(배출계수, 거리 매트릭스, ESG-GOLD 설정)으로 배치 계산
+
+    Args:
+        engine: CarbonCalculationEngine
+        activities: CarbonActivityBatch, CarbonActivity 목록, 또는 열 이름 -> 값 목록 매핑
+    """
+    started = time.perf_counter()
+    if isinstance(activities, CarbonActivityBatch):
+        batch = activities
+    elif isinstance(activities, dict) or hasattr(activities, 'columns'):
+        batch = CarbonActivityBatch.from_columns(activities)
+    else:
+        batch = CarbonActivityBatch.from_activities(activities)
+
+    factors = engine.carbon_factors
+    agriculture = factors['agriculture']
+    default_agriculture = agriculture['conventional_vegetables']
+    quantity = batch.quantity
+
+    # 1. 운송 배출량 - 지역 코드 -> 거리 행렬 인덱스로 바꿔 행렬에서 바로 조회
+    distances = engine.region_distances
+    origin_index = distances.region_indices(batch.origins)[batch.origin_region]
+    destination_index = distances.region_indices(batch.destinations)[batch.destination_region]
+    transport_factor = np.array([factors['transport'].get(m, 0.5) for m in batch.transport_methods],
+                                dtype=np.float64)
+    weight_in_tons = quantity / 1000
+    transport = np.maximum(0, distances.distances(origin_index, destination_index) * weight_in_tons *
+                           transport_factor[batch.transport_method])
+
+    # 2. 생산 배출량 - 제품 분류 x 농법 계수표
+    product_categories = engine.product_classifier.categories
+    category_index = {category: i for i, category in enumerate(product_categories)}
+    product_category = np.array([category_index[engine._classify_product(p)] for p in batch.products],
+                                dtype=np.int64)
+    production_table = np.array([
+        [agriculture.get(f"{method}_{category}", default_agriculture) for method in batch.farming_methods]
+        for category in product_categories
+    ], dtype=np.float64).reshape(len(product_categories), len(batch.farming_methods))
+    categories = product_category[batch.product_name]
+    production = quantity * production_table[categories, batch.farming_method]
+
+    # 3. 포장 배출량
+    packaging_ratio = np.array([PACKAGING_WEIGHT_RATIO.get(t, 0.10) for t in batch.packaging_types],
+                               dtype=np.float64)
+    packaging_factor = np.array([factors['packaging'].get(t, 1.0) for t in batch.packaging_types],
+                                dtype=np.float64)
+    packaging = quantity * packaging_ratio[batch.packaging_type] * packaging_factor[batch.packaging_type]
+
+    total = transport + production + packaging
+
+    # 4. 기준 배출량 (기준 산지 -> 도착지, 일반농법, 기준 운송/포장)
+    baseline_origin = distances.region_index(BASELINE_SCENARIO['origin_region'])
+    baseline_transport = np.maximum(0, distances.matrix[baseline_origin, destination_index] * weight_in_tons *
+                                    factors['transport'].get(BASELINE_SCENARIO['transport_method'], 0.5))
+    baseline_production_factor = np.array([
+        agriculture.get(f"{BASELINE_SCENARIO['farming_method']}_{category}", default_agriculture)
+        for category in product_categories
+    ], dtype=np.float64)
+    baseline_production = quantity * baseline_production_factor[categories]
+    baseline_packaging_type = BASELINE_SCENARIO['packaging_type']
+    baseline_packaging = (quantity * PACKAGING_WEIGHT_RATIO.get(baseline_packaging_type, 0.10) *
+                          factors['packaging'].get(baseline_packaging_type, 1.0))
+    baseline = baseline_transport + baseline_production + baseline_packaging
+
+    # 5. 탄소 절약량
+    savings = np.maximum(0, baseline - total)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reduction = np.where(baseline > 0, savings / baseline * 100, 0.0)
+
+    # 6. PAM 토큰 보상
+    reward_multiplier = np.array([TOKEN_REWARD_MULTIPLIERS.get(t, 10) for t in batch.activity_types],
+                                 dtype=np.float64)[batch.activity_type]
+    eligible = savings >= MIN_SAVINGS_FOR_REWARD
+    reward = np.where(eligible, np.minimum(np.trunc(savings * reward_multiplier), MAX_DAILY_REWARD), 0)
+
+    # 7. ESG-GOLD 변환
+    config = engine.esg_gold_config
+    esg_multiplier = np.array([ESG_GOLD_ACTIVITY_MULTIPLIERS.get(t, 1.0) for t in batch.activity_types],
+                              dtype=np.float64)[batch.activity_type]
+    mintable = savings >= config['min_dc_for_mint']
+    dc_units = np.where(mintable, savings * config['dc_per_kg_co2'] * esg_multiplier, 0.0)
+    esg_gold_micro = np.trunc(dc_units * config['micro_units_per_dc']).astype(np.int64)
+
+    result = CarbonBatchResult(
+        batch,
+        transport_emissions=transport,
+        production_emissions=production,
+        packaging_emissions=packaging,
+        total_emissions=total,
+        baseline_emissions=baseline,
+        carbon_savings=savings,
+        reduction_percentage=reduction,
+        token_reward_eligible=eligible,
+        reward_amount=reward.astype(np.int64),
+        digital_carbon_units=dc_units,
+        esg_gold_amount=esg_gold_micro,
+        esg_gold_actual=esg_gold_micro / config['micro_units_per_dc']
+    )
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def synthetic_columns(size: int, seed: int = 42) -> Dict[str, np.ndarray]:
+    """벤치마크용 임의 활동 열 생성"""
+    rng = np.random.default_rng(seed)
+    regions = np.array(['경기도', '서울시', '인천시', '부산시', '대구시', '대전시', '광주시',
+                        '울산시', '전라남도', '경상북도', '충청남도', '강원도', '제주도'], dtype=object)
+    products = np.array(['유기농 상추', '배추', '감자', '토마토', '사과', '딸기', '귤', '쌀',
+                         '콩', '옥수수', '표고버섯'], dtype=object)
+    return {
+        'activity_type': rng.choice(np.array([t.value for t in ActivityType], dtype=object), size),
+        'product_name': rng.choice(products, size),
+        'quantity': np.round(rng.uniform(0.5, 50.0, size), 2),
+        'origin_region': rng.choice(regions, size),
+        'destination_region': rng.choice(regions, size),
+        'farming_method': rng.choice(np.array(['organic', 'conventional'], dtype=object), size),
+        'transport_method': rng.choice(np.array(['truck_small', 'truck_medium', 'truck_large', 'rail'],
+                                                dtype=object), size),
+        'packaging_type': rng.choice(np.array(['plastic', 'paper', 'biodegradable', 'reusable'],
+                                              dtype=object), size)
+    }
+
+
+def run_benchmark(engine, size: int = 1_000_000, scalar_sample: int = 20_000) -> Dict:
+    """
+    배치 계산과 단건 반복 계산 처리량 비교
+
+    단건 계산은 scalar_sample건만 실행해 처리량을 구합니다.
+    """
+    columns = synthetic_columns(size)
+
+    started = time.perf_counter()
+    batch = CarbonActivityBatch.from_columns(columns)
+    encoded = time.perf_counter() - started
+    result = calculate_batch(engine, batch)
+    statistics = result.statistics()
+    batch_seconds = time.perf_counter() - started
+
+    sample = min(scalar_sample, size)
+    activities = [
+        CarbonActivity(activity_type=ActivityType(columns['activity_type'][i]), user_id='bench',
+                       product_name=columns['product_name'][i], quantity=float(columns['quantity'][i]),
+                       origin_region=columns['origin_region'][i],
+                       destination_region=columns['destination_region'][i],
+                       farming_method=columns['farming_method'][i],
+                       transport_method=columns['transport_method'][i],
+                       packaging_type=columns['packaging_type'][i], activity_date='2024-01-01')
+        for i in range(sample)
+    ]
+    started = time.perf_counter()
+    for activity in activities:
+        engine.calculate_carbon_footprint(activity)
+    scalar_seconds = time.perf_counter() - started
+
+    return {
+        'activities': size,
+        'batch_seconds': round(batch_seconds, 3),
+        'encode_seconds': round(encoded, 3),
+        'batch_per_second': round(size / batch_seconds),
+        'scalar_per_second': round(sample / scalar_seconds),
+        'speedup': round((size / batch_seconds) / (sample / scalar_seconds), 1),
+        'total_carbon_savings': statistics['total_carbon_savings']
+    }
+
+
+# 벤치마크: python -m app.service.carbon_batch [활동 수]
+if __name__ == "__main__":
+    import sys
+    from .carbon_calculation_engine import CarbonCalculationEngine
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    report = run_benchmark(CarbonCalculationEngine(), size=size)
+
+    print("=== 탄소 발자국 배치 계산 벤치마크 ===")
+    print(f"활동 수: {report['activities']:,}건")
+    print(f"배치 계산: {report['batch_seconds']}초 (인코딩 {report['encode_seconds']}초), "
+          f"{report['batch_per_second']:,}건/초")
+    print(f"단건 반복: {report['scalar_per_second']:,}건/초")
+    print(f"속도 향상: {report['speedup']}배")
+    print(f"총 탄소 절약량: {report['total_carbon_savings']:,} kg CO2")
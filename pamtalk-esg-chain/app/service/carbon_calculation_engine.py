@@ -10,6 +10,8 @@ from dataclasses import dataclass
 from enum import Enum
 import json
 
+from .carbon_lookup import ProductClassifier, RegionDistanceMatrix
+
 # ESG-GOLD 변환 상수
 ESG_GOLD_CONVERSION = {
     'dc_per_kg_co2': 1.0,  # 1 DC = 1 kg CO2 감축
@@ -80,6 +82,35 @@ DISTANCE_MATRIX = {
 }
 
 
+# 제품 분류 키워드 (앞의 분류가 우선)
+PRODUCT_KEYWORDS = {
+    'vegetables': ['상추', '배추', '무', '당근', '양파', '감자', '토마토', '오이', '브로콜리'],
+    'fruits': ['사과', '배', '딸기', '포도', '복숭아', '감', '귤', '바나나'],
+    'grains': ['쌀', '보리', '밀', '콩', '옥수수']
+}
+DEFAULT_PRODUCT_CATEGORY = 'vegetables'
+
+# 기준 시나리오: 장거리 운송 + 일반농법 + 플라스틱 포장
+BASELINE_SCENARIO = {
+    'origin_region': '경상북도',  # 가정: 원거리 산지
+    'farming_method': 'conventional',
+    'transport_method': 'truck_medium',
+    'packaging_type': 'plastic'
+}
+
+# 포장재 무게 추정 (제품 무게의 5-15%)
+PACKAGING_WEIGHT_RATIO = {
+    'plastic': 0.15,
+    'paper': 0.10,
+    'biodegradable': 0.12,
+    'reusable': 0.05
+}
+
+# 토큰 보상 기준
+MIN_SAVINGS_FOR_REWARD = 0.5  # 최소 절약량 (kg CO2)
+MAX_DAILY_REWARD = 500  # 최대 보상 (일일 500토큰)
+
+
 class ActivityType(Enum):
     """활동 유형"""
     LOCAL_FOOD_PURCHASE = "local_food_purchase"
@@ -90,6 +121,27 @@ class ActivityType(Enum):
     PACKAGING_REDUCTION = "packaging_reduction"
 
 
+# 활동별 PAM 토큰 보상 배율 (1kg CO2당 토큰)
+TOKEN_REWARD_MULTIPLIERS = {
+    ActivityType.LOCAL_FOOD_PURCHASE: 10,
+    ActivityType.ORGANIC_FARMING: 15,
+    ActivityType.RENEWABLE_ENERGY: 20,
+    ActivityType.WASTE_REDUCTION: 12,
+    ActivityType.TRANSPORT_REDUCTION: 8,
+    ActivityType.PACKAGING_REDUCTION: 5
+}
+
+# 활동별 ESG-GOLD 보너스 배율
+ESG_GOLD_ACTIVITY_MULTIPLIERS = {
+    ActivityType.LOCAL_FOOD_PURCHASE: 1.2,  # 지역 먹거리 20% 보너스
+    ActivityType.ORGANIC_FARMING: 1.5,      # 유기농 50% 보너스
+    ActivityType.RENEWABLE_ENERGY: 2.0,     # 재생에너지 100% 보너스
+    ActivityType.WASTE_REDUCTION: 1.8,      # 폐기물 감축 80% 보너스
+    ActivityType.TRANSPORT_REDUCTION: 1.3,  # 운송 감축 30% 보너스
+    ActivityType.PACKAGING_REDUCTION: 1.3   # 포장 감축 30% 보너스
+}
+
+
 @dataclass
 class CarbonActivity:
     """탄소 관련 활동 정보"""
@@ -127,10 +179,17 @@ class CarbonCalculationResult:
 class CarbonCalculationEngine:
     """탄소 발자국 계산 엔진"""
 
-    def __init__(self):
+    def __init__(self, region_coordinates: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Args:
+            region_coordinates: 지역 -> (위도, 경도). 주면 DISTANCE_MATRIX에 없는 조합을
+                좌표 거리로 계산 (예: carbon_lookup.REGION_COORDINATES), 없으면 기본 150km
+        """
         self.carbon_factors = CARBON_FACTORS
         self.distance_matrix = DISTANCE_MATRIX
         self.esg_gold_config = ESG_GOLD_CONVERSION
+        self.region_distances = RegionDistanceMatrix(DISTANCE_MATRIX, coordinates=region_coordinates)
+        self.product_classifier = _default_product_classifier()
 
     def calculate_carbon_footprint(self, activity: CarbonActivity) -> CarbonCalculationResult:
         """종합적인 탄소 발자국 계산"""
@@ -190,6 +249,19 @@ class CarbonCalculationEngine:
             esg_gold_actual=round(esg_gold_actual, 6)
         )
 
+    def calculate_carbon_footprint_batch(self, activities):
+        """
+        여러 활동의 탄소 발자국을 배열 연산으로 한 번에 계산
+
+        Args:
+            activities: CarbonActivity 목록, 열 이름 -> 값 목록 매핑, 또는 CarbonActivityBatch
+
+        Returns:
+            CarbonBatchResult: 행별 배열 (result(i)로 CarbonCalculationResult 변환)
+        """
+        from .carbon_batch import calculate_batch
+        return calculate_batch(self, activities)
+
     def _calculate_transport_emissions(self, origin: str, destination: str,
                                      quantity: float, transport_method: str) -> float:
         """운송 배출량 계산"""
@@ -223,15 +295,7 @@ class CarbonCalculationEngine:
 
     def _calculate_packaging_emissions(self, quantity: float, packaging_type: str) -> float:
         """포장 배출량 계산"""
-        # 포장재 무게 추정 (제품 무게의 5-15%)
-        packaging_ratio = {
-            'plastic': 0.15,
-            'paper': 0.10,
-            'biodegradable': 0.12,
-            'reusable': 0.05
-        }
-
-        packaging_weight = quantity * packaging_ratio.get(packaging_type, 0.10)
+        packaging_weight = quantity * PACKAGING_WEIGHT_RATIO.get(packaging_type, 0.10)
         emission_factor = self.carbon_factors['packaging'].get(packaging_type, 1.0)
 
         return packaging_weight * emission_factor
@@ -244,12 +308,9 @@ class CarbonCalculationEngine:
             user_id=activity.user_id,
             product_name=activity.product_name,
             quantity=activity.quantity,
-            origin_region="경상북도",  # 가정: 원거리 산지
             destination_region=activity.destination_region,
-            farming_method="conventional",
-            transport_method="truck_medium",
-            packaging_type="plastic",
-            activity_date=activity.activity_date
+            activity_date=activity.activity_date,
+            **BASELINE_SCENARIO
         )
 
         # 기준 배출량 계산
@@ -276,28 +337,14 @@ class CarbonCalculationEngine:
     def _calculate_token_reward(self, carbon_savings: float,
                                activity_type: ActivityType) -> Tuple[bool, int]:
         """토큰 보상 계산"""
-        # 최소 절약량 기준 (kg CO2)
-        min_savings_threshold = 0.5
-
-        if carbon_savings < min_savings_threshold:
+        if carbon_savings < MIN_SAVINGS_FOR_REWARD:
             return False, 0
 
-        # 활동별 보상 배율
-        reward_multipliers = {
-            ActivityType.LOCAL_FOOD_PURCHASE: 10,  # 1kg CO2 = 10 토큰
-            ActivityType.ORGANIC_FARMING: 15,      # 1kg CO2 = 15 토큰
-            ActivityType.RENEWABLE_ENERGY: 20,     # 1kg CO2 = 20 토큰
-            ActivityType.WASTE_REDUCTION: 12,      # 1kg CO2 = 12 토큰
-            ActivityType.TRANSPORT_REDUCTION: 8,   # 1kg CO2 = 8 토큰
-            ActivityType.PACKAGING_REDUCTION: 5    # 1kg CO2 = 5 토큰
-        }
-
-        multiplier = reward_multipliers.get(activity_type, 10)
+        multiplier = TOKEN_REWARD_MULTIPLIERS.get(activity_type, 10)
         reward_amount = int(carbon_savings * multiplier)
 
-        # 최대 보상 제한 (일일 500토큰)
-        max_daily_reward = 500
-        reward_amount = min(reward_amount, max_daily_reward)
+        # 최대 보상 제한
+        reward_amount = min(reward_amount, MAX_DAILY_REWARD)
 
         return True, reward_amount
 
@@ -322,16 +369,7 @@ class CarbonCalculationEngine:
         dc_units = carbon_savings * self.esg_gold_config['dc_per_kg_co2']
 
         # 활동 유형별 보상 배율 적용
-        activity_multipliers = {
-            ActivityType.LOCAL_FOOD_PURCHASE: 1.2,  # 지역 먹거리 20% 보너스
-            ActivityType.ORGANIC_FARMING: 1.5,      # 유기농 50% 보너스
-            ActivityType.RENEWABLE_ENERGY: 2.0,     # 재생에너지 100% 보너스
-            ActivityType.WASTE_REDUCTION: 1.8,      # 폐기물 감축 80% 보너스
-            ActivityType.TRANSPORT_REDUCTION: 1.3,  # 운송 감축 30% 보너스
-            ActivityType.PACKAGING_REDUCTION: 1.3   # 포장 감축 30% 보너스
-        }
-
-        multiplier = activity_multipliers.get(activity_type, 1.0)
+        multiplier = ESG_GOLD_ACTIVITY_MULTIPLIERS.get(activity_type, 1.0)
         dc_units_with_bonus = dc_units * multiplier
 
         # ESG-GOLD 토큰 계산 (micro units)
@@ -369,40 +407,12 @@ class CarbonCalculationEngine:
         return total_micro, burned_micro
 
     def _get_distance(self, origin: str, destination: str) -> float:
-        """지역 간 거리 조회"""
-        # 직접 매칭
-        key1 = (origin, destination)
-        key2 = (destination, origin)
-
-        if key1 in self.distance_matrix:
-            return self.distance_matrix[key1]
-        elif key2 in self.distance_matrix:
-            return self.distance_matrix[key2]
-
-        # 매칭되지 않으면 기본값 (평균 거리)
-        return 150.0  # km
+        """지역 간 거리 조회 (미등록 조합은 좌표 거리 또는 기본 150km)"""
+        return self.region_distances.distance(origin, destination)
 
     def _classify_product(self, product_name: str) -> str:
-        """제품 분류"""
-        product_name_lower = product_name.lower()
-
-        # 채소류
-        vegetables = ['상추', '배추', '무', '당근', '양파', '감자', '토마토', '오이', '브로콜리']
-        if any(veg in product_name_lower for veg in vegetables):
-            return 'vegetables'
-
-        # 과일류
-        fruits = ['사과', '배', '딸기', '포도', '복숭아', '감', '귤', '바나나']
-        if any(fruit in product_name_lower for fruit in fruits):
-            return 'fruits'
-
-        # 곡물류
-        grains = ['쌀', '보리', '밀', '콩', '옥수수']
-        if any(grain in product_name_lower for grain in grains):
-            return 'grains'
-
-        # 기본값
-        return 'vegetables'
+        """제품 분류 (채소류 > 과일류 > 곡물류 순으로 키워드 매칭, 없으면 채소류)"""
+        return self.product_classifier.classify(product_name)
 
     def get_carbon_statistics(self, activities: List[CarbonActivity]) -> Dict:
         """탄소 통계 계산"""
@@ -415,34 +425,18 @@ class CarbonCalculationEngine:
                 'by_activity_type': {}
             }
 
-        results = [self.calculate_carbon_footprint(activity) for activity in activities]
-
-        total_savings = sum(result.carbon_savings for result in results)
-        total_tokens = sum(result.reward_amount for result in results)
-        avg_reduction = sum(result.reduction_percentage for result in results) / len(results)
-
-        # 활동별 통계
-        by_activity = {}
-        for activity, result in zip(activities, results):
-            activity_type = activity.activity_type.value
-            if activity_type not in by_activity:
-                by_activity[activity_type] = {
-                    'count': 0,
-                    'total_savings': 0,
-                    'total_tokens': 0
-                }
-
-            by_activity[activity_type]['count'] += 1
-            by_activity[activity_type]['total_savings'] += result.carbon_savings
-            by_activity[activity_type]['total_tokens'] += result.reward_amount
-
-        return {
-            'total_activities': len(activities),
-            'total_carbon_savings': round(total_savings, 3),
-            'average_reduction_percentage': round(avg_reduction, 2),
-            'total_token_rewards': total_tokens,
-            'by_activity_type': by_activity
-        }
+        return self.calculate_carbon_footprint_batch(activities).statistics()
+
+
+_product_classifier: Optional[ProductClassifier] = None
+
+
+def _default_product_classifier() -> ProductClassifier:
+    """엔진 인스턴스들이 공유하는 제품 분류기 (제품명 캐시 공유)"""
+    global _product_classifier
+    if _product_classifier is None:
+        _product_classifier = ProductClassifier(PRODUCT_KEYWORDS, default=DEFAULT_PRODUCT_CATEGORY)
+    return _product_classifier
 
 
 # 사용 예시
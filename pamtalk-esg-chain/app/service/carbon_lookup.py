@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+탄소 계산용 사전 계산 조회 테이블
+CarbonCalculationEngine의 단건/배치 계산이 함께 사용
+
+- ProductClassifier: 전체 제품 키워드로 만든 Aho–Corasick 오토마톤, 제품명 한 번 훑기로 분류
+  (분류 결과는 제품명 LRU 캐시에 보관)
+- RegionDistanceMatrix: 지역 -> 정수 인덱스, 대칭 NumPy 거리 행렬
+  (미등록 조합은 좌표가 있으면 대권 거리 x 도로 계수, 없으면 기본 거리)
+"""
+
+import logging
+import math
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 미등록 지역 조합 기본 거리 (평균 거리, km)
+DEFAULT_DISTANCE_KM = 150.0
+
+# 직선 거리 -> 도로 거리 보정 계수
+ROAD_DISTANCE_FACTOR = 1.3
+
+# 시/도 대표 좌표 (위도, 경도) - 좌표 기반 거리 계산을 켤 때 사용
+REGION_COORDINATES = {
+    '서울시': (37.5665, 126.9780),
+    '인천시': (37.4563, 126.7052),
+    '경기도': (37.2636, 127.0286),   # 수원
+    '강원도': (37.8813, 127.7298),   # 춘천
+    '대전시': (36.3504, 127.3845),
+    '충청남도': (36.6588, 126.6728),  # 홍성
+    '충청북도': (36.6424, 127.4890),  # 청주
+    '세종시': (36.4800, 127.2890),
+    '광주시': (35.1595, 126.8526),
+    '전라남도': (34.8161, 126.4629),  # 무안
+    '전라북도': (35.8242, 127.1480),  # 전주
+    '대구시': (35.8714, 128.6014),
+    '경상북도': (36.5760, 128.5056),  # 안동
+    '부산시': (35.1796, 129.0756),
+    '울산시': (35.5384, 129.3114),
+    '경상남도': (35.2383, 128.6925),  # 창원
+    '제주도': (33.4996, 126.5312)
+}
+
+
+class KeywordAutomaton:
+    """
+    Aho–Corasick 다중 키워드 검색 오토마톤
+
+    키워드마다 값을 붙여 두고, 텍스트를 한 번 훑으며 포함된 모든 키워드의 값을 찾습니다.
+    """
+
+    def __init__(self, keywords: Dict[str, object]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[object]] = [[]]
+
+        for keyword, value in keywords.items():
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append(value)
+
+        # 실패 링크 (BFS), 실패 상태의 출력을 합쳐 둠
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> List[object]:
+        """텍스트에 포함된 키워드들의 값 (등장 순서, 중복 포함)"""
+        found = []
+        state = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.extend(output[state])
+        return found
+
+
+class ProductClassifier:
+    """
+    키워드 기반 제품 분류기
+
+    categories의 순서가 우선순위입니다 (여러 분류 키워드가 함께 나오면 앞의 분류).
+    """
+
+    def __init__(self, categories: Dict[str, Sequence[str]], default: str, cache_size: int = 4096):
+        self.categories = list(categories)
+        self.default = default
+        keywords: Dict[str, int] = {}
+        for priority, category in enumerate(self.categories):
+            for keyword in categories[category]:
+                keywords.setdefault(keyword.lower(), priority)
+        self._automaton = KeywordAutomaton(keywords)
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, product_name: str) -> str:
+        matches = self._automaton.find(product_name.lower())
+        return self.categories[min(matches)] if matches else self.default
+
+    def cache_info(self):
+        return self.classify.cache_info()
+
+
+def great_circle_km(origin: Tuple[float, float], destination: Tuple[float, float]) -> float:
+    """두 좌표 사이의 대권 거리 (km, haversine)"""
+    lat1, lon1 = map(math.radians, origin)
+    lat2, lon2 = map(math.radians, destination)
+    a = (math.sin((lat2 - lat1) / 2) ** 2 +
+         math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * 6371.0 * math.asin(math.sqrt(a))
+
+
+class RegionDistanceMatrix:
+    """
+    지역 간 거리 행렬
+
+    등록된 지역마다 정수 인덱스를 부여하고 대칭 (N+1)x(N+1) 행렬에 거리를 채웁니다.
+    마지막 인덱스(UNKNOWN)는 미등록 지역용으로 기본 거리가 들어 있어, 배치 계산은
+    인덱스 배열로 바로 조회할 수 있습니다.
+    """
+
+    def __init__(self, distances: Dict[Tuple[str, str], float],
+                 coordinates: Optional[Dict[str, Tuple[float, float]]] = None,
+                 default: float = DEFAULT_DISTANCE_KM, road_factor: float = ROAD_DISTANCE_FACTOR):
+        """
+        Args:
+            distances: (지역, 지역) -> 거리(km), 한 방향만 있어도 됨
+            coordinates: 지역 -> (위도, 경도), 주면 미등록 조합을 좌표로 계산
+            default: 좌표로도 계산할 수 없는 조합의 거리
+            road_factor: 좌표 직선 거리에 곱할 도로 보정 계수
+        """
+        self.coordinates = dict(coordinates or {})
+        self.default = float(default)
+
+        regions = list(dict.fromkeys(
+            [region for pair in distances for region in pair] + list(self.coordinates)))
+        self.index: Dict[str, int] = {region: i for i, region in enumerate(regions)}
+        self.regions = regions
+        self.unknown = len(regions)
+
+        size = len(regions) + 1
+        matrix = np.full((size, size), np.nan)
+        for (origin, destination), distance in distances.items():
+            i, j = self.index[origin], self.index[destination]
+            matrix[i, j] = matrix[j, i] = float(distance)
+
+        # 미등록 조합: 좌표 기반 계산, 없으면 기본 거리 (같은 지역도 등록되어 있지 않으면 기본 거리)
+        self.estimated_pairs = 0
+        for i, origin in enumerate(regions):
+            for j, destination in enumerate(regions):
+                if not np.isnan(matrix[i, j]):
+                    continue
+                if origin in self.coordinates and destination in self.coordinates:
+                    matrix[i, j] = round(great_circle_km(self.coordinates[origin],
+                                                         self.coordinates[destination]) * road_factor, 1)
+                    self.estimated_pairs += 1
+                else:
+                    matrix[i, j] = self.default
+        matrix[self.unknown, :] = matrix[:, self.unknown] = self.default
+        matrix.setflags(write=False)
+        self.matrix = matrix
+        self.unknown_regions: Dict[str, int] = {}
+
+    def region_index(self, region: str) -> int:
+        """지역 인덱스 (미등록 지역은 UNKNOWN 인덱스, 조회 횟수 기록)"""
+        index = self.index.get(region)
+        if index is None:
+            count = self.unknown_regions.get(region, 0)
+            if count == 0:
+                logger.warning(f"Unknown region '{region}', using {self.default} km")
+            self.unknown_regions[region] = count + 1
+            return self.unknown
+        return index
+
+    def region_indices(self, regions: Iterable[str]) -> np.ndarray:
+        return np.array([self.region_index(region) for region in regions], dtype=np.int64)
+
+    def distance(self, origin: str, destination: str) -> float:
+        return float(self.matrix[self.region_index(origin), self.region_index(destination)])
+
+    def distances(self, origin_indices: np.ndarray, destination_indices: np.ndarray) -> np.ndarray:
+        """인덱스 배열 쌍의 거리 배열"""
+        return self.matrix[origin_indices, destination_indices]
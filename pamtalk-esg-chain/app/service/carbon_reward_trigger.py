@@ -5,8 +5,11 @@
 """
 
 import asyncio
+import json
+import os
 import time
 import logging
+from collections import defaultdict
 from datetime import datetime, date
 from typing import Dict, List, Optional
 from dataclasses import dataclass
@@ -15,7 +18,7 @@ from app.service.carbon_tracking_service import carbon_tracking_service
 from app.service.batch_service import batch_service
 from app.service.enhanced_token_service import enhanced_token_service
 from app.service.smart_contract_service import SmartContractService
-from app.utils.db_pool import db_service
+from app.utils.db_pool import async_db
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -30,6 +33,7 @@ class RewardTriggerConfig:
     batch_processing_interval: int = 300  # 배치 처리 간격 (초)
     auto_verification_threshold: float = 5.0  # 자동 검증 임계값
     manual_review_threshold: float = 50.0  # 수동 검토 필요 임계값
+    max_concurrent_users: int = 8  # 동시에 보상을 처리할 사용자 수
 
 
 class CarbonRewardTrigger:
@@ -41,7 +45,7 @@ class CarbonRewardTrigger:
         self.batch_service = batch_service
         self.token_service = enhanced_token_service
         self.smart_contract_service = SmartContractService()
-        self.db = db_service
+        self.db = async_db
 
         # 처리 상태 추적
         self.processing_active = False
@@ -71,7 +75,7 @@ class CarbonRewardTrigger:
         logger.info("대기 중인 보상 처리 시작")
 
         # 1. 미처리 활동 조회
-        pending_activities = self._get_pending_reward_activities()
+        pending_activities = await self._get_pending_reward_activities()
 
         if not pending_activities:
             logger.info("처리할 보상이 없습니다.")
@@ -80,20 +84,31 @@ class CarbonRewardTrigger:
         logger.info(f"{len(pending_activities)}개의 보상 대기 활동 발견")
 
         # 2. 활동별 보상 처리
-        processed_count = 0
-        failed_count = 0
-
+        # 일일 토큰 제한은 같은 사용자의 이전 보상에 의존하므로 사용자별로는 순서대로,
+        # 사용자 간에는 max_concurrent_users까지 동시에 처리
+        activities_by_user = defaultdict(list)
         for activity in pending_activities:
-            try:
-                success = await self._process_single_activity_reward(activity)
-                if success:
-                    processed_count += 1
-                else:
-                    failed_count += 1
-
-            except Exception as e:
-                logger.error(f"활동 {activity['id']} 보상 처리 실패: {str(e)}")
-                failed_count += 1
+            activities_by_user[activity['user_id']].append(activity)
+
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_users)
+
+        async def process_user(activities: List[Dict]) -> List[bool]:
+            async with semaphore:
+                results = []
+                for activity in activities:
+                    try:
+                        results.append(await self._process_single_activity_reward(activity))
+                    except Exception as e:
+                        logger.error(f"활동 {activity['id']} 보상 처리 실패: {str(e)}")
+                        results.append(False)
+                return results
+
+        user_results = await asyncio.gather(
+            *(process_user(activities) for activities in activities_by_user.values())
+        )
+        outcomes = [success for results in user_results for success in results]
+        processed_count = outcomes.count(True)
+        failed_count = outcomes.count(False)
 
         # 3. 배치 토큰 발행 처리
         await self._process_batch_token_minting()
@@ -111,7 +126,7 @@ class CarbonRewardTrigger:
 
         try:
             # 1. 일일 토큰 제한 확인
-            if not self._check_daily_token_limit(user_id, token_amount):
+            if not await self._check_daily_token_limit(user_id, token_amount):
                 logger.warning(f"사용자 {user_id} 일일 토큰 제한 초과")
                 return False
 
@@ -129,13 +144,12 @@ class CarbonRewardTrigger:
                     user_id, carbon_savings, activity['activity_type']
                 )
 
-            # 4. 보상 기록 생성
-            reward_id = await self._create_reward_record(
-                user_id, activity_id, carbon_savings, token_amount
-            )
-
-            # 5. 활동 검증 완료 처리
-            await self._mark_activity_verified(activity_id, reward_id)
+            # 4. 보상 기록 생성 + 5. 활동 검증 완료 처리 (한 트랜잭션)
+            async with self.db.transaction() as conn:
+                reward_id = await self._create_reward_record(
+                    user_id, activity_id, carbon_savings, token_amount, conn=conn
+                )
+                await self._mark_activity_verified(activity_id, reward_id, conn=conn)
 
             logger.info(f"활동 {activity_id} 보상 처리 완료 (보상 ID: {reward_id})")
             return True
@@ -213,7 +227,7 @@ class CarbonRewardTrigger:
             ORDER BY activity_date DESC
         """
 
-        recent_activities = self.db.pool.execute_query(query, (user_id, activity_type))
+        recent_activities = await self.db.fetch(query, (user_id, activity_type))
 
         if not recent_activities:
             return True  # 첫 활동은 통과
@@ -281,7 +295,7 @@ class CarbonRewardTrigger:
 
         return max(0, score)
 
-    def _check_daily_token_limit(self, user_id: str, token_amount: int) -> bool:
+    async def _check_daily_token_limit(self, user_id: str, token_amount: int) -> bool:
         """일일 토큰 제한 확인"""
 
         query = """
@@ -292,8 +306,7 @@ class CarbonRewardTrigger:
             AND status != 'rejected'
         """
 
-        result = self.db.pool.execute_query(query, (user_id,), fetch='one')
-        daily_tokens = int(result['daily_tokens'])
+        daily_tokens = int(await self.db.fetchval(query, (user_id,)))
 
         return (daily_tokens + token_amount) <= self.config.max_daily_tokens_per_user
 
@@ -324,7 +337,7 @@ class CarbonRewardTrigger:
             # 스마트계약 기록 실패는 전체 프로세스를 중단하지 않음
 
     async def _create_reward_record(self, user_id: str, activity_id: int,
-                                   carbon_savings: float, token_amount: int) -> int:
+                                   carbon_savings: float, token_amount: int, conn=None) -> int:
         """보상 기록 생성"""
 
         query = """
@@ -334,13 +347,11 @@ class CarbonRewardTrigger:
             RETURNING id
         """
 
-        result = self.db.pool.execute_query(
-            query, (user_id, activity_id, carbon_savings, token_amount), fetch='one'
+        return await (conn or self.db).fetchval(
+            query, (user_id, activity_id, carbon_savings, token_amount)
         )
 
-        return result['id']
-
-    async def _mark_activity_verified(self, activity_id: int, reward_id: int):
+    async def _mark_activity_verified(self, activity_id: int, reward_id: int, conn=None):
         """활동 검증 완료 표시"""
 
         query = """
@@ -351,7 +362,7 @@ class CarbonRewardTrigger:
             WHERE id = %s
         """
 
-        self.db.pool.execute_query(query, (activity_id,), fetch=None)
+        await (conn or self.db).execute(query, (activity_id,))
 
     async def _mark_for_manual_review(self, activity_id: int, reason: str):
         """수동 검토 대상으로 표시"""
@@ -368,7 +379,7 @@ class CarbonRewardTrigger:
             'review_requested_at': datetime.now().isoformat()
         })
 
-        self.db.pool.execute_query(query, (metadata, activity_id), fetch=None)
+        await self.db.execute(query, (metadata, activity_id))
 
     async def _process_batch_token_minting(self):
         """배치 토큰 발행 처리"""
@@ -386,7 +397,7 @@ class CarbonRewardTrigger:
             HAVING SUM(token_amount) >= 10  -- 최소 10토큰 이상일 때만 발행
         """
 
-        pending_rewards = self.db.pool.execute_query(query)
+        pending_rewards = await self.db.fetch(query)
 
         if not pending_rewards:
             logger.info("발행할 토큰이 없습니다.")
@@ -429,9 +440,9 @@ class CarbonRewardTrigger:
             AND mint_tx_hash IS NULL
         """
 
-        self.db.pool.execute_query(update_query, (job_id, user_id), fetch=None)
+        await self.db.execute(update_query, (job_id, user_id))
 
-    def _get_pending_reward_activities(self) -> List[Dict]:
+    async def _get_pending_reward_activities(self) -> List[Dict]:
         """대기 중인 보상 활동 조회"""
 
         query = """
@@ -445,9 +456,7 @@ class CarbonRewardTrigger:
             LIMIT 100
         """
 
-        results = self.db.pool.execute_query(
-            query, (self.config.min_carbon_savings,)
-        )
+        results = await self.db.fetch(query, (self.config.min_carbon_savings,))
 
         return [dict(record) for record in results]
 
@@ -4,6 +4,7 @@
 온체인 탄소 검증 및 투명한 보상 시스템 구현
 """
 
+import asyncio
 import json
 import time
 import logging
@@ -12,7 +13,10 @@ from datetime import datetime
 
 from app.service.smart_contract_service import SmartContractService
 from app.service.carbon_tracking_service import carbon_tracking_service
-from app.utils.db_pool import db_service
+from app.utils.cached_algod import CachedAlgodClient
+from app.utils.db_pool import async_db
+from app.utils.tx_submitter import RateLimitedSubmitter
+from app.utils.wallet_utils import get_wallet_keys
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -25,11 +29,14 @@ class CarbonSmartContractBridge:
     def __init__(self):
         self.smart_contract_service = SmartContractService()
         self.carbon_service = carbon_tracking_service
-        self.db = db_service
+        self.db = async_db
+        # 이 프로세스에서 이미 생성을 확인한 테이블 (CREATE TABLE IF NOT EXISTS 반복 방지)
+        self._ensured_tables = set()
 
         # 스마트계약 앱 ID (실제 배포 후 설정)
         self.app_id = None
         self.contract_deployed = False
+        self._submitter = None
 
     async def deploy_carbon_contract(self) -> Dict:
         """탄소 보상 스마트계약 배포"""
@@ -254,21 +261,27 @@ class CarbonSmartContractBridge:
             synced_count = 0
             failed_count = 0
 
+            # 활동별 기록 트랜잭션 준비 (전송은 속도 제한 제출기가 동시에 처리)
+            jobs = []
             for activity in pending_activities:
+                user_wallet = await self._get_user_wallet_info(activity['user_id'])
+                if not user_wallet:
+                    failed_count += 1
+                    logger.warning(f"활동 {activity['id']} 동기화 실패: 사용자 지갑 정보를 찾을 수 없습니다.")
+                    continue
                 try:
-                    result = await self.record_carbon_activity_on_chain(activity['id'])
-                    if result['success']:
-                        synced_count += 1
-                    else:
-                        failed_count += 1
-                        logger.warning(f"활동 {activity['id']} 동기화 실패: {result['message']}")
-
+                    jobs.append(self._build_record_carbon_job(activity, user_wallet))
                 except Exception as e:
                     failed_count += 1
                     logger.error(f"활동 {activity['id']} 동기화 중 오류: {str(e)}")
 
-                # 과부하 방지를 위한 대기
-                await asyncio.sleep(0.5)
+            for result in await self.submitter.run(jobs):
+                if result['success']:
+                    await self._update_activity_on_chain_status(result['key'], result['tx_id'], True)
+                    synced_count += 1
+                else:
+                    failed_count += 1
+                    logger.warning(f"활동 {result['key']} 동기화 실패: {result['error']}")
 
             return {
                 'success': True,
@@ -285,6 +298,26 @@ class CarbonSmartContractBridge:
                 'message': f'동기화 실패: {str(e)}'
             }
 
+    @property
+    def submitter(self) -> RateLimitedSubmitter:
+        """온체인 기록용 속도 제한 제출기 (처음 사용할 때 생성)"""
+        if self._submitter is None:
+            self._submitter = RateLimitedSubmitter(
+                CachedAlgodClient(self.smart_contract_service.algod_client))
+        return self._submitter
+
+    def _build_record_carbon_job(self, activity: Dict, user_wallet: Dict) -> Dict:
+        """탄소 절약량 기록 트랜잭션 작업 (record_carbon_activity_on_chain과 같은 인자)"""
+        sender_address, sender_private_key = get_wallet_keys(user_wallet['mnemonic'])
+        args = [str(int(float(activity['carbon_savings']) * 1000)),  # g 단위로 변환
+                activity['activity_type']]
+        return {
+            'key': activity['id'],
+            'build': lambda params: self.smart_contract_service.build_contract_call_txn(
+                self.app_id, "record_carbon", args, sender_address, params),
+            'private_key': sender_private_key
+        }
+
     async def get_contract_statistics(self) -> Dict:
         """스마트계약 통계 조회"""
         if not self.contract_deployed:
@@ -335,13 +368,12 @@ class CarbonSmartContractBridge:
             )
         """
 
-        self.db.pool.execute_query(create_table_query, fetch=None)
+        await self._ensure_table('smart_contract_deployments', create_table_query)
 
-        self.db.pool.execute_query(
+        await self.db.execute(
             query,
             (deployment_result['app_id'], deployment_result['tx_id'],
-             deployment_result.get('program_hash'), datetime.now()),
-            fetch=None
+             deployment_result.get('program_hash'), datetime.now())
         )
 
     async def _opt_in_user_to_contract(self, wallet_address: str) -> Dict:
@@ -392,18 +424,23 @@ class CarbonSmartContractBridge:
             )
         """
 
-        self.db.pool.execute_query(create_table_query, fetch=None)
+        await self._ensure_table('user_smart_contract_registrations', create_table_query)
 
-        self.db.pool.execute_query(
+        await self.db.execute(
             query,
-            (user_id, wallet_address, role, tx_id, datetime.now()),
-            fetch=None
+            (user_id, wallet_address, role, tx_id, datetime.now())
         )
 
+    async def _ensure_table(self, table_name: str, create_table_query: str):
+        """테이블이 없으면 생성 (프로세스당 한 번)"""
+        if table_name not in self._ensured_tables:
+            await self.db.execute(create_table_query)
+            self._ensured_tables.add(table_name)
+
     async def _get_activity_info(self, activity_id: int) -> Optional[Dict]:
         """활동 정보 조회"""
         query = "SELECT * FROM carbon_activities WHERE id = %s"
-        result = self.db.pool.execute_query(query, (activity_id,), fetch='one')
+        result = await self.db.fetchrow(query, (activity_id,))
         return dict(result) if result else None
 
     async def _get_user_wallet_info(self, user_id: str) -> Optional[Dict]:
@@ -430,7 +467,7 @@ class CarbonSmartContractBridge:
             'on_chain_recorded_at': datetime.now().isoformat()
         })
 
-        self.db.pool.execute_query(query, (metadata, activity_id), fetch=None)
+        await self.db.execute(query, (metadata, activity_id))
 
     async def _get_calculated_rewards_from_contract(self, user_id: str) -> Dict:
         """스마트계약에서 계산된 보상 조회"""
@@ -462,7 +499,7 @@ class CarbonSmartContractBridge:
             LIMIT %s
         """
 
-        results = self.db.pool.execute_query(query, (limit,))
+        results = await self.db.fetch(query, (limit,))
         return [dict(record) for record in results]
 
     async def _get_offchain_carbon_statistics(self) -> Dict:
@@ -476,7 +513,7 @@ class CarbonSmartContractBridge:
             WHERE verified = TRUE
         """
 
-        result = self.db.pool.execute_query(query, fetch='one')
+        result = await self.db.fetchrow(query)
         return dict(result) if result else {}
 
 
@@ -486,8 +523,6 @@ carbon_smart_contract_bridge = CarbonSmartContractBridge()
 
 # 사용 예시
 if __name__ == "__main__":
-    import asyncio
-
     async def test_bridge():
         bridge = carbon_smart_contract_bridge
 
@@ -3,22 +3,24 @@ Charging Station Service
 Manages EV charging stations, usage tracking, and location-based searches
 """
 
-import sqlite3
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional, Tuple
 import json
 import math
 
+from app.utils.sqlite_pool import get_sqlite_pool
+
 
 class ChargingStationService:
     """Service for managing charging stations and usage"""
 
     def __init__(self, db_path: str = "pamtalk_esg.db"):
         self.db_path = db_path
+        self.pool = get_sqlite_pool(db_path)
 
     def _get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get pooled database connection (close() returns it to the pool)"""
+        return self.pool.acquire()
 
     def _dict_factory(self, cursor, row):
         """Convert database rows to dictionaries"""
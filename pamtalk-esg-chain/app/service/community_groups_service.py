@@ -9,7 +9,7 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 import logging
 
-from ..utils.db_pool import get_db_connection
+from ..utils.db_pool import async_db
 
 logger = logging.getLogger(__name__)
 
@@ -40,46 +40,35 @@ class CommunityGroupsService:
             if not await self._can_create_group(creator_user_id):
                 raise ValueError("그룹 생성 한도를 초과했습니다")
 
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            # 그룹 생성
-            cursor.execute("""
-                INSERT INTO community_groups (
+            async with async_db.transaction() as conn:
+                # 그룹 생성
+                group_id = await conn.fetchval("""
+                    INSERT INTO community_groups (
+                        name, description, avatar_url, cover_image_url,
+                        group_type, category, region, is_private, require_approval,
+                        allow_member_posts, created_by
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    RETURNING id
+                """, (
                     name, description, avatar_url, cover_image_url,
                     group_type, category, region, is_private, require_approval,
-                    allow_member_posts, created_by
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """, (
-                name, description, avatar_url, cover_image_url,
-                group_type, category, region, is_private, require_approval,
-                True, creator_user_id
-            ))
-
-            group_id = cursor.fetchone()[0]
-
-            # 생성자를 관리자로 멤버 추가
-            cursor.execute("""
-                INSERT INTO community_group_members (
-                    group_id, user_id, role, status, last_activity_at
-                ) VALUES (%s, %s, 'admin', 'active', %s)
-            """, (group_id, creator_user_id, datetime.now()))
-
-            # 그룹 멤버 수 업데이트
-            cursor.execute("""
-                UPDATE community_groups SET members_count = 1 WHERE id = %s
-            """, (group_id,))
+                    True, creator_user_id
+                ))
 
-            conn.commit()
-
-            # 생성된 그룹 정보 조회
-            group_info = await self.get_group_info(group_id)
+                # 생성자를 관리자로 멤버 추가
+                await conn.execute("""
+                    INSERT INTO community_group_members (
+                        group_id, user_id, role, status, last_activity_at
+                    ) VALUES (%s, %s, 'admin', 'active', %s)
+                """, (group_id, creator_user_id, datetime.now()))
 
-            cursor.close()
-            conn.close()
+                # 그룹 멤버 수 업데이트
+                await conn.execute("""
+                    UPDATE community_groups SET members_count = 1 WHERE id = %s
+                """, (group_id,))
 
-            return group_info
+            # 생성된 그룹 정보 조회
+            return await self.get_group_info(group_id)
 
         except Exception as e:
             logger.error(f"그룹 생성 오류: {e}")
@@ -88,19 +77,11 @@ class CommunityGroupsService:
     async def _can_create_group(self, user_id: str) -> bool:
         """사용자가 그룹을 생성할 수 있는지 확인"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            cursor.execute("""
+            count = await async_db.fetchval("""
                 SELECT COUNT(*) FROM community_groups
                 WHERE created_by = %s AND status = 'active'
             """, (user_id,))
 
-            count = cursor.fetchone()[0]
-
-            cursor.close()
-            conn.close()
-
             return count < self.max_groups_per_user
 
         except Exception as e:
@@ -110,10 +91,7 @@ class CommunityGroupsService:
     async def get_group_info(self, group_id: int) -> Optional[Dict[str, Any]]:
         """그룹 상세 정보 조회"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            cursor.execute("""
+            row = await async_db.fetchrow("""
                 SELECT
                     cg.id, cg.name, cg.description, cg.avatar_url, cg.cover_image_url,
                     cg.group_type, cg.category, cg.region, cg.is_private,
@@ -125,7 +103,6 @@ class CommunityGroupsService:
                 WHERE cg.id = %s
             """, (group_id,))
 
-            row = cursor.fetchone()
             if not row:
                 return None
 
@@ -150,14 +127,11 @@ class CommunityGroupsService:
                 'creator_avatar': row[17]
             }
 
-            # 최근 활동 멤버들 조회
-            group_info['recent_members'] = await self._get_recent_members(group_id)
-
-            # 최근 포스트들 조회
-            group_info['recent_posts'] = await self._get_recent_group_posts(group_id, limit=3)
-
-            cursor.close()
-            conn.close()
+            # 최근 활동 멤버와 최근 포스트를 동시에 조회
+            group_info['recent_members'], group_info['recent_posts'] = await asyncio.gather(
+                self._get_recent_members(group_id),
+                self._get_recent_group_posts(group_id, limit=3)
+            )
 
             return group_info
 
@@ -168,10 +142,7 @@ class CommunityGroupsService:
     async def _get_recent_members(self, group_id: int, limit: int = 10) -> List[Dict[str, Any]]:
         """최근 활동한 그룹 멤버들 조회"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            cursor.execute("""
+            rows = await async_db.fetch("""
                 SELECT
                     cgm.user_id, cgm.role, cgm.posts_count, cgm.last_activity_at,
                     sp.display_name, sp.avatar_url
@@ -183,7 +154,7 @@ class CommunityGroupsService:
             """, (group_id, limit))
 
             members = []
-            for row in cursor.fetchall():
+            for row in rows:
                 members.append({
                     'user_id': row[0],
                     'role': row[1],
@@ -193,9 +164,6 @@ class CommunityGroupsService:
                     'avatar_url': row[5]
                 })
 
-            cursor.close()
-            conn.close()
-
             return members
 
         except Exception as e:
@@ -205,10 +173,7 @@ class CommunityGroupsService:
     async def _get_recent_group_posts(self, group_id: int, limit: int = 5) -> List[Dict[str, Any]]:
         """그룹의 최근 포스트들 조회"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            cursor.execute("""
+            rows = await async_db.fetch("""
                 SELECT
                     sp.id, sp.user_id, sp.title, sp.content, sp.post_type,
                     sp.images, sp.likes_count, sp.comments_count,
@@ -224,7 +189,7 @@ class CommunityGroupsService:
             """, (group_id, limit))
 
             posts = []
-            for row in cursor.fetchall():
+            for row in rows:
                 posts.append({
                     'id': row[0],
                     'user_id': row[1],
@@ -241,9 +206,6 @@ class CommunityGroupsService:
                     'is_announcement': row[12]
                 })
 
-            cursor.close()
-            conn.close()
-
             return posts
 
         except Exception as e:
@@ -253,28 +215,23 @@ class CommunityGroupsService:
     async def join_group(self, group_id: int, user_id: str) -> bool:
         """그룹 가입"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            # 그룹 정보 확인
-            cursor.execute("""
-                SELECT is_private, require_approval FROM community_groups
-                WHERE id = %s AND status = 'active'
-            """, (group_id,))
+            # 그룹 정보와 기존 가입 여부를 동시에 확인
+            group_info, existing = await asyncio.gather(
+                async_db.fetchrow("""
+                    SELECT is_private, require_approval FROM community_groups
+                    WHERE id = %s AND status = 'active'
+                """, (group_id,)),
+                async_db.fetchrow("""
+                    SELECT status FROM community_group_members
+                    WHERE group_id = %s AND user_id = %s
+                """, (group_id, user_id))
+            )
 
-            group_info = cursor.fetchone()
             if not group_info:
                 return False
 
-            is_private, require_approval = group_info
-
-            # 이미 가입했는지 확인
-            cursor.execute("""
-                SELECT status FROM community_group_members
-                WHERE group_id = %s AND user_id = %s
-            """, (group_id, user_id))
+            is_private, require_approval = group_info[0], group_info[1]
 
-            existing = cursor.fetchone()
             if existing:
                 if existing[0] == 'active':
                     return True  # 이미 활성 멤버
@@ -284,29 +241,26 @@ class CommunityGroupsService:
             # 가입 상태 결정
             status = 'pending' if require_approval else 'active'
 
-            # 멤버 추가 또는 업데이트
-            cursor.execute("""
-                INSERT INTO community_group_members (
-                    group_id, user_id, role, status, last_activity_at
-                ) VALUES (%s, %s, 'member', %s, %s)
-                ON CONFLICT (group_id, user_id)
-                DO UPDATE SET status = %s, updated_at = %s
-            """, (group_id, user_id, status, datetime.now(), status, datetime.now()))
-
-            # 승인된 가입인 경우 멤버 수 업데이트
-            if status == 'active':
-                cursor.execute("""
-                    UPDATE community_groups
-                    SET members_count = (
-                        SELECT COUNT(*) FROM community_group_members
-                        WHERE group_id = %s AND status = 'active'
-                    )
-                    WHERE id = %s
-                """, (group_id, group_id))
-
-            conn.commit()
-            cursor.close()
-            conn.close()
+            async with async_db.transaction() as conn:
+                # 멤버 추가 또는 업데이트
+                await conn.execute("""
+                    INSERT INTO community_group_members (
+                        group_id, user_id, role, status, last_activity_at
+                    ) VALUES (%s, %s, 'member', %s, %s)
+                    ON CONFLICT (group_id, user_id)
+                    DO UPDATE SET status = %s, updated_at = %s
+                """, (group_id, user_id, status, datetime.now(), status, datetime.now()))
+
+                # 승인된 가입인 경우 멤버 수 업데이트
+                if status == 'active':
+                    await conn.execute("""
+                        UPDATE community_groups
+                        SET members_count = (
+                            SELECT COUNT(*) FROM community_group_members
+                            WHERE group_id = %s AND status = 'active'
+                        )
+                        WHERE id = %s
+                    """, (group_id, group_id))
 
             return True
 
@@ -317,45 +271,37 @@ class CommunityGroupsService:
     async def leave_group(self, group_id: int, user_id: str) -> bool:
         """그룹 탈퇴"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
+            async with async_db.transaction() as conn:
+                # 그룹 생성자인지 확인
+                creator = await conn.fetchval("""
+                    SELECT created_by FROM community_groups WHERE id = %s
+                """, (group_id,))
+
+                if creator == user_id:
+                    # 생성자는 다른 관리자가 있을 때만 탈퇴 가능
+                    other_admins = await conn.fetchval("""
+                        SELECT COUNT(*) FROM community_group_members
+                        WHERE group_id = %s AND role = 'admin' AND user_id != %s AND status = 'active'
+                    """, (group_id, user_id))
 
-            # 그룹 생성자인지 확인
-            cursor.execute("""
-                SELECT created_by FROM community_groups WHERE id = %s
-            """, (group_id,))
+                    if other_admins == 0:
+                        return False  # 다른 관리자가 없으면 탈퇴 불가
 
-            creator = cursor.fetchone()
-            if creator and creator[0] == user_id:
-                # 생성자는 다른 관리자가 있을 때만 탈퇴 가능
-                cursor.execute("""
-                    SELECT COUNT(*) FROM community_group_members
-                    WHERE group_id = %s AND role = 'admin' AND user_id != %s AND status = 'active'
+                # 멤버 삭제
+                await conn.execute("""
+                    DELETE FROM community_group_members
+                    WHERE group_id = %s AND user_id = %s
                 """, (group_id, user_id))
 
-                other_admins = cursor.fetchone()[0]
-                if other_admins == 0:
-                    return False  # 다른 관리자가 없으면 탈퇴 불가
-
-            # 멤버 삭제
-            cursor.execute("""
-                DELETE FROM community_group_members
-                WHERE group_id = %s AND user_id = %s
-            """, (group_id, user_id))
-
-            # 멤버 수 업데이트
-            cursor.execute("""
-                UPDATE community_groups
-                SET members_count = (
-                    SELECT COUNT(*) FROM community_group_members
-                    WHERE group_id = %s AND status = 'active'
-                )
-                WHERE id = %s
-            """, (group_id, group_id))
-
-            conn.commit()
-            cursor.close()
-            conn.close()
+                # 멤버 수 업데이트
+                await conn.execute("""
+                    UPDATE community_groups
+                    SET members_count = (
+                        SELECT COUNT(*) FROM community_group_members
+                        WHERE group_id = %s AND status = 'active'
+                    )
+                    WHERE id = %s
+                """, (group_id, group_id))
 
             return True
 
@@ -366,10 +312,7 @@ class CommunityGroupsService:
     async def get_user_groups(self, user_id: str) -> List[Dict[str, Any]]:
         """사용자가 가입한 그룹 목록"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            cursor.execute("""
+            rows = await async_db.fetch("""
                 SELECT
                     cg.id, cg.name, cg.description, cg.avatar_url,
                     cg.group_type, cg.category, cg.region, cg.members_count,
@@ -381,7 +324,7 @@ class CommunityGroupsService:
             """, (user_id,))
 
             groups = []
-            for row in cursor.fetchall():
+            for row in rows:
                 groups.append({
                     'id': row[0],
                     'name': row[1],
@@ -397,9 +340,6 @@ class CommunityGroupsService:
                     'last_activity_at': row[11]
                 })
 
-            cursor.close()
-            conn.close()
-
             return groups
 
         except Exception as e:
@@ -417,9 +357,6 @@ class CommunityGroupsService:
     ) -> List[Dict[str, Any]]:
         """그룹 검색"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
             base_query = """
                 SELECT
                     cg.id, cg.name, cg.description, cg.avatar_url,
@@ -467,10 +404,8 @@ class CommunityGroupsService:
             base_query += " ORDER BY cg.members_count DESC, cg.created_at DESC LIMIT %s"
             params.append(limit)
 
-            cursor.execute(base_query, params)
-
             groups = []
-            for row in cursor.fetchall():
+            for row in await async_db.fetch(base_query, params):
                 groups.append({
                     'id': row[0],
                     'name': row[1],
@@ -485,9 +420,6 @@ class CommunityGroupsService:
                     'created_at': row[10]
                 })
 
-            cursor.close()
-            conn.close()
-
             return groups
 
         except Exception as e:
@@ -497,18 +429,13 @@ class CommunityGroupsService:
     async def get_recommended_groups(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """사용자 맞춤 그룹 추천"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
             # 사용자 프로필 정보 조회
-            cursor.execute("""
+            profile = await async_db.fetchrow("""
                 SELECT specialties, farm_location, farmer_type
                 FROM social_profiles WHERE user_id = %s
             """, (user_id,))
 
-            profile = cursor.fetchone()
-
-            recommendations = []
+            searches = []
 
             if profile:
                 specialties = profile[0] or []
@@ -516,30 +443,30 @@ class CommunityGroupsService:
                 farmer_type = profile[2]
 
                 # 전문 분야 기반 추천
-                if specialties:
-                    for specialty in specialties:
-                        specialty_groups = await self.search_groups(
-                            category=specialty, user_id=user_id, limit=3
-                        )
-                        recommendations.extend(specialty_groups)
+                for specialty in specialties:
+                    searches.append(self.search_groups(
+                        category=specialty, user_id=user_id, limit=3
+                    ))
 
                 # 지역 기반 추천
                 if location:
-                    regional_groups = await self.search_groups(
+                    searches.append(self.search_groups(
                         region=location, user_id=user_id, limit=5
-                    )
-                    recommendations.extend(regional_groups)
+                    ))
 
                 # 농업 유형 기반 추천
                 if farmer_type:
-                    type_groups = await self.search_groups(
+                    searches.append(self.search_groups(
                         group_type=farmer_type, user_id=user_id, limit=3
-                    )
-                    recommendations.extend(type_groups)
+                    ))
 
             # 인기 그룹 추천 (멤버 수 기반)
-            popular_groups = await self.search_groups(user_id=user_id, limit=5)
-            recommendations.extend(popular_groups)
+            searches.append(self.search_groups(user_id=user_id, limit=5))
+
+            # 추천 검색을 동시에 실행 (결과 순서는 요청 순서 유지)
+            recommendations = []
+            for groups in await asyncio.gather(*searches):
+                recommendations.extend(groups)
 
             # 중복 제거 및 제한
             seen_ids = set()
@@ -553,9 +480,6 @@ class CommunityGroupsService:
                 if len(unique_recommendations) >= limit:
                     break
 
-            cursor.close()
-            conn.close()
-
             return unique_recommendations
 
         except Exception as e:
@@ -565,19 +489,12 @@ class CommunityGroupsService:
     async def update_member_activity(self, group_id: int, user_id: str) -> None:
         """멤버의 그룹 활동 시간 업데이트"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            cursor.execute("""
+            await async_db.execute("""
                 UPDATE community_group_members
                 SET last_activity_at = %s, updated_at = %s
                 WHERE group_id = %s AND user_id = %s
             """, (datetime.now(), datetime.now(), group_id, user_id))
 
-            conn.commit()
-            cursor.close()
-            conn.close()
-
         except Exception as e:
             logger.error(f"멤버 활동 업데이트 오류: {e}")
 
@@ -586,29 +503,23 @@ class CommunityGroupsService:
     ) -> bool:
         """그룹에 포스트 추가"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                INSERT INTO community_group_posts (
-                    group_id, post_id, is_pinned, is_announcement
-                ) VALUES (%s, %s, %s, %s)
-                ON CONFLICT (group_id, post_id) DO UPDATE SET
-                    is_pinned = %s, is_announcement = %s
-            """, (group_id, post_id, is_pinned, is_announcement, is_pinned, is_announcement))
-
-            # 그룹 포스트 수 업데이트
-            cursor.execute("""
-                UPDATE community_groups
-                SET posts_count = (
-                    SELECT COUNT(*) FROM community_group_posts WHERE group_id = %s
-                )
-                WHERE id = %s
-            """, (group_id, group_id))
-
-            conn.commit()
-            cursor.close()
-            conn.close()
+            async with async_db.transaction() as conn:
+                await conn.execute("""
+                    INSERT INTO community_group_posts (
+                        group_id, post_id, is_pinned, is_announcement
+                    ) VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (group_id, post_id) DO UPDATE SET
+                        is_pinned = %s, is_announcement = %s
+                """, (group_id, post_id, is_pinned, is_announcement, is_pinned, is_announcement))
+
+                # 그룹 포스트 수 업데이트
+                await conn.execute("""
+                    UPDATE community_groups
+                    SET posts_count = (
+                        SELECT COUNT(*) FROM community_group_posts WHERE group_id = %s
+                    )
+                    WHERE id = %s
+                """, (group_id, group_id))
 
             return True
 
@@ -1,36 +1,26 @@
-import psycopg2
-from app.config import DB_NAME, DB_USER, DB_PASSWORD, DB_HOST
+from app.utils.db_pool import db_service
 from datetime import datetime
 
 def get_db_conn():
-    return psycopg2.connect(
-        dbname=DB_NAME,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        host=DB_HOST,
-        port="5432"
-    )
+    """연결 풀에서 튜플 행 연결 획득 (with 블록으로 사용, 종료 시 풀에 반환)"""
+    return db_service.pool.get_connection(dict_rows=False)
 
 def get_undistributed_coupons(limit: int):
-    conn = get_db_conn()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT id FROM esg_coupons
-        WHERE status = 'ISSUED'
-        ORDER BY id
-        LIMIT %s
-    """, (limit,))
-    ids = [row[0] for row in cursor.fetchall()]
-    cursor.close()
-    conn.close()
+    with get_db_conn() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT id FROM esg_coupons
+                WHERE status = 'ISSUED'
+                ORDER BY id
+                LIMIT %s
+            """, (limit,))
+            ids = [row[0] for row in cursor.fetchall()]
     return ids
 
 def update_coupons_as_distributed(coupon_ids: list, committee_id: int, tx_hash: str):
     if not coupon_ids:
         return
 
-    conn = get_db_conn()
-    cursor = conn.cursor()
     now = datetime.now()
 
     sql = """
@@ -42,7 +32,7 @@ def update_coupons_as_distributed(coupon_ids: list, committee_id: int, tx_hash:
             updated_at = %s
         WHERE id = ANY(%s)
     """
-    cursor.execute(sql, (committee_id, now, tx_hash, now, coupon_ids))
-    conn.commit()
-    cursor.close()
-    conn.close()
\ No newline at end of file
+    with get_db_conn() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(sql, (committee_id, now, tx_hash, now, coupon_ids))
+        conn.commit()
@@ -1,93 +1,277 @@
 # -*- coding: utf-8 -*-
 from datetime import datetime
-import os
-import psycopg2
-from dotenv import load_dotenv
-
-# Base62 인코딩 유틸
-BASE62_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
-def encode_base62(num):
-    if num == 0:
-        return BASE62_ALPHABET[0]
-    arr = []
-    while num:
-        num, rem = divmod(num, 62)
-        arr.append(BASE62_ALPHABET[rem])
-    arr.reverse()
-    return ''.join(arr)
-
-# 환경 변수 로딩
-load_dotenv()
-DB_HOST = os.getenv("DB_HOST")
-DB_NAME = os.getenv("DB_NAME")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
+import time
+from typing import Callable, Dict, Optional
 
-# 쿠폰 생성 함수
-def create_initial_coupons(amount: int, description: str, issued_by: str,
-                           asset_id: int, asset_name: str, unit_name: str):
-    conn = psycopg2.connect(
-        dbname=DB_NAME,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        host=DB_HOST,
-        port="5432"
-    )
-    cursor = conn.cursor()
-    now = datetime.now()
-
-    # 1. 발행 이력 저장 (unit_name 포함)
-    cursor.execute("""
-        INSERT INTO token_mint_history (amount, unit_name, description, issued_by, created_at)
-        VALUES (%s, %s, %s, %s, %s)
-        RETURNING id
-    """, (amount, unit_name, description, issued_by, now))
-    mint_history_id = cursor.fetchone()[0]
-
-    # 2. 기존 쿠폰 수량 확인 → 중복 방지용 시리얼 시작점 설정
-    cursor.execute("""
-        SELECT COUNT(*) FROM esg_coupons WHERE coupon_code LIKE %s
-    """, (f"{unit_name}-%",))
-    existing_count = cursor.fetchone()[0]
-    start_serial = existing_count + 1
-
-    # 3. 쿠폰 일괄 생성 및 저장
-    BATCH_SIZE = 1000
-    for batch_start in range(0, amount, BATCH_SIZE):
-        batch = []
-        for i in range(0, min(BATCH_SIZE, amount - batch_start)):
-            serial_number = start_serial + batch_start + i
-            base62_serial = encode_base62(serial_number)
-            coupon_code = f"{unit_name}-{base62_serial}"
-
-            batch.append((
-                coupon_code, asset_id, asset_name, mint_history_id,
-                None, None, None, 'ISSUED',
-                None, None, None, None, None, None, None,
-                now, now
-            ))
+from app.service.coupon_copy import (
+    COPY_BUFFER_SIZE, COUPON_COPY_SQL, CopyStream, coupon_csv_blocks
+)
+from app.utils.db_pool import db_service
+
+# 발행 진행 콜백: (mint_history_id, 적재 수, 전체 수)
+MintProgress = Callable[[int, int, int], None]
+
+# 발행 작업별 세션 advisory lock 키: (MINT_JOB_LOCK_CLASS, mint_history_id)
+# 적재하는 동안 연결에 잡아 두어 같은 작업을 두 연결이 동시에 적재하지 못하게 함
+MINT_JOB_LOCK_CLASS = "hashtext('coupon_mint_jobs')"
+
+
+class CouponMintError(Exception):
+    """쿠폰 적재 실패 (mint_history_id로 resume_coupon_mint 재개 가능)"""
+
+    def __init__(self, message: str, mint_history_id: int, inserted: int):
+        super().__init__(message)
+        self.mint_history_id = mint_history_id
+        self.inserted = inserted
+
+
+class CouponMintBusyError(CouponMintError):
+    """다른 연결이 같은 발행 작업을 적재 중 (끝난 뒤 다시 재개)"""
+
+
+class BulkCouponMinter:
+    """
+    COPY 기반 대량 쿠폰 발행기
+
+    - 시리얼 구간은 esg_coupon_serial_seq에서 한 번에 예약 (동시 발행 간 충돌 없음)
+    - 쿠폰 행은 CSV 스트림으로 생성하여 COPY FROM STDIN으로 적재
+    - checkpoint_size가 없으면 하나의 트랜잭션, 있으면 구간마다 커밋하고
+      coupon_mint_jobs에 진행 상황을 남겨 resume()으로 이어서 발행
+    - 적재가 끝날 때까지 작업별 세션 advisory lock을 잡아, 체크포인트 커밋 사이에
+      다른 워커가 같은 작업을 재개해 같은 시리얼을 중복 적재하지 못하게 함
+    """
+
+    def __init__(self, db=None):
+        self.db = db or db_service
 
+    def mint(self, amount: int, description: str, issued_by: str, asset_id: int,
+             asset_name: str, unit_name: str, checkpoint_size: Optional[int] = None,
+             progress: Optional[MintProgress] = None) -> Dict:
+        """새 발행 (발행 이력 저장 + 시리얼 예약 후 적재)"""
+        if amount <= 0:
+            raise ValueError("발행 수량은 1 이상이어야 합니다")
+
+        with self.db.pool.get_connection(dict_rows=False) as conn:
+            job = self._reserve(conn, amount, description, issued_by,
+                                asset_id, asset_name, unit_name)
+            try:
+                if progress:
+                    progress(job['mint_history_id'], 0, amount)
+                return self._copy_range(conn, job, checkpoint_size, progress)
+            finally:
+                self._release_job_lock(conn, job['mint_history_id'])
+
+    def resume(self, mint_history_id: int, checkpoint_size: Optional[int] = None,
+               progress: Optional[MintProgress] = None) -> Dict:
+        """
+        중단된 발행을 마지막 체크포인트부터 재개
+
+        Raises:
+            CouponMintBusyError: 다른 연결이 같은 작업을 적재 중
+        """
+        locked = False
+        with self.db.pool.get_connection(dict_rows=False) as conn:
+            try:
+                with conn.cursor() as cursor:
+                    # 재개가 끝날 때까지 유지 (FOR UPDATE 행 잠금은 첫 커밋에서 풀림)
+                    cursor.execute(f"SELECT pg_try_advisory_lock({MINT_JOB_LOCK_CLASS}, %s)",
+                                   (mint_history_id,))
+                    locked = cursor.fetchone()[0]
+
+                    # 잠금을 잡은 뒤에 읽어야 이전 적재가 남긴 마지막 체크포인트를 봄
+                    cursor.execute("""
+                        SELECT mint_history_id, unit_name, asset_id, asset_name,
+                               serial_start, amount, inserted, status
+                        FROM coupon_mint_jobs
+                        WHERE mint_history_id = %s
+                    """, (mint_history_id,))
+                    row = cursor.fetchone()
+
+                    if row is None:
+                        conn.rollback()
+                        raise ValueError(f"발행 작업을 찾을 수 없습니다: {mint_history_id}")
+
+                    columns = [desc[0] for desc in cursor.description]
+                    job = dict(zip(columns, row))
+                    if not locked:
+                        conn.rollback()
+                        raise CouponMintBusyError(
+                            f"다른 연결이 발행 작업을 적재 중입니다: {mint_history_id}",
+                            mint_history_id, job['inserted'])
+                    if job['status'] == 'COMPLETED':
+                        conn.rollback()
+                        return self._report(job, copied=0, elapsed=0.0, checkpoints=0)
+
+                    cursor.execute("""
+                        UPDATE coupon_mint_jobs
+                        SET status = 'RUNNING', error_message = NULL, updated_at = CURRENT_TIMESTAMP
+                        WHERE mint_history_id = %s
+                    """, (mint_history_id,))
+                conn.commit()
+
+                print(f"[INFO] 발행 재개: {mint_history_id} ({job['inserted']} / {job['amount']})")
+                return self._copy_range(conn, job, checkpoint_size, progress)
+            finally:
+                if locked:
+                    self._release_job_lock(conn, mint_history_id)
+
+    def _reserve(self, conn, amount: int, description: str, issued_by: str,
+                 asset_id: int, asset_name: str, unit_name: str) -> Dict:
+        """발행 이력 저장 및 시리얼 구간 예약 (짧은 트랜잭션)"""
+        now = datetime.now()
         try:
-            args_str = ','.join(cursor.mogrify(
-                "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
-                x
-            ).decode('utf-8') for x in batch)
-
-            cursor.execute("""
-                INSERT INTO esg_coupons
-                (coupon_code, asset_id, asset_name, mint_history_id,
-                 committee_id, provider_id, consumer_id,
-                 status, committee_assigned_at, provider_assigned_at, consumer_assigned_at,
-                 used_at, redeemed_at, expired_at, tx_hash,
-                 created_at, updated_at)
-                VALUES """ + args_str)
-        except Exception as e:
-            print("[ERROR] Batch insert 오류:", e)
+            with conn.cursor() as cursor:
+                # 1. 발행 이력 저장 (unit_name 포함)
+                cursor.execute("""
+                    INSERT INTO token_mint_history
+                    (amount, unit_name, description, issued_by, asset_id, created_at)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    RETURNING id
+                """, (amount, unit_name, description, issued_by, asset_id, now))
+                mint_history_id = cursor.fetchone()[0]
+
+                # 2. 시리얼 구간 예약 - 동시 발행은 advisory lock으로 직렬화
+                #    (setval은 트랜잭션과 무관하게 즉시 반영되므로 실패 시 구간은 비어 있게 됨)
+                cursor.execute("SELECT pg_advisory_xact_lock(hashtext('esg_coupon_serial_seq'))")
+                cursor.execute("SELECT nextval('esg_coupon_serial_seq')")
+                serial_start = cursor.fetchone()[0]
+                cursor.execute("SELECT setval('esg_coupon_serial_seq', %s)",
+                               (serial_start + amount - 1,))
+
+                # 3. 체크포인트 생성 - 커밋 전에 작업 잠금을 잡아 재개와 겹치지 않게 함
+                cursor.execute("""
+                    INSERT INTO coupon_mint_jobs
+                    (mint_history_id, unit_name, asset_id, asset_name, serial_start, amount)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """, (mint_history_id, unit_name, asset_id, asset_name, serial_start, amount))
+                cursor.execute(f"SELECT pg_advisory_lock({MINT_JOB_LOCK_CLASS}, %s)",
+                               (mint_history_id,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
             raise
 
-        conn.commit()
-        print(f"[INFO] Inserted {batch_start + len(batch)} / {amount}")
+        return {
+            'mint_history_id': mint_history_id,
+            'unit_name': unit_name,
+            'asset_id': asset_id,
+            'asset_name': asset_name,
+            'serial_start': serial_start,
+            'amount': amount,
+            'inserted': 0
+        }
+
+    def _copy_range(self, conn, job: Dict, checkpoint_size: Optional[int],
+                    progress: Optional[MintProgress] = None) -> Dict:
+        """예약된 구간 중 남은 쿠폰을 COPY로 적재"""
+        amount = job['amount']
+        inserted = job['inserted']
+        step = checkpoint_size or (amount - inserted)
+        copied = 0
+        checkpoints = 0
+        started = time.perf_counter()
+
+        try:
+            with conn.cursor() as cursor:
+                while inserted < amount:
+                    count = min(step, amount - inserted)
+                    stream = CopyStream(coupon_csv_blocks(
+                        job['unit_name'], job['serial_start'] + inserted, count,
+                        job['asset_id'], job['asset_name'], job['mint_history_id'],
+                        datetime.now()
+                    ))
+                    cursor.copy_expert(COUPON_COPY_SQL, stream, size=COPY_BUFFER_SIZE)
+
+                    inserted += count
+                    cursor.execute("""
+                        UPDATE coupon_mint_jobs
+                        SET inserted = %s, status = %s, updated_at = CURRENT_TIMESTAMP
+                        WHERE mint_history_id = %s
+                    """, (inserted, 'COMPLETED' if inserted >= amount else 'RUNNING',
+                          job['mint_history_id']))
+                    conn.commit()
+
+                    copied += count
+                    checkpoints += 1
+                    print(f"[INFO] Inserted {inserted} / {amount}")
+                    if progress:
+                        progress(job['mint_history_id'], inserted, amount)
+
+        except Exception as e:
+            conn.rollback()
+            self._mark_failed(conn, job['mint_history_id'], str(e))
+            print("[ERROR] COPY 적재 오류:", e)
+            raise CouponMintError(str(e), job['mint_history_id'], inserted) from e
+
+        job['inserted'] = inserted
+        report = self._report(job, copied, time.perf_counter() - started, checkpoints)
+        print(f"[SUCCESS] 쿠폰 발행 완료 ({report['rows_per_second']:.0f} rows/s)")
+        return report
+
+    @staticmethod
+    def _release_job_lock(conn, mint_history_id: int):
+        """작업 잠금 해제 (풀로 돌아간 연결에 세션 잠금이 남지 않도록)"""
+        try:
+            conn.rollback()
+            with conn.cursor() as cursor:
+                cursor.execute(f"SELECT pg_advisory_unlock({MINT_JOB_LOCK_CLASS}, %s)",
+                               (mint_history_id,))
+            conn.commit()
+        except Exception as e:
+            print("[ERROR] 발행 작업 잠금 해제 실패:", e)
+
+    def _mark_failed(self, conn, mint_history_id: int, error: str):
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE coupon_mint_jobs
+                    SET status = 'FAILED', error_message = %s, updated_at = CURRENT_TIMESTAMP
+                    WHERE mint_history_id = %s
+                """, (error[:1000], mint_history_id))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print("[ERROR] 발행 작업 상태 기록 실패:", e)
+
+    @staticmethod
+    def _report(job: Dict, copied: int, elapsed: float, checkpoints: int) -> Dict:
+        return {
+            'mint_history_id': job['mint_history_id'],
+            'unit_name': job['unit_name'],
+            'serial_start': job['serial_start'],
+            'serial_end': job['serial_start'] + job['amount'] - 1,
+            'issued_amount': job['inserted'],
+            'copied_this_run': copied,
+            'checkpoints': checkpoints,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': copied / elapsed if elapsed > 0 else 0.0
+        }
+
+
+bulk_coupon_minter = BulkCouponMinter()
+
+
+# 쿠폰 생성 함수
+def create_initial_coupons(amount: int, description: str, issued_by: str,
+                           asset_id: int, asset_name: str, unit_name: str,
+                           checkpoint_size: Optional[int] = None,
+                           progress: Optional[MintProgress] = None) -> Dict:
+    """
+    쿠폰 대량 발행
+
+    Args:
+        checkpoint_size: 지정 시 이 수량마다 커밋 (중단 시 resume_coupon_mint로 재개),
+                         None이면 전체를 하나의 트랜잭션으로 적재
+        progress: 발행 이력 생성 직후와 체크포인트마다 (mint_history_id, 적재 수, 전체 수)로 호출
+
+    Returns:
+        발행 결과 및 처리량 (rows_per_second)
+    """
+    return bulk_coupon_minter.mint(amount, description, issued_by, asset_id,
+                                   asset_name, unit_name, checkpoint_size, progress)
+
 
-    cursor.close()
-    conn.close()
-    print("[SUCCESS] 쿠폰 발행 완료")
+def resume_coupon_mint(mint_history_id: int, checkpoint_size: Optional[int] = None,
+                       progress: Optional[MintProgress] = None) -> Dict:
+    """중단된 쿠폰 발행 재개"""
+    return bulk_coupon_minter.resume(mint_history_id, checkpoint_size, progress)
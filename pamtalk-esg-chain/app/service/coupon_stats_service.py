@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+쿠폰 통계 롤업 서비스
+coupon_status_counts(012 마이그레이션의 트리거로 유지)에서 상태별 쿠폰 수를 조회하고,
+esg_coupons 실제 집계와 비교해 어긋난 카운터를 바로잡는 검증 작업을 제공
+"""
+
+import time
+from typing import Dict, List, Optional
+
+from app.utils.db_pool import db_service
+
+COUPON_STATUSES = ('ISSUED', 'COMMITTEE', 'PROVIDER', 'CONSUMER', 'USED', 'EXPIRED')
+
+# 한 문장(하나의 스냅샷)으로 실제 집계와 롤업을 비교 - 트리거는 쿠폰 변경과 같은
+# 트랜잭션에서 롤업을 갱신하므로 동시 쓰기 중에도 정상이면 차이가 없음
+MISMATCH_QUERY = """
+    WITH actual AS (
+        SELECT asset_id, status, COUNT(*) AS actual_count
+        FROM esg_coupons
+        {where_coupons}
+        GROUP BY asset_id, status
+    ),
+    rollup AS (
+        SELECT asset_id, status, SUM(coupon_count) AS rollup_count
+        FROM coupon_status_counts
+        {where_rollup}
+        GROUP BY asset_id, status
+    )
+    SELECT
+        COALESCE(a.asset_id, r.asset_id) AS asset_id,
+        COALESCE(a.status, r.status) AS status,
+        COALESCE(a.actual_count, 0) AS actual_count,
+        COALESCE(r.rollup_count, 0) AS rollup_count
+    FROM actual a
+    FULL OUTER JOIN rollup r ON a.asset_id = r.asset_id AND a.status = r.status
+    WHERE COALESCE(a.actual_count, 0) <> COALESCE(r.rollup_count, 0)
+    ORDER BY 1, 2
+"""
+
+
+class CouponStatsService:
+    """쿠폰 상태별 통계 (롤업 조회 + 검증/복구)"""
+
+    def __init__(self, db=None):
+        self.db = db or db_service
+
+    def get_statistics(self) -> Dict:
+        """전체 토큰 통계 (롤업 테이블 합산, 쿠폰 수와 무관한 O(1) 조회)"""
+        return self.db.get_token_statistics()
+
+    def get_asset_statistics(self, asset_id: int) -> Dict[str, int]:
+        """자산별 상태별 쿠폰 수"""
+        rows = self.db.pool.execute_prepared("""
+            SELECT status, SUM(coupon_count) AS coupon_count
+            FROM coupon_status_counts
+            WHERE asset_id = %s
+            GROUP BY status
+        """, (asset_id,))
+
+        counts = {status: 0 for status in COUPON_STATUSES}
+        for row in rows:
+            counts[row['status']] = int(row['coupon_count'])
+        return counts
+
+    def find_mismatches(self, asset_ids: Optional[List[int]] = None) -> List[Dict]:
+        """
+        롤업과 실제 쿠폰 수가 다른 (자산, 상태) 목록
+
+        esg_coupons 전체를 집계하므로 대시보드 경로가 아닌 검증 작업에서만 사용합니다.
+        """
+        with self.db.pool.get_connection() as conn:
+            with conn.cursor() as cursor:
+                self._execute_mismatch_query(cursor, asset_ids)
+                return [dict(row) for row in cursor.fetchall()]
+
+    def reconcile(self, repair: bool = False, asset_ids: Optional[List[int]] = None) -> Dict:
+        """
+        롤업 카운터 검증 (repair=True면 어긋난 자산의 카운터를 실제 집계로 재작성)
+
+        Returns:
+            {'mismatches': [...], 'repaired_assets': [...], 'elapsed_seconds': ...}
+        """
+        started = time.perf_counter()
+        mismatches = self.find_mismatches(asset_ids)
+        repaired = []
+
+        if mismatches and repair:
+            repaired = sorted({row['asset_id'] for row in mismatches})
+            with self.db.pool.get_connection() as conn:
+                try:
+                    with conn.cursor() as cursor:
+                        # 재작성하는 동안 쿠폰 쓰기만 잠시 차단 (조회는 허용)
+                        cursor.execute("LOCK TABLE esg_coupons IN SHARE MODE")
+                        cursor.execute(
+                            "DELETE FROM coupon_status_counts WHERE asset_id = ANY(%s)", (repaired,)
+                        )
+                        cursor.execute("""
+                            INSERT INTO coupon_status_counts (asset_id, status, shard, coupon_count)
+                            SELECT asset_id, status, 0, COUNT(*)
+                            FROM esg_coupons
+                            WHERE asset_id = ANY(%s)
+                            GROUP BY asset_id, status
+                        """, (repaired,))
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+
+            print(f"[INFO] 쿠폰 통계 롤업 복구: 자산 {len(repaired)}개")
+        elif mismatches:
+            print(f"[WARN] 쿠폰 통계 롤업 불일치 {len(mismatches)}건")
+
+        return {
+            'mismatches': mismatches,
+            'repaired_assets': repaired,
+            'elapsed_seconds': round(time.perf_counter() - started, 3)
+        }
+
+    def compact(self) -> int:
+        """
+        샤드별 카운터를 샤드 0 하나로 합치고 0인 행 제거
+
+        Returns:
+            합친 뒤 남은 행 수
+        """
+        with self.db.pool.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    # 트리거의 누적과 겹치지 않도록 롤업 테이블 쓰기 차단
+                    cursor.execute("LOCK TABLE coupon_status_counts IN EXCLUSIVE MODE")
+                    cursor.execute("""
+                        CREATE TEMP TABLE coupon_status_totals ON COMMIT DROP AS
+                        SELECT asset_id, status, SUM(coupon_count) AS coupon_count
+                        FROM coupon_status_counts
+                        GROUP BY asset_id, status
+                    """)
+                    cursor.execute("DELETE FROM coupon_status_counts")
+                    cursor.execute("""
+                        INSERT INTO coupon_status_counts (asset_id, status, shard, coupon_count)
+                        SELECT asset_id, status, 0, coupon_count
+                        FROM coupon_status_totals
+                        WHERE coupon_count <> 0
+                    """)
+                    remaining = cursor.rowcount
+                conn.commit()
+                return remaining
+            except Exception:
+                conn.rollback()
+                raise
+
+    @staticmethod
+    def _execute_mismatch_query(cursor, asset_ids: Optional[List[int]]):
+        if asset_ids:
+            query = MISMATCH_QUERY.format(where_coupons="WHERE asset_id = ANY(%s)",
+                                          where_rollup="WHERE asset_id = ANY(%s)")
+            cursor.execute(query, (list(asset_ids), list(asset_ids)))
+        else:
+            cursor.execute(MISMATCH_QUERY.format(where_coupons='', where_rollup=''))
+
+
+coupon_stats_service = CouponStatsService()
+
+
+# 사용 예시
+if __name__ == "__main__":
+    print(f"토큰 통계: {coupon_stats_service.get_statistics()}")
+
+    report = coupon_stats_service.reconcile(repair=True)
+    print(f"검증 결과: 불일치 {len(report['mismatches'])}건, "
+          f"복구 자산 {report['repaired_assets']} ({report['elapsed_seconds']}s)")
+    print(f"압축 후 롤업 행 수: {coupon_stats_service.compact()}")
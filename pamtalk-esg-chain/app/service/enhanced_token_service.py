@@ -5,12 +5,12 @@
 """
 
 import time
-import psycopg2
 from algosdk import account
 from algosdk.transaction import AssetTransferTxn, PaymentTxn
 
-from app.config import HCF_MNEMONIC, ASA_ID, DB_HOST, DB_NAME, DB_USER, DB_PASSWORD
+from app.config import HCF_MNEMONIC, ASA_ID
 from app.utils.algorand_utils import get_algod_client
+from app.utils.db_pool import db_service
 from app.utils.wallet_utils import get_wallet_keys, get_wallet_keys_from_address
 from app.utils.transaction_retry import AlgorandTransactionManager, RetryConfig, with_retry
 
@@ -127,15 +127,15 @@ class EnhancedTokenService:
         if sender_address != account.address_from_private_key(sender_private_key):
             raise Exception("HCF 지갑 주소와 프라이빗 키가 일치하지 않습니다.")
 
-        # 3. DB 연결 및 위원회 정보 조회
-        conn = psycopg2.connect(host=DB_HOST, dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD)
+        # 3. 위원회 정보 조회 (온체인 처리 동안 풀 연결을 잡고 있지 않음)
         try:
-            with conn.cursor() as cur:
-                cur.execute("SELECT wallet_address FROM committees WHERE id = %s", (committee_id,))
-                result = cur.fetchone()
-                if not result:
-                    raise Exception("해당 committee_id에 대한 지갑 주소가 없습니다.")
-                receiver_address = result[0]
+            with db_service.pool.get_connection(dict_rows=False) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT wallet_address FROM committees WHERE id = %s", (committee_id,))
+                    result = cur.fetchone()
+                    if not result:
+                        raise Exception("해당 committee_id에 대한 지갑 주소가 없습니다.")
+                    receiver_address = result[0]
 
             # 4. 수신자 Opt-In 확인 및 처리
             receiver_info = self.tx_manager.get_account_info_safe(receiver_address)
@@ -152,19 +152,14 @@ class EnhancedTokenService:
                                                receiver_address, amount)
 
             # 6. 데이터베이스 상태 업데이트 (재시도 포함)
-            self._update_coupon_status_with_retry(conn, amount, committee_id, tx_id, "COMMITTEE")
+            self._update_coupon_status_with_retry(amount, committee_id, tx_id, "COMMITTEE")
 
-            conn.commit()
             return tx_id
 
         except Exception as e:
-            conn.rollback()
             print(f"[오류 발생] {str(e)}")
             raise Exception(f"토큰 전송 실패: {str(e)}")
 
-        finally:
-            conn.close()
-
     def _execute_token_transfer(self, sender_address: str, sender_private_key: str,
                               receiver_address: str, amount: int) -> str:
         """토큰 전송 트랜잭션 실행"""
@@ -194,9 +189,9 @@ class EnhancedTokenService:
         return tx_id
 
     @with_retry(RetryConfig(max_attempts=3))
-    def _update_coupon_status_with_retry(self, conn, amount: int, entity_id: int,
+    def _update_coupon_status_with_retry(self, amount: int, entity_id: int,
                                        tx_id: str, status: str):
-        """쿠폰 상태 업데이트 (재시도 포함)"""
+        """쿠폰 상태 업데이트 (재시도 포함, 시도마다 새 트랜잭션)"""
 
         status_field_map = {
             "COMMITTEE": ("committee_id", "committee_assigned_at"),
@@ -210,31 +205,33 @@ class EnhancedTokenService:
         id_field, timestamp_field = status_field_map[status]
         prev_status = {"COMMITTEE": "ISSUED", "PROVIDER": "COMMITTEE", "CONSUMER": "PROVIDER"}[status]
 
-        with conn.cursor() as cur:
-            cur.execute(f"""
-                WITH to_update AS (
-                    SELECT id
-                    FROM esg_coupons
-                    WHERE status = %s
-                    ORDER BY id
-                    LIMIT %s
-                )
-                UPDATE esg_coupons
-                SET status = %s,
-                    {id_field} = %s,
-                    tx_hash = %s,
-                    {timestamp_field} = NOW(),
-                    updated_at = NOW()
-                WHERE id IN (SELECT id FROM to_update)
-                RETURNING id
-            """, (prev_status, amount, status, entity_id, tx_id))
-
-            updated_rows = cur.fetchall()
-            updated_ids = [row[0] for row in updated_rows]
-            print(f"[DB 업데이트 완료] {status} 쿠폰 ID: {updated_ids}")
-
-            if len(updated_ids) != amount:
-                raise Exception(f"업데이트 수량 불일치: 요청 {amount}, 실제 {len(updated_ids)}")
+        with db_service.pool.get_connection(dict_rows=False) as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"""
+                    WITH to_update AS (
+                        SELECT id
+                        FROM esg_coupons
+                        WHERE status = %s
+                        ORDER BY id
+                        LIMIT %s
+                    )
+                    UPDATE esg_coupons
+                    SET status = %s,
+                        {id_field} = %s,
+                        tx_hash = %s,
+                        {timestamp_field} = NOW(),
+                        updated_at = NOW()
+                    WHERE id IN (SELECT id FROM to_update)
+                    RETURNING id
+                """, (prev_status, amount, status, entity_id, tx_id))
+
+                updated_rows = cur.fetchall()
+                updated_ids = [row[0] for row in updated_rows]
+                print(f"[DB 업데이트 완료] {status} 쿠폰 ID: {updated_ids}")
+
+                if len(updated_ids) != amount:
+                    raise Exception(f"업데이트 수량 불일치: 요청 {amount}, 실제 {len(updated_ids)}")
+            conn.commit()
 
 
 # 서비스 인스턴스 생성
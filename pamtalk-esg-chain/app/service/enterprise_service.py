@@ -4,23 +4,25 @@ Enterprise B2B Service
 Handles enterprise ESG purchasing, contracts, and reporting
 """
 
-import sqlite3
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional
 import secrets
 import json
 from decimal import Decimal
 
+from app.utils.sqlite_pool import get_sqlite_pool
+
 
 class EnterpriseService:
     """Service for managing enterprise B2B operations"""
 
     def __init__(self, db_path: str = "pamtalk_esg.db"):
         self.db_path = db_path
+        self.pool = get_sqlite_pool(db_path)
 
     def _get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get pooled database connection (close() returns it to the pool)"""
+        return self.pool.acquire()
 
     def _dict_factory(self, cursor, row):
         """Convert database rows to dictionaries"""
@@ -16,6 +16,8 @@ from algosdk.transaction import (
     wait_for_confirmation, PaymentTxn
 )
 
+from app.utils.cached_algod import CachedAlgodClient
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,11 +45,11 @@ class ESGGoldService:
             logger.error(f"Invalid JSON in config file: {e}")
             raise
 
-    def _create_client(self) -> algod.AlgodClient:
-        """Algorand 클라이언트 생성"""
+    def _create_client(self) -> CachedAlgodClient:
+        """Algorand 클라이언트 생성 (suggested_params / 옵트인·잔액 조회 캐시)"""
         algod_address = self.config['algod_endpoint']
         algod_token = ""  # Public API
-        return algod.AlgodClient(algod_token, algod_address)
+        return CachedAlgodClient(algod.AlgodClient(algod_token, algod_address))
 
     def mint_esg_gold(self, recipient_address: str, amount_dc: float,
                      creator_private_key: str, reason: str = "carbon_reduction") -> Dict:
@@ -4,21 +4,23 @@ Handles all local government operations including dashboard data, carbon stats,
 ESG programs, and regional management.
 """
 
-import sqlite3
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional, Any
 import json
 
+from app.utils.sqlite_pool import get_sqlite_pool
+
 
 class LocalGovernmentService:
     """Service for managing local government operations"""
 
     def __init__(self, db_path: str = "pamtalk_esg.db"):
         self.db_path = db_path
+        self.pool = get_sqlite_pool(db_path)
 
     def _get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get pooled database connection (close() returns it to the pool)"""
+        return self.pool.acquire()
 
     def _dict_factory(self, cursor, row):
         """Convert database rows to dictionaries"""
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+검증 기록 Merkle 앵커링
+검증 결과 해시 배치로 Merkle 트리를 만들어 루트만 블록체인에 기록하고,
+기록별 포함 증명(inclusion proof)은 로컬 SQLite에 보관
+
+- 잎 노드: sha256(0x00 || 검증 해시), 내부 노드: sha256(0x01 || 왼쪽 || 오른쪽)
+  (잎/내부 노드 도메인 분리로 내부 노드를 잎으로 위장하는 2차 원상 공격 방지)
+- 짝이 없는 마지막 노드는 복제하지 않고 그대로 다음 레벨로 올림
+- 포함 증명은 신뢰할 수 있는 루트(블록체인 앵커에서 확인한 값)만 알면 오프라인으로 검증 가능
+  (증명서에 함께 적힌 루트는 신뢰 근거가 아님)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Dict, List, Optional, Sequence
+
+from ..utils.sqlite_pool import SQLiteConnectionPool
+
+# 포함 증명 저장 DB
+MERKLE_PROOF_DB = os.getenv("MERKLE_PROOF_DB", "merkle_proofs.db")
+
+# 트랜잭션 Note에 기록하는 앵커 형식
+ANCHOR_NOTE_TYPE = "pamtalk_merkle_anchor"
+ANCHOR_NOTE_VERSION = "1.0"
+
+_LEAF_PREFIX = b'\x00'
+_NODE_PREFIX = b'\x01'
+
+
+def _hash_leaf(verification_hash: str) -> bytes:
+    return hashlib.sha256(_LEAF_PREFIX + bytes.fromhex(verification_hash)).digest()
+
+
+def _hash_node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+
+class MerkleTree:
+    """검증 해시(16진수 SHA256) 목록으로 만든 Merkle 트리"""
+
+    def __init__(self, leaves: Sequence[str]):
+        """
+        Args:
+            leaves: 검증 해시 목록 (순서가 잎 인덱스)
+        """
+        if not leaves:
+            raise ValueError("Merkle 트리에는 최소 1개의 잎이 필요합니다")
+
+        level = [_hash_leaf(leaf) for leaf in leaves]
+        self.levels: List[List[bytes]] = [level]
+        while len(level) > 1:
+            parents = [_hash_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+            level = parents
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    @property
+    def root(self) -> str:
+        return self.levels[-1][0].hex()
+
+    def proof(self, index: int) -> List[Dict[str, str]]:
+        """
+        잎의 포함 증명
+
+        Returns:
+            아래 레벨부터의 형제 노드 목록 [{'position': 'left' | 'right', 'hash': str}, ...]
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f"잎 인덱스 범위 초과: {index}")
+
+        path = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                path.append({
+                    'position': 'left' if sibling < index else 'right',
+                    'hash': level[sibling].hex()
+                })
+            index //= 2
+        return path
+
+
+def verify_inclusion(verification_hash: str, proof: List[Dict[str, str]], merkle_root: str) -> bool:
+    """
+    포함 증명 검증 (오프라인)
+
+    Args:
+        verification_hash: 검증 결과 해시
+        proof: MerkleTree.proof() 결과
+        merkle_root: 블록체인에 기록된 루트
+
+    Returns:
+        해시가 루트에 포함되어 있으면 True
+    """
+    try:
+        node = _hash_leaf(verification_hash)
+        for step in proof:
+            sibling = bytes.fromhex(step['hash'])
+            if step['position'] == 'left':
+                node = _hash_node(sibling, node)
+            elif step['position'] == 'right':
+                node = _hash_node(node, sibling)
+            else:
+                return False
+        return node.hex() == merkle_root
+    except (ValueError, KeyError, TypeError):
+        return False
+
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS merkle_batches (
+        batch_id TEXT PRIMARY KEY,
+        merkle_root TEXT NOT NULL,
+        leaf_count INTEGER NOT NULL,
+        tx_id TEXT NOT NULL,
+        confirmed_round INTEGER,
+        anchored_at TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS merkle_inclusion_proofs (
+        result_id TEXT PRIMARY KEY,
+        batch_id TEXT NOT NULL REFERENCES merkle_batches (batch_id),
+        leaf_index INTEGER NOT NULL,
+        verification_hash TEXT NOT NULL,
+        proof TEXT NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_merkle_inclusion_proofs_batch
+        ON merkle_inclusion_proofs (batch_id, leaf_index);
+"""
+
+
+class MerkleProofStore:
+    """앵커 배치와 기록별 포함 증명 저장소 (SQLite)"""
+
+    def __init__(self, db_path: str = MERKLE_PROOF_DB):
+        self.db_path = db_path
+        self.pool = SQLiteConnectionPool(db_path, schema=SCHEMA)
+
+    def _connect(self):
+        return self.pool.acquire(row_factory=sqlite3.Row)
+
+    def save_batch(self, batch: Dict, inclusions: List[Dict]):
+        """
+        앵커 배치와 포함 증명 저장 (한 트랜잭션)
+
+        Args:
+            batch: {'batch_id', 'merkle_root', 'leaf_count', 'tx_id', 'confirmed_round', 'anchored_at'}
+            inclusions: [{'result_id', 'leaf_index', 'verification_hash', 'proof'}, ...]
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("""
+                    INSERT INTO merkle_batches
+                    (batch_id, merkle_root, leaf_count, tx_id, confirmed_round, anchored_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (batch['batch_id'], batch['merkle_root'], batch['leaf_count'],
+                      batch['tx_id'], batch.get('confirmed_round'), batch['anchored_at']))
+                # 같은 결과를 다시 앵커링하면 최신 배치의 증명으로 교체
+                conn.executemany("""
+                    INSERT OR REPLACE INTO merkle_inclusion_proofs
+                    (result_id, batch_id, leaf_index, verification_hash, proof)
+                    VALUES (?, ?, ?, ?, ?)
+                """, [(item['result_id'], batch['batch_id'], item['leaf_index'],
+                       item['verification_hash'], json.dumps(item['proof']))
+                      for item in inclusions])
+        finally:
+            conn.close()
+
+    def get_inclusion(self, result_id: str) -> Optional[Dict]:
+        """검증 결과의 포함 증명 (배치 정보 포함, 없으면 None)"""
+        conn = self._connect()
+        try:
+            row = conn.execute("""
+                SELECT p.result_id, p.leaf_index, p.verification_hash, p.proof,
+                       b.batch_id, b.merkle_root, b.leaf_count, b.tx_id, b.confirmed_round, b.anchored_at
+                FROM merkle_inclusion_proofs p
+                JOIN merkle_batches b ON b.batch_id = p.batch_id
+                WHERE p.result_id = ?
+            """, (result_id,)).fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+        inclusion = dict(row)
+        inclusion['proof'] = json.loads(inclusion['proof'])
+        return inclusion
+
+    def get_batch(self, batch_id: str) -> Optional[Dict]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM merkle_batches WHERE batch_id = ?",
+                               (batch_id,)).fetchone()
+        finally:
+            conn.close()
+        return dict(row) if row else None
@@ -14,6 +14,7 @@ from enum import Enum
 
 from .carbon_calculation_engine import (
     CarbonCalculationEngine,
+    CarbonCalculationResult,
     CarbonActivity,
     ActivityType
 )
@@ -124,60 +125,66 @@ class MRVMeasurementModule:
         try:
             # 1. 탄소 발자국 계산
             carbon_result = self.carbon_engine.calculate_carbon_footprint(activity)
-
-            # 2. 측정 ID 생성
-            measurement_id = self._generate_measurement_id(activity.user_id)
-
-            # 3. 신뢰도 점수 계산
-            confidence_score = self._calculate_confidence_score(
-                measurement_method=measurement_method,
-                evidences=evidences or [],
-                activity=activity
-            )
-
-            # 4. 측정 데이터 생성
-            measurement = MeasurementData(
-                measurement_id=measurement_id,
-                user_id=activity.user_id,
-                activity=activity,
-                carbon_savings_kg=carbon_result.carbon_savings,
-                dc_units=carbon_result.digital_carbon_units,
-                esg_gold_amount=carbon_result.esg_gold_actual,
-                measurement_method=measurement_method,
-                measurement_timestamp=datetime.now().isoformat(),
-                measurement_location=location,
-                evidences=evidences or [],
-                status=MeasurementStatus.MEASURED,
-                confidence_score=confidence_score
-            )
-
-            # 5. 데이터 해시 생성 (무결성 보장)
-            measurement.data_hash = self._generate_data_hash(measurement)
-
-            # 6. 메타데이터 추가
-            measurement.metadata = {
-                'carbon_breakdown': {
-                    'transport': carbon_result.transport_emissions,
-                    'production': carbon_result.production_emissions,
-                    'packaging': carbon_result.packaging_emissions,
-                    'total': carbon_result.total_emissions,
-                    'baseline': carbon_result.baseline_emissions
-                },
-                'reduction_percentage': carbon_result.reduction_percentage,
-                'pam_tokens': carbon_result.reward_amount,
-                'measurement_version': '1.0'
-            }
-
-            logger.info(f"Activity measured: {measurement_id}, "
-                       f"Carbon savings: {carbon_result.carbon_savings} kg, "
-                       f"Confidence: {confidence_score}%")
-
-            return measurement
+            return self._build_measurement(activity, carbon_result, measurement_method,
+                                           evidences, location)
 
         except Exception as e:
             logger.error(f"Failed to measure activity: {e}")
             raise
 
+    def _build_measurement(self, activity: CarbonActivity, carbon_result: CarbonCalculationResult,
+                           measurement_method: str, evidences: Optional[List[Evidence]],
+                           location: Optional[Dict] = None) -> MeasurementData:
+        """계산된 탄소 결과로 측정 데이터 생성"""
+        # 2. 측정 ID 생성
+        measurement_id = self._generate_measurement_id(activity.user_id)
+
+        # 3. 신뢰도 점수 계산
+        confidence_score = self._calculate_confidence_score(
+            measurement_method=measurement_method,
+            evidences=evidences or [],
+            activity=activity
+        )
+
+        # 4. 측정 데이터 생성
+        measurement = MeasurementData(
+            measurement_id=measurement_id,
+            user_id=activity.user_id,
+            activity=activity,
+            carbon_savings_kg=carbon_result.carbon_savings,
+            dc_units=carbon_result.digital_carbon_units,
+            esg_gold_amount=carbon_result.esg_gold_actual,
+            measurement_method=measurement_method,
+            measurement_timestamp=datetime.now().isoformat(),
+            measurement_location=location,
+            evidences=evidences or [],
+            status=MeasurementStatus.MEASURED,
+            confidence_score=confidence_score
+        )
+
+        # 5. 데이터 해시 생성 (무결성 보장)
+        measurement.data_hash = self._generate_data_hash(measurement)
+
+        # 6. 메타데이터 추가
+        measurement.metadata = {
+            'carbon_breakdown': {
+                'transport': carbon_result.transport_emissions,
+                'production': carbon_result.production_emissions,
+                'packaging': carbon_result.packaging_emissions,
+                'total': carbon_result.total_emissions,
+                'baseline': carbon_result.baseline_emissions
+            },
+            'reduction_percentage': carbon_result.reduction_percentage,
+            'pam_tokens': carbon_result.reward_amount,
+            'measurement_version': '1.0'
+        }
+
+        logger.info(f"Activity measured: {measurement_id}, "
+                   f"Carbon savings: {carbon_result.carbon_savings} kg, "
+                   f"Confidence: {confidence_score}%")
+
+        return measurement
+
     def validate_measurement(self, measurement: MeasurementData) -> Tuple[bool, List[str]]:
         """
         측정 데이터 검증
@@ -301,13 +308,25 @@ class MRVMeasurementModule:
         """
         measurements = []
 
-        for activity, method, evidences in activities:
+        # 탄소 계산은 배열 연산으로 한 번에 (실패하면 건별 계산으로 오류 항목만 제외)
+        try:
+            carbon_results = self.carbon_engine.calculate_carbon_footprint_batch(
+                [activity for activity, _, _ in activities])
+        except Exception as e:
+            logger.warning(f"Batch carbon calculation failed, measuring one by one: {e}")
+            carbon_results = None
+
+        for i, (activity, method, evidences) in enumerate(activities):
             try:
-                measurement = self.measure_activity(
-                    activity=activity,
-                    measurement_method=method,
-                    evidences=evidences
-                )
+                if carbon_results is not None:
+                    measurement = self._build_measurement(
+                        activity, carbon_results.result(i), method, evidences)
+                else:
+                    measurement = self.measure_activity(
+                        activity=activity,
+                        measurement_method=method,
+                        evidences=evidences
+                    )
                 measurements.append(measurement)
             except Exception as e:
                 logger.error(f"Failed to measure activity for user {activity.user_id}: {e}")
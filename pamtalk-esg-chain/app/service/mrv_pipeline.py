@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+MRV 스트리밍 측정 파이프라인
+도시 단위 활동 업로드를 MRVMeasurementModule로 병렬 측정
+
+- 입력은 (CarbonActivity, 측정 방법, 증빙 목록) 이터러블, 출력은 MeasurementData 제너레이터
+- 입력을 chunk_size 단위로 읽어 프로세스 풀에 보내고, 끝난 청크부터 바로 내보냄
+- 동시에 처리 중인 청크 수를 max_pending_chunks로 제한해 입력 크기와 관계없이 메모리 사용량 고정
+- 워커는 청크마다 탄소 배치 계산 -> 증빙 해시 -> 측정 데이터 생성(신뢰도, 데이터 해시)을 수행
+- 단계별 처리 시간/처리량과 실패 건수를 get_stats()로 제공
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .carbon_calculation_engine import CarbonActivity
+from .mrv_measurement_module import Evidence, MeasurementData, MRVMeasurementModule
+
+logger = logging.getLogger(__name__)
+
+MeasurementItem = Tuple[CarbonActivity, str, List[Evidence]]
+
+# 워커 측 단계 (read/wait는 호출 프로세스 측)
+WORKER_STAGES = ('calculate', 'evidence_hash', 'measure')
+
+
+# ----------------------------------------------------------------------
+# 워커 측
+# ----------------------------------------------------------------------
+
+_worker_mrv: Optional[MRVMeasurementModule] = None
+
+
+def _init_worker(mrv_factory: Callable[[], MRVMeasurementModule]):
+    """워커 프로세스마다 MRV 모듈(탄소 엔진, 조회 테이블)을 한 번만 생성"""
+    global _worker_mrv
+    _worker_mrv = mrv_factory()
+
+
+def measure_chunk(items: List[MeasurementItem],
+                  mrv: Optional[MRVMeasurementModule] = None) -> Tuple[List[MeasurementData], Dict]:
+    """
+    청크 하나 측정 (워커 프로세스 또는 인라인 실행)
+
+    Returns:
+        (측정 데이터 목록, {'timings': 단계별 초, 'failed': 실패 건수})
+    """
+    mrv = mrv or _worker_mrv or MRVMeasurementModule()
+    timings = dict.fromkeys(WORKER_STAGES, 0.0)
+
+    # 1. 탄소 배치 계산 (실패하면 건별 계산으로 오류 항목만 제외)
+    started = time.perf_counter()
+    try:
+        carbon_results = mrv.carbon_engine.calculate_carbon_footprint_batch(
+            [activity for activity, _, _ in items])
+    except Exception as e:
+        logger.warning(f"Batch carbon calculation failed for chunk, measuring one by one: {e}")
+        carbon_results = None
+    timings['calculate'] = time.perf_counter() - started
+
+    # 2. 증빙 해시 (해시가 없는 증빙만)
+    started = time.perf_counter()
+    for _, _, evidences in items:
+        for evidence in evidences or ():
+            if not evidence.hash:
+                evidence.hash = mrv._generate_evidence_hash(evidence)
+    timings['evidence_hash'] = time.perf_counter() - started
+
+    # 3. 측정 데이터 생성 (신뢰도 점수, 데이터 해시)
+    started = time.perf_counter()
+    measurements = []
+    failed = 0
+    for i, (activity, method, evidences) in enumerate(items):
+        try:
+            if carbon_results is not None:
+                carbon_result = carbon_results.result(i)
+            else:
+                carbon_result = mrv.carbon_engine.calculate_carbon_footprint(activity)
+            measurements.append(mrv._build_measurement(activity, carbon_result, method, evidences))
+        except Exception as e:
+            failed += 1
+            logger.error(f"Failed to measure activity for user {getattr(activity, 'user_id', '?')}: {e}")
+    timings['measure'] = time.perf_counter() - started
+
+    return measurements, {'timings': timings, 'failed': failed}
+
+
+# ----------------------------------------------------------------------
+# 파이프라인 (호출 프로세스)
+# ----------------------------------------------------------------------
+
+class MRVStreamingPipeline:
+    """청크 단위 병렬 MRV 측정 파이프라인"""
+
+    def __init__(self, mrv_factory: Callable[[], MRVMeasurementModule] = MRVMeasurementModule,
+                 chunk_size: int = 1000, max_workers: Optional[int] = None,
+                 max_pending_chunks: Optional[int] = None, ordered: bool = True,
+                 mp_context: str = 'spawn'):
+        """
+        Args:
+            mrv_factory: 워커에서 MRV 모듈을 만드는 모듈 최상위 호출 가능 객체 (pickle 가능해야 함)
+            chunk_size: 워커 한 번에 보내는 활동 수
+            max_workers: 프로세스 수 (기본: CPU 코어 수, 0이면 현재 프로세스에서 순차 처리)
+            max_pending_chunks: 동시에 처리 중/대기 중인 청크 최대 수 (기본: 워커 수 x 2)
+            ordered: True면 입력 순서대로 내보냄, False면 끝난 청크부터
+            mp_context: 워커 시작 방식
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.mrv_factory = mrv_factory
+        self.chunk_size = chunk_size
+        self.max_workers = (multiprocessing.cpu_count() or 1) if max_workers is None else max_workers
+        self.max_pending_chunks = max_pending_chunks or max(2, self.max_workers * 2)
+        self.ordered = ordered
+        self._context = multiprocessing.get_context(mp_context)
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inline_mrv: Optional[MRVMeasurementModule] = None
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self._stats = {
+            'items_read': 0,
+            'measured': 0,
+            'failed': 0,
+            'chunks': 0,
+            'max_in_flight': 0,
+            'stage_seconds': dict.fromkeys(('read',) + WORKER_STAGES + ('wait',), 0.0),
+            'started_at': None,
+            'finished_at': None
+        }
+
+    def stream(self, items: Iterable[MeasurementItem]) -> Iterator[MeasurementData]:
+        """
+        활동을 읽는 대로 측정해 MeasurementData를 하나씩 내보냄
+
+        Args:
+            items: (CarbonActivity, measurement_method, evidences) 이터러블 (제너레이터 가능)
+        """
+        with self._lock:
+            self._reset_stats()
+            self._stats['started_at'] = time.time()
+
+        chunks = self._read_chunks(iter(items))
+        try:
+            if self.max_workers == 0:
+                for chunk in chunks:
+                    yield from self._collect(measure_chunk(chunk, self._get_inline_mrv()))
+            else:
+                yield from self._stream_parallel(chunks)
+        finally:
+            with self._lock:
+                self._stats['finished_at'] = time.time()
+
+    def _read_chunks(self, iterator: Iterator[MeasurementItem]) -> Iterator[List[MeasurementItem]]:
+        while True:
+            started = time.perf_counter()
+            chunk = list(islice(iterator, self.chunk_size))
+            with self._lock:
+                self._stats['stage_seconds']['read'] += time.perf_counter() - started
+                self._stats['items_read'] += len(chunk)
+            if not chunk:
+                return
+            yield chunk
+
+    def _stream_parallel(self, chunks: Iterator[List[MeasurementItem]]) -> Iterator[MeasurementData]:
+        executor = self._get_executor()
+        pending: deque = deque()
+        exhausted = False
+
+        try:
+            while True:
+                # 대기 한도까지 청크 제출
+                while not exhausted and len(pending) < self.max_pending_chunks:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    pending.append(executor.submit(measure_chunk, chunk))
+                    with self._lock:
+                        self._stats['max_in_flight'] = max(self._stats['max_in_flight'], len(pending))
+                if not pending:
+                    return
+
+                started = time.perf_counter()
+                if self.ordered:
+                    future = pending.popleft()
+                    output = future.result()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future = next(iter(done))
+                    pending.remove(future)
+                    output = future.result()
+                with self._lock:
+                    self._stats['stage_seconds']['wait'] += time.perf_counter() - started
+
+                yield from self._collect(output)
+        finally:
+            # 소비자가 중간에 멈추면 아직 시작하지 않은 청크 취소
+            for future in pending:
+                future.cancel()
+
+    def _collect(self, output: Tuple[List[MeasurementData], Dict]) -> List[MeasurementData]:
+        measurements, report = output
+        with self._lock:
+            self._stats['chunks'] += 1
+            self._stats['measured'] += len(measurements)
+            self._stats['failed'] += report['failed']
+            for stage, seconds in report['timings'].items():
+                self._stats['stage_seconds'][stage] += seconds
+        return measurements
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=self._context,
+                    initializer=_init_worker, initargs=(self.mrv_factory,))
+            return self._executor
+
+    def _get_inline_mrv(self) -> MRVMeasurementModule:
+        if self._inline_mrv is None:
+            self._inline_mrv = self.mrv_factory()
+        return self._inline_mrv
+
+    def get_stats(self) -> Dict:
+        """
+        마지막(또는 진행 중) 실행 통계
+
+        stage_seconds의 워커 단계는 모든 워커의 처리 시간 합계이고,
+        items_per_second는 단계별 처리량 (처리 건수 / 단계 시간)입니다.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['stage_seconds'] = dict(self._stats['stage_seconds'])
+
+        processed = stats['measured'] + stats['failed']
+        end = stats['finished_at'] or time.time()
+        elapsed = end - stats['started_at'] if stats['started_at'] else 0.0
+        stats['elapsed_seconds'] = round(elapsed, 4)
+        stats['throughput_per_second'] = round(processed / elapsed, 1) if elapsed > 0 else 0.0
+        stats['items_per_second'] = {
+            stage: round((stats['items_read'] if stage == 'read' else processed) / seconds, 1)
+            for stage, seconds in stats['stage_seconds'].items()
+            if stage != 'wait' and seconds > 0
+        }
+        stats['stage_seconds'] = {stage: round(seconds, 4) for stage, seconds in stats['stage_seconds'].items()}
+        stats['max_workers'] = self.max_workers
+        stats['chunk_size'] = self.chunk_size
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+
+# 벤치마크: python -m app.service.mrv_pipeline [활동 수]
+if __name__ == "__main__":
+    import sys
+    from datetime import datetime
+
+    from .carbon_batch import synthetic_columns
+    from .carbon_calculation_engine import ActivityType
+    from .mrv_measurement_module import EvidenceType
+
+    logging.basicConfig(level=logging.WARNING)
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    columns = synthetic_columns(size)
+
+    def uploads():
+        now = datetime.now().isoformat()
+        for i in range(size):
+            activity = CarbonActivity(
+                activity_type=ActivityType(columns['activity_type'][i]), user_id=f"citizen{i % 5000}",
+                product_name=columns['product_name'][i], quantity=float(columns['quantity'][i]),
+                origin_region=columns['origin_region'][i], destination_region=columns['destination_region'][i],
+                farming_method=columns['farming_method'][i], transport_method=columns['transport_method'][i],
+                packaging_type=columns['packaging_type'][i], activity_date=now)
+            evidence = Evidence(evidence_type=EvidenceType.RECEIPT, file_path=f"/uploads/receipt_{i}.jpg",
+                                timestamp=now)
+            yield activity, 'manual_verified', [evidence]
+
+    with MRVStreamingPipeline(chunk_size=2000) as pipeline:
+        total_savings = sum(m.carbon_savings_kg for m in pipeline.stream(uploads()))
+        stats = pipeline.get_stats()
+
+    print("=== MRV 스트리밍 측정 ===")
+    print(f"측정: {stats['measured']:,}건 (실패 {stats['failed']}건), 워커 {stats['max_workers']}개")
+    print(f"전체 처리량: {stats['throughput_per_second']:,}건/초 ({stats['elapsed_seconds']}초)")
+    print(f"단계별 처리량: {stats['items_per_second']}")
+    print(f"총 탄소 절약량: {total_savings:,.1f} kg CO2")
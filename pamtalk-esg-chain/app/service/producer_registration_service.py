@@ -3,21 +3,23 @@ Producer Registration Service
 Handles registration and verification of agricultural and fisheries producers
 """
 
-import sqlite3
 from datetime import datetime, date
 from typing import List, Dict, Optional, Any
 import json
 
+from app.utils.sqlite_pool import get_sqlite_pool
+
 
 class ProducerRegistrationService:
     """Service for managing local producer registration"""
 
     def __init__(self, db_path: str = "pamtalk_esg.db"):
         self.db_path = db_path
+        self.pool = get_sqlite_pool(db_path)
 
     def _get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get pooled database connection (close() returns it to the pool)"""
+        return self.pool.acquire()
 
     def _dict_factory(self, cursor, row):
         """Convert database rows to dictionaries"""
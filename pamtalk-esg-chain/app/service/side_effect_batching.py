@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+부가 작업 배치 큐
+작업을 메모리에 모아 종류별 처리기로 한 번에 기록하고, 실패한 배치는 지수 백오프로
+재시도하며 최대 재시도 초과 시 dead letter로 보관 (DB에 의존하지 않는 공통 로직)
+
+전달 보장: 최대 한 번 (at-most-once)
+- 대기 작업은 프로세스 메모리에만 있으며 영속화하지 않음
+- 정상 종료 시 shutdown()이 남은 작업을 한 번 더 기록하지만, 비정상 종료(크래시, SIGKILL,
+  OOM)나 shutdown 중 실패한 작업은 기록 없이 사라짐
+- 따라서 유실되어도 되거나 원본 데이터로 다시 계산할 수 있는 파생 값에만 사용
+  - 프로필 카운터: BatchService의 RECOMPUTE_SOCIAL_COUNTERS 작업이 원본 테이블 기준으로 재계산
+  - 트렌드 언급 수: 일간 값은 cleanup_old_trends에서 초기화될 때까지 어긋난 채로 남음
+  - 알림: 유실되면 다시 만들지 않음
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SideEffectTask:
+    """부가 작업 단위"""
+    kind: str
+    payload: Dict
+    attempts: int = 0
+    not_before: float = 0.0
+    created_at: float = field(default_factory=time.time)
+
+
+class BatchedSideEffectQueue:
+    """종류별 배치 처리 + 재시도 + dead letter 메모리 큐 (최대 한 번 전달)"""
+
+    def __init__(self, flush_interval: float = 0.5, max_batch: int = 1000,
+                 max_retries: int = 5, retry_backoff: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.clock = clock
+
+        self._pending: deque = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._running = False
+
+        self.dead_letters: deque = deque(maxlen=1000)
+        self.stats = {
+            'submitted': 0,
+            'flushes': 0,
+            'statements': 0,
+            'tasks_applied': 0,
+            'retries': 0,
+            'dead_lettered': 0
+        }
+
+        # 종류별 배치 처리기
+        self._handlers: Dict[str, Callable[[List[SideEffectTask]], int]] = {}
+
+    # ========== 작업 등록 ==========
+
+    def register_handler(self, kind: str, handler: Callable[[List[SideEffectTask]], int]):
+        """작업 종류별 배치 처리기 등록 (handler는 실행한 SQL 문 수를 반환)"""
+        self._handlers[kind] = handler
+
+    def submit(self, kind: str, payload: Dict):
+        """작업 등록 (즉시 반환)"""
+        if kind not in self._handlers:
+            raise ValueError(f"알 수 없는 부가 작업 종류: {kind}")
+
+        with self._lock:
+            self._pending.append(SideEffectTask(kind=kind, payload=payload))
+            self.stats['submitted'] += 1
+            backlog = len(self._pending)
+
+        self._ensure_worker()
+        if backlog >= self.max_batch:
+            self._wakeup.set()
+
+    # ========== 플러시 ==========
+
+    def flush(self) -> Dict[str, int]:
+        """
+        실행 가능한 대기 작업을 종류별로 묶어 기록
+
+        Returns:
+            종류별 처리된 작업 수
+        """
+        with self._flush_lock:
+            now = self.clock()
+            ready: List[SideEffectTask] = []
+            with self._lock:
+                waiting = deque()
+                while self._pending:
+                    task = self._pending.popleft()
+                    if task.not_before <= now:
+                        ready.append(task)
+                    else:
+                        waiting.append(task)
+                self._pending.extendleft(reversed(waiting))
+
+            if not ready:
+                return {}
+
+            by_kind: Dict[str, List[SideEffectTask]] = {}
+            for task in ready:
+                by_kind.setdefault(task.kind, []).append(task)
+
+            applied = {}
+            for kind, tasks in by_kind.items():
+                for start in range(0, len(tasks), self.max_batch):
+                    chunk = tasks[start:start + self.max_batch]
+                    try:
+                        self.stats['statements'] += self._handlers[kind](chunk)
+                        self.stats['tasks_applied'] += len(chunk)
+                        applied[kind] = applied.get(kind, 0) + len(chunk)
+                    except Exception as e:
+                        logger.warning(f"부가 작업 배치 실패 ({kind}, {len(chunk)}건): {e}")
+                        self._schedule_retry(chunk, str(e))
+
+            self.stats['flushes'] += 1
+            return applied
+
+    def _schedule_retry(self, tasks: List[SideEffectTask], error: str):
+        now = self.clock()
+        retry = []
+        for task in tasks:
+            task.attempts += 1
+            if task.attempts > self.max_retries:
+                self.dead_letters.append({'task': task, 'error': error})
+                self.stats['dead_lettered'] += 1
+                logger.error(f"부가 작업 최종 실패: {task.kind} {task.payload} - {error}")
+            else:
+                task.not_before = now + self.retry_backoff * (2 ** (task.attempts - 1))
+                retry.append(task)
+                self.stats['retries'] += 1
+
+        with self._lock:
+            self._pending.extend(retry)
+
+    # ========== 백그라운드 워커 ==========
+
+    def _ensure_worker(self):
+        if self._running:
+            return
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._worker = threading.Thread(target=self._worker_loop, daemon=True,
+                                            name='post-side-effects')
+            self._worker.start()
+
+    def _worker_loop(self):
+        while self._running:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"부가 작업 파이프라인 오류: {e}")
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'pending': self.pending_count(),
+            'dead_letters': len(self.dead_letters)
+        }
+
+    def shutdown(self, timeout: float = 5.0):
+        """
+        워커를 멈추고 남은 작업을 한 번 기록
+
+        재시도 대기 중이던 작업도 백오프를 무시하고 시도하며, 이때 실패한 작업은
+        대기열에 남은 채 프로세스와 함께 사라짐 (최대 한 번 전달)
+        """
+        self._running = False
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+        with self._lock:
+            for task in self._pending:
+                task.not_before = 0.0
+        self.flush()
+        lost = self.pending_count()
+        if lost:
+            logger.error(f"종료 시 기록하지 못한 부가 작업 {lost}건 유실")
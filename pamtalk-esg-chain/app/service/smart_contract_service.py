@@ -104,17 +104,7 @@ class SmartContractService:
             params = self.algod_client.suggested_params()
 
             # 애플리케이션 호출 트랜잭션
-            app_args = [method.encode()]
-            if args:
-                app_args.extend([arg.encode() if isinstance(arg, str) else arg for arg in args])
-
-            app_call_txn = transaction.ApplicationCallTxn(
-                sender=sender_address,
-                sp=params,
-                index=app_id,
-                on_complete=0,  # NoOp
-                app_args=app_args
-            )
+            app_call_txn = self.build_contract_call_txn(app_id, method, args, sender_address, params)
 
             # 트랜잭션 서명 및 전송
             signed_txn = app_call_txn.sign(sender_private_key)
@@ -137,6 +127,20 @@ class SmartContractService:
             print(f"[❌ 스마트계약 호출 실패] {str(e)}")
             raise Exception(f"스마트계약 호출 실패: {str(e)}")
 
+    def build_contract_call_txn(self, app_id, method, args, sender_address, params):
+        """스마트계약 메서드 호출 트랜잭션 생성 (서명 전)"""
+        app_args = [method.encode()]
+        if args:
+            app_args.extend([arg.encode() if isinstance(arg, str) else arg for arg in args])
+
+        return transaction.ApplicationCallTxn(
+            sender=sender_address,
+            sp=params,
+            index=app_id,
+            on_complete=0,  # NoOp
+            app_args=app_args
+        )
+
     def set_user_role(self, app_id, target_address, role):
         """사용자 역할 설정"""
         return self.call_contract_method(
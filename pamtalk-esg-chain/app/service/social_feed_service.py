@@ -12,6 +12,8 @@ from dataclasses import dataclass
 
 from app.utils.db_pool import db_service
 from app.service.carbon_tracking_service import carbon_tracking_service
+from app.service.social_timeline_service import social_timeline_service
+from app.service.social_side_effect_pipeline import post_side_effect_pipeline
 
 
 @dataclass
@@ -39,6 +41,8 @@ class SocialFeedService:
     def __init__(self):
         self.db = db_service
         self.carbon_service = carbon_tracking_service
+        self.timeline_service = social_timeline_service
+        self.side_effects = post_side_effect_pipeline
 
     def create_social_profile(self, user_id: str, profile_data: Dict) -> int:
         """소셜 프로필 생성"""
@@ -103,8 +107,13 @@ class SocialFeedService:
         result = self.db.pool.execute_query(query, params, fetch='one')
         post_id = result['id']
 
-        # 포스트 생성 시 관련 처리
-        self._post_creation_tasks(user_id, post_id, post_data)
+        # 작성자/팔로워 타임라인에 펼침 (캐시 무효화 포함)
+        # 물리화 타임라인은 다시 만드는 작업이 없으므로 유실될 수 있는 파이프라인에 넣지 않고 바로 기록
+        if post_data.get('status', 'published') == 'published':
+            self.timeline_service.fan_out_post(user_id, post_id)
+
+        # 포스트 생성 시 관련 처리 (백그라운드 배치 파이프라인에 등록)
+        self._post_creation_tasks(user_id, post_id, post_data, hashtags)
 
         return post_id
 
@@ -140,28 +149,21 @@ class SocialFeedService:
         return self.create_post(user_id, post_data)
 
     def get_user_feed(self, user_id: str, page: int = 1, limit: int = 20,
-                      feed_type: str = 'timeline') -> Dict:
-        """사용자 개인화 피드 조회"""
+                      feed_type: str = 'timeline', cursor: Optional[str] = None) -> Dict:
+        """
+        사용자 개인화 피드 조회
 
-        offset = (page - 1) * limit
+        timeline 피드는 물리화 타임라인과 키셋 커서로 조회합니다. 다음 페이지는
+        응답의 next_cursor를 cursor로 전달하여 요청합니다. cursor 없이 page만 주면
+        오프셋 방식으로 해당 페이지를 돌려줍니다 (기존 클라이언트 호환).
+        """
 
         if feed_type == 'timeline':
-            # 팔로우한 사용자들의 포스트 + 본인 포스트
-            query = """
-                SELECT p.*, sp.display_name, sp.avatar_url, sp.is_verified
-                FROM social_posts p
-                JOIN social_profiles sp ON p.user_id = sp.user_id
-                WHERE (p.user_id = %s
-                       OR p.user_id IN (
-                           SELECT following_id FROM social_follows WHERE follower_id = %s
-                       ))
-                AND p.status = 'published'
-                ORDER BY p.published_at DESC
-                LIMIT %s OFFSET %s
-            """
-            params = (user_id, user_id, limit, offset)
+            return self._get_timeline_feed(user_id, page, limit, cursor)
+
+        offset = (page - 1) * limit
 
-        elif feed_type == 'discover':
+        if feed_type == 'discover':
             # 트렌딩 포스트 (높은 참여도)
             query = """
                 SELECT p.*, sp.display_name, sp.avatar_url, sp.is_verified
@@ -218,6 +220,24 @@ class SocialFeedService:
             'has_more': len(processed_posts) == limit
         }
 
+    def _get_timeline_feed(self, user_id: str, page: int, limit: int,
+                           cursor: Optional[str]) -> Dict:
+        """팔로우한 사용자들의 포스트 + 본인 포스트 (키셋 페이지네이션)"""
+        offset = 0 if cursor else max(page - 1, 0) * limit
+        timeline = self.timeline_service.get_timeline_page(user_id, limit=limit, cursor=cursor,
+                                                           offset=offset)
+        post_ids = [post_id for _, post_id in timeline['entries']]
+        posts = self.timeline_service.hydrate_posts(post_ids)
+
+        return {
+            'posts': [self._process_post_data(post) for post in posts],
+            'page': page,
+            'limit': limit,
+            'feed_type': 'timeline',
+            'next_cursor': timeline['next_cursor'],
+            'has_more': timeline['has_more']
+        }
+
     def get_regional_feed(self, region: str, page: int = 1, limit: int = 20) -> Dict:
         """지역별 피드 조회"""
         offset = (page - 1) * limit
@@ -377,6 +397,7 @@ class SocialFeedService:
             """
 
             self.db.pool.execute_query(query, (follower_id, following_id), fetch=None)
+            self.timeline_service.on_follow(follower_id, following_id)
 
             # 팔로우 알림 생성
             self._create_notification(
@@ -401,6 +422,7 @@ class SocialFeedService:
             """
 
             self.db.pool.execute_query(query, (follower_id, following_id), fetch=None)
+            self.timeline_service.on_unfollow(follower_id, following_id)
             return True
 
         except Exception:
@@ -547,11 +569,18 @@ class SocialFeedService:
         else:
             return "방금 전"
 
-    def _post_creation_tasks(self, user_id: str, post_id: int, post_data: Dict):
-        """포스트 생성 후 처리 작업"""
+    def _post_creation_tasks(self, user_id: str, post_id: int, post_data: Dict,
+                             hashtags: List[str] = None):
+        """
+        포스트 생성 후 처리 작업
+
+        해시태그 트렌딩, 포스트 카운트는 부가 작업 파이프라인에 등록만 하고 즉시
+        반환합니다. 파이프라인이 플러시 구간마다 모아서 기록합니다 (최대 한 번 전달).
+        """
 
         # 해시태그 트렌딩 업데이트
-        hashtags = post_data.get('hashtags', [])
+        if hashtags is None:
+            hashtags = post_data.get('hashtags', [])
         for hashtag in hashtags:
             self._update_hashtag_trending(hashtag)
 
@@ -575,47 +604,28 @@ class SocialFeedService:
         return dict(result) if result else None
 
     def _update_hashtag_trending(self, hashtag: str):
-        """해시태그 트렌딩 점수 업데이트"""
-        query = """
-            INSERT INTO trending_topics (topic_name, hashtag, daily_mentions, trend_score)
-            VALUES (%s, %s, 1, 1.0)
-            ON CONFLICT (hashtag) DO UPDATE SET
-                daily_mentions = trending_topics.daily_mentions + 1,
-                trend_score = trending_topics.trend_score + 0.1,
-                last_mention_at = CURRENT_TIMESTAMP,
-                updated_at = CURRENT_TIMESTAMP
-        """
-
-        topic_name = hashtag.replace('#', '')
-        self.db.pool.execute_query(query, (topic_name, hashtag), fetch=None)
+        """해시태그 트렌딩 점수 업데이트 (파이프라인에서 해시태그별로 합산하여 기록)"""
+        self.side_effects.enqueue_hashtag_mentions([hashtag])
 
     def _increment_user_posts_count(self, user_id: str):
-        """사용자 포스트 카운트 증가"""
-        query = """
-            UPDATE social_profiles
-            SET posts_count = posts_count + 1
-            WHERE user_id = %s
-        """
-        self.db.pool.execute_query(query, (user_id,), fetch=None)
+        """사용자 포스트 카운트 증가 (파이프라인에서 사용자별로 합산하여 기록)"""
+        self.side_effects.enqueue_post_count(user_id)
 
     def _create_notification(self, user_id: str, notification_type: str,
                            triggered_by_user_id: str, title: str, message: str,
                            **kwargs):
-        """알림 생성"""
-        query = """
-            INSERT INTO social_notifications
-            (user_id, notification_type, triggered_by_user_id, title, message,
-             post_id, comment_id, group_id)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-
-        params = (
-            user_id, notification_type, triggered_by_user_id, title, message,
-            kwargs.get('post_id'), kwargs.get('comment_id'), kwargs.get('group_id')
+        """알림 생성 (파이프라인에서 다중 행 INSERT로 기록)"""
+        self.side_effects.enqueue_notification(
+            user_id=user_id,
+            notification_type=notification_type,
+            triggered_by_user_id=triggered_by_user_id,
+            title=title,
+            message=message,
+            post_id=kwargs.get('post_id'),
+            comment_id=kwargs.get('comment_id'),
+            group_id=kwargs.get('group_id')
         )
 
-        self.db.pool.execute_query(query, params, fetch=None)
-
 
 # 서비스 인스턴스
 social_feed_service = SocialFeedService()
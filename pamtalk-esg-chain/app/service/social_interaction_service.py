@@ -689,21 +689,11 @@ class SocialInteractionService:
     def _create_notification(self, user_id: str, notification_type: str,
                            triggered_by_user_id: str, title: str, message: str,
                            **kwargs):
-        """알림 생성"""
-        query = """
-            INSERT INTO social_notifications
-            (user_id, notification_type, triggered_by_user_id, title, message,
-             post_id, comment_id, group_id)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-
-        params = (
-            user_id, notification_type, triggered_by_user_id, title, message,
-            kwargs.get('post_id'), kwargs.get('comment_id'), kwargs.get('group_id')
+        """알림 생성 (피드 서비스의 부가 작업 파이프라인으로 배치 기록)"""
+        self.feed_service._create_notification(
+            user_id, notification_type, triggered_by_user_id, title, message, **kwargs
         )
 
-        self.db.pool.execute_query(query, params, fetch=None)
-
 
 # 서비스 인스턴스
 social_interaction_service = SocialInteractionService()
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+소셜 포스트 부가 작업 파이프라인
+포스트 생성 후 처리(해시태그 트렌딩, 포스트 카운트, 알림)를 백그라운드에서 모아 배치로 기록
+(타임라인 팬아웃은 유실되면 복구할 수 없으므로 포스트 생성 시 바로 기록)
+
+- 해시태그 언급: 플러시 구간 동안 해시태그별로 합산하여 한 번의 다중 행 UPSERT
+- 포스트 카운트: 사용자별로 합산하여 한 번의 UPDATE ... FROM (VALUES ...)
+- 알림: 한 번의 다중 행 INSERT
+- 실패한 배치는 지수 백오프로 재시도하고, 최대 재시도 초과 시 dead letter로 보관
+- 대기열은 메모리에만 있으므로 전달 보장은 최대 한 번 (at-most-once)
+  크래시/SIGKILL 시 아직 기록하지 않은 알림·카운트는 유실됨 (side_effect_batching 참고)
+  프로필 카운터는 recompute_profile_counters (BatchService RECOMPUTE_SOCIAL_COUNTERS 작업)로
+  원본 테이블 기준 재계산하며, 유실된 알림은 복구되지 않음
+"""
+
+import time
+import atexit
+import logging
+from collections import Counter
+from typing import Callable, Dict, List
+
+from psycopg2.extras import execute_values
+
+from app.service.side_effect_batching import BatchedSideEffectQueue, SideEffectTask
+from app.utils.db_pool import db_service
+
+logger = logging.getLogger(__name__)
+
+# 원본 테이블 기준 실제 카운트 (삭제된 포스트 제외)
+_ACTUAL_PROFILE_COUNTERS = """
+    SELECT profile.user_id,
+           COALESCE(p.n, 0) AS posts_count,
+           COALESCE(fr.n, 0) AS followers_count,
+           COALESCE(fg.n, 0) AS following_count
+    FROM social_profiles profile
+    LEFT JOIN (SELECT user_id, COUNT(*) AS n FROM social_posts
+               WHERE status <> 'deleted' GROUP BY user_id) p ON p.user_id = profile.user_id
+    LEFT JOIN (SELECT following_id, COUNT(*) AS n FROM social_follows
+               GROUP BY following_id) fr ON fr.following_id = profile.user_id
+    LEFT JOIN (SELECT follower_id, COUNT(*) AS n FROM social_follows
+               GROUP BY follower_id) fg ON fg.follower_id = profile.user_id
+"""
+
+_COUNTERS_DIFFER = """
+    (sp.posts_count, sp.followers_count, sp.following_count)
+    IS DISTINCT FROM (a.posts_count, a.followers_count, a.following_count)
+"""
+
+PROFILE_COUNTER_MISMATCH_SQL = f"""
+    SELECT sp.user_id,
+           sp.posts_count, sp.followers_count, sp.following_count,
+           a.posts_count AS actual_posts_count,
+           a.followers_count AS actual_followers_count,
+           a.following_count AS actual_following_count
+    FROM social_profiles sp
+    JOIN ({_ACTUAL_PROFILE_COUNTERS}) a ON a.user_id = sp.user_id
+    WHERE {_COUNTERS_DIFFER}
+    ORDER BY sp.user_id
+"""
+
+PROFILE_COUNTER_REPAIR_SQL = f"""
+    UPDATE social_profiles AS sp
+    SET posts_count = a.posts_count,
+        followers_count = a.followers_count,
+        following_count = a.following_count
+    FROM ({_ACTUAL_PROFILE_COUNTERS}) a
+    WHERE sp.user_id = a.user_id AND {_COUNTERS_DIFFER}
+    RETURNING sp.user_id
+"""
+
+
+class PostSideEffectPipeline(BatchedSideEffectQueue):
+    """포스트 생성 부가 작업 배치 파이프라인 (최대 한 번 전달)"""
+
+    HASHTAG_MENTION = 'hashtag_mention'
+    POST_COUNT = 'post_count'
+    NOTIFICATION = 'notification'
+
+    def __init__(self, db=None, flush_interval: float = 0.5, max_batch: int = 1000,
+                 max_retries: int = 5, retry_backoff: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__(flush_interval=flush_interval, max_batch=max_batch,
+                         max_retries=max_retries, retry_backoff=retry_backoff, clock=clock)
+        self.db = db or db_service
+
+        self.register_handler(self.HASHTAG_MENTION, self._flush_hashtag_mentions)
+        self.register_handler(self.POST_COUNT, self._flush_post_counts)
+        self.register_handler(self.NOTIFICATION, self._flush_notifications)
+
+    # ========== 작업 등록 ==========
+
+    def enqueue_hashtag_mentions(self, hashtags: List[str]):
+        for hashtag in hashtags:
+            self.submit(self.HASHTAG_MENTION, {'hashtag': hashtag})
+
+    def enqueue_post_count(self, user_id: str, delta: int = 1):
+        self.submit(self.POST_COUNT, {'user_id': user_id, 'delta': delta})
+
+    def enqueue_notification(self, user_id: str, notification_type: str,
+                             triggered_by_user_id: str, title: str, message: str,
+                             post_id: int = None, comment_id: int = None, group_id: int = None):
+        self.submit(self.NOTIFICATION, {
+            'user_id': user_id,
+            'notification_type': notification_type,
+            'triggered_by_user_id': triggered_by_user_id,
+            'title': title,
+            'message': message,
+            'post_id': post_id,
+            'comment_id': comment_id,
+            'group_id': group_id
+        })
+
+    # ========== 배치 처리기 ==========
+
+    def _flush_hashtag_mentions(self, tasks: List[SideEffectTask]) -> int:
+        mentions = Counter(task.payload['hashtag'] for task in tasks)
+        rows = [
+            (hashtag.replace('#', ''), hashtag, count, 1.0 + 0.1 * (count - 1))
+            for hashtag, count in mentions.items()
+        ]
+
+        query = """
+            INSERT INTO trending_topics (topic_name, hashtag, daily_mentions, trend_score)
+            VALUES %s
+            ON CONFLICT (hashtag, (COALESCE(region, ''))) DO UPDATE SET
+                daily_mentions = trending_topics.daily_mentions + EXCLUDED.daily_mentions,
+                trend_score = trending_topics.trend_score + 0.1 * EXCLUDED.daily_mentions,
+                last_mention_at = CURRENT_TIMESTAMP,
+                updated_at = CURRENT_TIMESTAMP
+        """
+        self._execute_values(query, rows)
+        return 1
+
+    def _flush_post_counts(self, tasks: List[SideEffectTask]) -> int:
+        deltas = Counter()
+        for task in tasks:
+            deltas[task.payload['user_id']] += task.payload.get('delta', 1)
+
+        query = """
+            UPDATE social_profiles AS sp
+            SET posts_count = sp.posts_count + v.delta
+            FROM (VALUES %s) AS v(user_id, delta)
+            WHERE sp.user_id = v.user_id
+        """
+        self._execute_values(query, list(deltas.items()))
+        return 1
+
+    def _flush_notifications(self, tasks: List[SideEffectTask]) -> int:
+        rows = [
+            (
+                p['user_id'], p['notification_type'], p['triggered_by_user_id'],
+                p['title'], p['message'], p.get('post_id'), p.get('comment_id'),
+                p.get('group_id')
+            )
+            for p in (task.payload for task in tasks)
+        ]
+
+        query = """
+            INSERT INTO social_notifications
+            (user_id, notification_type, triggered_by_user_id, title, message,
+             post_id, comment_id, group_id)
+            VALUES %s
+        """
+        self._execute_values(query, rows)
+        return 1
+
+    # ========== 카운터 재계산 ==========
+
+    def recompute_profile_counters(self, repair: bool = True) -> Dict:
+        """
+        프로필 카운터(포스트/팔로워/팔로잉 수)를 원본 테이블 기준으로 검증/복구
+
+        파이프라인이 유실한 포스트 카운트와, 따로 갱신하는 경로가 없는 팔로워/팔로잉 수를
+        social_posts / social_follows에서 다시 셉니다. 실행 시점에 아직 플러시되지 않은
+        증분은 복구 후 더해지므로 다음 실행에서 다시 맞춰집니다.
+
+        Args:
+            repair: 불일치 프로필을 실제 값으로 갱신할지 여부
+
+        Returns:
+            {'mismatches': [...], 'repaired_users': [...], 'elapsed_seconds': float}
+        """
+        started = time.monotonic()
+        with self.db.pool.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(PROFILE_COUNTER_MISMATCH_SQL)
+                    mismatches = [dict(row) for row in cursor.fetchall()]
+
+                    repaired = []
+                    if repair and mismatches:
+                        cursor.execute(PROFILE_COUNTER_REPAIR_SQL)
+                        repaired = sorted(row['user_id'] for row in cursor.fetchall())
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        if mismatches:
+            logger.warning(f"프로필 카운터 불일치 {len(mismatches)}건 (복구 {len(repaired)}건)")
+
+        return {
+            'mismatches': mismatches,
+            'repaired_users': repaired,
+            'elapsed_seconds': time.monotonic() - started
+        }
+
+    def _execute_values(self, query: str, rows: List[tuple]):
+        """다중 행 쿼리를 하나의 트랜잭션으로 실행"""
+        with self.db.pool.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    execute_values(cursor, query, rows, page_size=max(len(rows), 1))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+
+# 서비스 인스턴스
+post_side_effect_pipeline = PostSideEffectPipeline()
+atexit.register(post_side_effect_pipeline.shutdown)
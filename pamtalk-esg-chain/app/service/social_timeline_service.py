@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+소셜 타임라인 서비스
+사용자별 물리화 타임라인 (fan-out-on-write / fan-out-on-read 혼합) 및 키셋 페이지네이션
+
+- 일반 계정의 포스트: 작성 시 팔로워 타임라인(social_timelines)에 한 번의 INSERT ... SELECT로 펼침
+- 팔로워가 많은 계정의 포스트: 펼치지 않고 조회 시 작성자별 최근 포스트와 병합
+  한 번이라도 펼치지 않은 포스트를 쓴 작성자는 social_timeline_read_authors에 남아,
+  팔로워 수가 기준 아래로 내려가도 계속 조회 시 병합 (그 기간의 포스트가 피드에서 빠지지 않도록)
+- 페이지네이션: OFFSET 대신 (published_at, post_id) 커서 사용
+- 캐시: 사용자별 타임라인 앞부분과 대형 계정의 최근 포스트를 프로세스 메모리에 유지
+  쓰기를 처리한 프로세스의 캐시만 즉시 무효화되고 다른 웹 워커는 TTL이 지날 때까지 이전 값을
+  보므로, 기본 TTL(TIMELINE_CACHE_TTL)을 5초로 짧게 둠 (다른 워커에서는 최대 TTL만큼 늦게 보임)
+"""
+
+import os
+from typing import Dict, List, Optional
+
+from app.service.timeline_paging import (
+    TimelineCache, TimelineEntry, decode_cursor, encode_cursor, merge_timelines
+)
+from app.utils.db_pool import db_service
+
+class SocialTimelineService:
+    """사용자별 물리화 타임라인 관리 서비스"""
+
+    def __init__(self, db=None):
+        self.db = db or db_service
+
+        # 팔로워 수가 이 값 이상인 계정은 fan-out-on-read
+        self.high_follower_threshold = int(os.getenv('TIMELINE_HIGH_FOLLOWER_THRESHOLD', '5000'))
+        # 캐시에 유지할 타임라인 앞부분 항목 수
+        self.head_size = int(os.getenv('TIMELINE_CACHE_HEAD_SIZE', '200'))
+        # 팔로우 시 타임라인에 채워 넣을 과거 포스트 수
+        self.follow_backfill_limit = int(os.getenv('TIMELINE_FOLLOW_BACKFILL', '100'))
+
+        # 워커 간 무효화 채널이 없으므로 다른 워커의 변경이 보이기까지의 최대 지연
+        cache_ttl = float(os.getenv('TIMELINE_CACHE_TTL', '5'))
+        cache_size = int(os.getenv('TIMELINE_CACHE_SIZE', '10000'))
+
+        # user_id -> 타임라인 앞부분 [(published_at, post_id), ...]
+        self.inbox_cache = TimelineCache(max_size=cache_size, ttl=cache_ttl)
+        # user_id -> 팔로우 중인 대형 계정 목록
+        self.celebrity_cache = TimelineCache(max_size=cache_size, ttl=cache_ttl)
+        # author_id -> 대형 계정의 최근 포스트 [(published_at, post_id), ...]
+        self.outbox_cache = TimelineCache(max_size=max(cache_size // 10, 100), ttl=cache_ttl)
+
+    # ========== 쓰기 경로 ==========
+
+    def fan_out_post(self, author_id: str, post_id: int) -> int:
+        """
+        새 포스트를 타임라인에 펼침
+
+        일반 계정은 작성자와 모든 팔로워의 타임라인에 한 번의 쿼리로 삽입하고,
+        대형 계정은 작성자 본인 타임라인에만 기록합니다.
+
+        Returns:
+            포스트가 삽입된 타임라인 수
+        """
+        if self.is_high_follower(author_id):
+            # 팔로워 타임라인에는 펼치지 않으므로 작성자를 조회 시 병합 대상으로 남김
+            query = """
+                WITH read_author AS (
+                    INSERT INTO social_timeline_read_authors (author_id)
+                    VALUES (%s)
+                    ON CONFLICT (author_id) DO NOTHING
+                )
+                INSERT INTO social_timelines (user_id, post_id, author_id, published_at)
+                SELECT p.user_id, p.id, p.user_id, p.published_at
+                FROM social_posts p
+                WHERE p.id = %s
+                ON CONFLICT (user_id, post_id) DO NOTHING
+                RETURNING user_id
+            """
+            params = (author_id, post_id)
+        else:
+            query = """
+                INSERT INTO social_timelines (user_id, post_id, author_id, published_at)
+                SELECT r.user_id, p.id, p.user_id, p.published_at
+                FROM social_posts p
+                CROSS JOIN (
+                    SELECT %s::VARCHAR AS user_id
+                    UNION
+                    SELECT follower_id FROM social_follows WHERE following_id = %s
+                ) r
+                WHERE p.id = %s
+                ON CONFLICT (user_id, post_id) DO NOTHING
+                RETURNING user_id
+            """
+            params = (author_id, author_id, post_id)
+
+        recipients = self._execute_write(query, params, returning=True)
+
+        self.inbox_cache.invalidate(*[row['user_id'] for row in recipients])
+        self.outbox_cache.invalidate(author_id)
+        return len(recipients)
+
+    def on_follow(self, follower_id: str, following_id: str):
+        """팔로우 시 과거 포스트 채워 넣기 및 캐시 무효화"""
+        if not self.is_high_follower(following_id):
+            query = """
+                INSERT INTO social_timelines (user_id, post_id, author_id, published_at)
+                SELECT %s, p.id, p.user_id, p.published_at
+                FROM social_posts p
+                WHERE p.user_id = %s AND p.status = 'published'
+                ORDER BY p.published_at DESC, p.id DESC
+                LIMIT %s
+                ON CONFLICT (user_id, post_id) DO NOTHING
+            """
+            self._execute_write(query, (follower_id, following_id, self.follow_backfill_limit))
+
+        self.inbox_cache.invalidate(follower_id)
+        self.celebrity_cache.invalidate(follower_id)
+
+    def on_unfollow(self, follower_id: str, following_id: str):
+        """언팔로우 시 해당 작성자의 포스트를 타임라인에서 제거 및 캐시 무효화"""
+        query = """
+            DELETE FROM social_timelines
+            WHERE user_id = %s AND author_id = %s
+        """
+        self._execute_write(query, (follower_id, following_id))
+
+        self.inbox_cache.invalidate(follower_id)
+        self.celebrity_cache.invalidate(follower_id)
+
+    def _execute_write(self, query: str, params: tuple, returning: bool = False):
+        """
+        쓰기 쿼리를 실행하고 커밋 (pool.execute_query는 커밋하지 않아 반환 시 롤백됨)
+
+        Returns:
+            returning이면 RETURNING 행 목록, 아니면 영향받은 행 수
+        """
+        with self.db.pool.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(query, params)
+                    result = cursor.fetchall() if returning else cursor.rowcount
+                conn.commit()
+                return result
+            except Exception:
+                conn.rollback()
+                raise
+
+    # ========== 읽기 경로 ==========
+
+    def get_timeline_page(self, user_id: str, limit: int = 20,
+                          cursor: Optional[str] = None, offset: int = 0) -> Dict:
+        """
+        타임라인 한 페이지 조회 (키셋 페이지네이션)
+
+        Args:
+            offset: 커서 없이 page로 요청한 클라이언트용 건너뛸 항목 수
+                    (앞쪽 항목을 모두 읽으므로 깊은 페이지는 cursor 사용 권장)
+
+        Returns:
+            {'entries': [(published_at, post_id), ...], 'next_cursor': str | None}
+        """
+        before = decode_cursor(cursor) if cursor else None
+
+        # offset + limit + 1개를 가져와 다음 페이지 존재 여부 판단
+        fetch_count = offset + limit + 1
+        sources = [self._get_inbox_entries(user_id, fetch_count, before)]
+        for author_id in self._get_celebrity_followees(user_id):
+            sources.append(self._get_outbox_entries(author_id, fetch_count, before))
+
+        entries = merge_timelines(sources, limit + 1, before, offset=offset)
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+
+        return {
+            'entries': entries,
+            'next_cursor': encode_cursor(entries[-1]) if has_more and entries else None,
+            'has_more': has_more
+        }
+
+    def hydrate_posts(self, post_ids: List[int]) -> List[Dict]:
+        """포스트 ID 목록을 한 번의 쿼리로 조회하여 입력 순서대로 반환"""
+        if not post_ids:
+            return []
+
+        query = """
+            SELECT p.*, sp.display_name, sp.avatar_url, sp.is_verified
+            FROM social_posts p
+            JOIN social_profiles sp ON p.user_id = sp.user_id
+            WHERE p.id = ANY(%s) AND p.status = 'published'
+        """
+        rows = self.db.pool.execute_query(query, (list(post_ids),))
+        by_id = {row['id']: dict(row) for row in rows}
+        return [by_id[post_id] for post_id in post_ids if post_id in by_id]
+
+    def is_high_follower(self, user_id: str) -> bool:
+        """팔로워 수 기준 대형 계정 여부"""
+        query = "SELECT followers_count FROM social_profiles WHERE user_id = %s"
+        result = self.db.pool.execute_query(query, (user_id,), fetch='one')
+        return bool(result) and (result['followers_count'] or 0) >= self.high_follower_threshold
+
+    def get_cache_stats(self) -> Dict:
+        """타임라인 캐시 통계"""
+        return {
+            'inbox': {**self.inbox_cache.stats, 'size': len(self.inbox_cache)},
+            'celebrity': {**self.celebrity_cache.stats, 'size': len(self.celebrity_cache)},
+            'outbox': {**self.outbox_cache.stats, 'size': len(self.outbox_cache)}
+        }
+
+    def _get_inbox_entries(self, user_id: str, count: int,
+                           before: Optional[TimelineEntry]) -> List[TimelineEntry]:
+        return self._read_through(self.inbox_cache, self._query_inbox, user_id, count, before)
+
+    def _get_outbox_entries(self, author_id: str, count: int,
+                            before: Optional[TimelineEntry]) -> List[TimelineEntry]:
+        return self._read_through(self.outbox_cache, self._query_outbox, author_id, count, before)
+
+    def _read_through(self, cache: TimelineCache, query_fn, key: str, count: int,
+                      before: Optional[TimelineEntry]) -> List[TimelineEntry]:
+        """캐시된 타임라인 앞부분에서 읽고, 부족하면 그 이후 구간만 DB에서 조회"""
+        head = cache.get(key)
+        if head is None:
+            head = query_fn(key, self.head_size, None)
+            cache.set(key, head)
+
+        entries = [entry for entry in head if before is None or entry < before][:count]
+
+        # 앞부분이 잘려 있고(head_size만큼 가득 참) 항목이 부족하면 더 오래된 구간 조회
+        if len(entries) < count and len(head) >= self.head_size:
+            older_than = entries[-1] if entries else before
+            entries += query_fn(key, count - len(entries), older_than)
+
+        return entries
+
+    def _get_celebrity_followees(self, user_id: str) -> List[str]:
+        """조회 시 병합할 팔로우 중인 작성자 (지금 대형 계정이거나 펼치지 않은 포스트가 있는 작성자)"""
+        celebrities = self.celebrity_cache.get(user_id)
+        if celebrities is None:
+            query = """
+                SELECT sf.following_id
+                FROM social_follows sf
+                JOIN social_profiles sp ON sp.user_id = sf.following_id
+                WHERE sf.follower_id = %s AND sp.followers_count >= %s
+                UNION
+                SELECT sf.following_id
+                FROM social_follows sf
+                JOIN social_timeline_read_authors ra ON ra.author_id = sf.following_id
+                WHERE sf.follower_id = %s
+            """
+            rows = self.db.pool.execute_query(query, (user_id, self.high_follower_threshold, user_id))
+            celebrities = [row['following_id'] for row in rows]
+            self.celebrity_cache.set(user_id, celebrities)
+        return celebrities
+
+    def _query_inbox(self, user_id: str, limit: int,
+                     before: Optional[TimelineEntry]) -> List[TimelineEntry]:
+        if before is None:
+            query = """
+                SELECT published_at, post_id
+                FROM social_timelines
+                WHERE user_id = %s
+                ORDER BY published_at DESC, post_id DESC
+                LIMIT %s
+            """
+            params = (user_id, limit)
+        else:
+            query = """
+                SELECT published_at, post_id
+                FROM social_timelines
+                WHERE user_id = %s AND (published_at, post_id) < (%s, %s)
+                ORDER BY published_at DESC, post_id DESC
+                LIMIT %s
+            """
+            params = (user_id, before[0], before[1], limit)
+
+        rows = self.db.pool.execute_query(query, params)
+        return [(row['published_at'], row['post_id']) for row in rows]
+
+    def _query_outbox(self, author_id: str, limit: int,
+                      before: Optional[TimelineEntry]) -> List[TimelineEntry]:
+        if before is None:
+            query = """
+                SELECT published_at, id
+                FROM social_posts
+                WHERE user_id = %s AND status = 'published'
+                ORDER BY published_at DESC, id DESC
+                LIMIT %s
+            """
+            params = (author_id, limit)
+        else:
+            query = """
+                SELECT published_at, id
+                FROM social_posts
+                WHERE user_id = %s AND status = 'published'
+                AND (published_at, id) < (%s, %s)
+                ORDER BY published_at DESC, id DESC
+                LIMIT %s
+            """
+            params = (author_id, before[0], before[1], limit)
+
+        rows = self.db.pool.execute_query(query, params)
+        return [(row['published_at'], row['id']) for row in rows]
+
+
+# 서비스 인스턴스
+social_timeline_service = SocialTimelineService()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+타임라인 페이지네이션 도구
+SocialTimelineService가 사용하는 키셋 커서, 최신순 병합, TTL LRU 캐시 (DB 의존 없음)
+"""
+
+import base64
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Iterable, List, Optional, Tuple
+
+# (published_at, post_id)
+TimelineEntry = Tuple[datetime, int]
+
+
+def encode_cursor(entry: TimelineEntry) -> str:
+    """타임라인 항목을 불투명 커서 문자열로 인코딩"""
+    published_at, post_id = entry
+    raw = f"{published_at.isoformat()}|{post_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> TimelineEntry:
+    """커서 문자열을 (published_at, post_id)로 디코딩"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        published_at, post_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(published_at), int(post_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"잘못된 타임라인 커서입니다: {cursor}") from e
+
+
+def merge_timelines(sources: Iterable[List[TimelineEntry]], limit: int,
+                    before: Optional[TimelineEntry] = None, offset: int = 0) -> List[TimelineEntry]:
+    """
+    최신순으로 정렬된 여러 타임라인을 병합
+
+    Args:
+        sources: 각각 최신순으로 정렬된 항목 리스트들
+        limit: 반환할 최대 항목 수
+        before: 이 항목보다 오래된 항목만 반환 (키셋 커서)
+        offset: 앞에서 건너뛸 항목 수 (커서 없이 page로 요청한 경우)
+    """
+    merged = heapq.merge(*sources, reverse=True)
+    result = []
+    seen = set()
+    for entry in merged:
+        if before is not None and entry >= before:
+            continue
+        if entry[1] in seen:
+            continue
+        seen.add(entry[1])
+        if len(seen) <= offset:
+            continue
+        result.append(entry)
+        if len(result) >= limit:
+            break
+    return result
+
+
+class TimelineCache:
+    """TTL이 있는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300.0, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._data: "OrderedDict[Any, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0}
+
+    def get(self, key) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[1] < self.clock():
+                if item is not None:
+                    del self._data[key]
+                self.stats['misses'] += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats['hits'] += 1
+            return item[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, self.clock() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def invalidate(self, *keys):
+        with self._lock:
+            for key in keys:
+                if self._data.pop(key, None) is not None:
+                    self.stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -2,13 +2,14 @@
 # app/service/token_service.py
 import time
 
-import psycopg2
 from algosdk import account
 from algosdk.transaction import AssetTransferTxn, PaymentTxn, ApplicationCallTxn
 from algosdk.v2client import algod
 
-from app.config import HCF_MNEMONIC, ASA_ID, DB_HOST, DB_NAME, DB_USER, DB_PASSWORD
+from app.config import HCF_MNEMONIC, ASA_ID
 from app.utils.algorand_utils import get_algod_client
+from app.utils.confirmation_watcher import get_confirmation_watcher, ConfirmationTimeout
+from app.utils.db_pool import db_service
 from app.utils.wallet_utils import get_wallet_keys, get_wallet_keys_from_address
 
 
@@ -103,14 +104,14 @@ def transfer_committee_token(committee_id, amount):
         raise Exception("HCF 지갑 주소와 프라이빗 키가 일치하지 않습니다.")
 
     # 2. 위원회 지갑 주소 조회
-    conn = psycopg2.connect(host=DB_HOST, dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD)
     try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT wallet_address FROM committees WHERE id = %s", (committee_id,))
-            result = cur.fetchone()
-            if not result:
-                raise Exception("해당 committee_id에 대한 지갑 주소가 없습니다.")
-            receiver_address = result[0]
+        with db_service.pool.get_connection(dict_rows=False) as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT wallet_address FROM committees WHERE id = %s", (committee_id,))
+                result = cur.fetchone()
+                if not result:
+                    raise Exception("해당 committee_id에 대한 지갑 주소가 없습니다.")
+                receiver_address = result[0]
 
         # 3. 수신자 지갑 Opt-in 확인 및 처리
         receiver_info = algod_client.account_info(receiver_address)
@@ -142,38 +143,35 @@ def transfer_committee_token(committee_id, amount):
         print(f"[온체인 전송 완료] TX ID: {tx_id}")
 
         # 5. 오프체인 DB 상태 업데이트
-        with conn.cursor() as cur:
-            cur.execute("""
-                WITH to_update AS (
-                    SELECT id
-                    FROM esg_coupons
-                    WHERE status = 'ISSUED'
-                    ORDER BY id
-                    LIMIT %s
-                )
-                UPDATE esg_coupons
-                SET status = 'COMMITTEE',
-                    committee_id = %s,
-                    tx_hash = %s,
-                    committee_assigned_at = NOW(),
-                    updated_at = NOW()
-                WHERE id IN (SELECT id FROM to_update)
-                RETURNING id
-            """, (amount, committee_id, tx_id))
-            updated_rows = cur.fetchall()
-            updated_ids = [row[0] for row in updated_rows]
-            print(f"[DB 업데이트 완료] 쿠폰 ID: {updated_ids}")
-
-        conn.commit()
+        with db_service.pool.get_connection(dict_rows=False) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    WITH to_update AS (
+                        SELECT id
+                        FROM esg_coupons
+                        WHERE status = 'ISSUED'
+                        ORDER BY id
+                        LIMIT %s
+                    )
+                    UPDATE esg_coupons
+                    SET status = 'COMMITTEE',
+                        committee_id = %s,
+                        tx_hash = %s,
+                        committee_assigned_at = NOW(),
+                        updated_at = NOW()
+                    WHERE id IN (SELECT id FROM to_update)
+                    RETURNING id
+                """, (amount, committee_id, tx_id))
+                updated_rows = cur.fetchall()
+                updated_ids = [row[0] for row in updated_rows]
+                print(f"[DB 업데이트 완료] 쿠폰 ID: {updated_ids}")
+            conn.commit()
         return tx_id
 
     except Exception as e:
         print(f"[오류 발생] {str(e)}")
         raise Exception(f"토큰 전송 실패: {str(e)}")
 
-    finally:
-        conn.close()
-
 def transfer_provider_token(provider_id, amount):
     algod_client = get_algod_client()
 
@@ -183,14 +181,14 @@ def transfer_provider_token(provider_id, amount):
         raise Exception("위원회 지갑 주소와 프라이빗 키가 일치하지 않습니다.")
 
     # 2. 공급자 지갑 주소 조회
-    conn = psycopg2.connect(host=DB_HOST, dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD)
     try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT wallet_address FROM providers WHERE id = %s", (provider_id,))
-            result = cur.fetchone()
-            if not result:
-                raise Exception("해당 provider_id에 대한 지갑 주소가 없습니다.")
-            receiver_address = result[0]
+        with db_service.pool.get_connection(dict_rows=False) as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT wallet_address FROM providers WHERE id = %s", (provider_id,))
+                result = cur.fetchone()
+                if not result:
+                    raise Exception("해당 provider_id에 대한 지갑 주소가 없습니다.")
+                receiver_address = result[0]
 
         # 3. 수신자 지갑 Opt-in 확인 및 처리
         receiver_info = algod_client.account_info(receiver_address)
@@ -222,38 +220,35 @@ def transfer_provider_token(provider_id, amount):
         print(f"[온체인 전송 완료] TX ID: {tx_id}")
 
         # 5. 오프체인 DB 상태 업데이트
-        with conn.cursor() as cur:
-            cur.execute("""
-                WITH to_update AS (
-                    SELECT id
-                    FROM esg_coupons
-                    WHERE status = 'COMMITTEE'
-                    ORDER BY id
-                    LIMIT %s
-                )
-                UPDATE esg_coupons
-                SET status = 'PROVIDER',
-                    provider_id = %s,
-                    tx_hash = %s,
-                    provider_assigned_at = NOW(),
-                    updated_at = NOW()
-                WHERE id IN (SELECT id FROM to_update)
-                RETURNING id
-            """, (amount, provider_id, tx_id))
-            updated_rows = cur.fetchall()
-            updated_ids = [row[0] for row in updated_rows]
-            print(f"[DB 업데이트 완료] 쿠폰 ID: {updated_ids}")
-
-        conn.commit()
+        with db_service.pool.get_connection(dict_rows=False) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    WITH to_update AS (
+                        SELECT id
+                        FROM esg_coupons
+                        WHERE status = 'COMMITTEE'
+                        ORDER BY id
+                        LIMIT %s
+                    )
+                    UPDATE esg_coupons
+                    SET status = 'PROVIDER',
+                        provider_id = %s,
+                        tx_hash = %s,
+                        provider_assigned_at = NOW(),
+                        updated_at = NOW()
+                    WHERE id IN (SELECT id FROM to_update)
+                    RETURNING id
+                """, (amount, provider_id, tx_id))
+                updated_rows = cur.fetchall()
+                updated_ids = [row[0] for row in updated_rows]
+                print(f"[DB 업데이트 완료] 쿠폰 ID: {updated_ids}")
+            conn.commit()
         return tx_id
 
     except Exception as e:
         print(f"[오류 발생] {str(e)}")
         raise Exception(f"토큰 전송 실패: {str(e)}")
 
-    finally:
-        conn.close()
-
 def transfer_consumer_token(consumer_id, amount):
     algod_client = get_algod_client()
 
@@ -263,14 +258,14 @@ def transfer_consumer_token(consumer_id, amount):
         raise Exception("위원회 지갑 주소와 프라이빗 키가 일치하지 않습니다.")
 
     # 2. 공급자 지갑 주소 조회
-    conn = psycopg2.connect(host=DB_HOST, dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD)
     try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT wallet_address FROM consumers WHERE id = %s", (consumer_id,))
-            result = cur.fetchone()
-            if not result:
-                raise Exception("해당 consumer_id에 대한 지갑 주소가 없습니다.")
-            receiver_address = result[0]
+        with db_service.pool.get_connection(dict_rows=False) as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT wallet_address FROM consumers WHERE id = %s", (consumer_id,))
+                result = cur.fetchone()
+                if not result:
+                    raise Exception("해당 consumer_id에 대한 지갑 주소가 없습니다.")
+                receiver_address = result[0]
 
         # 3. 수신자 지갑 Opt-in 확인 및 처리
         receiver_info = algod_client.account_info(receiver_address)
@@ -302,56 +297,44 @@ def transfer_consumer_token(consumer_id, amount):
         print(f"[온체인 전송 완료] TX ID: {tx_id}")
 
         # 5. 오프체인 DB 상태 업데이트
-        with conn.cursor() as cur:
-            cur.execute("""
-                WITH to_update AS (
-                    SELECT id
-                    FROM esg_coupons
-                    WHERE status = 'PROVIDER'
-                    ORDER BY id
-                    LIMIT %s
-                )
-                UPDATE esg_coupons
-                SET status = 'CONSUMER',
-                    consumer_id = %s,
-                    tx_hash = %s,
-                    consumer_assigned_at = NOW(),
-                    updated_at = NOW()
-                WHERE id IN (SELECT id FROM to_update)
-                RETURNING id
-            """, (amount, consumer_id, tx_id))
-            updated_rows = cur.fetchall()
-            updated_ids = [row[0] for row in updated_rows]
-            print(f"[📝 DB 업데이트 완료] 쿠폰 ID: {updated_ids}")
-
-        conn.commit()
+        with db_service.pool.get_connection(dict_rows=False) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    WITH to_update AS (
+                        SELECT id
+                        FROM esg_coupons
+                        WHERE status = 'PROVIDER'
+                        ORDER BY id
+                        LIMIT %s
+                    )
+                    UPDATE esg_coupons
+                    SET status = 'CONSUMER',
+                        consumer_id = %s,
+                        tx_hash = %s,
+                        consumer_assigned_at = NOW(),
+                        updated_at = NOW()
+                    WHERE id IN (SELECT id FROM to_update)
+                    RETURNING id
+                """, (amount, consumer_id, tx_id))
+                updated_rows = cur.fetchall()
+                updated_ids = [row[0] for row in updated_rows]
+                print(f"[📝 DB 업데이트 완료] 쿠폰 ID: {updated_ids}")
+            conn.commit()
         return tx_id
 
     except Exception as e:
         print(f"[오류 발생] {str(e)}")
         raise Exception(f"토큰 전송 실패: {str(e)}")
 
-    finally:
-        conn.close()
-
 def wait_for_confirmation(client, txid, timeout=10):
     """
     주어진 txid가 블록에 포함될 때까지 최대 timeout초간 대기
+    (노드별 공유 감시기가 라운드마다 대기 중인 트랜잭션을 한꺼번에 확인)
     """
-    start_time = time.time()
-    last_round = client.status()["last-round"]
-
-    while time.time() - start_time < timeout:
-        try:
-            pending_txn = client.pending_transaction_info(txid)
-            if pending_txn.get("confirmed-round", 0) > 0:
-                print(f"[확인됨] 트랜잭션 {txid} 이 블록 {pending_txn['confirmed-round']}에 포함됨")
-                return pending_txn
-        except Exception:
-            pass
-
-        print(f"[⌛ 대기 중] 블록 round: {last_round + 1}")
-        client.status_after_block(last_round + 1)
-        last_round += 1
-
-    raise Exception(f"[타임아웃] {timeout}초 안에 트랜잭션 {txid} 확인 실패")
+    try:
+        pending_txn = get_confirmation_watcher(client).wait(txid, timeout_rounds=None, timeout=timeout)
+    except ConfirmationTimeout:
+        raise Exception(f"[타임아웃] {timeout}초 안에 트랜잭션 {txid} 확인 실패")
+
+    print(f"[확인됨] 트랜잭션 {txid} 이 블록 {pending_txn['confirmed-round']}에 포함됨")
+    return pending_txn
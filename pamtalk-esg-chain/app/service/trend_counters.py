@@ -0,0 +1,458 @@
+# -*- coding: utf-8 -*-
+"""
+트렌드 카운터
+해시태그 언급을 메모리에서 집계하는 자료구조
+
+DecayedTrendCounter:
+    해시태그/지역별 지수 감쇠 점수. 점수는 기준 시각으로 환산하여 저장하므로
+    시간이 흘러도 순위가 변하지 않으며, 상위 N개 조회는 힙 선택으로 끝납니다.
+
+TrendSketch:
+    Count-Min Sketch + Space-Saving 요약을 시간 버킷별로 두어 일간/주간/월간
+    슬라이딩 윈도우의 상위 해시태그를 고정 메모리로 근사합니다.
+
+merge_local_mentions:
+    DB 트렌딩 토픽(모든 워커의 합산 기준값)에 이 워커가 아직 기록하지 않은
+    언급 수를 더해 순위를 다시 매깁니다.
+"""
+
+import math
+import time
+import heapq
+import hashlib
+import threading
+from array import array
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 지역 미지정(전국) 키
+NATIONWIDE = None
+
+
+class DecayedTrendCounter:
+    """
+    지수 시간 감쇠 카운터
+
+    t 시점의 점수는 sum(weight_i * exp(-λ (t - t_i))) 입니다.
+    내부적으로는 weight_i * exp(λ (t_i - t0))를 누적하여 저장하고(t0: 기준 시각),
+    조회할 때만 exp(-λ (t - t0))를 곱합니다. 모든 항목에 같은 계수가 곱해지므로
+    저장된 값의 대소가 곧 현재 점수의 대소입니다.
+    """
+
+    # 저장 값이 이 배율을 넘으면 기준 시각을 옮겨 부동소수점 오버플로를 방지
+    _REBASE_EXPONENT = 50.0
+
+    def __init__(self, half_life_hours: float = 6.0, max_keys_per_region: int = 50000,
+                 clock: Callable[[], float] = time.time):
+        self.half_life_seconds = half_life_hours * 3600
+        self.decay_rate = math.log(2) / self.half_life_seconds
+        self.max_keys_per_region = max_keys_per_region
+        self.clock = clock
+
+        self._t0 = clock()
+        # region -> {hashtag: 기준 시각 환산 점수}
+        self._scores: Dict[Optional[str], Dict[str, float]] = {}
+        # region -> {hashtag: 마지막 언급 시각}
+        self._last_seen: Dict[Optional[str], Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, hashtag: str, region: Optional[str] = NATIONWIDE, weight: float = 1.0,
+            timestamp: Optional[float] = None):
+        """언급 추가. 지역이 주어지면 전국 집계에도 함께 반영"""
+        now = self.clock() if timestamp is None else timestamp
+        with self._lock:
+            scaled = weight * self._growth_factor(now)
+            regions = (NATIONWIDE,) if region is NATIONWIDE else (NATIONWIDE, region)
+            for key in regions:
+                scores = self._scores.setdefault(key, {})
+                scores[hashtag] = scores.get(hashtag, 0.0) + scaled
+                self._last_seen.setdefault(key, {})[hashtag] = now
+                if len(scores) > self.max_keys_per_region * 1.1:
+                    self._evict_smallest(key)
+
+    def seed(self, hashtag: str, score: float, region: Optional[str] = NATIONWIDE,
+             timestamp: Optional[float] = None):
+        """DB에서 읽은 현재 점수로 초기화 (지역 전파 없이 해당 키만 설정)"""
+        now = self.clock() if timestamp is None else timestamp
+        with self._lock:
+            scaled = score * self._growth_factor(now)
+            self._scores.setdefault(region, {})[hashtag] = scaled
+            self._last_seen.setdefault(region, {})[hashtag] = now
+
+    def score(self, hashtag: str, region: Optional[str] = NATIONWIDE) -> float:
+        """현재 시각 기준 감쇠 점수"""
+        with self._lock:
+            stored = self._scores.get(region, {}).get(hashtag, 0.0)
+            return stored * self._decay_factor(self.clock())
+
+    def top(self, region: Optional[str] = NATIONWIDE, limit: int = 20) -> List[Tuple[str, float]]:
+        """현재 감쇠 점수 상위 N개 [(hashtag, score), ...]"""
+        with self._lock:
+            scores = self._scores.get(region)
+            if not scores:
+                return []
+            factor = self._decay_factor(self.clock())
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [(hashtag, stored * factor) for hashtag, stored in best]
+
+    def last_seen(self, hashtag: str, region: Optional[str] = NATIONWIDE) -> Optional[float]:
+        with self._lock:
+            return self._last_seen.get(region, {}).get(hashtag)
+
+    def prune(self, min_score: float = 0.01) -> int:
+        """감쇠되어 min_score 미만이 된 항목 제거"""
+        removed = 0
+        with self._lock:
+            threshold = min_score / self._decay_factor(self.clock())
+            for region, scores in self._scores.items():
+                stale = [hashtag for hashtag, stored in scores.items() if stored < threshold]
+                for hashtag in stale:
+                    del scores[hashtag]
+                    self._last_seen.get(region, {}).pop(hashtag, None)
+                removed += len(stale)
+        return removed
+
+    def regions(self) -> List[Optional[str]]:
+        with self._lock:
+            return list(self._scores.keys())
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(scores) for scores in self._scores.values())
+
+    def _growth_factor(self, now: float) -> float:
+        """now 시점의 값을 기준 시각으로 환산하는 배율 (필요 시 기준 시각 이동)"""
+        exponent = self.decay_rate * (now - self._t0)
+        if exponent > self._REBASE_EXPONENT:
+            self._rebase(now)
+            exponent = 0.0
+        return math.exp(exponent)
+
+    def _decay_factor(self, now: float) -> float:
+        return math.exp(-self.decay_rate * (now - self._t0))
+
+    def _rebase(self, now: float):
+        factor = self._decay_factor(now)
+        for scores in self._scores.values():
+            for hashtag in scores:
+                scores[hashtag] *= factor
+        self._t0 = now
+
+    def _evict_smallest(self, region: Optional[str]):
+        # 한도를 10% 넘을 때마다 한꺼번에 정리하여 삽입 비용을 분할 상환
+        scores = self._scores[region]
+        excess = len(scores) - self.max_keys_per_region
+        for hashtag, _ in heapq.nsmallest(excess, scores.items(), key=lambda item: item[1]):
+            del scores[hashtag]
+            self._last_seen.get(region, {}).pop(hashtag, None)
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch
+
+    고정 메모리(width x depth)로 임의 키의 빈도를 과대추정 방향으로 근사합니다.
+    오차는 확률 1 - (1/2)^depth 로 총합 x e/width 이하입니다.
+    """
+
+    def __init__(self, width: int = 1024, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._table = array('q', bytes(8 * width * depth))
+
+    def _indexes(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, key: str, count: int = 1):
+        table = self._table
+        for index in self._indexes(key):
+            table[index] += count
+        self.total += count
+
+    def estimate(self, key: str, indexes: Optional[List[int]] = None) -> int:
+        """빈도 추정 (같은 크기의 스케치끼리는 indexes를 재사용 가능)"""
+        table = self._table
+        return min(table[index] for index in (indexes or self._indexes(key)))
+
+    def clear(self):
+        self._table = array('q', bytes(8 * self.width * self.depth))
+        self.total = 0
+
+
+class SpaceSaving:
+    """
+    Space-Saving 상위 K 빈도 추적
+
+    최대 capacity개의 키만 유지합니다. 가득 찬 상태에서 새 키가 들어오면 최솟값
+    키를 교체하고 그 최솟값을 오차로 물려받습니다. 실제 빈도가 전체의 1/capacity를
+    넘는 키는 반드시 추적됩니다.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        # key -> [count, error]
+        self._counters: Dict[str, List[int]] = {}
+        # (count, key) 최소 힙 - 카운트가 바뀐 항목은 지연 갱신
+        self._heap: List[Tuple[int, str]] = []
+
+    def add(self, key: str, count: int = 1):
+        counters = self._counters
+        entry = counters.get(key)
+        if entry is not None:
+            entry[0] += count
+            return
+
+        if len(counters) < self.capacity:
+            counters[key] = [count, 0]
+            heapq.heappush(self._heap, (count, key))
+            return
+
+        min_count, min_key = self._pop_min()
+        del counters[min_key]
+        counters[key] = [min_count + count, min_count]
+        heapq.heappush(self._heap, (min_count + count, key))
+
+    def _pop_min(self) -> Tuple[int, str]:
+        heap = self._heap
+        counters = self._counters
+        while True:
+            count, key = heapq.heappop(heap)
+            entry = counters.get(key)
+            if entry is None:
+                continue
+            if entry[0] == count:
+                return count, key
+            # 오래된 힙 항목 - 현재 값으로 다시 넣음
+            heapq.heappush(heap, (entry[0], key))
+
+    def count(self, key: str) -> int:
+        entry = self._counters.get(key)
+        return entry[0] if entry else 0
+
+    def top(self, limit: int) -> List[Tuple[str, int, int]]:
+        """상위 N개 [(key, count, error), ...]"""
+        best = heapq.nlargest(limit, self._counters.items(), key=lambda item: item[1][0])
+        return [(key, entry[0], entry[1]) for key, entry in best]
+
+    def keys(self):
+        return self._counters.keys()
+
+    def __len__(self):
+        return len(self._counters)
+
+
+class _WindowBucket:
+    """시간 버킷 하나의 요약 (빈도 근사 + 후보 키)"""
+
+    __slots__ = ('start', 'sketch', 'heavy')
+
+    def __init__(self, start: int, width: int, depth: int, capacity: int):
+        self.start = start
+        self.sketch = CountMinSketch(width, depth)
+        self.heavy = SpaceSaving(capacity)
+
+
+class SlidingWindowTopK:
+    """
+    슬라이딩 윈도우 상위 K 해시태그
+
+    시간을 bucket_seconds 단위 버킷으로 나누고 버킷마다 Count-Min Sketch와
+    Space-Saving 요약을 둡니다. 윈도우 조회 시 윈도우 안 버킷들의 후보 키를 모아
+    각 후보의 빈도를 버킷 스케치 추정치의 합으로 계산합니다.
+    윈도우를 벗어난 버킷은 통째로 버려지므로 메모리는 버킷 수에 비례해 고정됩니다.
+    """
+
+    def __init__(self, window_seconds: int, bucket_seconds: int, width: int = 1024,
+                 depth: int = 4, capacity: int = 500, clock: Callable[[], float] = time.time):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.clock = clock
+        self._buckets: "deque[_WindowBucket]" = deque()
+
+    def _current_bucket(self, now: float) -> _WindowBucket:
+        start = int(now // self.bucket_seconds) * self.bucket_seconds
+        if not self._buckets or self._buckets[-1].start < start:
+            self._buckets.append(_WindowBucket(start, self.width, self.depth, self.capacity))
+        self._expire(now)
+        return self._buckets[-1]
+
+    def _expire(self, now: float):
+        oldest_allowed = now - self.window_seconds
+        while self._buckets and self._buckets[0].start + self.bucket_seconds <= oldest_allowed:
+            self._buckets.popleft()
+
+    def add(self, key: str, count: int = 1, timestamp: Optional[float] = None):
+        bucket = self._current_bucket(self.clock() if timestamp is None else timestamp)
+        bucket.sketch.add(key, count)
+        bucket.heavy.add(key, count)
+
+    def estimate(self, key: str) -> int:
+        self._expire(self.clock())
+        return self._estimate(key)
+
+    def _estimate(self, key: str) -> int:
+        if not self._buckets:
+            return 0
+        # 모든 버킷 스케치의 크기가 같으므로 해시는 한 번만 계산
+        indexes = self._buckets[0].sketch._indexes(key)
+        return sum(bucket.sketch.estimate(key, indexes) for bucket in self._buckets)
+
+    def top(self, limit: int) -> List[Tuple[str, int]]:
+        """윈도우 내 상위 N개 [(key, estimated_count), ...]"""
+        self._expire(self.clock())
+        candidates = set()
+        for bucket in self._buckets:
+            candidates.update(key for key, _, _ in bucket.heavy.top(limit * 2))
+
+        estimates = ((key, self._estimate(key)) for key in candidates)
+        return heapq.nlargest(limit, estimates, key=lambda item: item[1])
+
+    def total(self) -> int:
+        self._expire(self.clock())
+        return sum(bucket.sketch.total for bucket in self._buckets)
+
+
+class TrendSketch:
+    """
+    일간/주간/월간 슬라이딩 윈도우 해시태그 빈도 (지역별)
+
+    일간 윈도우는 1시간 버킷 24개, 주간/월간 윈도우는 1일 버킷 7/30개를 사용합니다.
+    지역이 주어진 언급은 전국(None) 집계에도 함께 반영됩니다.
+    """
+
+    WINDOWS = {
+        'daily': (24 * 3600, 3600),
+        'weekly': (7 * 24 * 3600, 24 * 3600),
+        'monthly': (30 * 24 * 3600, 24 * 3600)
+    }
+
+    def __init__(self, width: int = 1024, depth: int = 4, capacity: int = 500,
+                 top_cache_seconds: float = 1.0, clock: Callable[[], float] = time.time):
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.top_cache_seconds = top_cache_seconds
+        self.clock = clock
+        self._regions: Dict[Optional[str], Dict[str, SlidingWindowTopK]] = {}
+        # (region, time_range, limit) -> (만료 시각, 결과) - 조회 폭주 시 재계산 방지
+        self._top_cache: Dict[Tuple[Optional[str], str, int], Tuple[float, List[Tuple[str, int]]]] = {}
+        self._lock = threading.Lock()
+
+    def _windows(self, region: Optional[str]) -> Dict[str, SlidingWindowTopK]:
+        windows = self._regions.get(region)
+        if windows is None:
+            windows = {
+                name: SlidingWindowTopK(window, bucket, self.width, self.depth,
+                                        self.capacity, self.clock)
+                for name, (window, bucket) in self.WINDOWS.items()
+            }
+            self._regions[region] = windows
+        return windows
+
+    def add(self, hashtag: str, region: Optional[str] = NATIONWIDE, count: int = 1,
+            timestamp: Optional[float] = None):
+        with self._lock:
+            regions = (NATIONWIDE,) if region is NATIONWIDE else (NATIONWIDE, region)
+            for key in regions:
+                for window in self._windows(key).values():
+                    window.add(hashtag, count, timestamp)
+
+    def top(self, region: Optional[str] = NATIONWIDE, time_range: str = 'daily',
+            limit: int = 20) -> List[Tuple[str, int]]:
+        with self._lock:
+            windows = self._regions.get(region)
+            if not windows or time_range not in windows:
+                return []
+
+            now = self.clock()
+            cache_key = (region, time_range, limit)
+            cached = self._top_cache.get(cache_key)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+
+            result = windows[time_range].top(limit)
+            self._top_cache[cache_key] = (now + self.top_cache_seconds, result)
+            return result
+
+    def estimate(self, hashtag: str, region: Optional[str] = NATIONWIDE,
+                 time_range: str = 'daily') -> int:
+        with self._lock:
+            windows = self._regions.get(region)
+            if not windows or time_range not in windows:
+                return 0
+            return windows[time_range].estimate(hashtag)
+
+    def total(self, region: Optional[str] = NATIONWIDE, time_range: str = 'daily') -> int:
+        with self._lock:
+            windows = self._regions.get(region)
+            if not windows or time_range not in windows:
+                return 0
+            return windows[time_range].total()
+
+
+def empty_topic(hashtag: str, region: Optional[str] = NATIONWIDE) -> Dict[str, Any]:
+    """DB에 아직 없는 해시태그의 토픽 정보"""
+    return {
+        'id': None,
+        'topic_name': hashtag[1:] if hashtag.startswith('#') else hashtag,
+        'hashtag': hashtag,
+        'region': region,
+        'category': None,
+        'posts_count': 0,
+        'mentions_count': 0,
+        'engagement_score': 0,
+        'trend_score': 0,
+        'is_promoted': False,
+        'trend_started_at': None,
+        'peak_time': None,
+        'last_mention_at': None
+    }
+
+
+def merge_local_mentions(
+    db_topics: List[Dict[str, Any]], local_mentions: Dict[str, int],
+    limit: int, min_mentions: float, region: Optional[str] = NATIONWIDE
+) -> List[Dict[str, Any]]:
+    """
+    DB 토픽의 current_mentions에 로컬 미기록 언급 수를 더해 순위 재계산
+
+    local_mentions에는 아직 DB에 기록하지 않은 증분만 넣어야 합니다.
+    (스케치처럼 이미 기록된 언급까지 센 값을 더하면 이중 집계)
+
+    Args:
+        db_topics: DB에서 읽은 토픽 목록 (current_mentions 포함)
+        local_mentions: {hashtag: 미기록 언급 수}
+        limit: 최대 개수
+        min_mentions: 합산 언급 수 최소 기준
+        region: DB에 없는 해시태그에 붙일 지역
+
+    Returns:
+        프로모션 우선, 합산 언급 수, 트렌드 점수 순 토픽 목록
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for topic in db_topics:
+        topic = dict(topic)
+        topic['current_mentions'] = (topic.get('current_mentions') or 0) + local_mentions.get(topic['hashtag'], 0)
+        merged[topic['hashtag']] = topic
+
+    for hashtag, count in local_mentions.items():
+        if hashtag not in merged:
+            topic = empty_topic(hashtag, region)
+            topic['current_mentions'] = count
+            merged[hashtag] = topic
+
+    ranked = [topic for topic in merged.values() if topic['current_mentions'] >= min_mentions]
+    ranked.sort(
+        key=lambda topic: (bool(topic.get('is_promoted')), topic['current_mentions'],
+                           topic.get('trend_score') or 0),
+        reverse=True
+    )
+    return ranked[:limit]
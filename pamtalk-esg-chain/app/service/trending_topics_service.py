@@ -4,14 +4,18 @@
 실시간 해시태그 분석, 지역별 트렌딩, 토픽 추천 기능
 """
 import asyncio
+import atexit
 import json
 import re
+import time
+import threading
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 from collections import Counter, defaultdict
 import logging
 
-from ..utils.db_pool import get_db_connection
+from ..utils.db_pool import async_db
+from .trend_counters import DecayedTrendCounter, TrendSketch, empty_topic, merge_local_mentions
 
 logger = logging.getLogger(__name__)
 
@@ -19,76 +23,142 @@ class TrendingTopicsService:
     def __init__(self):
         self.hashtag_pattern = re.compile(r'#[\w가-힣]+')
         self.min_mentions_for_trend = 5
+        # 감쇠 카운터 점수는 반감기마다 절반이 되는 실수라 언급 수 기준과 따로 둠
+        # (6시간 반감기 기준 6시간 전 5회 언급 ≈ 2.5)
+        self.min_decayed_score_for_trend = 2.5
         self.trend_decay_hours = 24
 
+        # 해시태그/지역별 지수 감쇠 카운터 (DB 장애 시 get_trending_topics 대체 응답용)
+        self.decayed_counter = DecayedTrendCounter(half_life_hours=6.0)
+        # (hashtag, region) -> 마지막 점수 계산 시 읽은 토픽 정보
+        self._topic_meta: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+
+        # 일간/주간/월간 슬라이딩 윈도우 해시태그 빈도 (Count-Min Sketch + Space-Saving)
+        self.trend_sketch = TrendSketch()
+
+        # DB에 아직 기록하지 않은 (hashtag, region)별 언급 수 - flush_interval마다 한 번의 UPSERT로 기록
+        # 지역이 있는 언급은 메모리 카운터와 같이 전국(None) 행에도 함께 누적
+        # 백그라운드 스레드가 주기적으로 기록하고, 프로세스 종료 시 shutdown()이 남은 언급을 기록
+        self.flush_interval = 5.0
+        self._pending_mentions: Counter = Counter()
+        self._pending_lock = threading.Lock()
+        self._flush_worker: Optional[threading.Thread] = None
+        self._flush_stop = threading.Event()
+
+        # user_id -> (만료 시각, 프로필 기반 추천 해시태그)
+        self._profile_tag_cache: Dict[str, Tuple[float, List[str]]] = {}
+        self.profile_tag_ttl = 600.0
+
     async def extract_hashtags_from_text(self, text: str) -> List[str]:
         """텍스트에서 해시태그 추출"""
         hashtags = self.hashtag_pattern.findall(text)
         return [tag.lower() for tag in hashtags if len(tag) > 2]
 
     async def process_new_post_hashtags(self, post_id: int, content: str, user_region: str = None) -> None:
-        """새 포스트의 해시태그 처리"""
+        """
+        새 포스트의 해시태그 처리
+
+        메모리 카운터에 즉시 반영하고, DB 기록은 백그라운드 스레드가 flush_interval마다
+        모아서 한 번에 합니다.
+        """
         try:
             hashtags = await self.extract_hashtags_from_text(content)
             if not hashtags:
                 return
 
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            for hashtag in hashtags:
-                # 기존 토픽 업데이트 또는 신규 생성
-                await self._update_or_create_trending_topic(
-                    cursor, hashtag, user_region
-                )
+            with self._pending_lock:
+                for hashtag in hashtags:
+                    self.decayed_counter.add(hashtag, user_region)
+                    self.trend_sketch.add(hashtag, user_region)
+                    self._pending_mentions[(hashtag, None)] += 1
+                    if user_region is not None:
+                        self._pending_mentions[(hashtag, user_region)] += 1
 
-            conn.commit()
-            cursor.close()
-            conn.close()
+            self._ensure_flush_worker()
 
         except Exception as e:
             logger.error(f"해시태그 처리 오류: {e}")
 
-    async def _update_or_create_trending_topic(
-        self, cursor, hashtag: str, region: str = None
-    ) -> None:
-        """트렌딩 토픽 업데이트 또는 생성"""
+    async def flush_mentions(self) -> int:
+        """
+        누적된 해시태그 언급 수를 한 트랜잭션의 UPSERT 배치로 기록
 
-        # 기존 토픽 확인
-        cursor.execute("""
-            SELECT id, posts_count, mentions_count, daily_mentions, weekly_mentions, monthly_mentions
-            FROM trending_topics
-            WHERE hashtag = %s AND (region = %s OR (region IS NULL AND %s IS NULL))
-        """, (hashtag, region, region))
+        Returns:
+            기록한 (해시태그, 지역) 행 수 (실패 시 누적분을 되돌리고 0)
+        """
+        with self._pending_lock:
+            pending, self._pending_mentions = self._pending_mentions, Counter()
 
-        existing = cursor.fetchone()
+        if not pending:
+            return 0
 
         now = datetime.now()
+        rows = [
+            (hashtag[1:] if hashtag.startswith('#') else hashtag, hashtag, region,
+             count, count, count, count, now, now)
+            for (hashtag, region), count in pending.items()
+        ]
 
-        if existing:
-            # 기존 토픽 업데이트
-            topic_id = existing[0]
-            cursor.execute("""
-                UPDATE trending_topics SET
-                    mentions_count = mentions_count + 1,
-                    daily_mentions = daily_mentions + 1,
-                    weekly_mentions = weekly_mentions + 1,
-                    monthly_mentions = monthly_mentions + 1,
-                    last_mention_at = %s,
-                    updated_at = %s
-                WHERE id = %s
-            """, (now, now, topic_id))
-
-        else:
-            # 새 토픽 생성
-            topic_name = hashtag[1:] if hashtag.startswith('#') else hashtag
-            cursor.execute("""
+        try:
+            await async_db.executemany("""
                 INSERT INTO trending_topics (
                     topic_name, hashtag, region, mentions_count,
                     daily_mentions, weekly_mentions, monthly_mentions,
                     trend_started_at, last_mention_at
-                ) VALUES (%s, %s, %s, 1, 1, 1, 1, %s, %s)
-            """, (topic_name, hashtag, region, now, now))
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (hashtag, (COALESCE(region, ''))) DO UPDATE SET
+                    mentions_count = trending_topics.mentions_count + EXCLUDED.mentions_count,
+                    daily_mentions = trending_topics.daily_mentions + EXCLUDED.daily_mentions,
+                    weekly_mentions = trending_topics.weekly_mentions + EXCLUDED.weekly_mentions,
+                    monthly_mentions = trending_topics.monthly_mentions + EXCLUDED.monthly_mentions,
+                    last_mention_at = EXCLUDED.last_mention_at,
+                    updated_at = EXCLUDED.last_mention_at
+            """, rows)
+            return len(rows)
+
+        except Exception as e:
+            logger.error(f"해시태그 언급 기록 오류: {e}")
+            # 다음 플러시에서 다시 시도
+            with self._pending_lock:
+                self._pending_mentions.update(pending)
+            return 0
+
+    def _ensure_flush_worker(self):
+        """첫 언급이 들어오면 주기적 플러시 스레드 시작 (종료 시 남은 언급 기록 등록)"""
+        if self._flush_worker is not None:
+            return
+        with self._pending_lock:
+            if self._flush_worker is not None:
+                return
+            self._flush_worker = threading.Thread(target=self._flush_loop, daemon=True,
+                                                  name='trending-mention-flush')
+            self._flush_worker.start()
+        atexit.register(self.shutdown)
+
+    def _flush_loop(self):
+        # 요청마다 asyncio.run으로 루프를 새로 만들므로 요청 루프가 아닌 전용 스레드에서 기록
+        while not self._flush_stop.wait(self.flush_interval):
+            if not self._pending_mentions:
+                continue
+            try:
+                asyncio.run(self.flush_mentions())
+            except Exception as e:
+                logger.error(f"해시태그 언급 주기 기록 오류: {e}")
+
+    def shutdown(self, timeout: float = 5.0):
+        """플러시 스레드를 멈추고 남은 언급을 한 번 기록 (실패하면 유실)"""
+        self._flush_stop.set()
+        worker = self._flush_worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout)
+        if self._pending_mentions:
+            try:
+                asyncio.run(self.flush_mentions())
+            except Exception as e:
+                logger.error(f"종료 시 해시태그 언급 기록 오류: {e}")
+        lost = sum(self._pending_mentions.values())
+        if lost:
+            logger.error(f"종료 시 기록하지 못한 해시태그 언급 {lost}건 유실")
 
     async def get_trending_topics(
         self,
@@ -96,112 +166,252 @@ class TrendingTopicsService:
         limit: int = 20,
         time_range: str = 'daily'
     ) -> List[Dict[str, Any]]:
-        """트렌딩 토픽 조회"""
+        """
+        트렌딩 토픽 조회
+
+        여러 워커의 언급이 합산된 DB 값이 기준이며, 이 워커가 아직 기록하지 않은
+        언급 수만 더해 순위를 다시 매깁니다. DB 조회가 실패할 때만 이 워커의
+        메모리 카운터(스케치/감쇠 카운터)로 근사 응답합니다.
+        """
+        # 시간 범위에 따른 정렬 기준
+        order_field = {
+            'daily': 'daily_mentions',
+            'weekly': 'weekly_mentions',
+            'monthly': 'monthly_mentions'
+        }.get(time_range, 'daily_mentions')
+
+        with self._pending_lock:
+            local_mentions = {
+                hashtag: count for (hashtag, pending_region), count in self._pending_mentions.items()
+                if pending_region == region
+            }
+
+        select = f"""
+            SELECT
+                id, topic_name, hashtag, region, category,
+                posts_count, mentions_count, engagement_score, trend_score,
+                {order_field} as current_mentions,
+                is_promoted, trend_started_at, peak_time, last_mention_at
+            FROM trending_topics
+            WHERE is_active = TRUE
+            AND (region = %s OR (region IS NULL AND CAST(%s AS TEXT) IS NULL))
+        """
+
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
+            # 로컬 언급을 더하면 기준을 넘을 수 있으므로 기준 없이 상위 후보를 넉넉히 조회
+            rows = await async_db.fetch(
+                select + f" ORDER BY is_promoted DESC, {order_field} DESC, trend_score DESC LIMIT %s",
+                (region, region, limit * 2)
+            )
+            topics = [self._row_to_topic(row) for row in rows]
+
+            # 로컬 언급이 있는데 상위 후보에 없는 해시태그는 DB 값을 따로 읽어 합산
+            missing = set(local_mentions) - {topic['hashtag'] for topic in topics}
+            if missing:
+                rows = await async_db.fetch(select + " AND hashtag = ANY(%s)",
+                                            (region, region, sorted(missing)))
+                topics.extend(self._row_to_topic(row) for row in rows)
 
-            # 시간 범위에 따른 정렬 기준
-            order_field = {
-                'daily': 'daily_mentions',
-                'weekly': 'weekly_mentions',
-                'monthly': 'monthly_mentions'
-            }.get(time_range, 'daily_mentions')
+        except Exception as e:
+            logger.error(f"트렌딩 토픽 조회 오류: {e}")
+            return self._get_trending_topics_from_memory(region, limit, time_range) or []
+
+        return merge_local_mentions(topics, local_mentions, limit, self.min_mentions_for_trend, region)
+
+    @staticmethod
+    def _row_to_topic(row) -> Dict[str, Any]:
+        return {
+            'id': row[0],
+            'topic_name': row[1],
+            'hashtag': row[2],
+            'region': row[3],
+            'category': row[4],
+            'posts_count': row[5],
+            'mentions_count': row[6],
+            'engagement_score': float(row[7]) if row[7] else 0,
+            'trend_score': float(row[8]) if row[8] else 0,
+            'current_mentions': row[9],
+            'is_promoted': row[10],
+            'trend_started_at': row[11],
+            'peak_time': row[12],
+            'last_mention_at': row[13]
+        }
+
+    def _get_trending_topics_from_memory(
+        self, region: Optional[str], limit: int, time_range: str = 'daily'
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        메모리 카운터 기반 트렌딩 토픽 (DB 장애 시 대체 응답, 카운터가 비어 있으면 None)
+
+        이 워커가 받은 언급만 반영된 근사값입니다.
+        """
+        ranked = self.trend_sketch.top(region, time_range, limit * 2)
+        threshold = self.min_mentions_for_trend
+        if not ranked and time_range == 'daily':
+            ranked = self.decayed_counter.top(region, limit * 2)
+            threshold = self.min_decayed_score_for_trend
+        if not ranked:
+            return None
+
+        # 윈도우 언급 수 우선, 같으면 최근성(감쇠 점수) 순
+        ranked = sorted(
+            ranked,
+            key=lambda item: (item[1], self.decayed_counter.score(item[0], region)),
+            reverse=True
+        )
 
-            query = f"""
-                SELECT
-                    id, topic_name, hashtag, region, category,
-                    posts_count, mentions_count, engagement_score, trend_score,
-                    {order_field} as current_mentions,
-                    is_promoted, trend_started_at, peak_time, last_mention_at
-                FROM trending_topics
-                WHERE is_active = TRUE
-                AND (region = %s OR (region IS NULL AND %s IS NULL))
-                AND {order_field} >= %s
-                ORDER BY is_promoted DESC, {order_field} DESC, trend_score DESC
-                LIMIT %s
-            """
+        promoted = [
+            meta for (hashtag, meta_region), meta in self._topic_meta.items()
+            if meta_region == region and meta.get('is_promoted')
+        ]
+        promoted_tags = {meta['hashtag'] for meta in promoted}
 
-            min_mentions = self.min_mentions_for_trend
-            cursor.execute(query, (region, region, min_mentions, limit))
+        topics = [dict(meta) for meta in promoted]
+        for hashtag, mentions in ranked:
+            if len(topics) >= limit:
+                break
+            if hashtag in promoted_tags or mentions < threshold:
+                continue
 
-            topics = []
-            for row in cursor.fetchall():
-                topics.append({
-                    'id': row[0],
-                    'topic_name': row[1],
-                    'hashtag': row[2],
-                    'region': row[3],
-                    'category': row[4],
-                    'posts_count': row[5],
-                    'mentions_count': row[6],
-                    'engagement_score': float(row[7]) if row[7] else 0,
-                    'trend_score': float(row[8]) if row[8] else 0,
-                    'current_mentions': row[9],
-                    'is_promoted': row[10],
-                    'trend_started_at': row[11],
-                    'peak_time': row[12],
-                    'last_mention_at': row[13]
-                })
+            meta = self._topic_meta.get((hashtag, region))
+            topic = dict(meta) if meta else empty_topic(hashtag, region)
+            topic['current_mentions'] = round(mentions, 2)
+            topics.append(topic)
 
-            cursor.close()
-            conn.close()
+        return topics[:limit]
 
-            return topics
+    async def calculate_trend_scores(self, mode: str = 'sql') -> int:
+        """
+        트렌드 점수 계산 (백그라운드 작업)
 
-        except Exception as e:
-            logger.error(f"트렌딩 토픽 조회 오류: {e}")
-            return []
+        Args:
+            mode: 'sql'  - 한 번의 UPDATE 문으로 DB에서 모든 점수 계산
+                  'bulk' - 한 번 조회 후 메모리에서 계산, UPDATE ... FROM (VALUES ...) 한 번으로 기록
 
-    async def calculate_trend_scores(self) -> None:
-        """트렌드 점수 계산 (백그라운드 작업)"""
-        try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
+        Returns:
+            갱신된 토픽 수
+        """
+        # 점수 계산 전에 누적된 언급 수를 먼저 기록
+        await self.flush_mentions()
 
-            # 활성 토픽들 조회
-            cursor.execute("""
-                SELECT id, hashtag, region, daily_mentions, weekly_mentions,
-                       monthly_mentions, engagement_score, trend_started_at, last_mention_at
-                FROM trending_topics
-                WHERE is_active = TRUE
-                AND last_mention_at >= %s
-            """, (datetime.now() - timedelta(hours=self.trend_decay_hours),))
-
-            topics = cursor.fetchall()
-
-            for topic in topics:
-                topic_id = topic[0]
-                daily = topic[3]
-                weekly = topic[4]
-                monthly = topic[5]
-                engagement = float(topic[6]) if topic[6] else 0
-                started = topic[7]
-                last_mention = topic[8]
-
-                # 트렌드 점수 계산 로직
-                trend_score = await self._calculate_trend_score(
-                    daily, weekly, monthly, engagement, started, last_mention
-                )
+        try:
+            since = datetime.now() - timedelta(hours=self.trend_decay_hours)
 
-                cursor.execute("""
-                    UPDATE trending_topics
-                    SET trend_score = %s, updated_at = %s
-                    WHERE id = %s
-                """, (trend_score, datetime.now(), topic_id))
+            async with async_db.transaction() as conn:
+                if mode == 'sql':
+                    rows = await self._update_trend_scores_sql(conn, since)
+                elif mode == 'bulk':
+                    rows = await self._update_trend_scores_bulk(conn, since)
+                else:
+                    raise ValueError(f"알 수 없는 점수 계산 모드: {mode}")
 
-            conn.commit()
-            cursor.close()
-            conn.close()
+            self._refresh_topic_cache(rows)
+            return len(rows)
 
         except Exception as e:
             logger.error(f"트렌드 점수 계산 오류: {e}")
+            return 0
+
+    # 갱신 후 캐시용으로 돌려받는 컬럼
+    _TOPIC_COLUMNS = (
+        'id', 'topic_name', 'hashtag', 'region', 'category', 'posts_count',
+        'mentions_count', 'engagement_score', 'trend_score', 'daily_mentions',
+        'is_promoted', 'trend_started_at', 'peak_time', 'last_mention_at'
+    )
+
+    async def _update_trend_scores_sql(self, conn, since: datetime) -> List[tuple]:
+        """_score_topic과 같은 식을 SQL로 계산하여 한 번에 갱신"""
+        rows = await conn.fetch(f"""
+            WITH scored AS (
+                SELECT
+                    id,
+                    daily_mentions * 10
+                    + CASE
+                        WHEN weekly_mentions > 0 AND daily_mentions * 7.0 / weekly_mentions > 1
+                        THEN (daily_mentions * 7.0 / weekly_mentions - 1) * 50
+                        ELSE 0
+                      END
+                    + COALESCE(engagement_score, 0) * 2
+                    + GREATEST(0, 100 - EXTRACT(EPOCH FROM (LOCALTIMESTAMP - last_mention_at)) / 3600 * 2)
+                    + CASE
+                        WHEN EXTRACT(EPOCH FROM (LOCALTIMESTAMP - COALESCE(trend_started_at, last_mention_at))) / 3600 > 24
+                        THEN LEAST(50, EXTRACT(EPOCH FROM (LOCALTIMESTAMP - COALESCE(trend_started_at, last_mention_at))) / 3600 / 24 * 5)
+                        ELSE 0
+                      END AS score
+                FROM trending_topics
+                WHERE is_active = TRUE
+                AND last_mention_at >= %s
+            )
+            UPDATE trending_topics t
+            SET trend_score = ROUND(scored.score::numeric, 2), updated_at = LOCALTIMESTAMP
+            FROM scored
+            WHERE t.id = scored.id
+            RETURNING {', '.join('t.' + column for column in self._TOPIC_COLUMNS)}
+        """, (since,))
+        return [tuple(row) for row in rows]
+
+    async def _update_trend_scores_bulk(self, conn, since: datetime) -> List[tuple]:
+        """한 번 조회 → 메모리 계산 → 같은 트랜잭션에서 UPDATE 배치"""
+        topics = await conn.fetch(f"""
+            SELECT {', '.join(self._TOPIC_COLUMNS)}, weekly_mentions
+            FROM trending_topics
+            WHERE is_active = TRUE
+            AND last_mention_at >= %s
+        """, (since,))
+        topics = [tuple(row) for row in topics]
+        if not topics:
+            return []
+
+        now = datetime.now()
+        score_index = self._TOPIC_COLUMNS.index('trend_score')
+        rows = []
+        updates = []
+        for topic in topics:
+            record = dict(zip(self._TOPIC_COLUMNS, topic))
+            trend_score = self._score_topic(
+                record['daily_mentions'], topic[-1],
+                float(record['engagement_score']) if record['engagement_score'] else 0,
+                record['trend_started_at'] or record['last_mention_at'],
+                record['last_mention_at'], now
+            )
+            updates.append((trend_score, record['id']))
+            rows.append(topic[:score_index] + (trend_score,) + topic[score_index + 1:-1])
+
+        await conn.executemany("""
+            UPDATE trending_topics
+            SET trend_score = %s, updated_at = LOCALTIMESTAMP
+            WHERE id = %s
+        """, updates)
+        return rows
+
+    def _refresh_topic_cache(self, rows: List[tuple]):
+        """점수 계산 결과로 메모리 토픽 정보와 감쇠 카운터를 갱신"""
+        meta = {}
+        for row in rows:
+            record = dict(zip(self._TOPIC_COLUMNS, row))
+            daily_mentions = record.pop('daily_mentions') or 0
+            record['engagement_score'] = float(record['engagement_score']) if record['engagement_score'] else 0
+            record['trend_score'] = float(record['trend_score']) if record['trend_score'] else 0
+            meta[(record['hashtag'], record['region'])] = record
+
+            # DB의 일간 언급 수가 여러 워커에서 합산된 기준값
+            self.decayed_counter.seed(record['hashtag'], daily_mentions, record['region'])
+
+        self._topic_meta = meta
 
     async def _calculate_trend_score(
         self, daily: int, weekly: int, monthly: int,
         engagement: float, started: datetime, last_mention: datetime
     ) -> float:
         """트렌드 점수 계산 알고리즘"""
+        return self._score_topic(daily, weekly, engagement, started, last_mention, datetime.now())
+
+    @staticmethod
+    def _score_topic(
+        daily: int, weekly: int, engagement: float,
+        started: datetime, last_mention: datetime, now: datetime
+    ) -> float:
+        """트렌드 점수 계산 (_update_trend_scores_sql의 SQL 식과 동일)"""
 
         # 기본 점수 (일일 언급 수 기반)
         base_score = daily * 10
@@ -217,11 +427,11 @@ class TrendingTopicsService:
         engagement_bonus = engagement * 2
 
         # 신선도 보너스 (최근 언급일수록 높음)
-        hours_since_mention = (datetime.now() - last_mention).total_seconds() / 3600
+        hours_since_mention = (now - last_mention).total_seconds() / 3600
         freshness_bonus = max(0, 100 - hours_since_mention * 2)
 
         # 지속성 보너스 (오래 지속되는 토픽)
-        hours_since_start = (datetime.now() - started).total_seconds() / 3600
+        hours_since_start = (now - started).total_seconds() / 3600
         if hours_since_start > 24:
             persistence_bonus = min(50, hours_since_start / 24 * 5)
         else:
@@ -239,9 +449,6 @@ class TrendingTopicsService:
     ) -> List[Dict[str, Any]]:
         """특정 토픽의 포스트들 조회"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
             # 해시태그를 포함한 포스트 검색
             query = """
                 SELECT
@@ -264,10 +471,8 @@ class TrendingTopicsService:
             query += " ORDER BY sp.published_at DESC LIMIT %s"
             params.append(limit)
 
-            cursor.execute(query, params)
-
             posts = []
-            for row in cursor.fetchall():
+            for row in await async_db.fetch(query, params):
                 posts.append({
                     'id': row[0],
                     'user_id': row[1],
@@ -286,9 +491,6 @@ class TrendingTopicsService:
                     'user_avatar_url': row[14]
                 })
 
-            cursor.close()
-            conn.close()
-
             return posts
 
         except Exception as e:
@@ -298,40 +500,21 @@ class TrendingTopicsService:
     async def get_recommended_hashtags(
         self, user_id: str, content: str, limit: int = 10
     ) -> List[str]:
-        """사용자에게 추천할 해시태그"""
-        try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            # 사용자 프로필 정보 조회
-            cursor.execute("""
-                SELECT specialties, farm_location, farmer_type
-                FROM social_profiles WHERE user_id = %s
-            """, (user_id,))
-
-            profile = cursor.fetchone()
-            recommendations = []
-
-            if profile:
-                specialties = profile[0] or []
-                location = profile[1]
-                farmer_type = profile[2]
-
-                # 전문 분야 기반 추천
-                if specialties:
-                    for specialty in specialties:
-                        recommendations.append(f"#{specialty}")
+        """
+        사용자에게 추천할 해시태그
 
-                # 지역 기반 추천
-                if location:
-                    recommendations.append(f"#{location}")
-
-                # 농업 유형 기반 추천
-                if farmer_type:
-                    recommendations.append(f"#{farmer_type}")
+        프로필 기반 추천은 profile_tag_ttl 동안 캐시하고, 콘텐츠 키워드와 트렌딩
+        토픽은 메모리 스케치에서 바로 순위를 매깁니다.
+        """
+        try:
+            recommendations = list(await self._get_profile_hashtags(user_id))
 
-            # 콘텐츠 기반 키워드 추천
+            # 콘텐츠 기반 키워드 추천 (최근 하루 언급이 많은 키워드 우선)
             content_keywords = await self._extract_keywords_from_content(content)
+            content_keywords.sort(
+                key=lambda keyword: self.trend_sketch.estimate(f"#{keyword}".lower()),
+                reverse=True
+            )
             recommendations.extend([f"#{kw}" for kw in content_keywords[:3]])
 
             # 현재 트렌딩 토픽 추천
@@ -339,17 +522,47 @@ class TrendingTopicsService:
             recommendations.extend([topic['hashtag'] for topic in trending])
 
             # 중복 제거 및 제한
-            unique_recommendations = list(dict.fromkeys(recommendations))[:limit]
-
-            cursor.close()
-            conn.close()
-
-            return unique_recommendations
+            return list(dict.fromkeys(recommendations))[:limit]
 
         except Exception as e:
             logger.error(f"해시태그 추천 오류: {e}")
             return []
 
+    async def _get_profile_hashtags(self, user_id: str) -> List[str]:
+        """프로필(전문 분야, 지역, 농업 유형) 기반 해시태그 (TTL 캐시)"""
+        cached = self._profile_tag_cache.get(user_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        # 사용자 프로필 정보 조회
+        profile = await async_db.fetchrow("""
+            SELECT specialties, farm_location, farmer_type
+            FROM social_profiles WHERE user_id = %s
+        """, (user_id,))
+
+        tags = []
+        if profile:
+            specialties = profile[0] or []
+            location = profile[1]
+            farmer_type = profile[2]
+
+            # 전문 분야 기반 추천
+            for specialty in specialties:
+                tags.append(f"#{specialty}")
+
+            # 지역 기반 추천
+            if location:
+                tags.append(f"#{location}")
+
+            # 농업 유형 기반 추천
+            if farmer_type:
+                tags.append(f"#{farmer_type}")
+
+        if len(self._profile_tag_cache) >= 10000:
+            self._profile_tag_cache.clear()
+        self._profile_tag_cache[user_id] = (time.monotonic() + self.profile_tag_ttl, tags)
+        return tags
+
     async def _extract_keywords_from_content(self, content: str) -> List[str]:
         """콘텐츠에서 키워드 추출 (간단한 구현)"""
         # 농업/환경 관련 키워드 사전
@@ -373,34 +586,28 @@ class TrendingTopicsService:
     async def cleanup_old_trends(self) -> None:
         """오래된 트렌드 데이터 정리"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            # 30일 이상 언급이 없는 토픽 비활성화
-            cutoff_date = datetime.now() - timedelta(days=30)
-
-            cursor.execute("""
-                UPDATE trending_topics
-                SET is_active = FALSE
-                WHERE last_mention_at < %s AND is_active = TRUE
-            """, (cutoff_date,))
-
-            # 일일/주간/월간 카운터 리셋 (매일 자정 실행 가정)
-            if datetime.now().hour == 0:
-                # 일일 리셋
-                cursor.execute("UPDATE trending_topics SET daily_mentions = 0")
-
-                # 주간 리셋 (월요일)
-                if datetime.now().weekday() == 0:
-                    cursor.execute("UPDATE trending_topics SET weekly_mentions = 0")
-
-                # 월간 리셋 (1일)
-                if datetime.now().day == 1:
-                    cursor.execute("UPDATE trending_topics SET monthly_mentions = 0")
-
-            conn.commit()
-            cursor.close()
-            conn.close()
+            async with async_db.transaction() as conn:
+                # 30일 이상 언급이 없는 토픽 비활성화
+                cutoff_date = datetime.now() - timedelta(days=30)
+
+                await conn.execute("""
+                    UPDATE trending_topics
+                    SET is_active = FALSE
+                    WHERE last_mention_at < %s AND is_active = TRUE
+                """, (cutoff_date,))
+
+                # 일일/주간/월간 카운터 리셋 (매일 자정 실행 가정)
+                if datetime.now().hour == 0:
+                    # 일일 리셋
+                    await conn.execute("UPDATE trending_topics SET daily_mentions = 0")
+
+                    # 주간 리셋 (월요일)
+                    if datetime.now().weekday() == 0:
+                        await conn.execute("UPDATE trending_topics SET weekly_mentions = 0")
+
+                    # 월간 리셋 (1일)
+                    if datetime.now().day == 1:
+                        await conn.execute("UPDATE trending_topics SET monthly_mentions = 0")
 
         except Exception as e:
             logger.error(f"오래된 트렌드 정리 오류: {e}")
\ No newline at end of file
@@ -1,10 +1,27 @@
 # app/utils/algorand_utils.py
 
+import threading
+
 from algosdk.v2client import algod
 from app.config import ALGOD_ADDRESS, ALGOD_TOKEN
+from app.utils.cached_algod import CachedAlgodClient
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
 
 def get_algod_client():
-    headers = {
-        "X-API-Key": ALGOD_TOKEN
-    }
-    return algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS, headers)
\ No newline at end of file
+    """
+    공유 algod 클라이언트 (suggested_params / account_info 캐시 포함)
+
+    호출마다 새 클라이언트를 만들면 캐시가 매번 비므로 프로세스 전체에서 하나를 재사용합니다.
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                headers = {
+                    "X-API-Key": ALGOD_TOKEN
+                }
+                _shared_client = CachedAlgodClient(algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS, headers))
+    return _shared_client
@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+"""
+asyncio 서비스용 비동기 연결 풀
+async def 서비스 메서드가 이벤트 루프를 막지 않고 DB를 조회하도록 하는 풀
+
+- PostgreSQL: asyncpg 풀 (기본)
+- SQLite: aiosqlite 연결 묶음 (테스트/로컬 개발용, ASYNC_DB_BACKEND=sqlite)
+- 쿼리는 기존 psycopg2 형식(%s)으로 작성하고 백엔드 형식($1 / ?)으로 자동 변환
+
+백엔드 풀은 전용 이벤트 루프 스레드에서 동작합니다. 라우트가 요청마다
+asyncio.run으로 새 루프를 만들어도 같은 풀을 재사용하며, 호출한 루프는 결과를
+기다리는 동안 다른 작업을 계속 진행하므로 asyncio.gather로 묶은 조회가 실제로 겹쳐 실행됩니다.
+"""
+
+import asyncio
+import atexit
+import itertools
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+_PLACEHOLDER_RE = re.compile(r'%([s%])')
+
+
+@lru_cache(maxsize=1024)
+def convert_placeholders(query: str, style: str) -> str:
+    """
+    psycopg2 형식 쿼리(%s, %%)를 백엔드 파라미터 형식으로 변환
+
+    Args:
+        style: 'numeric' ($1, $2, ... - asyncpg) 또는 'qmark' (? - sqlite)
+    """
+    counter = itertools.count(1)
+
+    def replace(match):
+        if match.group(1) == '%':
+            return '%'
+        return f'${next(counter)}' if style == 'numeric' else '?'
+
+    return _PLACEHOLDER_RE.sub(replace, query)
+
+
+class _AsyncpgBackend:
+    """asyncpg 기반 PostgreSQL 풀"""
+
+    name = 'asyncpg'
+    placeholder_style = 'numeric'
+
+    def __init__(self, db_config: Dict[str, Any], min_size: int, max_size: int):
+        self.db_config = db_config
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool = None
+
+    async def open(self):
+        import asyncpg
+
+        self._pool = await asyncpg.create_pool(
+            host=self.db_config['host'],
+            port=int(self.db_config['port']),
+            database=self.db_config['database'],
+            user=self.db_config['user'],
+            password=self.db_config['password'],
+            min_size=self.min_size,
+            max_size=self.max_size
+        )
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+
+    async def acquire(self, timeout: float):
+        return await self._pool.acquire(timeout=timeout)
+
+    async def release(self, conn):
+        await self._pool.release(conn)
+
+    async def fetch(self, conn, query: str, params: tuple) -> List:
+        return await conn.fetch(query, *params)
+
+    async def fetchrow(self, conn, query: str, params: tuple):
+        return await conn.fetchrow(query, *params)
+
+    async def execute(self, conn, query: str, params: tuple) -> int:
+        status = await conn.execute(query, *params)
+        # 'UPDATE 3', 'INSERT 0 1' 등 상태 문자열의 마지막 값이 처리된 행 수
+        tail = status.rsplit(' ', 1)[-1]
+        return int(tail) if tail.isdigit() else 0
+
+    async def executemany(self, conn, query: str, rows: List[tuple]):
+        await conn.executemany(query, rows)
+
+    async def begin(self, conn):
+        transaction = conn.transaction()
+        await transaction.start()
+        return transaction
+
+    async def commit(self, conn, transaction):
+        await transaction.commit()
+
+    async def rollback(self, conn, transaction):
+        await transaction.rollback()
+
+    async def autocommit(self, conn):
+        # 트랜잭션 블록 밖의 문은 asyncpg가 문 단위로 커밋
+        pass
+
+    def size_stats(self) -> Dict[str, int]:
+        if self._pool is None:
+            return {}
+        return {'pool_size': self._pool.get_size(), 'idle_connections': self._pool.get_idle_size()}
+
+
+class _AiosqliteBackend:
+    """aiosqlite 기반 SQLite 연결 묶음 (테스트/로컬 개발용)"""
+
+    name = 'aiosqlite'
+    placeholder_style = 'qmark'
+
+    def __init__(self, path: str, max_size: int):
+        self.path = path
+        self.max_size = max_size
+        self._aiosqlite = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._connections = []
+
+    async def open(self):
+        import aiosqlite
+
+        self._aiosqlite = aiosqlite
+        self._idle = asyncio.Queue()
+
+    async def close(self):
+        for conn in self._connections:
+            await conn.close()
+        self._connections = []
+
+    async def acquire(self, timeout: float):
+        if self._idle.empty() and len(self._connections) < self.max_size:
+            conn = await self._aiosqlite.connect(self.path)
+            conn.row_factory = sqlite3.Row
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.execute("PRAGMA synchronous=NORMAL")
+            self._connections.append(conn)
+            return conn
+        return await asyncio.wait_for(self._idle.get(), timeout)
+
+    async def release(self, conn):
+        if conn.in_transaction:
+            await conn.rollback()
+        self._idle.put_nowait(conn)
+
+    async def fetch(self, conn, query: str, params: tuple) -> List:
+        async with conn.execute(query, params) as cursor:
+            return await cursor.fetchall()
+
+    async def fetchrow(self, conn, query: str, params: tuple):
+        async with conn.execute(query, params) as cursor:
+            return await cursor.fetchone()
+
+    async def execute(self, conn, query: str, params: tuple) -> int:
+        async with conn.execute(query, params) as cursor:
+            return cursor.rowcount
+
+    async def executemany(self, conn, query: str, rows: List[tuple]):
+        await conn.executemany(query, rows)
+
+    async def begin(self, conn):
+        await conn.execute("BEGIN")
+        return None
+
+    async def commit(self, conn, transaction):
+        await conn.commit()
+
+    async def rollback(self, conn, transaction):
+        await conn.rollback()
+
+    async def autocommit(self, conn):
+        if conn.in_transaction:
+            await conn.commit()
+
+    def size_stats(self) -> Dict[str, int]:
+        idle = self._idle.qsize() if self._idle is not None else 0
+        return {'pool_size': len(self._connections), 'idle_connections': idle}
+
+
+class AsyncConnection:
+    """
+    비동기 풀에서 빌린 연결
+
+    transaction() 블록 밖에서 실행한 문은 각각 자동 커밋됩니다.
+    """
+
+    def __init__(self, pool: 'AsyncDatabasePool', raw):
+        self._pool = pool
+        self._raw = raw
+        self._transaction = None
+        self._in_transaction = False
+
+    async def fetch(self, query: str, params: Optional[Sequence] = None) -> List:
+        return await self._pool._run(self._pool._query(self, 'fetch', query, params))
+
+    async def fetchrow(self, query: str, params: Optional[Sequence] = None):
+        return await self._pool._run(self._pool._query(self, 'fetchrow', query, params))
+
+    async def fetchval(self, query: str, params: Optional[Sequence] = None):
+        row = await self.fetchrow(query, params)
+        return row[0] if row is not None else None
+
+    async def execute(self, query: str, params: Optional[Sequence] = None) -> int:
+        """쿼리 실행 (처리된 행 수 반환)"""
+        return await self._pool._run(self._pool._query(self, 'execute', query, params))
+
+    async def executemany(self, query: str, rows: Iterable[Sequence]) -> None:
+        await self._pool._run(self._pool._query(self, 'executemany', query, rows))
+
+    @asynccontextmanager
+    async def transaction(self):
+        """트랜잭션 블록 (중첩 시 바깥 트랜잭션에 합류)"""
+        if self._in_transaction:
+            yield self
+            return
+
+        backend = self._pool._backend
+        self._transaction = await self._pool._run(backend.begin(self._raw))
+        self._in_transaction = True
+        try:
+            yield self
+        except BaseException:
+            await self._pool._run(backend.rollback(self._raw, self._transaction))
+            raise
+        else:
+            await self._pool._run(backend.commit(self._raw, self._transaction))
+        finally:
+            self._transaction = None
+            self._in_transaction = False
+
+
+class AsyncDatabasePool:
+    """
+    비동기 연결 풀 (fetch / fetchrow / fetchval / execute / executemany)
+
+    사용 예:
+        rows = await async_db.fetch("SELECT * FROM t WHERE id = %s", (1,))
+
+        async with async_db.transaction() as conn:
+            await conn.execute(...)
+            await conn.execute(...)
+    """
+
+    def __init__(self, backend: Optional[str] = None, min_size: Optional[int] = None,
+                 max_size: Optional[int] = None, sqlite_path: Optional[str] = None,
+                 acquire_timeout: float = 30.0):
+        self.backend_name = backend or os.getenv('ASYNC_DB_BACKEND', 'asyncpg')
+        self.min_size = min_size or int(os.getenv('ASYNC_DB_POOL_MIN', '2'))
+        self.max_size = max_size or int(os.getenv('ASYNC_DB_POOL_MAX', '20'))
+        self.sqlite_path = sqlite_path or os.getenv('ASYNC_DB_SQLITE_PATH', 'pamtalk_async.db')
+        self.acquire_timeout = acquire_timeout
+
+        self.db_config = {
+            'host': os.getenv('DB_HOST'),
+            'database': os.getenv('DB_NAME'),
+            'user': os.getenv('DB_USER'),
+            'password': os.getenv('DB_PASSWORD'),
+            'port': '5432'
+        }
+
+        self._backend = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._opened: Optional[Future] = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'queries': 0,
+            'query_errors': 0,
+            'query_time_total': 0.0,
+            'acquired': 0
+        }
+
+    # ========== 전용 이벤트 루프 ==========
+
+    def _create_backend(self):
+        if self.backend_name == 'asyncpg':
+            return _AsyncpgBackend(self.db_config, self.min_size, self.max_size)
+        if self.backend_name in ('sqlite', 'aiosqlite'):
+            return _AiosqliteBackend(self.sqlite_path, self.max_size)
+        raise ValueError(f"지원하지 않는 비동기 DB 백엔드: {self.backend_name}")
+
+    def _ensure_started(self) -> Future:
+        """풀 전용 루프 스레드를 시작하고 백엔드 풀 열기 (실패했으면 다시 시도)"""
+        opened = self._opened
+        if opened is not None and not (opened.done() and opened.exception() is not None):
+            return opened
+
+        with self._start_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, daemon=True,
+                                                name='async-db-pool')
+                self._thread.start()
+
+            opened = self._opened
+            if opened is None or (opened.done() and opened.exception() is not None):
+                self._backend = self._create_backend()
+                self._opened = asyncio.run_coroutine_threadsafe(self._backend.open(), self._loop)
+            return self._opened
+
+    async def _run(self, coro):
+        """코루틴을 풀 전용 루프에서 실행하고 호출한 루프에서 결과를 기다림"""
+        opened = self._ensure_started()
+        running = asyncio.get_running_loop()
+        if running is self._loop:
+            return await coro
+
+        if not opened.done():
+            await asyncio.wrap_future(opened)
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    # ========== 풀 전용 루프에서 실행되는 코루틴 ==========
+
+    async def _query(self, conn: AsyncConnection, method: str, query: str, params):
+        backend = self._backend
+        if method == 'executemany':
+            sql = convert_placeholders(query, backend.placeholder_style)
+            args = [tuple(row) for row in params]
+        elif params is None:
+            sql, args = query, ()
+        else:
+            sql, args = convert_placeholders(query, backend.placeholder_style), tuple(params)
+
+        started = time.perf_counter()
+        try:
+            result = await getattr(backend, method)(conn._raw, sql, args)
+            if not conn._in_transaction:
+                await backend.autocommit(conn._raw)
+            return result
+        except Exception:
+            self._count('query_errors')
+            raise
+        finally:
+            with self._stats_lock:
+                self._stats['queries'] += 1
+                self._stats['query_time_total'] += time.perf_counter() - started
+
+    async def _acquire_raw(self):
+        raw = await self._backend.acquire(self.acquire_timeout)
+        self._count('acquired')
+        return raw
+
+    async def _release_raw(self, conn: AsyncConnection):
+        if conn._in_transaction:
+            await self._backend.rollback(conn._raw, conn._transaction)
+            conn._in_transaction = False
+        await self._backend.release(conn._raw)
+
+    async def _with_connection(self, method: str, query: str, params):
+        """연결 획득 → 쿼리 → 반환을 풀 루프 안에서 한 번에 처리"""
+        conn = AsyncConnection(self, await self._acquire_raw())
+        try:
+            return await self._query(conn, method, query, params)
+        finally:
+            await self._release_raw(conn)
+
+    # ========== 공개 API ==========
+
+    @asynccontextmanager
+    async def acquire(self):
+        """연결 하나를 블록 동안 빌림"""
+        conn = AsyncConnection(self, await self._run(self._acquire_raw()))
+        try:
+            yield conn
+        finally:
+            await self._run(self._release_raw(conn))
+
+    @asynccontextmanager
+    async def transaction(self):
+        """연결을 빌려 트랜잭션 블록 실행 (예외 시 롤백)"""
+        async with self.acquire() as conn:
+            async with conn.transaction():
+                yield conn
+
+    async def fetch(self, query: str, params: Optional[Sequence] = None) -> List:
+        """여러 행 조회 (행은 인덱스와 컬럼명으로 모두 접근 가능)"""
+        return await self._run(self._with_connection('fetch', query, params))
+
+    async def fetchrow(self, query: str, params: Optional[Sequence] = None):
+        """한 행 조회 (없으면 None)"""
+        return await self._run(self._with_connection('fetchrow', query, params))
+
+    async def fetchval(self, query: str, params: Optional[Sequence] = None):
+        """첫 행의 첫 값 조회 (없으면 None)"""
+        row = await self.fetchrow(query, params)
+        return row[0] if row is not None else None
+
+    async def execute(self, query: str, params: Optional[Sequence] = None) -> int:
+        """쿼리 실행 후 자동 커밋 (처리된 행 수 반환)"""
+        return await self._run(self._with_connection('execute', query, params))
+
+    async def executemany(self, query: str, rows: Iterable[Sequence]) -> None:
+        """같은 쿼리를 여러 파라미터로 한 트랜잭션에서 실행"""
+        rows = list(rows)
+        if not rows:
+            return
+        async with self.transaction() as conn:
+            await conn.executemany(query, rows)
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """비동기 풀 통계"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['backend'] = self.backend_name
+        stats['avg_query_ms'] = (
+            stats['query_time_total'] / stats['queries'] * 1000 if stats['queries'] else 0.0
+        )
+        if self._backend is not None and self._opened is not None and self._opened.done():
+            stats.update(self._backend.size_stats())
+        return stats
+
+    def close(self, timeout: float = 5.0):
+        """백엔드 풀과 전용 루프 종료"""
+        with self._start_lock:
+            loop, opened, backend = self._loop, self._opened, self._backend
+            self._loop = self._thread = self._opened = self._backend = None
+
+        if loop is None:
+            return
+        try:
+            if opened is not None and opened.done() and opened.exception() is None:
+                asyncio.run_coroutine_threadsafe(backend.close(), loop).result(timeout)
+        except Exception:
+            pass
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+
+
+# 글로벌 비동기 DB 인스턴스 (첫 쿼리 시 연결)
+async_db = AsyncDatabasePool()
+atexit.register(async_db.close)
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+캐시 algod 클라이언트 래퍼
+전송 경로마다 반복되는 suggested_params / account_info 조회를 줄이기 위한 계층
+
+- suggested_params: 라운드 기준 재사용 (window_rounds 라운드가 지나면 새로 조회)
+- account_info / account_asset_info: 짧은 TTL 캐시, 우리가 보낸 트랜잭션의 관련 주소는
+  즉시 무효화하고 확인될 때까지(dirty_seconds) 캐시하지 않음
+- 캐시는 max_entries 크기의 LRU, sweep_interval마다 만료된 항목과 캐시 금지 표시를 정리
+  (프로세스 공용 클라이언트라 조회한 주소/자산 수만큼 계속 커지지 않도록)
+- 같은 인자로 동시에 들어온 조회는 노드 호출 하나로 합침
+- 그 외 메서드(send_transaction, pending_transaction_info 등)는 원래 클라이언트로 위임
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# 한 라운드 예상 시간 (초) - 라운드를 관찰하지 못했을 때 파라미터 만료 시간 계산에 사용
+ROUND_SECONDS = 3.3
+
+# 트랜잭션에서 잔액/옵트인 상태가 바뀌는 주소 필드
+_ADDRESS_FIELDS = ('sender', 'receiver', 'close_remainder_to', 'close_assets_to', 'revocation_target')
+
+
+class _Coalescer:
+    """같은 키의 동시 호출을 하나로 합침 (먼저 온 호출의 결과를 나머지가 공유)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Any, Future] = {}
+
+    def call(self, key, func: Callable[[], Any]):
+        """
+        Returns:
+            (결과, 다른 호출의 결과를 공유했는지 여부)
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+
+class CachedAlgodClient:
+    """algod 클라이언트 캐시 래퍼 (AlgodClient와 같은 방식으로 사용)"""
+
+    def __init__(self, client, params_window_rounds: int = 10, account_ttl: float = 2.0,
+                 asset_ttl: float = 60.0, dirty_seconds: float = 10.0,
+                 max_entries: int = 10000, sweep_interval: float = 30.0):
+        self._client = client
+        self.params_window_rounds = params_window_rounds
+        self.account_ttl = account_ttl
+        self.asset_ttl = asset_ttl
+        self.dirty_seconds = dirty_seconds
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+
+        self._lock = threading.Lock()
+        self._coalescer = _Coalescer()
+        self._params = None
+        self._params_fetched_at = 0.0
+        self._latest_round = 0
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (만료 시각, 값), LRU 순
+        self._dirty: Dict[str, float] = {}        # 주소 -> 캐시 금지 해제 시각
+        self._last_sweep = time.monotonic()
+        self._stats = {'node_calls': 0, 'cache_hits': 0, 'coalesced': 0, 'invalidations': 0,
+                       'evictions': 0, 'expired': 0}
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    # ------------------------------------------------------------------
+    # 라운드 추적
+    # ------------------------------------------------------------------
+
+    def _observe(self, status: Dict) -> Dict:
+        with self._lock:
+            self._latest_round = max(self._latest_round, status.get('last-round', 0))
+        return status
+
+    def status(self) -> Dict:
+        return self._observe(self._node_call('status', self._client.status))
+
+    def status_after_block(self, block_num: int) -> Dict:
+        return self._observe(self._node_call('status_after_block',
+                                             lambda: self._client.status_after_block(block_num)))
+
+    # ------------------------------------------------------------------
+    # 캐시 조회
+    # ------------------------------------------------------------------
+
+    def suggested_params(self):
+        """라운드 창 안에서는 같은 파라미터 재사용 (호출자가 수정해도 캐시에 영향 없도록 복사본 반환)"""
+        with self._lock:
+            params = self._params if not self._params_stale() else None
+            if params is not None:
+                self._stats['cache_hits'] += 1
+
+        if params is None:
+            params, shared = self._coalescer.call(('suggested_params',), self._fetch_params)
+            if shared:
+                self._count('coalesced')
+        return copy.copy(params)
+
+    def _fetch_params(self):
+        params = self._node_call('suggested_params', self._client.suggested_params)
+        with self._lock:
+            self._params = params
+            self._params_fetched_at = time.monotonic()
+            self._latest_round = max(self._latest_round, params.first)
+        return params
+
+    def _params_stale(self) -> bool:
+        if self._params is None:
+            return True
+        if self._latest_round >= self._params.first + self.params_window_rounds:
+            return True
+        return time.monotonic() - self._params_fetched_at > self.params_window_rounds * ROUND_SECONDS
+
+    def account_info(self, address: str, **kwargs) -> Dict:
+        return self._cached(('account_info', address, tuple(sorted(kwargs.items()))), address,
+                            self.account_ttl, lambda: self._client.account_info(address, **kwargs))
+
+    def account_asset_info(self, address: str, asset_id: int, **kwargs) -> Dict:
+        return self._cached(('account_asset_info', address, asset_id, tuple(sorted(kwargs.items()))),
+                            address, self.account_ttl,
+                            lambda: self._client.account_asset_info(address, asset_id, **kwargs))
+
+    def asset_info(self, asset_id: int, **kwargs) -> Dict:
+        return self._cached(('asset_info', asset_id, tuple(sorted(kwargs.items()))), None,
+                            self.asset_ttl, lambda: self._client.asset_info(asset_id, **kwargs))
+
+    def _cached(self, key: tuple, address: Optional[str], ttl: float, fetch: Callable[[], Any]):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > now:
+                self._cache.move_to_end(key)
+                self._stats['cache_hits'] += 1
+                return copy.deepcopy(entry[1])
+            if entry is not None:
+                del self._cache[key]
+                self._stats['expired'] += 1
+
+        value, shared = self._coalescer.call(key, lambda: self._node_call(key[0], fetch))
+        if shared:
+            self._count('coalesced')
+            return copy.deepcopy(value)
+
+        with self._lock:
+            now = time.monotonic()
+            dirty_until = self._dirty.get(address) if address else None
+            if dirty_until is None or dirty_until <= now:
+                self._dirty.pop(address, None)
+                self._cache[key] = (now + ttl, value)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+                    self._stats['evictions'] += 1
+            self._sweep_if_due(now)
+        return copy.deepcopy(value)
+
+    def _sweep_if_due(self, now: float):
+        """만료된 캐시 항목과 캐시 금지 표시 정리 (같은 키를 다시 읽지 않아도 빠지도록, 락 안에서 호출)"""
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+        for key in [key for key, (expires_at, _) in self._cache.items() if expires_at <= now]:
+            del self._cache[key]
+            self._stats['expired'] += 1
+        for address in [address for address, until in self._dirty.items() if until <= now]:
+            del self._dirty[address]
+
+    # ------------------------------------------------------------------
+    # 전송 (관련 주소 캐시 무효화)
+    # ------------------------------------------------------------------
+
+    def send_transaction(self, signed_txn, **kwargs) -> str:
+        tx_id = self._node_call('send_transaction',
+                                lambda: self._client.send_transaction(signed_txn, **kwargs))
+        self._invalidate_for([signed_txn])
+        return tx_id
+
+    def send_transactions(self, signed_txns, **kwargs) -> str:
+        tx_id = self._node_call('send_transactions',
+                                lambda: self._client.send_transactions(signed_txns, **kwargs))
+        self._invalidate_for(signed_txns)
+        return tx_id
+
+    def invalidate_address(self, address: str):
+        """주소 관련 캐시 제거 (외부에서 상태가 바뀐 것을 알았을 때)"""
+        self._invalidate_addresses([address])
+
+    def _invalidate_for(self, signed_txns: Iterable):
+        addresses = set()
+        for signed in signed_txns:
+            txn = getattr(signed, 'transaction', signed)
+            for field in _ADDRESS_FIELDS:
+                value = getattr(txn, field, None)
+                if value:
+                    addresses.add(value)
+        self._invalidate_addresses(addresses)
+
+    def _invalidate_addresses(self, addresses: Iterable[str]):
+        now = time.monotonic()
+        with self._lock:
+            self._sweep_if_due(now)
+            for address in addresses:
+                self._dirty[address] = now + self.dirty_seconds
+                for key in [key for key in self._cache if len(key) > 1 and key[1] == address]:
+                    del self._cache[key]
+                self._stats['invalidations'] += 1
+
+    # ------------------------------------------------------------------
+    # 통계
+    # ------------------------------------------------------------------
+
+    def _node_call(self, method: str, func: Callable[[], Any]):
+        self._count('node_calls')
+        self._count(f'node_calls.{method}')
+        return func()
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] = self._stats.get(key, 0) + 1
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """노드 호출 수와 캐시/합치기로 아낀 호출 수"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cached_entries'] = len(self._cache)
+            stats['dirty_addresses'] = len(self._dirty)
+            stats['latest_round'] = self._latest_round
+        stats['calls_saved'] = stats['cache_hits'] + stats['coalesced']
+        return stats
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""
+라운드 기반 트랜잭션 확인 감시기
+트랜잭션마다 폴링 루프를 돌리는 대신, 감시 스레드 하나가 새 라운드를 따라가며
+(status_after_block) 라운드마다 블록의 트랜잭션 ID 목록을 한 번 받아(get_block_txids)
+대기 중인 트랜잭션과 맞춰 보고 Future를 완료
+
+트랜잭션별 조회(pending_transaction_info)는 다음 경우에만 합니다
+- 등록 직후 한 번 (등록 전에 지나간 블록에 이미 포함됐거나 바로 거부된 경우)
+- 블록에서 찾았을 때 한 번 (호출자에게 돌려줄 asset-index 등 확인 정보)
+- recheck_rounds 라운드마다 한 번 (pool-error 확인)
+- 제한 라운드/시간에 도달했을 때 (타임아웃 전 마지막 확인)
+블록 목록을 쓸 수 없으면(구버전 노드, max_block_scan보다 많이 밀림) 라운드별 전체 조회로 대체
+
+- 동기 코드: watcher.wait(tx_id)
+- 비동기 코드: await watcher.wait_async(tx_id)
+- 여러 건: watcher.wait_many([...])
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional
+
+from algosdk.error import AlgodHTTPError
+
+logger = logging.getLogger(__name__)
+
+
+class ConfirmationError(Exception):
+    """트랜잭션이 거부되어 블록에 포함될 수 없음 (pool-error)"""
+
+    def __init__(self, tx_id: str, reason: str):
+        super().__init__(f"트랜잭션 {tx_id} 거부: {reason}")
+        self.tx_id = tx_id
+        self.reason = reason
+
+
+class ConfirmationTimeout(ConfirmationError):
+    """제한 라운드/시간 안에 확인되지 않음"""
+
+    def __init__(self, tx_id: str, detail: str):
+        Exception.__init__(self, f"트랜잭션 {tx_id} 확인 타임아웃 ({detail})")
+        self.tx_id = tx_id
+        self.reason = detail
+
+
+class _Watch:
+    __slots__ = ('future', 'timeout_rounds', 'deadline_round', 'deadline_time', 'checked_round')
+
+    def __init__(self, future: Future, timeout_rounds: Optional[int], deadline_time: Optional[float]):
+        self.future = future
+        self.timeout_rounds = timeout_rounds
+        self.deadline_round = None  # 감시 스레드가 현재 라운드를 알게 되면 정함
+        self.deadline_time = deadline_time
+        self.checked_round = None  # 마지막 개별 조회 라운드 (None이면 아직 조회 전)
+
+
+class ConfirmationWatcher:
+    """algod 클라이언트 하나를 공유하는 확인 감시기"""
+
+    def __init__(self, client, error_backoff: float = 1.0, recheck_rounds: int = 10,
+                 max_block_scan: int = 20):
+        self.client = client
+        self.error_backoff = error_backoff
+        self.recheck_rounds = recheck_rounds
+        self.max_block_scan = max_block_scan
+        self._cond = threading.Condition()
+        self._watches: Dict[str, _Watch] = {}
+        self._round = 0
+        self._scanned_round = 0
+        self._block_txids_supported = True
+        self._thread = None
+        self._stopped = False
+        self._stats = {
+            'watched': 0,
+            'confirmed': 0,
+            'rejected': 0,
+            'timed_out': 0,
+            'rounds_followed': 0,
+            'status_calls': 0,
+            'block_lookups': 0,
+            'lookups': 0
+        }
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+
+    def watch(self, tx_id: str, timeout_rounds: Optional[int] = 10,
+              timeout: Optional[float] = None) -> Future:
+        """
+        확인 감시 등록
+
+        Args:
+            timeout_rounds: 등록 시점 라운드 기준 이만큼 지나도 확인되지 않으면 ConfirmationTimeout
+            timeout: 초 단위 제한 (노드가 멈춰 라운드가 진행되지 않을 때 대비)
+
+        Returns:
+            확인되면 pending_transaction_info 결과로 완료되는 Future
+            (같은 tx_id를 여러 곳에서 기다리면 같은 Future를 공유)
+        """
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("확인 감시기가 중지되었습니다")
+
+            existing = self._watches.get(tx_id)
+            if existing is not None:
+                return existing.future
+
+            future = Future()
+            future.set_running_or_notify_cancel()
+            watch = _Watch(future, timeout_rounds,
+                           time.monotonic() + timeout if timeout is not None else None)
+            if timeout_rounds is not None and self._round:
+                watch.deadline_round = self._round + timeout_rounds
+            self._watches[tx_id] = watch
+            self._stats['watched'] += 1
+            self._ensure_thread()
+            self._cond.notify_all()
+            return future
+
+    def wait(self, tx_id: str, timeout_rounds: Optional[int] = 10,
+             timeout: Optional[float] = None) -> Dict:
+        """확인될 때까지 대기 (동기)"""
+        return self.watch(tx_id, timeout_rounds, timeout).result()
+
+    async def wait_async(self, tx_id: str, timeout_rounds: Optional[int] = 10,
+                         timeout: Optional[float] = None) -> Dict:
+        """확인될 때까지 대기 (비동기, 이벤트 루프를 막지 않음)"""
+        return await asyncio.wrap_future(self.watch(tx_id, timeout_rounds, timeout))
+
+    def wait_many(self, tx_ids: Iterable[str], timeout_rounds: Optional[int] = 10,
+                  timeout: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        여러 트랜잭션을 함께 대기
+
+        Returns:
+            {tx_id: 확인 정보 또는 실패 시 {'error': 메시지}}
+        """
+        futures = {tx_id: self.watch(tx_id, timeout_rounds, timeout) for tx_id in tx_ids}
+        results = {}
+        for tx_id, future in futures.items():
+            try:
+                results[tx_id] = future.result()
+            except ConfirmationError as e:
+                results[tx_id] = {'error': str(e)}
+        return results
+
+    def stop(self):
+        """감시 중지 (남은 대기는 취소)"""
+        with self._cond:
+            self._stopped = True
+            watches, self._watches = self._watches, {}
+            self._cond.notify_all()
+        for watch in watches.values():
+            watch.future.cancel()
+
+    def get_stats(self) -> Dict:
+        with self._cond:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._watches)
+            stats['last_round'] = self._round
+        return stats
+
+    # ------------------------------------------------------------------
+    # 감시 스레드
+    # ------------------------------------------------------------------
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="algod-confirmation-watcher",
+                                            daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._watches and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+
+            try:
+                self._follow_round()
+                self._check_pending()
+            except Exception as e:
+                logger.error(f"확인 감시 오류: {str(e)}")
+                self._expire_by_time()
+                time.sleep(self.error_backoff)
+
+    def _follow_round(self):
+        """첫 호출은 현재 라운드, 이후에는 다음 라운드가 나올 때까지 대기"""
+        if self._round:
+            status = self.client.status_after_block(self._round)
+        else:
+            status = self.client.status()
+        current = status['last-round']
+
+        with self._cond:
+            self._stats['status_calls'] += 1
+            if self._round and current > self._round:
+                self._stats['rounds_followed'] += current - self._round
+            self._round = max(self._round, current)
+            for watch in self._watches.values():
+                if watch.deadline_round is None and watch.timeout_rounds is not None:
+                    watch.deadline_round = self._round + watch.timeout_rounds
+
+    def _check_pending(self):
+        """이번 라운드까지의 새 블록을 한 번씩 훑어 대기 중인 트랜잭션 전체를 확인"""
+        with self._cond:
+            first, current = self._scanned_round + 1, self._round
+            if not self._scanned_round:
+                first = current + 1  # 시작 라운드 이전 블록은 등록 직후 개별 조회로 확인
+
+        included = self._scan_blocks(first, current)
+        with self._cond:
+            self._scanned_round = max(self._scanned_round, current)
+            snapshot = list(self._watches.items())
+
+        now = time.monotonic()
+        for tx_id, watch in snapshot:
+            if included is not None and tx_id in included:
+                info = self._lookup(tx_id)
+                if info.get('confirmed-round', 0) <= 0:
+                    info = dict(info, **{'confirmed-round': included[tx_id]})
+                self._resolve(tx_id, result=info, counter='confirmed')
+                continue
+
+            round_expired = watch.deadline_round is not None and watch.deadline_round <= current
+            time_expired = watch.deadline_time is not None and now >= watch.deadline_time
+            if not (included is None or round_expired or time_expired
+                    or watch.checked_round is None
+                    or current - watch.checked_round >= self.recheck_rounds):
+                continue
+
+            info = self._lookup(tx_id)
+            watch.checked_round = current
+            if info.get('confirmed-round', 0) > 0:
+                self._resolve(tx_id, result=info, counter='confirmed')
+            elif info.get('pool-error'):
+                self._resolve(tx_id, error=ConfirmationError(tx_id, info['pool-error']),
+                              counter='rejected')
+            elif round_expired:
+                self._resolve(tx_id, error=ConfirmationTimeout(tx_id, f"라운드 {watch.deadline_round}까지 미확인"),
+                              counter='timed_out')
+            elif time_expired:
+                self._resolve(tx_id, error=ConfirmationTimeout(tx_id, "제한 시간 초과"),
+                              counter='timed_out')
+
+    def _scan_blocks(self, first: int, last: int) -> Optional[Dict[str, int]]:
+        """
+        first~last 라운드 블록의 트랜잭션 ID 수집
+
+        Returns:
+            {tx_id: 포함 라운드}, 블록 목록을 쓸 수 없으면 None (전체 개별 조회로 대체)
+        """
+        if first > last:
+            return {}
+        if not self._block_txids_supported or last - first + 1 > self.max_block_scan:
+            return None
+
+        included = {}
+        for round_num in range(first, last + 1):
+            try:
+                response = self.client.get_block_txids(round_num)
+            except (AttributeError, AlgodHTTPError) as e:
+                if isinstance(e, AlgodHTTPError) and e.code != 404:
+                    raise
+                logger.warning(f"블록 트랜잭션 목록을 쓸 수 없어 개별 조회로 확인합니다: {str(e)}")
+                self._block_txids_supported = False
+                return None
+            finally:
+                with self._cond:
+                    self._stats['block_lookups'] += 1
+            for tx_id in response.get('blockTxids') or []:
+                included[tx_id] = round_num
+        return included
+
+    def _lookup(self, tx_id: str) -> Dict:
+        """트랜잭션 개별 조회 (노드에 없으면 빈 dict)"""
+        try:
+            return self.client.pending_transaction_info(tx_id)
+        except AlgodHTTPError as e:
+            if e.code != 404:
+                raise
+            return {}  # 아직 노드에 도착하지 않았거나 풀에서 빠짐
+        finally:
+            with self._cond:
+                self._stats['lookups'] += 1
+
+    def _expire_by_time(self):
+        """노드 오류로 라운드를 따라가지 못하는 동안에도 시간 제한은 지킴"""
+        now = time.monotonic()
+        with self._cond:
+            expired = [tx_id for tx_id, watch in self._watches.items()
+                       if watch.deadline_time is not None and now >= watch.deadline_time]
+        for tx_id in expired:
+            self._resolve(tx_id, error=ConfirmationTimeout(tx_id, "제한 시간 초과"), counter='timed_out')
+
+    def _resolve(self, tx_id: str, result: Optional[Dict] = None,
+                 error: Optional[Exception] = None, counter: str = 'confirmed'):
+        with self._cond:
+            watch = self._watches.pop(tx_id, None)
+            if watch is None:
+                return
+            self._stats[counter] += 1
+
+        if error is not None:
+            watch.future.set_exception(error)
+        else:
+            watch.future.set_result(result)
+
+
+_watchers: Dict[tuple, ConfirmationWatcher] = {}
+_watchers_lock = threading.Lock()
+
+
+def get_confirmation_watcher(client) -> ConfirmationWatcher:
+    """
+    노드별 공유 감시기
+
+    호출마다 새 AlgodClient를 만드는 코드도 같은 감시 스레드를 쓰도록
+    노드 주소/토큰으로 묶습니다 (주소가 없는 클라이언트는 객체 단위).
+    """
+    address = getattr(client, 'algod_address', None)
+    key = (address, getattr(client, 'algod_token', None)) if address else ('client', id(client))
+    with _watchers_lock:
+        watcher = _watchers.get(key)
+        if watcher is None:
+            watcher = _watchers[key] = ConfirmationWatcher(client)
+        return watcher
+
+
+def wait_for_confirmations(client, tx_ids: List[str], timeout_rounds: int = 10) -> Dict[str, Dict]:
+    """여러 트랜잭션을 공유 감시기로 함께 대기"""
+    return get_confirmation_watcher(client).wait_many(tx_ids, timeout_rounds)
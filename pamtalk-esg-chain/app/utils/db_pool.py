@@ -7,6 +7,7 @@ PostgreSQL 연결 풀을 사용한 효율적인 DB 관리
 import os
 import threading
 import time
+import weakref
 from contextlib import contextmanager
 from typing import Optional, Dict, Any
 
@@ -15,6 +16,15 @@ from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 
+# SQLite 기반 서비스용 스레드별 연결 풀 (같은 모듈에서 함께 제공)
+from app.utils.sqlite_pool import SQLiteConnectionPool, get_sqlite_pool
+# asyncio 서비스용 비동기 연결 풀 (asyncpg / aiosqlite)
+from app.utils.async_db_pool import AsyncDatabasePool, async_db
+# 풀 대기열 / 지연 히스토그램 / 누수 감지
+from app.utils.pool_monitor import FairSlotQueue, LatencyHistogram, LeakDetector, PoolTimeoutError
+# 서버 측 prepared statement 캐시 / 다중 조회 배치
+from app.utils.statement_cache import PreparedStatementCache, build_batch_select
+
 load_dotenv()
 
 
@@ -51,17 +61,44 @@ class DatabaseConnectionPool:
             'minconn': int(os.getenv('DB_POOL_MIN', '2')),
             'maxconn': int(os.getenv('DB_POOL_MAX', '20')),
         }
+        # 유휴 연결 검증 주기 / 누수 판단 기준 (초)
+        self.validation_interval = float(os.getenv('DB_POOL_VALIDATE_INTERVAL', '30'))
+        self.leak_threshold = float(os.getenv('DB_POOL_LEAK_THRESHOLD', '60'))
 
         self._pool = None
+        self._stats_lock = threading.Lock()
         self._stats = {
             'total_connections': 0,
             'active_connections': 0,
             'pool_hits': 0,
             'pool_misses': 0,
-            'connection_errors': 0
+            'connection_errors': 0,
+            'acquire_timeouts': 0,
+            'validations': 0,
+            'validation_failures': 0,
+            'batched_queries': 0,
+            'round_trips_saved': 0
         }
+        self._statement_cache = PreparedStatementCache(
+            max_size=int(os.getenv('DB_PREPARED_CACHE_SIZE', '128'))
+        )
+
+        # 풀 크기만큼의 슬롯을 요청 순서대로 배분 (getconn은 고갈 시 대기 없이 실패하므로)
+        self._slots = FairSlotQueue(self.pool_config['maxconn'])
+        self._wait_histogram = LatencyHistogram()
+        self._hold_histogram = LatencyHistogram()
+        self._leak_detector = LeakDetector(
+            threshold=self.leak_threshold,
+            capture_stack=os.getenv('DB_POOL_LEAK_STACKS', 'true').lower() == 'true'
+        )
+        # 연결 -> 마지막 반환(또는 검증) 시각
+        # (id()는 닫힌 연결의 주소가 재사용되면 엉뚱한 연결과 섞이므로 약한 참조 키 사용)
+        self._last_used: "weakref.WeakKeyDictionary[Any, float]" = weakref.WeakKeyDictionary()
+        self._maintenance_stop = threading.Event()
+        self._maintenance_thread = None
 
         self._initialize_pool()
+        self._start_maintenance()
         self._initialized = True
 
     def _initialize_pool(self):
@@ -82,55 +119,200 @@ class DatabaseConnectionPool:
             print(f"[DB 연결 풀 초기화 실패] {str(e)}")
             raise
 
-    @contextmanager
-    def get_connection(self, timeout: int = 30):
-        """연결 풀에서 연결 획득 (컨텍스트 매니저)"""
-        connection = None
-        start_time = time.time()
+    def _count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def record_round_trips_saved(self, count: int):
+        """쿼리를 합쳐 줄인 왕복 수 기록 (get_pool_stats의 round_trips_saved)"""
+        self._count('round_trips_saved', count)
+
+    def _acquire(self, timeout: float):
+        """
+        슬롯을 기다린 뒤 연결 획득 (timeout 초과 시 PoolTimeoutError)
+
+        validation_interval 이상 쉬고 있던 연결은 건네기 전에 확인하고,
+        끊어졌으면 버린 뒤 새 연결을 받습니다.
+        """
+        try:
+            waited = self._slots.acquire(timeout)
+        except PoolTimeoutError:
+            self._count('pool_misses')
+            self._count('acquire_timeouts')
+            raise
+        self._wait_histogram.record(waited)
 
         try:
-            # 연결 풀에서 연결 획득
             connection = self._pool.getconn()
+            idle_since = self._last_used.get(connection)
+            if connection.closed or (
+                idle_since is not None and time.monotonic() - idle_since >= self.validation_interval
+                and not self._validate(connection)
+            ):
+                self._last_used.pop(connection, None)
+                self._pool.putconn(connection, close=True)
+                connection = self._pool.getconn()
 
-            if connection is None:
-                self._stats['pool_misses'] += 1
-                raise Exception("연결 풀에서 연결을 획득할 수 없습니다")
+            # 한 번도 반환된 적 없는 연결은 새로 연 연결
+            if connection not in self._last_used:
+                self._count('total_connections')
+        except BaseException:
+            self._slots.release()
+            raise
+
+        self._count('pool_hits')
+        self._count('active_connections')
+        self._leak_detector.checkout(connection)
+        return connection
 
-            self._stats['pool_hits'] += 1
-            self._stats['active_connections'] += 1
+    def _release(self, connection):
+        """트랜잭션 정리 후 풀에 반환하고 슬롯 해제"""
+        self._hold_histogram.record(self._leak_detector.checkin(connection))
+        try:
+            # 커밋되지 않은 트랜잭션 정리
+            if not connection.closed and not connection.autocommit and \
+                    connection.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
+                connection.rollback()
 
-            # 연결 상태 확인
+            connection.cursor_factory = RealDictCursor
+            self._pool.putconn(connection, close=bool(connection.closed))
             if connection.closed:
-                self._pool.putconn(connection)
-                connection = self._pool.getconn()
+                self._last_used.pop(connection, None)
+            else:
+                self._last_used[connection] = time.monotonic()
+
+        except Exception as e:
+            print(f"[연결 반환 중 오류] {str(e)}")
+        finally:
+            self._count('active_connections', -1)
+            self._slots.release()
+
+    def _validate(self, connection) -> bool:
+        """SELECT 1로 연결 확인 (실패 시 False)"""
+        self._count('validations')
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            self._last_used[connection] = time.monotonic()
+            return True
+        except Exception:
+            self._count('validation_failures')
+            self._last_used.pop(connection, None)
+            return False
+
+    @contextmanager
+    def get_connection(self, timeout: int = 30, dict_rows: bool = True):
+        """
+        연결 풀에서 연결 획득 (컨텍스트 매니저)
+
+        Args:
+            timeout: 풀이 모두 사용 중일 때 기다릴 최대 시간 (초, 요청 순서대로 배분)
+            dict_rows: False면 이 연결에서 만든 커서가 튜플 행을 반환
+                       (psycopg2.connect를 직접 쓰던 코드의 row[0] 접근 유지)
+        """
+        connection = self._acquire(timeout)
+
+        try:
+            if not dict_rows:
+                connection.cursor_factory = psycopg2.extensions.cursor
 
             yield connection
 
         except Exception as e:
-            self._stats['connection_errors'] += 1
+            self._count('connection_errors')
 
-            if connection:
-                # 오류 발생 시 롤백
-                try:
-                    connection.rollback()
-                except:
-                    pass
+            # 오류 발생 시 롤백
+            try:
+                connection.rollback()
+            except Exception:
+                pass
 
             raise e
 
         finally:
             # 연결 반환
-            if connection:
-                try:
-                    # 커밋되지 않은 트랜잭션 정리
-                    if not connection.autocommit and connection.status == psycopg2.extensions.STATUS_IN_TRANSACTION:
-                        connection.rollback()
+            self._release(connection)
 
-                    self._pool.putconn(connection)
-                    self._stats['active_connections'] -= 1
+    def _start_maintenance(self):
+        """유휴 연결 검증 / 누수 감지 백그라운드 스레드 시작"""
+        interval = min(self.validation_interval, self.leak_threshold) / 2
+        if interval <= 0:
+            return
+        self._maintenance_thread = threading.Thread(
+            target=self._maintenance_loop, args=(interval,), daemon=True, name='db-pool-maintenance'
+        )
+        self._maintenance_thread.start()
 
-                except Exception as e:
-                    print(f"[연결 반환 중 오류] {str(e)}")
+    def _maintenance_loop(self, interval: float):
+        while not self._maintenance_stop.wait(interval):
+            try:
+                self.validate_idle_connections()
+                for leak in self._leak_detector.find_leaks():
+                    print(f"[연결 누수 의심] {leak['held_seconds']}초 점유 "
+                          f"(스레드: {leak['thread']})\n{leak['stack'] or ''}")
+            except Exception as e:
+                print(f"[연결 풀 점검 오류] {str(e)}")
+
+    def validate_idle_connections(self) -> int:
+        """
+        validation_interval 이상 쉬고 있는 유휴 연결을 확인하고 끊어진 연결 제거
+
+        점검할 연결은 풀 잠금 안에서 유휴 목록에서 빼 두고(다른 스레드가 가져가지 못하게),
+        SELECT 1 확인은 잠금 밖에서 한 뒤 살아 있는 연결만 다시 돌려놓습니다.
+
+        Returns:
+            제거한 연결 수
+        """
+        if not self._pool:
+            return 0
+
+        now = time.monotonic()
+        checked_out = self._take_idle(
+            lambda connection: connection.closed
+            or now - self._last_used.get(connection, now) >= self.validation_interval
+        )
+
+        alive = []
+        removed = 0
+        for connection in checked_out:
+            if not connection.closed and self._validate(connection):
+                alive.append(connection)
+                continue
+            self._last_used.pop(connection, None)
+            try:
+                connection.close()
+            except Exception:
+                pass
+            removed += 1
+
+        self._return_idle(alive)
+        return removed
+
+    # psycopg2 풀은 유휴 연결을 하나씩 점검하는 공개 API가 없어 내부 목록(_pool/_lock)을 직접 다룸
+    # (이 두 메서드 밖에서는 접근하지 않음)
+
+    def _take_idle(self, predicate) -> list:
+        """조건에 맞는 유휴 연결을 풀 잠금 안에서 꺼냄"""
+        with self._pool._lock:
+            taken = [connection for connection in self._pool._pool if predicate(connection)]
+            for connection in taken:
+                self._pool._pool.remove(connection)
+        return taken
+
+    def _return_idle(self, connections: list):
+        """_take_idle로 꺼낸 연결을 유휴 목록에 되돌림 (풀이 닫혔으면 연결도 닫음)"""
+        if not connections:
+            return
+        with self._pool._lock:
+            if not self._pool.closed:
+                self._pool._pool.extend(connections)
+                return
+        for connection in connections:
+            try:
+                connection.close()
+            except Exception:
+                pass
 
     def execute_query(self, query: str, params: tuple = None, fetch: str = 'all') -> Any:
         """쿼리 실행 (연결 풀 사용)"""
@@ -147,6 +329,52 @@ class DatabaseConnectionPool:
                 else:
                     return cursor.rowcount
 
+    def execute_prepared(self, query: str, params: tuple = None, fetch: str = 'all') -> Any:
+        """
+        서버 측 prepared statement로 쿼리 실행
+
+        연결마다 처음 한 번만 PREPARE하고 이후에는 EXECUTE만 보내므로 반복되는
+        조회의 파싱/계획 비용이 사라집니다. fetch는 execute_query와 같습니다.
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                self._statement_cache.execute(cursor, query, params)
+
+                if fetch == 'all':
+                    return cursor.fetchall()
+                elif fetch == 'one':
+                    return cursor.fetchone()
+                elif fetch == 'many':
+                    return cursor.fetchmany()
+                else:
+                    return cursor.rowcount
+
+    def execute_batch(self, queries: list) -> Dict[str, list]:
+        """
+        여러 SELECT를 한 연결에서 한 번의 왕복으로 실행
+
+        Args:
+            queries: execute_transaction과 같은 형식에 결과 이름을 더한 목록
+                     [{'name': ..., 'query': ..., 'params': ...}, ...]
+
+        Returns:
+            {name: [행(dict), ...]} (값은 json으로 전달되므로 날짜 등은 문자열)
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                encoding = psycopg2.extensions.encodings[conn.encoding]
+                bound = [
+                    (query_info['name'],
+                     cursor.mogrify(query_info['query'], query_info.get('params')).decode(encoding))
+                    for query_info in queries
+                ]
+                cursor.execute(build_batch_select(bound))
+                row = cursor.fetchone()
+
+        self._count('batched_queries', len(queries))
+        self.record_round_trips_saved(len(queries) - 1)
+        return {name: row[name] for name, _ in bound}
+
     def execute_transaction(self, queries: list) -> bool:
         """트랜잭션 실행 (여러 쿼리를 하나의 트랜잭션으로)"""
         with self.get_connection() as conn:
@@ -166,14 +394,31 @@ class DatabaseConnectionPool:
                 raise
 
     def get_pool_stats(self) -> Dict[str, Any]:
-        """연결 풀 통계"""
+        """
+        연결 풀 통계
+
+        획득 대기/점유 시간 히스토그램(acquire_wait, hold_time)과
+        leak_threshold를 넘긴 점유 목록(leaks, 획득 위치 스택 포함)을 함께 반환
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        stats.update(self._statement_cache.get_stats())
+        stats.update({
+            'max_connections': self.pool_config['maxconn'],
+            'in_use': self._slots.in_use,
+            'waiting': self._slots.waiting,
+            'acquire_wait': self._wait_histogram.snapshot(),
+            'hold_time': self._hold_histogram.snapshot(),
+            'leaks': self._leak_detector.find_leaks(),
+            'leaks_detected': self._leak_detector.leaks_detected
+        })
+
         if self._pool:
-            return {
-                **self._stats,
-                'pool_size': len(self._pool._pool),
-                'available_connections': len([conn for conn in self._pool._pool if not conn.closed])
-            }
-        return self._stats
+            idle = list(self._pool._pool)
+            stats['pool_size'] = len(idle)
+            stats['available_connections'] = len([conn for conn in idle if not conn.closed])
+        return stats
 
     def health_check(self) -> Dict[str, Any]:
         """DB 연결 상태 확인"""
@@ -198,6 +443,7 @@ class DatabaseConnectionPool:
 
     def close_all_connections(self):
         """모든 연결 종료"""
+        self._maintenance_stop.set()
         if self._pool:
             self._pool.closeall()
             print("[DB 연결 풀 종료 완료]")
@@ -224,37 +470,29 @@ class DatabaseService:
         query = "SELECT * FROM committees WHERE id = %s"
         return self.pool.execute_query(query, (committee_id,), fetch='one')
 
-    def get_token_statistics(self) -> dict:
-        """토큰 통계 조회"""
-        queries = [
-            {
-                'name': 'total_issued',
-                'query': 'SELECT COUNT(*) as count FROM esg_coupons WHERE status != %s',
-                'params': ('ISSUED',)
-            },
-            {
-                'name': 'committee_tokens',
-                'query': 'SELECT COUNT(*) as count FROM esg_coupons WHERE status = %s',
-                'params': ('COMMITTEE',)
-            },
-            {
-                'name': 'provider_tokens',
-                'query': 'SELECT COUNT(*) as count FROM esg_coupons WHERE status = %s',
-                'params': ('PROVIDER',)
-            },
-            {
-                'name': 'consumer_tokens',
-                'query': 'SELECT COUNT(*) as count FROM esg_coupons WHERE status = %s',
-                'params': ('CONSUMER',)
-            }
-        ]
-
-        stats = {}
-        for query_info in queries:
-            result = self.pool.execute_query(query_info['query'], query_info['params'], fetch='one')
-            stats[query_info['name']] = result['count'] if result else 0
+    # 상태별 쿠폰 수를 롤업 테이블(coupon_status_counts, 012 마이그레이션)에서 한 번에 집계
+    # 롤업 행 수는 자산 수 x 상태 수 x 샤드 수로 고정되어 쿠폰 수와 무관
+    TOKEN_STATISTICS_QUERY = """
+        SELECT
+            COALESCE(SUM(coupon_count) FILTER (WHERE status != %s), 0) AS total_issued,
+            COALESCE(SUM(coupon_count) FILTER (WHERE status = %s), 0) AS committee_tokens,
+            COALESCE(SUM(coupon_count) FILTER (WHERE status = %s), 0) AS provider_tokens,
+            COALESCE(SUM(coupon_count) FILTER (WHERE status = %s), 0) AS consumer_tokens
+        FROM coupon_status_counts
+    """
 
-        return stats
+    def get_token_statistics(self) -> dict:
+        """토큰 통계 조회 (롤업 테이블 집계 쿼리 한 번)"""
+        result = self.pool.execute_prepared(
+            self.TOKEN_STATISTICS_QUERY,
+            ('ISSUED', 'COMMITTEE', 'PROVIDER', 'CONSUMER'),
+            fetch='one'
+        )
+        # 통계 4개를 쿼리 하나로 조회하므로 왕복 3번 절약
+        self.pool.record_round_trips_saved(3)
+
+        columns = ('total_issued', 'committee_tokens', 'provider_tokens', 'consumer_tokens')
+        return {column: int(result[column]) if result else 0 for column in columns}
 
     def bulk_insert_coupons(self, coupons_data: list) -> int:
         """대량 쿠폰 삽입 (배치 처리)"""
@@ -313,5 +551,33 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"통계 조회 실패: {e}")
 
+    # 여러 조회를 한 번의 왕복으로 실행
+    batch = db_service.pool.execute_batch([
+        {'name': 'recent_committees', 'query': 'SELECT id, name FROM committees ORDER BY id DESC LIMIT %s',
+         'params': (5,)},
+        {'name': 'coupon_assets', 'query': 'SELECT DISTINCT asset_id FROM esg_coupons LIMIT %s',
+         'params': (5,)}
+    ])
+    print(f"배치 조회: {batch}")
+    print(f"절약한 왕복 수: {db_service.pool.get_pool_stats()['round_trips_saved']}")
+
+    # 요청당 연결 오버헤드 비교 (직접 연결 vs 연결 풀)
+    iterations = 200
+    started = time.perf_counter()
+    for _ in range(iterations):
+        conn = psycopg2.connect(**db_service.pool.db_config)
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.close()
+    direct_ms = (time.perf_counter() - started) / iterations * 1000
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with db_service.pool.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+    pooled_ms = (time.perf_counter() - started) / iterations * 1000
+    print(f"요청당 오버헤드: 직접 연결 {direct_ms:.2f}ms, 연결 풀 {pooled_ms:.2f}ms")
+
     # 풀 종료
     # db_service.pool.close_all_connections()
\ No newline at end of file
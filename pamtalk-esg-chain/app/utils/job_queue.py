@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite 기반 영속 우선순위 작업 큐
+BatchProcessor가 사용 (재시작해도 대기 중인 작업이 사라지지 않음)
+
+- 우선순위(숫자가 클수록 먼저) → 생성 순서로 꺼냄
+- 임대(lease): 꺼낸 작업은 visibility_timeout 동안 해당 워커만 처리, 하트비트로 연장하며
+  시간 안에 연장하지 못하면(프로세스 종료 등) 다른 워커가 다시 가져감
+- 실패 시 max_attempts까지 지수 백오프로 재시도
+- 완료/실패 작업은 TTL이 지나면 cleanup()으로 삭제
+- WAL 모드 + BEGIN IMMEDIATE로 여러 워커 프로세스가 같은 파일을 공유
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from app.utils.sqlite_pool import SQLiteConnectionPool
+
+
+class JobState:
+    """큐에 저장되는 작업 상태"""
+    PENDING = "PENDING"
+    PROCESSING = "PROCESSING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS batch_jobs (
+        job_id TEXT PRIMARY KEY,
+        job_type TEXT NOT NULL,
+        parameters TEXT NOT NULL,
+        priority INTEGER NOT NULL DEFAULT 5,
+        status TEXT NOT NULL DEFAULT 'PENDING',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL DEFAULT 3,
+        available_at REAL NOT NULL,
+        lease_owner TEXT,
+        lease_expires_at REAL,
+        progress REAL NOT NULL DEFAULT 0,
+        progress_message TEXT,
+        result TEXT,
+        error_message TEXT,
+        created_at REAL NOT NULL,
+        started_at REAL,
+        completed_at REAL,
+        updated_at REAL NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_batch_jobs_ready
+        ON batch_jobs (status, priority DESC, created_at);
+
+    CREATE INDEX IF NOT EXISTS idx_batch_jobs_finished
+        ON batch_jobs (completed_at) WHERE status IN ('COMPLETED', 'FAILED');
+"""
+
+_JSON_COLUMNS = ('parameters', 'result')
+
+
+def default_worker_id(worker_index: int) -> str:
+    """프로세스 간에 겹치지 않는 워커 식별자 (호스트:PID:번호)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{worker_index}"
+
+
+class PersistentJobQueue:
+    """SQLite 영속 우선순위 큐"""
+
+    def __init__(self, db_path: str, visibility_timeout: float = 300.0, max_attempts: int = 3,
+                 backoff_base: float = 5.0, backoff_max: float = 600.0,
+                 finished_ttl: float = 7 * 24 * 3600):
+        self.db_path = db_path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.finished_ttl = finished_ttl
+        self.pool = SQLiteConnectionPool(db_path, schema=SCHEMA)
+
+    def _connect(self):
+        return self.pool.acquire(row_factory=sqlite3.Row)
+
+    def _write(self, sql: str, params: tuple) -> int:
+        conn = self._connect()
+        try:
+            with conn:
+                return conn.execute(sql, params).rowcount
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # 생산자
+    # ------------------------------------------------------------------
+
+    def enqueue(self, job_id: str, job_type: str, parameters: Dict, priority: int = 5,
+                max_attempts: Optional[int] = None, delay: float = 0.0) -> str:
+        """작업 추가 (같은 job_id가 이미 있으면 ValueError)"""
+        now = time.time()
+        try:
+            self._write("""
+                INSERT INTO batch_jobs
+                (job_id, job_type, parameters, priority, max_attempts,
+                 available_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (job_id, job_type, json.dumps(parameters), priority,
+                  max_attempts or self.max_attempts, now + delay, now, now))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"이미 존재하는 작업 ID입니다: {job_id}")
+        return job_id
+
+    # ------------------------------------------------------------------
+    # 워커
+    # ------------------------------------------------------------------
+
+    def lease(self, worker_id: str, job_types: Optional[List[str]] = None) -> Optional[Dict]:
+        """
+        처리할 작업 하나를 임대 (없으면 None)
+
+        대기 중이면서 재시도 시각이 된 작업, 또는 임대가 만료된 처리 중 작업을
+        우선순위 순으로 가져옵니다. 임대 만료 시점에 시도 횟수를 다 쓴 작업은 실패로 닫습니다.
+        """
+        now = time.time()
+        type_filter, type_params = '', ()
+        if job_types:
+            type_filter = f"AND job_type IN ({', '.join('?' * len(job_types))})"
+            type_params = tuple(job_types)
+
+        conn = self._connect()
+        try:
+            # 쓰기 잠금을 먼저 잡아 다른 프로세스와 같은 작업을 동시에 임대하지 않음
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("""
+                    UPDATE batch_jobs
+                    SET status = 'FAILED', lease_owner = NULL, completed_at = ?, updated_at = ?,
+                        error_message = COALESCE(error_message, '처리 중 임대 만료 (워커 중단)')
+                    WHERE status = 'PROCESSING' AND lease_expires_at <= ? AND attempts >= max_attempts
+                """, (now, now, now))
+
+                row = conn.execute(f"""
+                    SELECT job_id FROM batch_jobs
+                    WHERE ((status = 'PENDING' AND available_at <= ?)
+                           OR (status = 'PROCESSING' AND lease_expires_at <= ?))
+                      {type_filter}
+                    ORDER BY priority DESC, created_at
+                    LIMIT 1
+                """, (now, now) + type_params).fetchone()
+
+                if row is None:
+                    conn.commit()
+                    return None
+
+                conn.execute("""
+                    UPDATE batch_jobs
+                    SET status = 'PROCESSING', lease_owner = ?, lease_expires_at = ?,
+                        attempts = attempts + 1, started_at = COALESCE(started_at, ?), updated_at = ?
+                    WHERE job_id = ?
+                """, (worker_id, now + self.visibility_timeout, now, now, row['job_id']))
+                job = conn.execute("SELECT * FROM batch_jobs WHERE job_id = ?",
+                                   (row['job_id'],)).fetchone()
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            return self._to_dict(job)
+        finally:
+            conn.close()
+
+    def heartbeat(self, job_id: str, worker_id: str, progress: Optional[float] = None,
+                  message: Optional[str] = None, parameters: Optional[Dict] = None) -> bool:
+        """
+        임대 연장 + 진행률/파라미터 기록
+
+        Returns:
+            임대를 아직 보유하고 있으면 True (다른 워커가 가져갔으면 False)
+        """
+        now = time.time()
+        return self._write("""
+            UPDATE batch_jobs
+            SET lease_expires_at = ?, updated_at = ?,
+                progress = COALESCE(?, progress),
+                progress_message = COALESCE(?, progress_message),
+                parameters = COALESCE(?, parameters)
+            WHERE job_id = ? AND lease_owner = ? AND status = 'PROCESSING'
+        """, (now + self.visibility_timeout, now, progress, message,
+              json.dumps(parameters) if parameters is not None else None,
+              job_id, worker_id)) == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Any) -> bool:
+        now = time.time()
+        return self._write("""
+            UPDATE batch_jobs
+            SET status = 'COMPLETED', result = ?, progress = 1.0, error_message = NULL,
+                lease_owner = NULL, lease_expires_at = NULL, completed_at = ?, updated_at = ?
+            WHERE job_id = ? AND lease_owner = ? AND status = 'PROCESSING'
+        """, (json.dumps(result, default=str), now, now, job_id, worker_id)) == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str,
+             parameters: Optional[Dict] = None) -> Optional[str]:
+        """
+        실패 처리 (시도 횟수가 남았으면 백오프 후 재시도 대기)
+
+        Args:
+            parameters: 다음 시도에 넘길 파라미터 (재개 위치 등), None이면 그대로
+
+        Returns:
+            바뀐 상태 (PENDING=재시도 예정, FAILED=최종 실패), 임대를 잃었으면 None
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                row = conn.execute("""
+                    SELECT attempts, max_attempts FROM batch_jobs
+                    WHERE job_id = ? AND lease_owner = ? AND status = 'PROCESSING'
+                """, (job_id, worker_id)).fetchone()
+                if row is None:
+                    return None
+
+                encoded = json.dumps(parameters) if parameters is not None else None
+                if row['attempts'] < row['max_attempts']:
+                    delay = min(self.backoff_base * (2 ** (row['attempts'] - 1)), self.backoff_max)
+                    conn.execute("""
+                        UPDATE batch_jobs
+                        SET status = 'PENDING', available_at = ?, error_message = ?,
+                            parameters = COALESCE(?, parameters),
+                            lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                        WHERE job_id = ?
+                    """, (now + delay, error, encoded, now, job_id))
+                    return JobState.PENDING
+
+                conn.execute("""
+                    UPDATE batch_jobs
+                    SET status = 'FAILED', error_message = ?, parameters = COALESCE(?, parameters),
+                        lease_owner = NULL, lease_expires_at = NULL, completed_at = ?, updated_at = ?
+                    WHERE job_id = ?
+                """, (error, encoded, now, now, job_id))
+                return JobState.FAILED
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # 조회 / 정리
+    # ------------------------------------------------------------------
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM batch_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            return self._to_dict(row) if row else None
+        finally:
+            conn.close()
+
+    def list_jobs(self, limit: int = 50, status: Optional[str] = None) -> List[Dict]:
+        """최근 작업 목록 (생성 역순)"""
+        conn = self._connect()
+        try:
+            if status:
+                rows = conn.execute("""
+                    SELECT * FROM batch_jobs WHERE status = ?
+                    ORDER BY created_at DESC LIMIT ?
+                """, (status, limit)).fetchall()
+            else:
+                rows = conn.execute("""
+                    SELECT * FROM batch_jobs ORDER BY created_at DESC LIMIT ?
+                """, (limit,)).fetchall()
+            return [self._to_dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """상태별 작업 수 (ready: 지금 바로 임대 가능한 대기 작업)"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            stats = {state: 0 for state in (JobState.PENDING, JobState.PROCESSING,
+                                            JobState.COMPLETED, JobState.FAILED)}
+            for row in conn.execute("SELECT status, COUNT(*) AS n FROM batch_jobs GROUP BY status"):
+                stats[row['status']] = row['n']
+            stats['ready'] = conn.execute("""
+                SELECT COUNT(*) FROM batch_jobs WHERE status = 'PENDING' AND available_at <= ?
+            """, (now,)).fetchone()[0]
+            return stats
+        finally:
+            conn.close()
+
+    def cleanup(self, ttl: Optional[float] = None) -> int:
+        """TTL이 지난 완료/실패 작업 삭제 (삭제 건수 반환)"""
+        cutoff = time.time() - (self.finished_ttl if ttl is None else ttl)
+        return self._write("""
+            DELETE FROM batch_jobs
+            WHERE status IN ('COMPLETED', 'FAILED') AND completed_at < ?
+        """, (cutoff,))
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        for column in _JSON_COLUMNS:
+            if job[column] is not None:
+                job[column] = json.loads(job[column])
+        return job
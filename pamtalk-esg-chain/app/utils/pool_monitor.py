@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+연결 풀 상태 모니터링 도구
+DatabaseConnectionPool이 사용하는 대기열, 지연 히스토그램, 누수 감지기
+
+- FairSlotQueue: 풀 크기만큼의 슬롯을 요청 순서(FIFO)대로 배분, 타임아웃까지 대기
+- LatencyHistogram: 획득 대기 시간 / 점유 시간 분포 (버킷 + 백분위수 근사)
+- LeakDetector: 임계 시간 이상 반환되지 않은 연결과 획득 위치(스택) 추적
+"""
+
+import bisect
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+
+# 기본 버킷 경계 (밀리초)
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class PoolTimeoutError(Exception):
+    """timeout 안에 풀에서 연결을 얻지 못함"""
+
+    def __init__(self, timeout: float, waiting: int):
+        super().__init__(f"{timeout}초 안에 연결 풀에서 연결을 획득하지 못했습니다 (대기 {waiting}건)")
+        self.timeout = timeout
+        self.waiting = waiting
+
+
+class FairSlotQueue:
+    """
+    FIFO 순서로 슬롯을 배분하는 대기열
+
+    먼저 기다리기 시작한 스레드가 먼저 슬롯을 받으므로, 부하가 몰려도
+    특정 요청이 계속 밀려 타임아웃되는 일이 없습니다.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._cond = threading.Condition(threading.Lock())
+        self._waiters = deque()
+        self._in_use = 0
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """
+        슬롯 획득 (timeout 초과 시 PoolTimeoutError)
+
+        Returns:
+            대기한 시간 (초)
+        """
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        ticket = object()
+
+        with self._cond:
+            self._waiters.append(ticket)
+            try:
+                while self._waiters[0] is not ticket or self._in_use >= self.capacity:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise PoolTimeoutError(timeout, len(self._waiters))
+                    self._cond.wait(remaining)
+            except BaseException:
+                self._waiters.remove(ticket)
+                # 앞자리가 비었을 수 있으므로 다음 대기자를 깨움
+                self._cond.notify_all()
+                raise
+
+            self._waiters.popleft()
+            self._in_use += 1
+            if self._waiters and self._in_use < self.capacity:
+                self._cond.notify_all()
+
+        return time.monotonic() - started
+
+    def release(self):
+        with self._cond:
+            self._in_use -= 1
+            self._cond.notify_all()
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+
+class LatencyHistogram:
+    """스레드 안전 지연 시간 히스토그램"""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.buckets_ms) + 1)  # 마지막 칸은 최대 경계 초과
+        self._count = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+
+    def record(self, seconds: float):
+        value_ms = seconds * 1000
+        index = bisect.bisect_left(self.buckets_ms, value_ms)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._total_ms += value_ms
+            if value_ms > self._max_ms:
+                self._max_ms = value_ms
+
+    def _percentile(self, counts: List[int], total: int, max_ms: float, q: float) -> float:
+        """q 백분위수가 속한 버킷의 상한 (최대값을 넘지 않게 보정)"""
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                bound = self.buckets_ms[index] if index < len(self.buckets_ms) else max_ms
+                return min(bound, max_ms)
+        return max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total, total_ms, max_ms = self._count, self._total_ms, self._max_ms
+
+        labels = [f"le_{bound}ms" for bound in self.buckets_ms] + [f"gt_{self.buckets_ms[-1]}ms"]
+        return {
+            'count': total,
+            'avg_ms': round(total_ms / total, 3) if total else 0.0,
+            'max_ms': round(max_ms, 3),
+            'p50_ms': self._percentile(counts, total, max_ms, 0.50) if total else 0.0,
+            'p95_ms': self._percentile(counts, total, max_ms, 0.95) if total else 0.0,
+            'p99_ms': self._percentile(counts, total, max_ms, 0.99) if total else 0.0,
+            'buckets': dict(zip(labels, counts))
+        }
+
+
+class LeakDetector:
+    """
+    연결 점유 추적 및 누수 감지
+
+    threshold초 이상 반환되지 않은 연결을 누수 의심으로 보고합니다.
+    capture_stack이 켜져 있으면 획득 시점의 호출 스택을 함께 남깁니다.
+    """
+
+    def __init__(self, threshold: float = 60.0, capture_stack: bool = True, stack_limit: int = 12):
+        self.threshold = threshold
+        self.capture_stack = capture_stack
+        self.stack_limit = stack_limit
+        self._lock = threading.Lock()
+        self._checkouts: Dict[int, Dict[str, Any]] = {}
+        self._reported = set()
+        self.leaks_detected = 0
+
+    def checkout(self, conn):
+        stack = None
+        if self.capture_stack:
+            # 가장 최근 프레임(이 메서드)은 제외
+            stack = ''.join(traceback.format_stack(limit=self.stack_limit + 1)[:-1])
+        record = {
+            'started': time.monotonic(),
+            'thread': threading.current_thread().name,
+            'stack': stack
+        }
+        with self._lock:
+            self._checkouts[id(conn)] = record
+
+    def checkin(self, conn) -> float:
+        """반환 처리 (점유 시간 반환)"""
+        with self._lock:
+            record = self._checkouts.pop(id(conn), None)
+            self._reported.discard(id(conn))
+        if record is None:
+            return 0.0
+        return time.monotonic() - record['started']
+
+    def find_leaks(self) -> List[Dict[str, Any]]:
+        """임계 시간을 넘긴 점유 목록 (새로 발견된 건은 leaks_detected에 누적)"""
+        now = time.monotonic()
+        leaks = []
+        with self._lock:
+            for key, record in self._checkouts.items():
+                held = now - record['started']
+                if held < self.threshold:
+                    continue
+                if key not in self._reported:
+                    self._reported.add(key)
+                    self.leaks_detected += 1
+                leaks.append({
+                    'held_seconds': round(held, 3),
+                    'thread': record['thread'],
+                    'stack': record['stack']
+                })
+        return sorted(leaks, key=lambda leak: leak['held_seconds'], reverse=True)
+
+    @property
+    def checked_out(self) -> int:
+        return len(self._checkouts)
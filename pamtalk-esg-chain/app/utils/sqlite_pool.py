@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite 스레드별 연결 풀
+요청마다 sqlite3.connect를 새로 여는 대신 스레드마다 영속 연결을 재사용
+
+- WAL 저널 모드 + synchronous=NORMAL (읽기와 쓰기가 서로를 막지 않음)
+- 연결별 prepared statement 캐시 (cached_statements)
+- 반환 시 커밋되지 않은 트랜잭션 롤백 및 row_factory 초기화
+- 스키마를 넘기면 처음 연결을 빌려줄 때 한 번 생성 (영속 큐/증명 저장소 등)
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+
+class PooledSQLiteConnection:
+    """
+    풀에서 빌린 SQLite 연결
+
+    sqlite3.Connection과 같은 방식으로 사용하며, close()는 실제로 연결을 닫지 않고
+    풀에 반환합니다.
+    """
+
+    __slots__ = ('_conn', '_pool', '_released')
+
+    def __init__(self, conn: sqlite3.Connection, pool: 'SQLiteConnectionPool'):
+        self._conn = conn
+        self._pool = pool
+        self._released = False
+
+    @property
+    def row_factory(self):
+        return self._conn.row_factory
+
+    @row_factory.setter
+    def row_factory(self, factory):
+        self._conn.row_factory = factory
+
+    def __getattr__(self, name):
+        if self._released:
+            raise sqlite3.ProgrammingError("반환된 연결은 사용할 수 없습니다")
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # sqlite3.Connection과 같이 트랜잭션만 커밋/롤백 (연결 반환은 close())
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._pool._release(self._conn)
+
+
+class SQLiteConnectionPool:
+    """스레드별 영속 SQLite 연결 풀"""
+
+    def __init__(self, db_path: str, max_idle_per_thread: int = 4,
+                 cached_statements: int = 256, busy_timeout: float = 5.0,
+                 schema: Optional[str] = None):
+        """
+        Args:
+            schema: 처음 연결을 빌려줄 때 executescript로 실행할 스키마 (CREATE ... IF NOT EXISTS)
+        """
+        self.db_path = db_path
+        self.max_idle_per_thread = max_idle_per_thread
+        self.cached_statements = cached_statements
+        self.busy_timeout = busy_timeout
+        self.schema = schema
+        self._schema_lock = threading.Lock()
+        self._schema_ready = schema is None
+
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'connections_opened': 0,
+            'connections_closed': 0,
+            'acquired': 0,
+            'reused': 0,
+            'rollbacks_on_release': 0
+        }
+
+    def _idle(self) -> List[sqlite3.Connection]:
+        idle = getattr(self._local, 'idle', None)
+        if idle is None:
+            idle = self._local.idle = []
+        return idle
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout,
+            cached_statements=self.cached_statements
+        )
+        if self.db_path != ':memory:':
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._count('connections_opened')
+        return conn
+
+    def acquire(self, row_factory: Optional[Callable] = None) -> PooledSQLiteConnection:
+        """
+        현재 스레드의 유휴 연결을 빌림 (없으면 새로 열기)
+
+        같은 스레드에서 중첩으로 빌리면 서로 다른 연결을 받으므로
+        한쪽의 반환이 다른 쪽 트랜잭션에 영향을 주지 않습니다.
+
+        Args:
+            row_factory: 이번에 빌리는 동안 쓸 row_factory (반환 시 초기화)
+        """
+        idle = self._idle()
+        if idle:
+            conn = idle.pop()
+            self._count('reused')
+        else:
+            conn = self._open()
+        self._count('acquired')
+
+        try:
+            self._ensure_schema(conn)
+        except sqlite3.Error:
+            self._discard(conn)
+            raise
+
+        conn.row_factory = row_factory
+        return PooledSQLiteConnection(conn, self)
+
+    def _ensure_schema(self, conn: sqlite3.Connection):
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            if not self._schema_ready:
+                conn.executescript(self.schema)
+                self._schema_ready = True
+
+    def _release(self, conn: sqlite3.Connection):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+                self._count('rollbacks_on_release')
+            conn.row_factory = None
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        idle = self._idle()
+        if len(idle) < self.max_idle_per_thread:
+            idle.append(conn)
+        else:
+            self._discard(conn)
+
+    def _discard(self, conn: sqlite3.Connection):
+        try:
+            conn.close()
+        finally:
+            self._count('connections_closed')
+
+    @contextmanager
+    def connection(self):
+        """with 블록 동안 연결을 빌림"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def close_thread_connections(self):
+        """현재 스레드의 유휴 연결 종료"""
+        idle = self._idle()
+        while idle:
+            self._discard(idle.pop())
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['db_path'] = self.db_path
+        stats['open_connections'] = stats['connections_opened'] - stats['connections_closed']
+        return stats
+
+
+_pools: Dict[str, SQLiteConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_sqlite_pool(db_path: str) -> SQLiteConnectionPool:
+    """DB 파일별 공유 풀 (같은 파일을 쓰는 서비스는 연결을 함께 재사용)"""
+    pool = _pools.get(db_path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(db_path)
+            if pool is None:
+                pool = _pools[db_path] = SQLiteConnectionPool(db_path)
+    return pool
+
+
+def benchmark_connection_overhead(db_path: str, iterations: int = 2000) -> Dict[str, float]:
+    """
+    요청당 연결 오버헤드 비교 (연결 + 단순 조회 + 반환)
+
+    Returns:
+        {'connect_per_request_us': ..., 'pooled_us': ..., 'speedup': ...}
+    """
+    def per_request():
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute("SELECT 1").fetchone()
+        finally:
+            conn.close()
+
+    pool = SQLiteConnectionPool(db_path)
+
+    def pooled():
+        conn = pool.acquire()
+        try:
+            conn.execute("SELECT 1").fetchone()
+        finally:
+            conn.close()
+
+    results = {}
+    for name, fn in (('connect_per_request_us', per_request), ('pooled_us', pooled)):
+        fn()  # 워밍업
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        results[name] = (time.perf_counter() - started) / iterations * 1e6
+
+    pool.close_thread_connections()
+    results['speedup'] = results['connect_per_request_us'] / max(results['pooled_us'], 1e-9)
+    return results
+
+
+# 사용 예시
+if __name__ == "__main__":
+    import os
+    import sys
+    import tempfile
+
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(tempfile.mkdtemp(), 'bench.db')
+    result = benchmark_connection_overhead(path)
+    print(f"요청별 연결: {result['connect_per_request_us']:.1f}us, "
+          f"풀 연결: {result['pooled_us']:.1f}us ({result['speedup']:.1f}x)")
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+PostgreSQL 서버 측 prepared statement 캐시와 다중 조회 배치
+
+- PreparedStatementCache: 연결마다 PREPARE한 쿼리를 기억해 두고 이후에는 EXECUTE만 전송
+  (같은 쿼리를 매번 파싱/계획하지 않음)
+- build_batch_select: 여러 SELECT를 json_agg 서브쿼리로 묶어 한 번의 왕복으로 실행
+"""
+
+import hashlib
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.utils.async_db_pool import convert_placeholders
+
+_IDENTIFIER_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def statement_name(query: str) -> str:
+    """쿼리 텍스트로 정한 prepared statement 이름 (모든 연결에서 같은 이름)"""
+    return 'ps_' + hashlib.sha1(query.encode('utf-8')).hexdigest()[:16]
+
+
+class PreparedStatementCache:
+    """
+    연결별 서버 측 prepared statement 캐시
+
+    쿼리는 psycopg2 형식(%s, 리터럴 %는 %%)으로 작성합니다. 연결마다 최대
+    max_size개를 유지하며, 넘치면 가장 오래 쓰지 않은 문을 DEALLOCATE합니다.
+    연결이 닫혀 사라지면 해당 캐시도 함께 정리됩니다.
+    """
+
+    def __init__(self, max_size: int = 128):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._per_connection = weakref.WeakKeyDictionary()
+        self._stats = {'prepared_hits': 0, 'prepared_misses': 0, 'prepared_evictions': 0}
+
+    def _statements(self, conn) -> 'OrderedDict[str, str]':
+        with self._lock:
+            statements = self._per_connection.get(conn)
+            if statements is None:
+                statements = self._per_connection[conn] = OrderedDict()
+            return statements
+
+    def execute(self, cursor, query: str, params: Optional[Sequence] = None):
+        """필요하면 PREPARE한 뒤 EXECUTE (결과는 cursor에서 읽음)"""
+        statements = self._statements(cursor.connection)
+        name = statements.get(query)
+
+        if name is None:
+            name = statement_name(query)
+            cursor.execute(f"PREPARE {name} AS {convert_placeholders(query, 'numeric')}")
+            statements[query] = name
+            self._count('prepared_misses')
+
+            while len(statements) > self.max_size:
+                _, evicted = statements.popitem(last=False)
+                cursor.execute(f"DEALLOCATE {evicted}")
+                self._count('prepared_evictions')
+        else:
+            statements.move_to_end(query)
+            self._count('prepared_hits')
+
+        if params:
+            placeholders = ', '.join(['%s'] * len(params))
+            cursor.execute(f"EXECUTE {name} ({placeholders})", tuple(params))
+        else:
+            cursor.execute(f"EXECUTE {name}")
+
+    def forget(self, conn):
+        """연결의 캐시 제거 (DISCARD ALL 등으로 서버 측 문이 사라졌을 때)"""
+        with self._lock:
+            self._per_connection.pop(conn, None)
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['prepared_connections'] = len(self._per_connection)
+        return stats
+
+
+def build_batch_select(queries: List[Tuple[str, str]]) -> str:
+    """
+    여러 SELECT를 한 문장으로 묶기
+
+    각 쿼리 결과는 json 배열 컬럼 하나가 됩니다 (행은 컬럼명 → 값 객체).
+    json으로 전달되므로 숫자/문자열/불리언 외의 값(날짜 등)은 문자열로 받습니다.
+
+    Args:
+        queries: [(결과 이름, 파라미터가 이미 바인딩된 SELECT 문), ...]
+    """
+    if not queries:
+        raise ValueError("배치로 실행할 쿼리가 없습니다")
+
+    columns = []
+    for name, sql in queries:
+        if not _IDENTIFIER_RE.match(name):
+            raise ValueError(f"배치 결과 이름이 올바르지 않습니다: {name}")
+        body = sql.strip().rstrip(';')
+        columns.append(f"(SELECT COALESCE(json_agg(q), '[]'::json) FROM ({body}) AS q) AS \"{name}\"")
+
+    return "SELECT " + ",\n       ".join(columns)
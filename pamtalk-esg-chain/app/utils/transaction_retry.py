@@ -12,6 +12,10 @@ from functools import wraps
 from algosdk.v2client import algod
 from algosdk.error import AlgodHTTPError
 
+from app.utils.confirmation_watcher import (
+    get_confirmation_watcher, ConfirmationError, ConfirmationTimeout
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -144,33 +148,19 @@ class AlgorandTransactionManager:
 
     @with_retry(RetryConfig(max_attempts=10, initial_delay=2.0))
     def wait_for_confirmation_with_retry(self, tx_id: str, timeout: int = 60) -> dict:
-        """트랜잭션 확인 대기 (재시도 포함)"""
-
-        start_time = time.time()
-        last_round = self.algod_client.status()["last-round"]
+        """트랜잭션 확인 대기 (재시도 포함, 노드별 공유 감시기 사용)"""
 
-        while time.time() - start_time < timeout:
-            try:
-                # 트랜잭션 상태 확인
-                pending_info = self.algod_client.pending_transaction_info(tx_id)
-
-                if pending_info.get("confirmed-round", 0) > 0:
-                    logger.info(f"트랜잭션 확인됨: {tx_id} (라운드 {pending_info['confirmed-round']})")
-                    return pending_info
-
-                # 다음 라운드 대기
-                self.algod_client.status_after_block(last_round + 1)
-                last_round += 1
-
-            except AlgodHTTPError as e:
-                if e.code == 404:
-                    # 트랜잭션이 아직 펜딩 상태가 아님
-                    time.sleep(1)
-                    continue
-                else:
-                    raise e
-
-        raise TransactionError(f"트랜잭션 확인 타임아웃: {tx_id} (제한시간 {timeout}초)")
+        try:
+            pending_info = get_confirmation_watcher(self.algod_client).wait(
+                tx_id, timeout_rounds=None, timeout=timeout
+            )
+        except ConfirmationTimeout:
+            raise TransactionError(f"트랜잭션 확인 타임아웃: {tx_id} (제한시간 {timeout}초)")
+        except ConfirmationError as e:
+            raise TransactionError(f"트랜잭션 거부: {tx_id} ({e.reason})")
+
+        logger.info(f"트랜잭션 확인됨: {tx_id} (라운드 {pending_info['confirmed-round']})")
+        return pending_info
 
     @with_retry(RetryConfig(max_attempts=3))
     def get_account_info_safe(self, address: str) -> dict:
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+속도 제한 동시 트랜잭션 제출기
+고정 sleep을 넣은 직렬 전송 루프 대신, 온체인 쓰기를 토큰 버킷으로 속도를 맞추며
+여러 건을 동시에 서명 → 전송 → 확인 단계로 흘려보냄
+
+- 토큰 버킷: 초당 rate건, 최대 burst건까지 몰아서 전송
+- 단계 파이프라인: 한 건이 확인을 기다리는 동안 다른 건은 서명/전송 진행
+  (확인은 라운드 기반 ConfirmationWatcher 공유, 전송 슬롯을 차지하지 않음)
+- 적응형 백오프: 노드가 조절(429/503 등, TransactionRetry와 같은 분류)하면 전송 속도를
+  절반으로 줄이고 지수 백오프 후 재전송, 성공이 이어지면 설정 속도까지 점진적으로 회복
+- 지표: 처리량, 단계별 지연 시간(p50/p95/최대), 재시도/조절 횟수
+
+사용:
+    submitter = RateLimitedSubmitter(client, rate=10, concurrency=8)
+    results = await submitter.run([
+        {'key': 1, 'build': lambda sp: PaymentTxn(..., sp=sp, ...), 'private_key': pk}, ...
+    ])
+    results = submitter.submit_all(jobs)   # 동기 코드
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.utils.confirmation_watcher import get_confirmation_watcher
+from app.utils.transaction_retry import RetryConfig, TransactionRetry
+
+logger = logging.getLogger(__name__)
+
+# 기본 전송 속도 (초당 건수) / 동시 전송 수
+SUBMIT_RATE = float(os.getenv("ONCHAIN_SUBMIT_RATE", "10"))
+SUBMIT_CONCURRENCY = int(os.getenv("ONCHAIN_SUBMIT_CONCURRENCY", "8"))
+
+# 지연 시간 표본 보관 개수 (단계별)
+LATENCY_SAMPLES = 10000
+
+STAGES = ('sign', 'submit', 'confirm', 'total')
+
+
+class TokenBucket:
+    """asyncio 토큰 버킷 (한 이벤트 루프 안에서 사용)"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate: float):
+        self._refill(self._clock())
+        self.rate = float(rate)
+
+    def pause(self, seconds: float):
+        """seconds 동안 토큰 지급 중지 (쌓인 토큰도 비움)"""
+        now = self._clock()
+        self._refill(now)
+        self._tokens = 0.0
+        self._paused_until = max(self._paused_until, now + seconds)
+
+    async def acquire(self):
+        while True:
+            now = self._clock()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                self._updated = max(self._updated, self._paused_until)
+                continue
+            self._refill(now)
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
+class RateLimitedSubmitter:
+    """토큰 버킷 속도 제한 + 단계 파이프라인 트랜잭션 제출기"""
+
+    def __init__(self, client, rate: float = SUBMIT_RATE, burst: Optional[float] = None,
+                 concurrency: int = SUBMIT_CONCURRENCY, max_in_flight: Optional[int] = None,
+                 min_rate: Optional[float] = None, retry_config: Optional[RetryConfig] = None,
+                 confirm_timeout_rounds: int = 10, confirm_timeout: Optional[float] = None,
+                 watcher=None):
+        """
+        Args:
+            client: algod 클라이언트 (CachedAlgodClient 권장, suggested_params 재사용)
+            rate: 초당 최대 전송 건수
+            burst: 몰아서 보낼 수 있는 최대 건수 (기본: rate)
+            concurrency: 동시에 진행하는 노드 호출(서명용 파라미터 조회/전송) 수
+            max_in_flight: 확인 대기를 포함해 동시에 처리 중인 최대 건수 (기본: concurrency * 8)
+            min_rate: 조절 시 내려갈 수 있는 최저 속도 (기본: rate / 16)
+            retry_config: 재전송 횟수/백오프 설정 (TransactionRetry와 공유)
+            confirm_timeout_rounds: 확인 대기 라운드 제한
+            confirm_timeout: 확인 대기 시간 제한 (초)
+            watcher: 확인 감시기 (기본: 노드별 공유 감시기)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency는 1 이상이어야 합니다")
+        self.client = client
+        self.rate = float(rate)
+        self.burst = burst
+        self.min_rate = float(min_rate) if min_rate is not None else self.rate / 16
+        self.concurrency = concurrency
+        self.max_in_flight = max_in_flight or concurrency * 8
+        self.confirm_timeout_rounds = confirm_timeout_rounds
+        self.confirm_timeout = confirm_timeout
+        self.retry = TransactionRetry(retry_config or RetryConfig(initial_delay=0.5, max_delay=8.0))
+        self.watcher = watcher or get_confirmation_watcher(client)
+        self.bucket = TokenBucket(self.rate, burst)
+
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="tx-submit")
+        self._latencies = {stage: deque(maxlen=LATENCY_SAMPLES) for stage in STAGES}
+        self._in_flight = 0
+        self._stats = {
+            'jobs': 0,
+            'submitted': 0,
+            'confirmed': 0,
+            'failed': 0,
+            'retries': 0,
+            'throttled': 0,
+            'max_in_flight': 0,
+            'busy_seconds': 0.0
+        }
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+
+    async def run(self, jobs: Iterable[Dict]) -> List[Dict]:
+        """
+        트랜잭션 일괄 제출
+
+        Args:
+            jobs: [{'key': 식별자, 'build': SuggestedParams -> Transaction, 'private_key': str}, ...]
+
+        Returns:
+            입력 순서의 결과 목록
+            [{'key', 'success', 'tx_id', 'confirmed_round', 'attempts', 'latency', 'error'}, ...]
+        """
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        submit_slots = asyncio.Semaphore(self.concurrency)
+        results: List[Dict] = []
+        tasks = []
+        started = time.monotonic()
+
+        try:
+            for job in jobs:
+                await slots.acquire()
+                result = {'key': job.get('key'), 'success': False, 'tx_id': None,
+                          'confirmed_round': None, 'attempts': 0, 'latency': {}, 'error': None}
+                results.append(result)
+                tasks.append(asyncio.ensure_future(
+                    self._process(loop, job, result, slots, submit_slots)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._stats['busy_seconds'] += time.monotonic() - started
+
+        return results
+
+    def submit_all(self, jobs: Iterable[Dict]) -> List[Dict]:
+        """run()의 동기 버전 (이벤트 루프가 없는 코드에서 사용)"""
+        return asyncio.run(self.run(jobs))
+
+    def get_stats(self) -> Dict:
+        stats = dict(self._stats)
+        stats['in_flight'] = self._in_flight
+        stats['current_rate'] = round(self.bucket.rate, 3)
+        stats['target_rate'] = self.rate
+        busy = stats.pop('busy_seconds')
+        stats['elapsed_seconds'] = round(busy, 3)
+        stats['throughput_per_second'] = round(stats['confirmed'] / busy, 2) if busy > 0 else 0.0
+        stats['latency'] = {stage: self._summarize(samples) for stage, samples in self._latencies.items()}
+        return stats
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    # ------------------------------------------------------------------
+    # 단계
+    # ------------------------------------------------------------------
+
+    async def _process(self, loop, job: Dict, result: Dict,
+                       slots: asyncio.Semaphore, submit_slots: asyncio.Semaphore):
+        self._stats['jobs'] += 1
+        self._in_flight += 1
+        self._stats['max_in_flight'] = max(self._stats['max_in_flight'], self._in_flight)
+        started = time.monotonic()
+        try:
+            # 1. 서명 (파라미터 조회 포함)
+            mark = time.monotonic()
+            async with submit_slots:
+                signed = await loop.run_in_executor(self._executor, self._sign, job)
+            self._record(result, 'sign', mark)
+
+            # 2. 전송 (토큰 버킷 + 적응형 백오프)
+            mark = time.monotonic()
+            result['tx_id'] = await self._submit(loop, signed, result, submit_slots)
+            self._record(result, 'submit', mark)
+
+            # 3. 확인 (라운드 기반 공유 감시기)
+            mark = time.monotonic()
+            info = await self.watcher.wait_async(result['tx_id'], self.confirm_timeout_rounds,
+                                                 self.confirm_timeout)
+            self._record(result, 'confirm', mark)
+
+            result['confirmed_round'] = info.get('confirmed-round')
+            result['success'] = True
+            self._stats['confirmed'] += 1
+            self._record(result, 'total', started)
+
+        except Exception as e:
+            result['error'] = str(e)
+            self._stats['failed'] += 1
+            logger.warning(f"온체인 제출 실패 ({result['key']}): {str(e)}")
+        finally:
+            self._in_flight -= 1
+            slots.release()
+
+    def _sign(self, job: Dict):
+        txn = job['build'](self.client.suggested_params())
+        return txn.sign(job['private_key'])
+
+    async def _submit(self, loop, signed, result: Dict, submit_slots: asyncio.Semaphore) -> str:
+        config = self.retry.config
+        delay = config.initial_delay
+        tx_id = signed.get_txid()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            await self.bucket.acquire()
+            result['attempts'] = attempt
+            async with submit_slots:
+                try:
+                    await loop.run_in_executor(self._executor, self.client.send_transaction, signed)
+                    self._stats['submitted'] += 1
+                    self._recover()
+                    return tx_id
+                except Exception as e:
+                    # 앞선 시도가 타임아웃 등으로 응답만 잃은 경우 이미 풀/원장에 있음
+                    if attempt > 1 and 'already in ledger' in str(e).lower():
+                        self._stats['submitted'] += 1
+                        return tx_id
+                    if not self.retry._is_retryable_error(e) or attempt >= config.max_attempts:
+                        raise
+
+            self._throttle(delay)
+            self._stats['retries'] += 1
+            logger.warning(f"노드 조절/일시 오류, {delay:.1f}초 후 재전송 ({tx_id}, 시도 {attempt})")
+            await asyncio.sleep(delay)
+            delay = min(delay * config.backoff_multiplier, config.max_delay)
+
+    # ------------------------------------------------------------------
+    # 적응형 속도
+    # ------------------------------------------------------------------
+
+    def _throttle(self, delay: float):
+        """조절 신호: 속도 절반 + 백오프 동안 전송 중지"""
+        self._stats['throttled'] += 1
+        self.bucket.set_rate(max(self.min_rate, self.bucket.rate / 2))
+        self.bucket.pause(delay)
+
+    def _recover(self):
+        """성공 시 설정 속도의 5%씩 회복"""
+        if self.bucket.rate < self.rate:
+            self.bucket.set_rate(min(self.rate, self.bucket.rate + self.rate / 20))
+
+    # ------------------------------------------------------------------
+    # 지표
+    # ------------------------------------------------------------------
+
+    def _record(self, result: Dict, stage: str, since: float):
+        elapsed = time.monotonic() - since
+        result['latency'][stage] = round(elapsed, 4)
+        self._latencies[stage].append(elapsed)
+
+    @staticmethod
+    def _summarize(samples) -> Dict[str, float]:
+        if not samples:
+            return {'count': 0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+        ordered = sorted(samples)
+        pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+        return {'count': len(ordered), 'p50': round(pick(0.5), 4),
+                'p95': round(pick(0.95), 4), 'max': round(ordered[-1], 4)}
@@ -0,0 +1,51 @@
+-- PAM-TALK ESG Chain Database Schema Migration
+-- Version: 010
+-- Description: 사용자별 타임라인 물리화(fan-out-on-write) 테이블 및 키셋 페이지네이션 인덱스
+
+-- 사용자별 타임라인 (팔로우한 사용자의 포스트 + 본인 포스트)
+-- 팔로워가 많은 계정의 포스트는 여기에 펼쳐지지 않고 조회 시 병합됩니다 (fan-out-on-read)
+CREATE TABLE IF NOT EXISTS social_timelines (
+    user_id VARCHAR(100) NOT NULL,  -- 타임라인 소유자
+    post_id INTEGER NOT NULL REFERENCES social_posts(id) ON DELETE CASCADE,
+    author_id VARCHAR(100) NOT NULL,  -- 포스트 작성자 (언팔로우 시 정리용)
+    published_at TIMESTAMP NOT NULL,
+
+    PRIMARY KEY (user_id, post_id)
+);
+
+-- 키셋 페이지네이션: (published_at, post_id) < (cursor) ORDER BY published_at DESC, post_id DESC
+CREATE INDEX IF NOT EXISTS idx_social_timelines_user_published
+    ON social_timelines(user_id, published_at DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS idx_social_timelines_user_author
+    ON social_timelines(user_id, author_id);
+
+-- 팔로워가 많은 계정의 최근 포스트 조회 (fan-out-on-read 병합용)
+CREATE INDEX IF NOT EXISTS idx_social_posts_user_published
+    ON social_posts(user_id, published_at DESC, id DESC)
+    WHERE status = 'published';
+
+-- 기존 팔로우/포스트로 타임라인 채우기 (배포 직후 기존 사용자의 타임라인이 비지 않도록)
+-- 작성자별 최근 100개 포스트 (TIMELINE_FOLLOW_BACKFILL 기본값)를 작성자 본인과 팔로워에게 펼침
+-- 팔로워 5000명 이상 계정 (TIMELINE_HIGH_FOLLOWER_THRESHOLD 기본값)은 조회 시 병합되므로 본인에게만 기록
+WITH recent_posts AS (
+    SELECT ranked.id, ranked.user_id, ranked.published_at
+    FROM (
+        SELECT p.id, p.user_id, p.published_at,
+               ROW_NUMBER() OVER (PARTITION BY p.user_id ORDER BY p.published_at DESC, p.id DESC) AS rn
+        FROM social_posts p
+        WHERE p.status = 'published' AND p.published_at IS NOT NULL
+    ) ranked
+    WHERE ranked.rn <= 100
+)
+INSERT INTO social_timelines (user_id, post_id, author_id, published_at)
+SELECT sf.follower_id, rp.id, rp.user_id, rp.published_at
+FROM recent_posts rp
+JOIN social_follows sf ON sf.following_id = rp.user_id
+LEFT JOIN social_profiles sp ON sp.user_id = rp.user_id
+WHERE COALESCE(sp.followers_count, 0) < 5000
+UNION ALL
+SELECT rp.user_id, rp.id, rp.user_id, rp.published_at
+FROM recent_posts rp
+ON CONFLICT (user_id, post_id) DO NOTHING;
+
+COMMENT ON TABLE social_timelines IS '사용자별 물리화 타임라인 (fan-out-on-write)';
@@ -0,0 +1,37 @@
+-- PAM-TALK ESG Chain Database Schema Migration
+-- Version: 011
+-- Description: 쿠폰 시리얼 시퀀스 및 대량 발행 체크포인트 테이블
+
+-- 쿠폰 시리얼 번호 시퀀스 (발행 건마다 연속 구간을 예약)
+-- 기존 발행분은 단위별로 1..COUNT 시리얼을 사용했으므로 전체 쿠폰 수 이후부터 시작하면 겹치지 않음
+CREATE SEQUENCE IF NOT EXISTS esg_coupon_serial_seq AS BIGINT;
+
+SELECT setval(
+    'esg_coupon_serial_seq',
+    GREATEST(
+        (SELECT last_value FROM esg_coupon_serial_seq),
+        (SELECT COUNT(*) FROM esg_coupons),
+        1
+    )
+);
+
+-- 대량 발행 작업 체크포인트 (중단된 발행 재개용)
+CREATE TABLE IF NOT EXISTS coupon_mint_jobs (
+    mint_history_id INTEGER PRIMARY KEY REFERENCES token_mint_history(id) ON DELETE CASCADE,
+    unit_name VARCHAR(50) NOT NULL,
+    asset_id BIGINT NOT NULL,
+    asset_name VARCHAR(255) NOT NULL,
+    serial_start BIGINT NOT NULL,  -- 예약된 시리얼 구간 시작 (포함)
+    amount INTEGER NOT NULL,  -- 예약된 구간 길이
+    inserted INTEGER NOT NULL DEFAULT 0,  -- 커밋된 쿠폰 수 (serial_start + inserted 부터 재개)
+    status VARCHAR(20) NOT NULL DEFAULT 'RUNNING'
+           CHECK (status IN ('RUNNING', 'COMPLETED', 'FAILED')),
+    error_message TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_coupon_mint_jobs_status ON coupon_mint_jobs(status);
+
+COMMENT ON SEQUENCE esg_coupon_serial_seq IS 'ESG 쿠폰 코드 시리얼 (Base62 인코딩되어 coupon_code 접미사로 사용)';
+COMMENT ON TABLE coupon_mint_jobs IS '대량 쿠폰 발행 진행 상황 (COPY 체크포인트)';
@@ -0,0 +1,96 @@
+-- PAM-TALK ESG Chain Database Schema Migration
+-- Version: 012
+-- Description: 자산/상태별 쿠폰 수 롤업 테이블 및 유지 트리거 (토큰 통계 O(1) 조회)
+
+-- 자산/상태별 쿠폰 수
+-- 동시에 쓰는 트랜잭션이 같은 행을 두고 대기하지 않도록 백엔드 PID 기준 16개 샤드로 나눠 누적하고,
+-- 조회 시 샤드를 합산합니다 (행 수는 자산 수 x 상태 수 x 16 이하)
+CREATE TABLE IF NOT EXISTS coupon_status_counts (
+    asset_id BIGINT NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    shard SMALLINT NOT NULL DEFAULT 0,
+    coupon_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (asset_id, status, shard)
+);
+
+-- 문장 단위 트리거: 변경된 행 전체(전이 테이블)를 자산/상태별로 모아 한 번에 누적
+-- (COPY로 수백만 건을 적재해도 문장당 UPSERT 한 번)
+CREATE OR REPLACE FUNCTION coupon_status_counts_apply()
+RETURNS TRIGGER AS $$
+DECLARE
+    target_shard SMALLINT := pg_backend_pid() % 16;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO coupon_status_counts (asset_id, status, shard, coupon_count)
+        SELECT asset_id, status, target_shard, COUNT(*)
+        FROM new_rows
+        GROUP BY asset_id, status
+        ON CONFLICT (asset_id, status, shard) DO UPDATE
+        SET coupon_count = coupon_status_counts.coupon_count + EXCLUDED.coupon_count,
+            updated_at = CURRENT_TIMESTAMP;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO coupon_status_counts (asset_id, status, shard, coupon_count)
+        SELECT asset_id, status, target_shard, -COUNT(*)
+        FROM old_rows
+        GROUP BY asset_id, status
+        ON CONFLICT (asset_id, status, shard) DO UPDATE
+        SET coupon_count = coupon_status_counts.coupon_count + EXCLUDED.coupon_count,
+            updated_at = CURRENT_TIMESTAMP;
+
+    ELSE
+        -- 상태/자산이 바뀐 행만 이전 상태 -1, 새 상태 +1 (그 외 컬럼 변경은 상쇄되어 제외)
+        INSERT INTO coupon_status_counts (asset_id, status, shard, coupon_count)
+        SELECT asset_id, status, target_shard, SUM(delta)
+        FROM (
+            SELECT asset_id, status, -1 AS delta FROM old_rows
+            UNION ALL
+            SELECT asset_id, status, 1 AS delta FROM new_rows
+        ) changes
+        GROUP BY asset_id, status
+        HAVING SUM(delta) <> 0
+        ON CONFLICT (asset_id, status, shard) DO UPDATE
+        SET coupon_count = coupon_status_counts.coupon_count + EXCLUDED.coupon_count,
+            updated_at = CURRENT_TIMESTAMP;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+BEGIN;
+
+-- 트리거 생성과 초기 집계 사이에 쿠폰 변경이 끼어들지 않도록 쓰기 차단 (조회는 허용)
+LOCK TABLE esg_coupons IN SHARE ROW EXCLUSIVE MODE;
+
+-- 전이 테이블은 이벤트마다 별도 트리거가 필요
+DROP TRIGGER IF EXISTS esg_coupons_status_counts_insert ON esg_coupons;
+CREATE TRIGGER esg_coupons_status_counts_insert
+    AFTER INSERT ON esg_coupons
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION coupon_status_counts_apply();
+
+DROP TRIGGER IF EXISTS esg_coupons_status_counts_update ON esg_coupons;
+CREATE TRIGGER esg_coupons_status_counts_update
+    AFTER UPDATE ON esg_coupons
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION coupon_status_counts_apply();
+
+DROP TRIGGER IF EXISTS esg_coupons_status_counts_delete ON esg_coupons;
+CREATE TRIGGER esg_coupons_status_counts_delete
+    AFTER DELETE ON esg_coupons
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION coupon_status_counts_apply();
+
+-- 기존 쿠폰으로 초기 집계 (다시 실행해도 같은 결과)
+DELETE FROM coupon_status_counts;
+INSERT INTO coupon_status_counts (asset_id, status, shard, coupon_count)
+SELECT asset_id, status, 0, COUNT(*)
+FROM esg_coupons
+GROUP BY asset_id, status;
+
+COMMIT;
+
+COMMENT ON TABLE coupon_status_counts IS '자산/상태별 쿠폰 수 롤업 (esg_coupons 트리거로 유지, 샤드 합산하여 조회)';
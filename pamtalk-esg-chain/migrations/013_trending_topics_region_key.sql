@@ -0,0 +1,13 @@
+-- PAM-TALK ESG Chain Database Schema Migration
+-- Version: 013
+-- Description: 트렌딩 토픽을 해시태그/지역 단위로 집계 (다른 지역 언급이 첫 지역 행에 합쳐지지 않도록)
+
+-- 지금까지의 행은 지역과 무관하게 해시태그 하나에 모든 언급을 누적했으므로 전국 집계로 전환
+UPDATE trending_topics SET region = NULL WHERE region IS NOT NULL;
+
+ALTER TABLE trending_topics DROP CONSTRAINT IF EXISTS trending_topics_hashtag_key;
+
+-- 해시태그마다 전국(region NULL) 행 하나 + 지역별 행 하나씩
+-- UPSERT는 ON CONFLICT (hashtag, (COALESCE(region, '')))로 이 인덱스를 사용
+CREATE UNIQUE INDEX IF NOT EXISTS uq_trending_topics_hashtag_region
+    ON trending_topics (hashtag, (COALESCE(region, '')));
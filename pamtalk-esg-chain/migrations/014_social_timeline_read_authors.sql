@@ -0,0 +1,19 @@
+-- PAM-TALK ESG Chain Database Schema Migration
+-- Version: 014
+-- Description: 팔로워 타임라인에 펼치지 않은 포스트가 있는 작성자 (fan-out-on-read 병합 대상 유지)
+
+-- 대형 계정일 때 쓴 포스트는 social_timelines에 펼쳐지지 않으므로, 팔로워 수가 기준 아래로
+-- 내려간 뒤에도 이 작성자의 포스트는 조회 시 병합해야 피드에서 빠지지 않음
+CREATE TABLE IF NOT EXISTS social_timeline_read_authors (
+    author_id VARCHAR(100) PRIMARY KEY,
+    since TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 010 백필에서 펼치지 않은 작성자 (팔로워 5000명 이상, TIMELINE_HIGH_FOLLOWER_THRESHOLD 기본값)
+INSERT INTO social_timeline_read_authors (author_id)
+SELECT sp.user_id
+FROM social_profiles sp
+WHERE sp.followers_count >= 5000
+ON CONFLICT (author_id) DO NOTHING;
+
+COMMENT ON TABLE social_timeline_read_authors IS '펼치지 않은 포스트가 있어 조회 시 병합하는 작성자';
@@ -0,0 +1,109 @@
+"""
+Unit Tests for Async Database Pool
+Tests the asyncio query API on the aiosqlite backend used for local testing
+"""
+
+import asyncio
+import sys
+import os
+import time
+
+import pytest
+
+pytest.importorskip('aiosqlite')
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.async_db_pool import AsyncDatabasePool, convert_placeholders
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = AsyncDatabasePool(backend='sqlite', sqlite_path=str(tmp_path / 'async.db'), max_size=4)
+    asyncio.run(db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, qty INTEGER)"))
+    yield db
+    db.close()
+
+
+class TestPlaceholderConversion:
+    """Test psycopg2-style placeholder rewriting"""
+
+    def test_numeric_and_qmark_styles(self):
+        query = "SELECT * FROM t WHERE a = %s AND b LIKE 'x%%' AND c = %s"
+        assert convert_placeholders(query, 'numeric') == \
+            "SELECT * FROM t WHERE a = $1 AND b LIKE 'x%' AND c = $2"
+        assert convert_placeholders(query, 'qmark') == \
+            "SELECT * FROM t WHERE a = ? AND b LIKE 'x%' AND c = ?"
+
+
+class TestAsyncDatabasePool:
+    """Test query helpers, transactions and concurrent use"""
+
+    def test_fetch_helpers(self, db):
+        async def scenario():
+            await db.executemany("INSERT INTO items (name, qty) VALUES (%s, %s)",
+                                 [('apple', 3), ('pear', 5)])
+            rows = await db.fetch("SELECT name, qty FROM items ORDER BY name")
+            row = await db.fetchrow("SELECT qty FROM items WHERE name = %s", ('pear',))
+            total = await db.fetchval("SELECT SUM(qty) FROM items")
+            missing = await db.fetchrow("SELECT qty FROM items WHERE name = %s", ('kiwi',))
+            return rows, row, total, missing
+
+        rows, row, total, missing = asyncio.run(scenario())
+        assert [tuple(r) for r in rows] == [('apple', 3), ('pear', 5)]
+        assert row['qty'] == 5
+        assert total == 8
+        assert missing is None
+
+    def test_execute_returns_rowcount(self, db):
+        async def scenario():
+            await db.executemany("INSERT INTO items (name, qty) VALUES (%s, %s)",
+                                 [('a', 1), ('b', 1), ('c', 2)])
+            return await db.execute("UPDATE items SET qty = qty + 1 WHERE qty = %s", (1,))
+
+        assert asyncio.run(scenario()) == 2
+
+    def test_transaction_rolls_back_on_error(self, db):
+        async def scenario():
+            with pytest.raises(RuntimeError):
+                async with db.transaction() as conn:
+                    await conn.execute("INSERT INTO items (name, qty) VALUES (%s, %s)", ('x', 1))
+                    raise RuntimeError("boom")
+
+            async with db.transaction() as conn:
+                await conn.execute("INSERT INTO items (name, qty) VALUES (%s, %s)", ('y', 1))
+                async with conn.transaction():
+                    await conn.execute("INSERT INTO items (name, qty) VALUES (%s, %s)", ('z', 1))
+
+            return await db.fetch("SELECT name FROM items ORDER BY name")
+
+        assert [row[0] for row in asyncio.run(scenario())] == ['y', 'z']
+
+    def test_pool_survives_separate_event_loops(self, db):
+        # Routes create a fresh event loop per request via asyncio.run
+        for i in range(3):
+            asyncio.run(db.execute("INSERT INTO items (name, qty) VALUES (%s, %s)", (f'n{i}', i)))
+
+        assert asyncio.run(db.fetchval("SELECT COUNT(*) FROM items")) == 3
+        stats = db.get_pool_stats()
+        assert stats['backend'] == 'sqlite'
+        assert stats['pool_size'] <= 4
+        assert stats['query_errors'] == 0
+
+    def test_waiting_caller_does_not_block_its_loop(self, db):
+        async def scenario():
+            ticks = []
+
+            async def ticker():
+                for _ in range(5):
+                    ticks.append(time.perf_counter())
+                    await asyncio.sleep(0.01)
+
+            await asyncio.gather(
+                ticker(),
+                *(db.fetchval("SELECT %s", (i,)) for i in range(20))
+            )
+            return ticks
+
+        assert len(asyncio.run(scenario())) == 5
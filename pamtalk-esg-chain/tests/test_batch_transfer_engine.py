@@ -0,0 +1,181 @@
+"""
+Unit Tests for the Batch Transfer Engine
+Runs atomic-group batch transfers against the local algod simulator in test_helpers
+"""
+
+import sys
+import os
+
+import pytest
+from algosdk import account
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.service.batch_transfer_engine import (
+    BatchTransferEngine, SuggestedParamsWindow, MAX_GROUP_SIZE, TransferStatus
+)
+from tests.test_helpers import AlgodSimulator
+
+ASSET_ID = 12345
+
+
+@pytest.fixture
+def sender():
+    private_key, address = account.generate_account()
+    return address, private_key
+
+
+def make_recipients(count):
+    return [account.generate_account()[1] for _ in range(count)]
+
+
+class CongestedAlgod(AlgodSimulator):
+    """Simulator that keeps pooled transactions out of blocks for `hold_rounds` rounds"""
+
+    def __init__(self, *args, hold_rounds: int, validity_rounds: int = 1000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hold_until = self.round + hold_rounds
+        self.validity_rounds = validity_rounds
+
+    def suggested_params(self):
+        params = super().suggested_params()
+        params.last = params.first + self.validity_rounds
+        return params
+
+    def _produce_block(self):
+        if self.round < self.hold_until:
+            self.round += 1
+            return
+        super()._produce_block()
+
+
+def make_engine(client, sender, **kwargs):
+    address, private_key = sender
+    return BatchTransferEngine(client, address, private_key, ASSET_ID, **kwargs)
+
+
+class TestBatchTransferEngine:
+    """Test grouping, params reuse, pipelined submission and bulk confirmation"""
+
+    def test_transfers_are_grouped_and_confirmed(self, sender):
+        recipients = make_recipients(10)
+        client = AlgodSimulator(ASSET_ID, opted_in=recipients)
+        # Repeated recipient/amount pairs must still become distinct transactions
+        transfers = [{'recipient': recipients[i % 10], 'amount': 5} for i in range(40)]
+
+        progress = []
+        result = make_engine(client, sender).run(
+            transfers, note_prefix="job-1", progress=lambda done, total: progress.append((done, total)))
+
+        assert result['success_count'] == 40
+        assert result['failed_count'] == 0
+        assert result['group_count'] == 3
+        assert [len(g['tx_ids']) for g in result['groups']] == [MAX_GROUP_SIZE, MAX_GROUP_SIZE, 8]
+        assert all(g['status'] == TransferStatus.CONFIRMED for g in result['groups'])
+        assert len(client.confirmed) == 40
+        assert sum(client.balances.values()) == 200
+        assert progress[-1] == (40, 40)
+
+        # One params fetch and one submit call per group, not per transfer
+        assert client.calls['suggested_params'] == 1
+        assert client.calls['send_transactions'] == 3
+        assert client.calls['pending_transaction_info'] == 3
+
+    def test_rejected_group_is_split_so_other_transfers_succeed(self, sender):
+        recipients = make_recipients(16)
+        client = AlgodSimulator(ASSET_ID, opted_in=recipients[1:])
+        transfers = [{'recipient': r, 'amount': 1} for r in recipients]
+
+        result = make_engine(client, sender).run(transfers, note_prefix="job-2")
+
+        assert result['success_count'] == 15
+        assert result['failed_count'] == 1
+        failed = result['failed_transfers'][0]
+        assert failed['index'] == 0
+        assert failed['recipient'] == recipients[0]
+        assert 'must optin' in failed['error']
+
+    def test_invalid_address_only_fails_its_own_transfer(self, sender):
+        recipients = make_recipients(4)
+        client = AlgodSimulator(ASSET_ID, opted_in=recipients)
+        transfers = [{'recipient': r, 'amount': 1} for r in recipients]
+        transfers.insert(2, {'recipient': 'NOT-AN-ADDRESS', 'amount': 1})
+
+        result = make_engine(client, sender).run(transfers)
+
+        assert result['success_count'] == 4
+        assert [t['index'] for t in result['failed_transfers']] == [2]
+
+    def test_in_flight_limit_spreads_groups_over_rounds(self, sender):
+        recipients = make_recipients(8)
+        client = AlgodSimulator(ASSET_ID, opted_in=recipients, block_capacity=16)
+        transfers = [{'recipient': recipients[i % 8], 'amount': 1} for i in range(64)]
+
+        result = make_engine(client, sender, group_size=8, max_in_flight=2).run(transfers)
+
+        assert result['success_count'] == 64
+        rounds = {g['confirmed_round'] for g in result['groups']}
+        assert len(rounds) == 4
+        assert result['rounds_waited'] == 4
+
+
+class TestConfirmationWaiting:
+    """Test that slow groups are not reported as failed while they can still confirm"""
+
+    def test_groups_confirming_late_are_waited_for(self, sender):
+        recipients = make_recipients(4)
+        client = CongestedAlgod(ASSET_ID, opted_in=recipients, hold_rounds=25)
+        transfers = [{'recipient': r, 'amount': 1} for r in recipients]
+
+        result = make_engine(client, sender).run(transfers)
+
+        assert result['success_count'] == 4
+        assert result['failed_count'] == result['unconfirmed_count'] == 0
+        assert result['rounds_waited'] > 10
+
+    def test_group_fails_only_after_last_valid(self, sender):
+        recipients = make_recipients(2)
+        client = CongestedAlgod(ASSET_ID, opted_in=recipients, hold_rounds=100, validity_rounds=20)
+        transfers = [{'recipient': r, 'amount': 1} for r in recipients]
+
+        result = make_engine(client, sender).run(transfers)
+
+        assert result['failed_count'] == 2
+        assert all('만료' in t['error'] for t in result['failed_transfers'])
+        assert result['rounds_waited'] > 20
+
+    def test_capped_wait_reports_unknown_not_failed(self, sender):
+        recipients = make_recipients(3)
+        client = CongestedAlgod(ASSET_ID, opted_in=recipients, hold_rounds=100)
+        transfers = [{'recipient': r, 'amount': 1} for r in recipients]
+
+        result = make_engine(client, sender, confirm_rounds=5).run(transfers)
+
+        assert result['failed_count'] == 0 and result['failed_transfers'] == []
+        assert result['unconfirmed_count'] == 3
+        unconfirmed = result['unconfirmed_transfers']
+        assert [t['index'] for t in unconfirmed] == [0, 1, 2]
+        assert all(t['tx_id'] and t['last_valid'] > client.round for t in unconfirmed)
+        assert result['groups'][0]['status'] == TransferStatus.UNKNOWN
+        # Still pooled: it may confirm later, so it must not be resubmitted
+        assert len(client.pool) == 3
+
+
+class TestSuggestedParamsWindow:
+    """Test params reuse across a round window"""
+
+    def test_params_are_refreshed_after_window(self):
+        client = AlgodSimulator(ASSET_ID)
+        window = SuggestedParamsWindow(client, window_rounds=5)
+
+        first = window.get()
+        window.observe_round(client.round + 4)
+        assert window.get() is first
+
+        window.observe_round(client.round + 5)
+        client.round += 5
+        refreshed = window.get()
+        assert refreshed is not first
+        assert refreshed.first == first.first + 5
+        assert (window.fetches, window.reuses) == (2, 1)
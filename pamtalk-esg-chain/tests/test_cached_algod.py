@@ -0,0 +1,127 @@
+"""
+Unit Tests for the Cached Algod Client
+Tests round-aware params reuse, account caching, invalidation and request coalescing
+"""
+
+import threading
+import time
+import sys
+import os
+
+import pytest
+from algosdk import account, transaction
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.cached_algod import CachedAlgodClient
+from tests.test_helpers import AlgodSimulator
+
+ASSET_ID = 12345
+
+
+class SlowAlgodSimulator(AlgodSimulator):
+    """Simulator whose account lookups take a while, so concurrent callers overlap"""
+
+    def account_info(self, address):
+        time.sleep(0.1)
+        return super().account_info(address)
+
+
+@pytest.fixture
+def node():
+    return AlgodSimulator(ASSET_ID)
+
+
+class TestCachedAlgodClient:
+    """Test the caching algod wrapper"""
+
+    def test_suggested_params_are_reused_within_round_window(self, node):
+        client = CachedAlgodClient(node, params_window_rounds=3)
+
+        first = client.suggested_params()
+        first.fee = 5000  # callers tweak fees; the cached copy must not change
+        second = client.suggested_params()
+        assert second.fee == 1000
+        assert node.calls['suggested_params'] == 1
+
+        client.status_after_block(node.round + 2)
+        refreshed = client.suggested_params()
+        assert refreshed.first == first.first + 3
+        assert node.calls['suggested_params'] == 2
+
+    def test_account_info_is_cached_until_own_transaction(self, node):
+        private_key, sender = account.generate_account()
+        receiver = account.generate_account()[1]
+        node.opted_in.add(receiver)
+        client = CachedAlgodClient(node, dirty_seconds=0.05)
+
+        assert client.account_info(receiver)['assets'][0]['amount'] == 0
+        client.account_info(receiver)
+        assert node.calls['account_info'] == 1
+
+        txn = transaction.AssetTransferTxn(sender, client.suggested_params(), receiver, 7, ASSET_ID)
+        client.send_transaction(txn.sign(private_key))
+        node.status_after_block(node.round)
+
+        # Invalidated by our own transfer, and not cached again until it has had time to confirm
+        assert client.account_info(receiver)['assets'][0]['amount'] == 7
+        client.account_info(receiver)
+        assert node.calls['account_info'] == 3
+
+        time.sleep(0.06)
+        client.account_info(receiver)
+        client.account_info(receiver)
+        assert node.calls['account_info'] == 4
+
+    def test_concurrent_identical_calls_are_coalesced(self):
+        node = SlowAlgodSimulator(ASSET_ID)
+        client = CachedAlgodClient(node)
+        address = account.generate_account()[1]
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(client.account_info(address)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 8
+        assert node.calls['account_info'] == 1
+
+        stats = client.get_cache_stats()
+        assert stats['node_calls.account_info'] == 1
+        assert stats['calls_saved'] == 7
+
+    def test_cache_is_bounded_and_expired_entries_are_swept(self, node):
+        client = CachedAlgodClient(node, account_ttl=0.2, dirty_seconds=0.2,
+                                   max_entries=3, sweep_interval=0.2)
+        addresses = [account.generate_account()[1] for _ in range(5)]
+
+        for address in addresses:
+            client.account_info(address)
+        stats = client.get_cache_stats()
+        assert stats['cached_entries'] == 3
+        assert stats['evictions'] == 2
+
+        # Least recently used entries go first
+        client.account_info(addresses[2])
+        client.account_info(addresses[0])
+        assert node.calls['account_info'] == 6
+        client.account_info(addresses[2])
+        assert node.calls['account_info'] == 6
+
+        client.invalidate_address(addresses[1])
+        time.sleep(0.25)
+        client.account_info(account.generate_account()[1])
+
+        # Expired entries and dirty marks are dropped without reading their keys again
+        stats = client.get_cache_stats()
+        assert stats['cached_entries'] == 1
+        assert stats['dirty_addresses'] == 0
+
+    def test_other_calls_are_delegated(self, node):
+        client = CachedAlgodClient(node)
+        assert client.block_capacity == node.block_capacity
+        assert client.status()['last-round'] == node.round
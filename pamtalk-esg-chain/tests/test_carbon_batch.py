@@ -0,0 +1,127 @@
+"""
+Unit Tests for the Carbon Footprint Batch Engine
+Tests that the vectorized batch path matches calculate_carbon_footprint row by row,
+aggregates statistics the same way and feeds MRV batch measurements
+"""
+
+import random
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.service.carbon_calculation_engine import (
+    ActivityType, CarbonActivity, CarbonCalculationEngine
+)
+from app.service.carbon_batch import CarbonActivityBatch, synthetic_columns
+from app.service.mrv_measurement_module import MRVMeasurementModule
+
+REGIONS = ['경기도', '서울시', '인천시', '부산시', '광주시', '전라남도', '경상북도',
+           '충청남도', '대전시', '강원도', '제주도']
+PRODUCTS = ['유기농 상추', '배추', '토마토', '사과', '딸기', '쌀', '현미 쌀', '옥수수', '표고버섯', 'Apple']
+
+
+def random_activity(rng, i):
+    return CarbonActivity(
+        activity_type=rng.choice(list(ActivityType)),
+        user_id=f"user{i % 7}",
+        product_name=rng.choice(PRODUCTS),
+        # Include tiny quantities so the reward and mint thresholds are exercised
+        quantity=rng.choice([0.01, 0.2, 1.0, round(rng.uniform(0.1, 80), 2)]),
+        origin_region=rng.choice(REGIONS),
+        destination_region=rng.choice(REGIONS),
+        farming_method=rng.choice(['organic', 'conventional', 'hydroponic']),
+        transport_method=rng.choice(['truck_small', 'truck_medium', 'rail', 'ship', 'bicycle']),
+        packaging_type=rng.choice(['plastic', 'paper', 'biodegradable', 'reusable', 'none']),
+        activity_date="2024-01-15"
+    )
+
+
+@pytest.fixture(scope="module")
+def activities():
+    rng = random.Random(7)
+    return [random_activity(rng, i) for i in range(3000)]
+
+
+@pytest.fixture
+def engine():
+    return CarbonCalculationEngine()
+
+
+class TestCarbonBatch:
+    """Test the columnar carbon footprint calculation"""
+
+    def test_batch_matches_scalar_results(self, engine, activities):
+        batch = engine.calculate_carbon_footprint_batch(activities)
+        assert len(batch) == len(activities)
+
+        for i, activity in enumerate(activities):
+            assert batch.result(i) == engine.calculate_carbon_footprint(activity)
+
+    def test_columns_accept_enum_values_and_match_activity_lists(self, engine, activities):
+        columns = {
+            'activity_type': [a.activity_type.value for a in activities],
+            'product_name': np.array([a.product_name for a in activities], dtype=object),
+            'quantity': [a.quantity for a in activities],
+            'origin_region': [a.origin_region for a in activities],
+            'destination_region': [a.destination_region for a in activities],
+            'farming_method': [a.farming_method for a in activities],
+            'transport_method': [a.transport_method for a in activities],
+            'packaging_type': [a.packaging_type for a in activities]
+        }
+        from_columns = engine.calculate_carbon_footprint_batch(columns)
+        from_list = engine.calculate_carbon_footprint_batch(CarbonActivityBatch.from_activities(activities))
+
+        assert np.array_equal(from_columns.carbon_savings, from_list.carbon_savings)
+        assert np.array_equal(from_columns.esg_gold_amount, from_list.esg_gold_amount)
+        assert np.array_equal(from_columns.reward_amount, from_list.reward_amount)
+
+    def test_invalid_columns_are_rejected(self, engine):
+        with pytest.raises(ValueError):
+            engine.calculate_carbon_footprint_batch({'quantity': [1.0]})
+
+        columns = synthetic_columns(3)
+        columns['activity_type'] = ['local_food_purchase', 'moon_landing', 'organic_farming']
+        with pytest.raises(ValueError):
+            engine.calculate_carbon_footprint_batch(columns)
+
+        columns = synthetic_columns(3)
+        columns['packaging_type'] = columns['packaging_type'][:2]
+        with pytest.raises(ValueError):
+            engine.calculate_carbon_footprint_batch(columns)
+
+    def test_statistics_match_per_activity_aggregation(self, engine, activities):
+        stats = engine.get_carbon_statistics(activities)
+        results = [engine.calculate_carbon_footprint(a) for a in activities]
+
+        assert stats['total_activities'] == len(activities)
+        assert stats['total_token_rewards'] == sum(r.reward_amount for r in results)
+        assert stats['total_carbon_savings'] == pytest.approx(sum(r.carbon_savings for r in results), abs=1e-6)
+        assert stats['average_reduction_percentage'] == pytest.approx(
+            sum(r.reduction_percentage for r in results) / len(results), abs=0.01)
+
+        for activity_type in ActivityType:
+            matching = [r for a, r in zip(activities, results) if a.activity_type == activity_type]
+            entry = stats['by_activity_type'][activity_type.value]
+            assert entry['count'] == len(matching)
+            assert entry['total_tokens'] == sum(r.reward_amount for r in matching)
+            assert entry['total_savings'] == pytest.approx(sum(r.carbon_savings for r in matching))
+
+        assert engine.get_carbon_statistics([])['total_activities'] == 0
+
+    def test_mrv_batch_measurement_uses_batch_results(self, engine, activities):
+        mrv = MRVMeasurementModule(engine)
+        sample = activities[:50]
+        measurements = mrv.batch_measure_activities([(a, 'sensor', []) for a in sample])
+
+        assert len(measurements) == len(sample)
+        for activity, measurement in zip(sample, measurements):
+            expected = engine.calculate_carbon_footprint(activity)
+            assert measurement.carbon_savings_kg == expected.carbon_savings
+            assert measurement.esg_gold_amount == expected.esg_gold_actual
+            assert measurement.metadata['pam_tokens'] == expected.reward_amount
+            assert measurement.data_hash
@@ -0,0 +1,122 @@
+"""
+Unit Tests for Carbon Lookup Tables
+Tests the Aho–Corasick product classifier and the integer-indexed region distance matrix
+"""
+
+import random
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.service.carbon_calculation_engine import (
+    CarbonCalculationEngine, DISTANCE_MATRIX, PRODUCT_KEYWORDS
+)
+from app.service.carbon_lookup import (
+    KeywordAutomaton, ProductClassifier, RegionDistanceMatrix, REGION_COORDINATES, great_circle_km
+)
+from app.service.carbon_batch import synthetic_columns
+
+
+def substring_classify(product_name):
+    """The original keyword scan the classifier replaces"""
+    lowered = product_name.lower()
+    for category, keywords in PRODUCT_KEYWORDS.items():
+        if any(keyword in lowered for keyword in keywords):
+            return category
+    return 'vegetables'
+
+
+class TestKeywordAutomaton:
+    """Test multi-keyword matching"""
+
+    def test_finds_overlapping_and_nested_keywords(self):
+        automaton = KeywordAutomaton({'he': 1, 'she': 2, 'his': 3, 'hers': 4})
+        assert sorted(automaton.find('ushers')) == [1, 2, 4]
+        assert automaton.find('xyz') == []
+
+    def test_matches_korean_keywords_inside_words(self):
+        automaton = KeywordAutomaton({'배': 'fruit', '배추': 'vegetable', '쌀': 'grain'})
+        assert sorted(automaton.find('유기농 배추')) == ['fruit', 'vegetable']
+        assert automaton.find('찹쌀떡') == ['grain']
+
+
+class TestProductClassifier:
+    """Test the compiled product classifier"""
+
+    def test_agrees_with_substring_scan(self):
+        classifier = ProductClassifier(PRODUCT_KEYWORDS, default='vegetables')
+        rng = random.Random(3)
+        alphabet = [k for keywords in PRODUCT_KEYWORDS.values() for k in keywords] + \
+                   ['유기농', ' ', '국산', '버섯', 'APPLE', '햇', '감귤', '무농약']
+        names = [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(3000)]
+        names += ['배추', '배', '단감', '무화과', '현미 쌀', '표고버섯', '']
+
+        for name in names:
+            assert classifier.classify(name) == substring_classify(name), name
+
+    def test_repeated_names_hit_the_cache(self):
+        classifier = ProductClassifier(PRODUCT_KEYWORDS, default='vegetables', cache_size=2)
+        for name in ['사과', '사과', '쌀', '사과']:
+            classifier.classify(name)
+        info = classifier.cache_info()
+        assert (info.hits, info.misses) == (2, 2)
+
+
+class TestRegionDistanceMatrix:
+    """Test the symmetric integer-indexed distance matrix"""
+
+    def test_known_pairs_are_symmetric_and_unknown_pairs_use_default(self):
+        table = RegionDistanceMatrix(DISTANCE_MATRIX)
+
+        for (origin, destination), distance in DISTANCE_MATRIX.items():
+            assert table.distance(origin, destination) == distance
+            assert table.distance(destination, origin) == distance
+        assert np.array_equal(table.matrix, table.matrix.T)
+
+        assert table.distance('서울시', '부산시') == 150.0
+        assert table.distance('제주도', '서울시') == 150.0
+        assert table.unknown_regions == {'제주도': 1}
+
+    def test_index_arrays_look_up_the_same_distances(self):
+        table = RegionDistanceMatrix(DISTANCE_MATRIX)
+        origins = ['경기도', '강원도', '제주도', '서울시']
+        destinations = ['부산시', '서울시', '서울시', '경기도']
+
+        looked_up = table.distances(table.region_indices(origins), table.region_indices(destinations))
+        assert looked_up.tolist() == [table.distance(o, d) for o, d in zip(origins, destinations)]
+
+    def test_coordinates_fill_unknown_pairs(self):
+        table = RegionDistanceMatrix(DISTANCE_MATRIX, coordinates=REGION_COORDINATES, road_factor=1.3)
+
+        # Listed distances win over coordinates
+        assert table.distance('경기도', '부산시') == 325
+        estimated = table.distance('서울시', '부산시')
+        assert estimated == pytest.approx(great_circle_km(REGION_COORDINATES['서울시'],
+                                                          REGION_COORDINATES['부산시']) * 1.3, abs=0.1)
+        assert 400 < estimated < 500
+        assert table.distance('제주도', '제주도') == 0.0
+        assert table.distance('평양시', '서울시') == 150.0
+
+
+class TestEngineLookups:
+    """Test that single and batch calculations share the lookup tables"""
+
+    def test_engine_with_coordinates_keeps_batch_and_scalar_in_step(self):
+        engine = CarbonCalculationEngine(region_coordinates=REGION_COORDINATES)
+        columns = synthetic_columns(500, seed=11)
+        batch = engine.calculate_carbon_footprint_batch(columns)
+
+        for i in range(0, 500, 25):
+            transport = engine._calculate_transport_emissions(
+                columns['origin_region'][i], columns['destination_region'][i],
+                float(columns['quantity'][i]), columns['transport_method'][i])
+            assert batch.transport_emissions[i] == transport
+
+        default_engine = CarbonCalculationEngine()
+        assert default_engine._get_distance('서울시', '부산시') == 150.0
+        assert engine._get_distance('서울시', '부산시') > 150.0
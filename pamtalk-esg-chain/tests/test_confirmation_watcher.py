@@ -0,0 +1,130 @@
+"""
+Unit Tests for the Confirmation Watcher
+Checks round-based bulk confirmation against the local algod simulator in test_helpers
+"""
+
+import asyncio
+import threading
+import sys
+import os
+
+import pytest
+from algosdk import account, transaction
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.confirmation_watcher import (
+    ConfirmationWatcher, ConfirmationTimeout, get_confirmation_watcher
+)
+from tests.test_helpers import AlgodSimulator
+
+ASSET_ID = 12345
+
+
+def submit_transfers(client, count):
+    """Send count single asset transfers and return their tx ids"""
+    private_key, sender = account.generate_account()
+    receiver = account.generate_account()[1]
+    client.opted_in.add(receiver)
+    params = client.suggested_params()
+
+    tx_ids = []
+    for i in range(count):
+        txn = transaction.AssetTransferTxn(sender, params, receiver, 1, ASSET_ID, note=str(i).encode())
+        tx_ids.append(client.send_transaction(txn.sign(private_key)))
+    return tx_ids
+
+
+@pytest.fixture
+def client():
+    return AlgodSimulator(ASSET_ID)
+
+
+class TestConfirmationWatcher:
+    """Test shared round following and future resolution"""
+
+    def test_many_waiters_share_one_round_loop(self):
+        client = AlgodSimulator(ASSET_ID, block_time=0.1)
+        tx_ids = submit_transfers(client, 60)
+        watcher = ConfirmationWatcher(client)
+        results = {}
+
+        def waiter(tx_id):
+            results[tx_id] = watcher.wait(tx_id, timeout=5)
+
+        threads = [threading.Thread(target=waiter, args=(tx_id,)) for tx_id in tx_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        watcher.stop()
+
+        assert all(results[tx_id]['confirmed-round'] == 1001 for tx_id in tx_ids)
+        stats = watcher.get_stats()
+        assert stats['confirmed'] == 60
+        # Rounds are followed once for all waiters, not once per transaction
+        assert client.calls['status_after_block'] <= 3
+        assert stats['lookups'] <= 2 * 60
+
+    def test_lookups_do_not_scale_with_pending_rounds(self):
+        client = AlgodSimulator(ASSET_ID, block_capacity=2)
+        tx_ids = submit_transfers(client, 20)
+        watcher = ConfirmationWatcher(client)
+
+        results = watcher.wait_many(tx_ids, timeout_rounds=20)
+        watcher.stop()
+
+        assert [results[tx_id]['confirmed-round'] for tx_id in tx_ids] == [
+            1001 + i // 2 for i in range(20)]
+        stats = watcher.get_stats()
+        # One block list per round; per-transaction lookups only on registration and confirmation
+        assert stats['block_lookups'] == client.round - 1000
+        assert stats['lookups'] <= 2 * 20
+        assert client.calls['pending_transaction_info'] == stats['lookups']
+
+    def test_falls_back_to_lookups_without_block_txids(self):
+        class OldNode(AlgodSimulator):
+            def get_block_txids(self, round_num):
+                from algosdk.error import AlgodHTTPError
+                raise AlgodHTTPError("not found", 404)
+
+        client = OldNode(ASSET_ID, block_capacity=2)
+        tx_ids = submit_transfers(client, 6)
+        watcher = ConfirmationWatcher(client)
+
+        results = watcher.wait_many(tx_ids, timeout_rounds=10)
+        watcher.stop()
+
+        assert [results[tx_id]['confirmed-round'] for tx_id in tx_ids] == [1001, 1001, 1002, 1002, 1003, 1003]
+        assert watcher.get_stats()['block_lookups'] == 1
+
+    def test_wait_many_and_async_wait(self, client):
+        tx_ids = submit_transfers(client, 5)
+        watcher = ConfirmationWatcher(client)
+
+        async def wait_all():
+            return await asyncio.gather(*(watcher.wait_async(tx_id, timeout=5) for tx_id in tx_ids[:3]))
+
+        confirmed = asyncio.run(wait_all())
+        assert [info['confirmed-round'] for info in confirmed] == [1001] * 3
+
+        results = watcher.wait_many(tx_ids[3:] + ["UNKNOWNTX"], timeout_rounds=3)
+        watcher.stop()
+
+        assert results[tx_ids[3]]['confirmed-round'] == 1001
+        assert 'error' in results["UNKNOWNTX"]
+
+    def test_unknown_transaction_times_out_after_rounds(self, client):
+        watcher = ConfirmationWatcher(client)
+
+        with pytest.raises(ConfirmationTimeout):
+            watcher.wait("NEVERSENT", timeout_rounds=4)
+        watcher.stop()
+
+        assert client.round >= 1004
+        assert watcher.get_stats()['timed_out'] == 1
+
+    def test_shared_watcher_per_client(self, client):
+        assert get_confirmation_watcher(client) is get_confirmation_watcher(client)
+        assert get_confirmation_watcher(client) is not get_confirmation_watcher(AlgodSimulator(ASSET_ID))
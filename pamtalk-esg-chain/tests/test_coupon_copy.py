@@ -0,0 +1,126 @@
+"""
+Unit Tests for the Coupon COPY Stream
+Tests CSV field escaping, block generation of Base62 coupon codes and the file-like
+CopyStream that feeds COPY FROM STDIN
+"""
+
+import csv
+import io
+import sys
+import os
+from datetime import datetime
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.service.coupon_copy import (
+    COPY_ROWS_PER_BLOCK, CopyStream, _csv_field, coupon_csv_blocks, encode_base62
+)
+
+CREATED_AT = datetime(2024, 1, 15, 12, 0, 0)
+
+
+def parse(blocks):
+    return list(csv.reader(io.StringIO(b''.join(blocks).decode('utf-8'))))
+
+
+class TestCsvField:
+    """Test escaping of single CSV fields"""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("ESG", "ESG"),
+        (12345, "12345"),
+        ("", '""'),
+        ("a,b", '"a,b"'),
+        ('say "hi"', '"say ""hi"""'),
+        ("line\nbreak", '"line\nbreak"'),
+        ("carriage\rreturn", '"carriage\rreturn"'),
+    ])
+    def test_escaping(self, value, expected):
+        assert _csv_field(value) == expected
+
+    def test_round_trips_through_csv_reader(self):
+        values = ['plain', '', 'a,b', 'q"uote', 'multi\nline', '한글 자산']
+        line = ','.join(_csv_field(v) for v in values) + '\n'
+        assert next(csv.reader(io.StringIO(line))) == values
+
+
+class TestCouponCsvBlocks:
+    """Test streamed coupon rows"""
+
+    def test_rows_and_codes(self):
+        rows = parse(coupon_csv_blocks("ESG", 61, 3, 777, "ESG Coupon", 42, CREATED_AT))
+
+        assert [row[0] for row in rows] == ["ESG-z", "ESG-10", "ESG-11"]
+        assert rows[0][1:] == ["777", "ESG Coupon", "42", "ISSUED",
+                               "2024-01-15 12:00:00", "2024-01-15 12:00:00"]
+
+    def test_blocks_are_bounded_and_cover_the_range(self):
+        count = COPY_ROWS_PER_BLOCK * 2 + 5
+        blocks = list(coupon_csv_blocks("ESG", 1, count, 1, "a", 1, CREATED_AT))
+
+        assert len(blocks) == 3
+        rows = parse(blocks)
+        assert len(rows) == count
+        assert rows[-1][0] == f"ESG-{encode_base62(count)}"
+        assert len({row[0] for row in rows}) == count
+
+    def test_special_characters_in_unit_and_asset_name_are_quoted(self):
+        rows = parse(coupon_csv_blocks('E,"S"', 0, 2, 1, 'Green, "Gold"', 1, CREATED_AT))
+
+        assert [row[0] for row in rows] == ['E,"S"-0', 'E,"S"-1']
+        assert all(row[2] == 'Green, "Gold"' and len(row) == 7 for row in rows)
+
+    def test_empty_range(self):
+        assert list(coupon_csv_blocks("ESG", 1, 0, 1, "a", 1, CREATED_AT)) == []
+
+    def test_base62(self):
+        assert encode_base62(0) == "0"
+        assert encode_base62(61) == "z"
+        assert encode_base62(62 ** 3) == "1000"
+
+
+class TestCopyStream:
+    """Test the file-like adapter read by copy_expert"""
+
+    def test_reads_across_block_boundaries(self):
+        stream = CopyStream(iter([b"abc", b"defg", b"h"]))
+
+        assert stream.read(2) == b"ab"
+        assert stream.read(4) == b"cdef"
+        assert stream.read(10) == b"gh"
+        assert stream.read(10) == b""
+        assert stream.bytes_read == 8
+
+    def test_read_all(self):
+        stream = CopyStream(iter([b"12", b"34"]))
+        assert stream.read() == b"1234"
+        assert stream.read() == b""
+
+    def test_pulls_blocks_lazily(self):
+        pulled = []
+
+        def blocks():
+            for i in range(100):
+                pulled.append(i)
+                yield b"x" * 10
+
+        stream = CopyStream(blocks())
+        assert stream.read(25) == b"x" * 25
+        assert len(pulled) == 3
+
+    def test_whole_coupon_stream_matches_blocks(self):
+        blocks = list(coupon_csv_blocks("ESG", 100, 2500, 1, "asset", 9, CREATED_AT))
+        stream = CopyStream(iter(blocks))
+
+        chunks = []
+        while True:
+            chunk = stream.read(4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        assert b''.join(chunks) == b''.join(blocks)
+        assert stream.bytes_read == sum(len(block) for block in blocks)
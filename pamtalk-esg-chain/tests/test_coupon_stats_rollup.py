@@ -0,0 +1,210 @@
+"""
+Integration Tests for the Coupon Status Rollup
+Runs migration 012 in a throwaway schema on the PostgreSQL server configured by
+DB_HOST / DB_NAME / DB_USER / DB_PASSWORD (skipped when it is not reachable) and checks
+the statement triggers, pid-sharded counters, reconcile mismatch detection/repair and compaction
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+psycopg2 = pytest.importorskip('psycopg2')
+from psycopg2.extras import RealDictCursor
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+MIGRATION = Path(__file__).resolve().parent.parent / 'migrations' / '012_coupon_status_rollup.sql'
+SCHEMA = f"coupon_rollup_test_{os.getpid()}"
+
+COUPONS_TABLE = """
+    CREATE TABLE esg_coupons (
+        id SERIAL PRIMARY KEY,
+        coupon_code VARCHAR(100) NOT NULL UNIQUE,
+        asset_id BIGINT NOT NULL,
+        asset_name VARCHAR(255) NOT NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'ISSUED'
+               CHECK (status IN ('ISSUED', 'COMMITTEE', 'PROVIDER', 'CONSUMER', 'USED', 'EXPIRED'))
+    )
+"""
+
+
+def connect(schema=None):
+    options = f"-c search_path={schema}" if schema else None
+    try:
+        return psycopg2.connect(
+            host=os.getenv('DB_HOST'), dbname=os.getenv('DB_NAME'), user=os.getenv('DB_USER'),
+            password=os.getenv('DB_PASSWORD'), port=os.getenv('DB_PORT', '5432'),
+            connect_timeout=3, options=options, cursor_factory=RealDictCursor
+        )
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"PostgreSQL not reachable: {e}")
+
+
+class SchemaDb:
+    """The db.pool.get_connection() surface CouponStatsService uses, bound to the test schema"""
+
+    def __init__(self, connection):
+        self.pool = self
+        self._connection = connection
+
+    @contextmanager
+    def get_connection(self):
+        yield self._connection
+
+
+@pytest.fixture
+def schema():
+    admin = connect()
+    admin.autocommit = True
+    with admin.cursor() as cursor:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+        cursor.execute(COUPONS_TABLE)
+        cursor.execute(MIGRATION.read_text(encoding='utf-8'))
+    try:
+        yield SCHEMA
+    finally:
+        with admin.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        admin.close()
+
+
+@pytest.fixture
+def conn(schema):
+    connection = connect(schema)
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def stats(conn):
+    # Imported only once a server is reachable (app.utils.db_pool connects on import)
+    from app.service.coupon_stats_service import CouponStatsService
+    return CouponStatsService(db=SchemaDb(conn))
+
+
+def insert_coupons(connection, asset_id, count, status='ISSUED', prefix=None):
+    prefix = prefix or f"A{asset_id}-{status}"
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO esg_coupons (coupon_code, asset_id, asset_name, status)
+            SELECT %s || '-' || n, %s, 'asset', %s FROM generate_series(1, %s) AS n
+        """, (prefix, asset_id, status, count))
+    connection.commit()
+
+
+def execute(connection, query, params=None):
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        rows = cursor.fetchall() if cursor.description else None
+    connection.commit()
+    return rows
+
+
+def rollup(connection):
+    rows = execute(connection, """
+        SELECT asset_id, status, SUM(coupon_count) AS total
+        FROM coupon_status_counts GROUP BY asset_id, status HAVING SUM(coupon_count) <> 0
+    """)
+    return {(row['asset_id'], row['status']): int(row['total']) for row in rows}
+
+
+class TestRollupTriggers:
+    """Test that the statement triggers keep the rollup equal to the real counts"""
+
+    def test_insert_update_delete_are_tracked(self, conn, stats):
+        insert_coupons(conn, 1, 50)
+        insert_coupons(conn, 2, 20)
+        execute(conn, """
+            UPDATE esg_coupons SET status = 'COMMITTEE'
+            WHERE asset_id = 1 AND id IN (SELECT id FROM esg_coupons WHERE asset_id = 1 LIMIT 15)
+        """)
+        # Changes to other columns cancel out and leave the rollup alone
+        execute(conn, "UPDATE esg_coupons SET asset_name = 'renamed' WHERE asset_id = 2")
+        execute(conn, "DELETE FROM esg_coupons WHERE asset_id = 2 AND status = 'ISSUED' AND id % 2 = 0")
+
+        remaining = execute(conn, "SELECT COUNT(*) AS n FROM esg_coupons WHERE asset_id = 2")[0]['n']
+        assert rollup(conn) == {(1, 'ISSUED'): 35, (1, 'COMMITTEE'): 15, (2, 'ISSUED'): remaining}
+        assert stats.find_mismatches() == []
+
+    def test_writers_accumulate_into_their_own_pid_shard(self, conn, schema, stats):
+        other = connect(schema)
+        try:
+            insert_coupons(conn, 1, 10, prefix='first')
+            insert_coupons(other, 1, 7, prefix='second')
+            pids = {conn.get_backend_pid() % 16, other.get_backend_pid() % 16}
+        finally:
+            other.close()
+
+        shards = {row['shard'] for row in execute(conn, "SELECT shard FROM coupon_status_counts")}
+        assert shards == pids
+        assert rollup(conn) == {(1, 'ISSUED'): 17}
+
+
+class TestReconcile:
+    """Test mismatch detection and repair"""
+
+    def test_detects_drift_without_repairing(self, conn, stats):
+        insert_coupons(conn, 1, 30)
+        insert_coupons(conn, 2, 5)
+        execute(conn, "UPDATE coupon_status_counts SET coupon_count = coupon_count + 7 WHERE asset_id = 1")
+        execute(conn, "INSERT INTO coupon_status_counts (asset_id, status, shard, coupon_count) "
+                      "VALUES (3, 'USED', 5, 2)")
+
+        report = stats.reconcile()
+
+        assert [(m['asset_id'], m['status'], m['actual_count'], m['rollup_count'])
+                for m in report['mismatches']] == [(1, 'ISSUED', 30, 37), (3, 'USED', 0, 2)]
+        assert report['repaired_assets'] == []
+        assert len(stats.find_mismatches()) == 2
+        assert stats.find_mismatches(asset_ids=[2]) == []
+
+    def test_repair_rewrites_only_drifted_assets(self, conn, stats):
+        insert_coupons(conn, 1, 30)
+        insert_coupons(conn, 2, 5)
+        execute(conn, "DELETE FROM coupon_status_counts WHERE asset_id = 1")
+        execute(conn, "INSERT INTO coupon_status_counts (asset_id, status, shard, coupon_count) "
+                      "VALUES (3, 'USED', 5, 2)")
+        untouched = execute(conn, "SELECT shard, coupon_count FROM coupon_status_counts WHERE asset_id = 2")
+
+        report = stats.reconcile(repair=True)
+
+        assert report['repaired_assets'] == [1, 3]
+        assert stats.find_mismatches() == []
+        assert rollup(conn) == {(1, 'ISSUED'): 30, (2, 'ISSUED'): 5}
+        assert execute(conn, "SELECT shard, coupon_count FROM coupon_status_counts "
+                             "WHERE asset_id = 2") == untouched
+
+        # Triggers keep counting on top of the repaired rows
+        insert_coupons(conn, 1, 4, prefix='after-repair')
+        assert rollup(conn)[(1, 'ISSUED')] == 34
+        assert stats.reconcile()['mismatches'] == []
+
+
+class TestCompact:
+    """Test folding shards into shard 0"""
+
+    def test_compact_merges_shards_and_drops_zero_rows(self, conn, schema, stats):
+        other = connect(schema)
+        try:
+            insert_coupons(conn, 1, 10, prefix='first')
+            insert_coupons(other, 1, 6, prefix='second')
+            insert_coupons(other, 2, 3)
+        finally:
+            other.close()
+        execute(conn, "DELETE FROM esg_coupons WHERE asset_id = 2")
+        before = rollup(conn)
+
+        remaining = stats.compact()
+
+        rows = execute(conn, "SELECT asset_id, status, shard, coupon_count FROM coupon_status_counts")
+        assert remaining == len(rows) == 1
+        assert rows[0]['shard'] == 0 and int(rows[0]['coupon_count']) == 16
+        assert rollup(conn) == before == {(1, 'ISSUED'): 16}
+        assert stats.find_mismatches() == []
@@ -2,7 +2,10 @@
 Test Helper Functions and Utilities
 """
 
+import base64
 import hashlib
+import threading
+import time
 from datetime import datetime
 from typing import Dict, List, Any
 
@@ -377,6 +380,156 @@ class EscrowSimulator(ContractSimulator):
         return True
 
 
+class AlgodSimulator:
+    """
+    Local algod stand-in for batch transfer tests
+
+    Accepts signed asset transfers and 0-ALGO note payments (single or atomic groups), verifies
+    signatures and group consistency, and confirms pooled transactions one block per
+    status_after_block call.
+    """
+
+    def __init__(self, asset_id: int, opted_in: List[str] = (), start_round: int = 1000,
+                 block_capacity: int = 1000, block_time: float = 0.0):
+        self.asset_id = asset_id
+        self.block_time = block_time
+        self.opted_in = set(opted_in)
+        self.round = start_round
+        self.block_capacity = block_capacity
+        self.pool = []          # [(txid, signed_txn), ...] in submission order
+        self.confirmed = {}     # txid -> confirmed round
+        self.transactions = {}  # txid -> confirmed signed transaction
+        self.blocks = {}        # round -> txids included in that block
+        self.balances = {}      # receiver -> amount received
+        self.calls = {}
+        self._lock = threading.RLock()
+
+    def _count(self, name: str):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def status(self) -> Dict:
+        self._count('status')
+        return {'last-round': self.round}
+
+    def suggested_params(self):
+        from algosdk.transaction import SuggestedParams
+
+        self._count('suggested_params')
+        return SuggestedParams(fee=1000, first=self.round, last=self.round + 1000,
+                               gh='SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=',
+                               gen='sandnet-v1', flat_fee=True)
+
+    def send_transaction(self, signed_txn) -> str:
+        return self.send_transactions([signed_txn])
+
+    def send_transactions(self, signed_txns) -> str:
+        with self._lock:
+            return self._send_transactions(signed_txns)
+
+    def _send_transactions(self, signed_txns) -> str:
+        from algosdk import encoding
+        from algosdk.error import AlgodHTTPError
+        from nacl.signing import VerifyKey
+        from nacl.exceptions import BadSignatureError
+
+        self._count('send_transactions')
+        known = {txid for txid, _ in self.pool} | set(self.confirmed)
+        groups = {stxn.transaction.group for stxn in signed_txns}
+
+        if len(signed_txns) > 1 and (len(groups) != 1 or None in groups):
+            raise AlgodHTTPError("transactionGroup: incomplete group", 400)
+
+        for stxn in signed_txns:
+            txn = stxn.transaction
+            txid = txn.get_txid()
+            message = b"TX" + base64.b64decode(encoding.msgpack_encode(txn))
+            try:
+                VerifyKey(encoding.decode_address(txn.sender)).verify(
+                    message, base64.b64decode(stxn.signature))
+            except BadSignatureError:
+                raise AlgodHTTPError(f"{txid}: invalid signature", 400)
+            if txid in known:
+                raise AlgodHTTPError(f"transaction already in ledger: {txid}", 400)
+            if not txn.first_valid_round <= self.round <= txn.last_valid_round:
+                raise AlgodHTTPError(f"{txid}: txn dead: round {self.round} outside of "
+                                     f"{txn.first_valid_round}--{txn.last_valid_round}", 400)
+            if txn.type == 'axfer' and (txn.index != self.asset_id or txn.receiver not in self.opted_in):
+                raise AlgodHTTPError(f"{txid}: receiver error: must optin, asset {txn.index} "
+                                     f"missing from {txn.receiver}", 400)
+
+        for stxn in signed_txns:
+            self.pool.append((stxn.transaction.get_txid(), stxn))
+        return signed_txns[0].transaction.get_txid()
+
+    def pending_transaction_info(self, txid: str) -> Dict:
+        from algosdk.error import AlgodHTTPError
+
+        with self._lock:
+            self._count('pending_transaction_info')
+            if txid in self.confirmed:
+                return {'confirmed-round': self.confirmed[txid], 'pool-error': '',
+                        'txn': self._encode(self.transactions[txid])}
+            for pooled, stxn in self.pool:
+                if pooled == txid:
+                    return {'confirmed-round': 0, 'pool-error': '', 'txn': self._encode(stxn)}
+        raise AlgodHTTPError("txn does not exist", 404)
+
+    def get_block_txids(self, round_num: int) -> Dict:
+        from algosdk.error import AlgodHTTPError
+
+        with self._lock:
+            self._count('get_block_txids')
+            if round_num > self.round:
+                raise AlgodHTTPError("failed to retrieve information from the ledger", 404)
+            return {'blockTxids': list(self.blocks.get(round_num, []))}
+
+    @staticmethod
+    def _encode(stxn) -> Dict:
+        """Signed transaction as algod returns it (note base64 encoded)"""
+        txn = stxn.transaction
+        encoded = {'type': txn.type, 'snd': txn.sender}
+        if txn.note:
+            encoded['note'] = base64.b64encode(txn.note).decode()
+        return {'sig': stxn.signature, 'txn': encoded}
+
+    def account_info(self, address: str) -> Dict:
+        self._count('account_info')
+        assets = []
+        if address in self.opted_in:
+            assets.append({'asset-id': self.asset_id, 'amount': self.balances.get(address, 0)})
+        return {'address': address, 'round': self.round, 'assets': assets}
+
+    def status_after_block(self, block_num: int) -> Dict:
+        """Produce blocks until the chain is past block_num (atomic groups never split)"""
+        self._count('status_after_block')
+        while self.round <= block_num:
+            time.sleep(self.block_time)
+            with self._lock:
+                if self.round <= block_num:
+                    self._produce_block()
+        return {'last-round': self.round}
+
+    def _produce_block(self):
+        self.round += 1
+        self.blocks[self.round] = []
+        included = 0
+        while self.pool:
+            group = self.pool[0][1].transaction.group
+            size = 1 if group is None else sum(
+                1 for _, stxn in self.pool if stxn.transaction.group == group)
+            if included and included + size > self.block_capacity:
+                break
+            for _ in range(size):
+                txid, stxn = self.pool.pop(0)
+                self.confirmed[txid] = self.round
+                self.transactions[txid] = stxn
+                self.blocks[self.round].append(txid)
+                if stxn.transaction.type == 'axfer':
+                    receiver = stxn.transaction.receiver
+                    self.balances[receiver] = self.balances.get(receiver, 0) + stxn.transaction.amount
+            included += size
+
+
 def generate_test_data():
     """Generate test data for integration tests"""
     return {
@@ -0,0 +1,126 @@
+"""
+Unit Tests for the Persistent Job Queue
+Tests priority ordering, leasing, visibility timeouts, retries and cleanup on a WAL SQLite file
+"""
+
+import threading
+import time
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.job_queue import PersistentJobQueue, JobState
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "batch_jobs.db")
+
+
+class TestPersistentJobQueue:
+    """Test the SQLite-backed batch job queue"""
+
+    def test_jobs_survive_restart_and_lease_by_priority(self, db_path):
+        queue = PersistentJobQueue(db_path)
+        queue.enqueue("low", "MASS_TOKEN_MINT", {'amount': 1}, priority=1)
+        queue.enqueue("high", "MASS_TOKEN_MINT", {'amount': 2}, priority=9)
+        queue.enqueue("normal-1", "BATCH_TRANSFER", {'transfers': []}, priority=5)
+        queue.enqueue("normal-2", "BATCH_TRANSFER", {'transfers': []}, priority=5)
+
+        with pytest.raises(ValueError):
+            queue.enqueue("high", "MASS_TOKEN_MINT", {}, priority=9)
+
+        restarted = PersistentJobQueue(db_path)
+        order = [restarted.lease("worker")['job_id'] for _ in range(4)]
+
+        assert order == ["high", "normal-1", "normal-2", "low"]
+        assert restarted.lease("worker") is None
+        assert restarted.get("high")['parameters'] == {'amount': 2}
+
+    def test_each_job_is_leased_by_one_worker(self, db_path):
+        setup = PersistentJobQueue(db_path)
+        for i in range(50):
+            setup.enqueue(f"job-{i}", "BATCH_TRANSFER", {}, priority=i % 3)
+
+        # Separate queue instances stand in for separate worker processes
+        leased = []
+        lock = threading.Lock()
+
+        def worker(name):
+            queue = PersistentJobQueue(db_path)
+            while True:
+                job = queue.lease(name)
+                if job is None:
+                    return
+                with lock:
+                    leased.append(job['job_id'])
+
+        threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(leased) == sorted(f"job-{i}" for i in range(50))
+
+    def test_expired_lease_is_reclaimed_by_another_worker(self, db_path):
+        queue = PersistentJobQueue(db_path, visibility_timeout=0.05)
+        queue.enqueue("mint", "MASS_TOKEN_MINT", {}, max_attempts=2)
+
+        assert queue.lease("crashed")['attempts'] == 1
+        assert queue.lease("other") is None
+
+        time.sleep(0.06)
+        job = queue.lease("other")
+        assert job['lease_owner'] == "other"
+        assert job['attempts'] == 2
+
+        # The crashed worker has lost its lease and cannot finish the job
+        assert not queue.heartbeat("mint", "crashed", progress=0.5)
+        assert not queue.complete("mint", "crashed", {})
+
+        # Out of attempts: the next expiry closes the job instead of handing it out again
+        time.sleep(0.06)
+        assert queue.lease("third") is None
+        assert queue.get("mint")['status'] == JobState.FAILED
+
+    def test_failures_retry_with_backoff_then_fail(self, db_path):
+        queue = PersistentJobQueue(db_path, backoff_base=0.05)
+        queue.enqueue("mint", "MASS_TOKEN_MINT", {'amount': 10}, max_attempts=2)
+
+        queue.lease("w")
+        assert queue.fail("mint", "w", "boom", parameters={'amount': 10, 'mint_history_id': 7}) \
+            == JobState.PENDING
+
+        job = queue.get("mint")
+        assert job['status'] == JobState.PENDING
+        assert job['parameters']['mint_history_id'] == 7
+        assert queue.lease("w") is None  # still backing off
+
+        time.sleep(0.06)
+        assert queue.lease("w")['job_id'] == "mint"
+        assert queue.fail("mint", "w", "boom again") == JobState.FAILED
+        assert queue.get("mint")['error_message'] == "boom again"
+
+    def test_progress_completion_and_ttl_cleanup(self, db_path):
+        queue = PersistentJobQueue(db_path)
+        queue.enqueue("old", "RECONCILE_COUPON_STATS", {})
+        queue.enqueue("pending", "RECONCILE_COUPON_STATS", {})
+
+        queue.lease("w")
+        assert queue.heartbeat("old", "w", progress=0.4, message="40%")
+        assert queue.get("old")['progress'] == pytest.approx(0.4)
+        assert queue.complete("old", "w", {'mismatch_count': 0})
+
+        stats = queue.get_stats()
+        assert stats[JobState.COMPLETED] == 1
+        assert stats[JobState.PENDING] == 1
+
+        assert queue.cleanup(ttl=60) == 0
+        assert queue.cleanup(ttl=0) == 1
+        assert queue.get("old") is None
+        assert queue.get("pending") is not None
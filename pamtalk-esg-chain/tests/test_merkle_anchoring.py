@@ -0,0 +1,205 @@
+"""
+Unit Tests for Merkle Verification Anchoring
+Tests the Merkle tree and inclusion proofs, the local proof store, and single-transaction
+batch anchoring with proof verification against the on-chain anchor (algod simulator in test_helpers)
+"""
+
+import hashlib
+import sys
+import os
+
+import pytest
+from algosdk import account
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.service.blockchain_verification_service import BlockchainVerificationService
+from app.service.committee_verification_workflow import VerificationResult
+from app.service.merkle_anchoring import MerkleProofStore, MerkleTree, verify_inclusion
+from tests.test_helpers import AlgodSimulator
+
+ASSET_ID = 12345
+
+
+def leaf(i):
+    return hashlib.sha256(f"record-{i}".encode()).hexdigest()
+
+
+def make_result(i):
+    return VerificationResult(
+        result_id=f"VRS-{i:06d}",
+        request_id=f"VRQ-{i:06d}",
+        measurement_id=f"MRV-user{i}-20240115",
+        approved=i % 5 != 0,
+        confidence_score_verified=85.5,
+        carbon_savings_verified=round(1.5 + i * 0.1, 2),
+        dc_units_verified=round(1.8 + i * 0.12, 2),
+        verification_method="committee_review",
+        verified_by="committee001",
+        verified_at="2024-01-15T12:00:00",
+        checklist_results={'evidence_check': True},
+        evidence_verified=True,
+        data_integrity_verified=True,
+        calculation_verified=True,
+        verifier_comments="검증 완료"
+    )
+
+
+@pytest.fixture
+def simulator():
+    return AlgodSimulator(ASSET_ID)
+
+
+@pytest.fixture
+def service(simulator, tmp_path):
+    return BlockchainVerificationService(client=simulator,
+                                         proof_store=MerkleProofStore(str(tmp_path / "proofs.db")))
+
+
+class TestMerkleTree:
+    """Test tree construction and inclusion proofs"""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 8, 33])
+    def test_every_leaf_proves_inclusion(self, size):
+        leaves = [leaf(i) for i in range(size)]
+        tree = MerkleTree(leaves)
+
+        for i, value in enumerate(leaves):
+            assert verify_inclusion(value, tree.proof(i), tree.root)
+        assert len(tree.proof(0)) <= (size - 1).bit_length()
+
+    def test_tampered_leaf_or_path_fails(self):
+        leaves = [leaf(i) for i in range(6)]
+        tree = MerkleTree(leaves)
+        proof = tree.proof(4)
+
+        assert not verify_inclusion(leaf(99), proof, tree.root)
+        assert not verify_inclusion(leaves[4], tree.proof(3), tree.root)
+        flipped = [dict(step, position='left' if step['position'] == 'right' else 'right') for step in proof]
+        assert not verify_inclusion(leaves[4], flipped, tree.root)
+        assert not verify_inclusion(leaves[4], [{'position': 'up', 'hash': 'zz'}], tree.root)
+
+    def test_root_depends_on_order_and_internal_nodes_are_not_leaves(self):
+        leaves = [leaf(i) for i in range(4)]
+        tree = MerkleTree(leaves)
+        assert MerkleTree(list(reversed(leaves))).root != tree.root
+
+        # An internal node presented as a leaf does not verify (domain separation)
+        internal = tree.levels[1][0].hex()
+        assert not verify_inclusion(internal, tree.proof(2)[1:], tree.root)
+
+        with pytest.raises(ValueError):
+            MerkleTree([])
+        with pytest.raises(IndexError):
+            tree.proof(4)
+
+
+class TestMerkleAnchoring:
+    """Test batch anchoring through the verification service"""
+
+    def test_batch_is_anchored_in_one_transaction(self, service, simulator):
+        private_key, _ = account.generate_account()
+        results = [make_result(i) for i in range(25)]
+
+        stored = service.batch_store_verifications(results, private_key, mode="merkle")
+
+        assert simulator.calls['send_transactions'] == 1
+        assert len(stored) == 25 and all(r['success'] for r in stored)
+        assert len({r['tx_id'] for r in stored}) == 1
+        assert [r['leaf_index'] for r in stored] == list(range(25))
+        assert all(v.blockchain_tx_id == stored[0]['tx_id'] for v in results)
+
+        chain_data = service.retrieve_verification_from_chain(stored[0]['tx_id'])
+        assert chain_data['merkle_root'] == stored[0]['merkle_root']
+        assert chain_data['leaf_count'] == 25
+        assert chain_data['batch_id'] == stored[0]['batch_id']
+
+    def test_proofs_verify_offline_and_against_the_anchor(self, service, simulator):
+        private_key, _ = account.generate_account()
+        results = [make_result(i) for i in range(10)]
+        service.anchor_verifications_merkle(results, private_key)
+
+        proof = service.generate_proof_of_verification(results[7])
+        inclusion = proof['blockchain_record']['merkle_inclusion']
+        assert inclusion['leaf_index'] == 7 and inclusion['leaf_count'] == 10
+
+        assert service.verify_proof_authenticity(proof)[0]
+
+        # Offline only against a root the caller already trusts
+        node_calls = dict(simulator.calls)
+        assert service.verify_proof_authenticity(proof, check_anchor=False,
+                                                 trusted_root=inclusion['merkle_root'])[0]
+        assert simulator.calls == node_calls
+        valid, message = service.verify_proof_authenticity(proof, check_anchor=False)
+        assert not valid and "앵커를 확인하지 않았습니다" in message
+        valid, _ = service.verify_proof_authenticity(proof, check_anchor=False, trusted_root="00" * 32)
+        assert not valid
+
+        proof['verification_summary']['carbon_savings_verified'] += 1.0
+        valid, message = service.verify_proof_authenticity(proof)
+        assert not valid and "일치하지 않습니다" in message
+
+    def test_forged_root_is_rejected_by_anchor_check(self, service):
+        private_key, _ = account.generate_account()
+        results = [make_result(i) for i in range(4)]
+        service.anchor_verifications_merkle(results, private_key)
+
+        # Rebuild a self-consistent proof under a root that was never anchored
+        forged_tree = MerkleTree([service._generate_verification_hash(results[0]), leaf(1)])
+        proof = service.generate_proof_of_verification(results[0])
+        proof['blockchain_record']['merkle_inclusion'].update(
+            merkle_root=forged_tree.root, proof=forged_tree.proof(0))
+
+        valid, message = service.verify_proof_authenticity(proof)
+        assert not valid and "Merkle 루트" in message
+
+    def test_forged_certificate_is_rejected_by_default(self, service):
+        # Never anchored: the root is the certificate's own leaf and the anchor does not exist
+        forged = make_result(42)
+        forged.blockchain_tx_id = "FORGEDTXID"
+        proof = service.generate_proof_of_verification(forged)
+        verification_hash = proof['blockchain_record']['verification_hash']
+        proof['proof_version'] = '1.1'
+        proof['blockchain_record']['merkle_inclusion'] = {
+            'batch_id': 'MAB-forged',
+            'merkle_root': MerkleTree([verification_hash]).root,
+            'leaf_index': 0,
+            'leaf_count': 1,
+            'proof': [],
+            'anchor_tx_id': 'FORGEDTXID',
+            'anchored_round': 1
+        }
+
+        valid, message = service.verify_proof_authenticity(proof)
+        assert not valid and "앵커 기록" in message
+        assert not service.verify_proof_authenticity(proof, check_anchor=False)[0]
+
+    def test_leaf_count_must_match_the_anchor(self, service):
+        private_key, _ = account.generate_account()
+        results = [make_result(i) for i in range(4)]
+        service.anchor_verifications_merkle(results, private_key)
+
+        proof = service.generate_proof_of_verification(results[1])
+        proof['blockchain_record']['merkle_inclusion']['leaf_count'] = 5
+        valid, message = service.verify_proof_authenticity(proof)
+        assert not valid and "잎 개수" in message
+
+        proof['blockchain_record']['merkle_inclusion'].update(leaf_index=4, leaf_count=4)
+        assert not service.verify_proof_authenticity(proof)[0]
+
+    def test_proof_store_round_trip(self, service):
+        private_key, _ = account.generate_account()
+        summary = service.anchor_verifications_merkle([make_result(i) for i in range(3)], private_key)
+
+        inclusion = service.proof_store.get_inclusion("VRS-000002")
+        assert inclusion['merkle_root'] == summary['merkle_root']
+        assert inclusion['tx_id'] == summary['tx_id']
+        assert service.proof_store.get_batch(summary['batch_id'])['leaf_count'] == 3
+        assert service.proof_store.get_inclusion("VRS-999999") is None
+
+    def test_unknown_mode_and_empty_batch(self, service):
+        private_key, _ = account.generate_account()
+        with pytest.raises(ValueError):
+            service.batch_store_verifications([make_result(0)], private_key, mode="bulk")
+        assert service.batch_store_verifications([], private_key, mode="merkle") == []
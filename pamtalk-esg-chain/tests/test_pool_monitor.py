@@ -0,0 +1,100 @@
+"""
+Unit Tests for Connection Pool Monitoring
+Tests the fair slot queue, latency histogram and leak detector used by DatabaseConnectionPool
+"""
+
+import threading
+import time
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.pool_monitor import FairSlotQueue, LatencyHistogram, LeakDetector, PoolTimeoutError
+
+
+class TestFairSlotQueue:
+    """Test blocking acquire, timeout and FIFO ordering"""
+
+    def test_acquire_times_out_when_exhausted(self):
+        slots = FairSlotQueue(1)
+        slots.acquire(timeout=0.1)
+
+        started = time.monotonic()
+        with pytest.raises(PoolTimeoutError):
+            slots.acquire(timeout=0.05)
+        assert time.monotonic() - started >= 0.05
+        assert slots.waiting == 0
+
+        slots.release()
+        assert slots.acquire(timeout=0.05) < 0.05
+
+    def test_waiters_are_served_in_arrival_order(self):
+        slots = FairSlotQueue(1)
+        slots.acquire()
+        order = []
+
+        def worker(index):
+            slots.acquire(timeout=5)
+            order.append(index)
+            slots.release()
+
+        threads = []
+        for index in range(5):
+            thread = threading.Thread(target=worker, args=(index,))
+            thread.start()
+            threads.append(thread)
+            # Make sure each thread is queued before starting the next one
+            while slots.waiting < index + 1:
+                time.sleep(0.001)
+
+        slots.release()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert order == [0, 1, 2, 3, 4]
+        assert slots.in_use == 0
+
+
+class TestLatencyHistogram:
+    """Test bucket counts and percentile estimates"""
+
+    def test_snapshot(self):
+        histogram = LatencyHistogram(buckets_ms=(1, 10, 100))
+        for _ in range(90):
+            histogram.record(0.0005)
+        for _ in range(10):
+            histogram.record(0.05)
+
+        snapshot = histogram.snapshot()
+        assert snapshot['count'] == 100
+        assert snapshot['buckets'] == {'le_1ms': 90, 'le_10ms': 0, 'le_100ms': 10, 'gt_100ms': 0}
+        assert snapshot['p50_ms'] == 1
+        assert snapshot['p95_ms'] == pytest.approx(50.0)
+        assert snapshot['max_ms'] == pytest.approx(50.0)
+
+
+class TestLeakDetector:
+    """Test hold-time tracking and leak reports"""
+
+    def test_reports_connections_held_past_threshold(self):
+        detector = LeakDetector(threshold=0.02)
+        leaked, returned = object(), object()
+        detector.checkout(leaked)
+        detector.checkout(returned)
+        assert detector.checkin(returned) >= 0
+
+        time.sleep(0.03)
+        leaks = detector.find_leaks()
+        assert len(leaks) == 1
+        assert 'test_reports_connections_held_past_threshold' in leaks[0]['stack']
+
+        # A leak is only counted once however often it is reported
+        detector.find_leaks()
+        assert detector.leaks_detected == 1
+
+        detector.checkin(leaked)
+        assert detector.find_leaks() == []
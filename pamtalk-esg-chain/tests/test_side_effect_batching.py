@@ -0,0 +1,190 @@
+"""
+Unit Tests for the Side-Effect Batch Queue
+Tests per-kind batching and chunking, exponential retry backoff, the dead-letter path
+and the at-most-once flush on shutdown used by the social post side-effect pipeline
+"""
+
+import sys
+import os
+import time
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.service.side_effect_batching import BatchedSideEffectQueue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingHandler:
+    """Batch handler that records each chunk and fails the first `failures` calls"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.batches = []
+
+    def __call__(self, tasks):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("db unavailable")
+        self.batches.append([task.payload for task in tasks])
+        return 1
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_queue(clock, **kwargs):
+    queue = BatchedSideEffectQueue(clock=clock, **kwargs)
+    # Flush explicitly from the test instead of the background worker
+    queue._ensure_worker = lambda: None
+    return queue
+
+
+class TestBatching:
+    """Test grouping of queued tasks into per-kind batches"""
+
+    def test_tasks_are_grouped_by_kind_in_one_flush(self, clock):
+        queue = make_queue(clock)
+        counts, notes = RecordingHandler(), RecordingHandler()
+        queue.register_handler('count', counts)
+        queue.register_handler('note', notes)
+
+        for i in range(5):
+            queue.submit('count', {'n': i})
+            queue.submit('note', {'n': i})
+
+        assert queue.flush() == {'count': 5, 'note': 5}
+        assert counts.batches == [[{'n': i} for i in range(5)]]
+        assert len(notes.batches) == 1
+        stats = queue.get_stats()
+        assert (stats['submitted'], stats['tasks_applied'], stats['statements']) == (10, 10, 2)
+        assert stats['pending'] == 0
+
+    def test_large_backlog_is_chunked_by_max_batch(self, clock):
+        queue = make_queue(clock, max_batch=4)
+        handler = RecordingHandler()
+        queue.register_handler('count', handler)
+
+        for i in range(10):
+            queue.submit('count', {'n': i})
+
+        assert queue.flush() == {'count': 10}
+        assert [len(batch) for batch in handler.batches] == [4, 4, 2]
+
+    def test_unknown_kind_is_rejected(self, clock):
+        queue = make_queue(clock)
+        with pytest.raises(ValueError):
+            queue.submit('missing', {})
+        assert queue.flush() == {}
+
+
+class TestRetry:
+    """Test exponential backoff and the dead-letter path"""
+
+    def test_failed_batch_is_retried_after_backoff(self, clock):
+        queue = make_queue(clock, retry_backoff=1.0)
+        handler = RecordingHandler(failures=2)
+        queue.register_handler('count', handler)
+        queue.submit('count', {'n': 1})
+
+        assert queue.flush() == {}
+        assert queue.pending_count() == 1
+
+        # First retry waits 1s
+        clock.now += 0.5
+        assert queue.flush() == {}
+        assert handler.failures == 1
+        clock.now += 0.5
+        assert queue.flush() == {}
+
+        # Second retry waits 2s
+        clock.now += 1.9
+        assert queue.flush() == {}
+        clock.now += 0.1
+        assert queue.flush() == {'count': 1}
+
+        assert handler.batches == [[{'n': 1}]]
+        stats = queue.get_stats()
+        assert (stats['retries'], stats['dead_lettered'], stats['pending']) == (2, 0, 0)
+
+    def test_tasks_past_max_retries_go_to_dead_letters(self, clock):
+        queue = make_queue(clock, max_retries=2, retry_backoff=1.0)
+        queue.register_handler('count', RecordingHandler(failures=100))
+        queue.submit('count', {'n': 1})
+        queue.submit('count', {'n': 2})
+
+        for _ in range(5):
+            queue.flush()
+            clock.now += 10
+
+        stats = queue.get_stats()
+        assert stats['dead_lettered'] == 2 and stats['dead_letters'] == 2
+        assert stats['retries'] == 4 and stats['pending'] == 0
+        letter = queue.dead_letters[0]
+        assert letter['task'].payload == {'n': 1}
+        assert letter['task'].attempts == 3
+        assert 'db unavailable' in letter['error']
+
+    def test_failure_in_one_kind_does_not_block_others(self, clock):
+        queue = make_queue(clock)
+        ok = RecordingHandler()
+        queue.register_handler('ok', ok)
+        queue.register_handler('bad', RecordingHandler(failures=1))
+        queue.submit('ok', {'n': 1})
+        queue.submit('bad', {'n': 2})
+
+        assert queue.flush() == {'ok': 1}
+        assert ok.batches == [[{'n': 1}]]
+        assert queue.pending_count() == 1
+
+
+class TestShutdown:
+    """Test the final flush and at-most-once loss accounting"""
+
+    def test_shutdown_flushes_tasks_waiting_for_backoff(self, clock):
+        queue = make_queue(clock, retry_backoff=60.0)
+        handler = RecordingHandler(failures=1)
+        queue.register_handler('count', handler)
+        queue.submit('count', {'n': 1})
+        queue.flush()
+
+        queue.shutdown()
+
+        assert handler.batches == [[{'n': 1}]]
+        assert queue.pending_count() == 0
+
+    def test_tasks_failing_during_shutdown_are_dropped_not_blocked_on(self, clock):
+        queue = make_queue(clock)
+        queue.register_handler('count', RecordingHandler(failures=100))
+        queue.submit('count', {'n': 1})
+
+        queue.shutdown()
+
+        # At-most-once: nothing persisted, the task is left behind for the dying process
+        assert queue.pending_count() == 1
+        assert queue.get_stats()['tasks_applied'] == 0
+
+    def test_background_worker_flushes_on_its_own(self):
+        queue = BatchedSideEffectQueue(flush_interval=0.01)
+        handler = RecordingHandler()
+        queue.register_handler('count', handler)
+        queue.submit('count', {'n': 1})
+
+        for _ in range(200):
+            if handler.batches:
+                break
+            time.sleep(0.01)
+        queue.shutdown()
+
+        assert handler.batches == [[{'n': 1}]]
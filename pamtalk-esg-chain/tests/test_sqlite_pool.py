@@ -0,0 +1,123 @@
+"""
+Unit Tests for SQLite Connection Pool
+Tests per-thread connection reuse used by the SQLite-backed services
+"""
+
+import sqlite3
+import threading
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.sqlite_pool import SQLiteConnectionPool, get_sqlite_pool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLiteConnectionPool(str(tmp_path / 'pool.db'))
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.commit()
+    conn.close()
+    yield pool
+    pool.close_thread_connections()
+
+
+class TestSQLiteConnectionPool:
+    """Test connection reuse and release semantics"""
+
+    def test_connection_is_reused_within_thread(self, pool):
+        for _ in range(5):
+            conn = pool.acquire()
+            conn.execute("SELECT 1").fetchone()
+            conn.close()
+
+        stats = pool.get_pool_stats()
+        assert stats['connections_opened'] == 1
+        assert stats['reused'] == 5
+
+    def test_wal_and_synchronous_pragmas(self, pool):
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+            # NORMAL = 1
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_release_rolls_back_and_resets_row_factory(self, pool):
+        conn = pool.acquire()
+        conn.row_factory = sqlite3.Row
+        conn.execute("INSERT INTO items (name) VALUES ('uncommitted')")
+        conn.close()
+
+        with pool.connection() as conn:
+            assert conn.row_factory is None
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+        assert pool.get_pool_stats()['rollbacks_on_release'] == 1
+
+    def test_nested_acquire_uses_separate_connections(self, pool):
+        outer = pool.acquire()
+        outer.execute("INSERT INTO items (name) VALUES ('outer')")
+
+        inner = pool.acquire()
+        inner.execute("SELECT COUNT(*) FROM items").fetchone()
+        inner.close()
+
+        # the inner release must not roll back the outer transaction
+        outer.commit()
+        assert outer.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+        outer.close()
+
+    def test_released_connection_cannot_be_used(self, pool):
+        conn = pool.acquire()
+        conn.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    def test_each_thread_gets_its_own_connection(self, pool):
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(3):
+                    with pool.connection() as conn:
+                        conn.execute("INSERT INTO items (name) VALUES ('t')")
+                        conn.commit()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 12
+        assert pool.get_pool_stats()['connections_opened'] == 5
+
+    def test_schema_is_created_once_on_first_acquire(self, tmp_path):
+        pool = SQLiteConnectionPool(str(tmp_path / 'schema.db'),
+                                    schema="CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY);")
+        first = pool.acquire(row_factory=sqlite3.Row)
+        first.execute("INSERT INTO jobs VALUES ('a')")
+        first.commit()
+        assert first.execute("SELECT id FROM jobs").fetchone()['id'] == 'a'
+
+        # A nested connection opened after the schema exists sees the table as well
+        second = pool.acquire()
+        assert second.execute("SELECT id FROM jobs").fetchone() == ('a',)
+        second.close()
+        first.close()
+
+        # row_factory applies only to the borrow that asked for it
+        with pool.connection() as conn:
+            assert conn.row_factory is None
+        pool.close_thread_connections()
+
+    def test_shared_pool_per_db_path(self, tmp_path):
+        path = str(tmp_path / 'shared.db')
+        assert get_sqlite_pool(path) is get_sqlite_pool(path)
@@ -0,0 +1,93 @@
+"""
+Unit Tests for Prepared Statement Cache
+Tests PREPARE/EXECUTE bookkeeping and batch SELECT generation used by DatabaseConnectionPool
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.statement_cache import PreparedStatementCache, build_batch_select, statement_name
+
+
+class RecordingConnection:
+    """Connection stand-in that only needs to be hashable and weak-referenceable"""
+
+
+class RecordingCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+
+class TestPreparedStatementCache:
+    """Test that each query is prepared once per connection"""
+
+    def test_prepares_once_then_executes(self):
+        cache = PreparedStatementCache()
+        cursor = RecordingCursor(RecordingConnection())
+        query = "SELECT * FROM esg_coupons WHERE status = %s AND asset_id = %s"
+        name = statement_name(query)
+
+        cache.execute(cursor, query, ('ISSUED', 7))
+        cache.execute(cursor, query, ('COMMITTEE', 7))
+
+        assert cursor.executed == [
+            (f"PREPARE {name} AS SELECT * FROM esg_coupons WHERE status = $1 AND asset_id = $2", None),
+            (f"EXECUTE {name} (%s, %s)", ('ISSUED', 7)),
+            (f"EXECUTE {name} (%s, %s)", ('COMMITTEE', 7)),
+        ]
+        stats = cache.get_stats()
+        assert stats['prepared_misses'] == 1
+        assert stats['prepared_hits'] == 1
+
+    def test_each_connection_prepares_separately(self):
+        cache = PreparedStatementCache()
+        first = RecordingCursor(RecordingConnection())
+        second = RecordingCursor(RecordingConnection())
+
+        cache.execute(first, "SELECT 1")
+        cache.execute(second, "SELECT 1")
+
+        assert first.executed[0][0].startswith("PREPARE")
+        assert second.executed[0][0].startswith("PREPARE")
+        assert second.executed[1] == (f"EXECUTE {statement_name('SELECT 1')}", None)
+
+    def test_evicts_least_recently_used(self):
+        cache = PreparedStatementCache(max_size=2)
+        cursor = RecordingCursor(RecordingConnection())
+
+        cache.execute(cursor, "SELECT 1")
+        cache.execute(cursor, "SELECT 2")
+        cache.execute(cursor, "SELECT 1")
+        cache.execute(cursor, "SELECT 3")
+
+        assert (f"DEALLOCATE {statement_name('SELECT 2')}", None) in cursor.executed
+        assert cache.get_stats()['prepared_evictions'] == 1
+
+
+class TestBuildBatchSelect:
+    """Test combining several SELECTs into one statement"""
+
+    def test_builds_one_column_per_query(self):
+        sql = build_batch_select([
+            ('committees', "SELECT id FROM committees LIMIT 5;"),
+            ('assets', "SELECT DISTINCT asset_id FROM esg_coupons"),
+        ])
+
+        assert sql.startswith("SELECT ")
+        assert "FROM (SELECT id FROM committees LIMIT 5) AS q) AS \"committees\"" in sql
+        assert sql.count("json_agg") == 2
+
+    def test_rejects_invalid_names(self):
+        with pytest.raises(ValueError):
+            build_batch_select([('bad name', "SELECT 1")])
+        with pytest.raises(ValueError):
+            build_batch_select([])
@@ -0,0 +1,119 @@
+"""
+Unit Tests for Timeline Paging Helpers
+Tests keyset cursor encoding, newest-first timeline merging (with offset paging)
+and the TTL LRU cache used by the materialized timeline service
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.service.timeline_paging import (
+    TimelineCache, decode_cursor, encode_cursor, merge_timelines
+)
+
+BASE = datetime(2024, 1, 15, 12, 0, 0)
+
+
+def entries(*spec):
+    """(minutes ago, post_id) pairs as newest-first timeline entries"""
+    return sorted(((BASE - timedelta(minutes=m), pid) for m, pid in spec), reverse=True)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCursor:
+    """Test opaque keyset cursors"""
+
+    def test_round_trip(self):
+        entry = (datetime(2024, 1, 15, 12, 30, 5, 123456), 42)
+        cursor = encode_cursor(entry)
+        assert '|' not in cursor
+        assert decode_cursor(cursor) == entry
+
+    @pytest.mark.parametrize("cursor", ["not-base64!!", "bm8tc2VwYXJhdG9y", "", "한글"])
+    def test_malformed_cursor_is_rejected(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestMergeTimelines:
+    """Test merging inbox and outbox timelines"""
+
+    def test_merges_newest_first_and_deduplicates(self):
+        inbox = entries((1, 10), (5, 11), (9, 12))
+        outbox = entries((2, 20), (5, 11), (7, 21))
+
+        merged = merge_timelines([inbox, outbox], limit=10)
+        assert [pid for _, pid in merged] == [10, 20, 11, 21, 12]
+
+    def test_before_cursor_and_limit(self):
+        inbox = entries((1, 10), (3, 11), (5, 12), (7, 13))
+        merged = merge_timelines([inbox], limit=2, before=inbox[1])
+        assert [pid for _, pid in merged] == [12, 13]
+
+    def test_offset_pages_match_cursor_pages(self):
+        inbox = entries(*[(m, 100 + m) for m in range(0, 30, 2)])
+        outbox = entries(*[(m, 200 + m) for m in range(1, 30, 2)])
+
+        by_offset = [merge_timelines([inbox, outbox], limit=5, offset=page * 5) for page in range(3)]
+
+        by_cursor, before = [], None
+        for _ in range(3):
+            page = merge_timelines([inbox, outbox], limit=5, before=before)
+            by_cursor.append(page)
+            before = page[-1]
+
+        assert by_offset == by_cursor
+        assert by_offset[1] != by_offset[0]
+
+    def test_offset_counts_unique_entries(self):
+        inbox = entries((1, 10), (2, 11))
+        outbox = entries((1, 10), (3, 12))
+        assert [pid for _, pid in merge_timelines([inbox, outbox], limit=5, offset=1)] == [11, 12]
+
+
+class TestTimelineCache:
+    """Test TTL expiry, LRU eviction and invalidation"""
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = TimelineCache(max_size=10, ttl=5.0, clock=clock)
+        cache.set('u1', [1])
+
+        clock.now = 4.9
+        assert cache.get('u1') == [1]
+        clock.now = 5.1
+        assert cache.get('u1') is None
+        assert cache.stats['hits'] == 1 and cache.stats['misses'] == 1
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        cache = TimelineCache(max_size=2, ttl=60.0)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 1 and cache.get('c') == 3
+        assert cache.stats['evictions'] == 1
+
+    def test_invalidate_counts_only_present_keys(self):
+        cache = TimelineCache()
+        cache.set('a', 1)
+        cache.invalidate('a', 'missing')
+
+        assert cache.get('a') is None
+        assert cache.stats['invalidations'] == 1
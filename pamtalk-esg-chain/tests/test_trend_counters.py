@@ -0,0 +1,220 @@
+"""
+Unit Tests for Trend Counters
+Tests the in-memory hashtag counters used by TrendingTopicsService and the merge of
+unflushed local mentions into database trending rows
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.service.trend_counters import (
+    DecayedTrendCounter, CountMinSketch, SpaceSaving, SlidingWindowTopK, TrendSketch,
+    merge_local_mentions
+)
+
+
+class FakeClock:
+    """Controllable clock (seconds)"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance_hours(self, hours: float):
+        self.now += hours * 3600
+
+
+class TestDecayedTrendCounter:
+    """Test exponential time-decayed counting"""
+
+    def test_score_halves_after_half_life(self):
+        clock = FakeClock()
+        counter = DecayedTrendCounter(half_life_hours=6, clock=clock)
+
+        for _ in range(8):
+            counter.add('#유기농')
+        assert counter.score('#유기농') == pytest.approx(8)
+
+        clock.advance_hours(6)
+        assert counter.score('#유기농') == pytest.approx(4)
+
+    def test_recent_mentions_outrank_older_bursts(self):
+        clock = FakeClock()
+        counter = DecayedTrendCounter(half_life_hours=1, clock=clock)
+
+        for _ in range(10):
+            counter.add('#old')
+        clock.advance_hours(4)
+        for _ in range(3):
+            counter.add('#new')
+
+        top = counter.top(limit=2)
+        assert [hashtag for hashtag, _ in top] == ['#new', '#old']
+
+    def test_regional_mentions_count_nationwide(self):
+        clock = FakeClock()
+        counter = DecayedTrendCounter(clock=clock)
+
+        counter.add('#로컬푸드', region='경기')
+        counter.add('#로컬푸드', region='전남')
+
+        assert counter.score('#로컬푸드', region='경기') == pytest.approx(1)
+        assert counter.score('#로컬푸드') == pytest.approx(2)
+
+    def test_rebase_keeps_scores_stable(self):
+        clock = FakeClock()
+        counter = DecayedTrendCounter(half_life_hours=1, clock=clock)
+
+        counter.add('#a')
+        # far enough in the future to force a rebase of the reference time
+        clock.advance_hours(100)
+        counter.add('#b')
+
+        assert counter.score('#b') == pytest.approx(1)
+        assert counter.score('#a') == pytest.approx(0, abs=1e-12)
+
+    def test_prune_and_capacity(self):
+        clock = FakeClock()
+        counter = DecayedTrendCounter(half_life_hours=1, max_keys_per_region=10, clock=clock)
+
+        for i in range(12):
+            counter.add(f'#tag{i}', weight=i + 1)
+        assert len(counter) == 10
+        assert '#tag0' not in dict(counter.top(limit=20))
+
+        clock.advance_hours(24)
+        assert counter.prune(min_score=0.01) == 10
+        assert counter.top() == []
+
+    def test_seed_sets_authoritative_value(self):
+        clock = FakeClock()
+        counter = DecayedTrendCounter(clock=clock)
+
+        counter.add('#탄소절약')
+        counter.seed('#탄소절약', 42)
+        assert counter.score('#탄소절약') == pytest.approx(42)
+
+
+class TestCountMinSketch:
+    """Test approximate frequency counting"""
+
+    def test_estimate_never_underestimates(self):
+        sketch = CountMinSketch(width=64, depth=4)
+        true_counts = {f'#tag{i}': i + 1 for i in range(200)}
+        for key, count in true_counts.items():
+            sketch.add(key, count)
+
+        for key, count in true_counts.items():
+            assert sketch.estimate(key) >= count
+        assert sketch.total == sum(true_counts.values())
+
+    def test_estimate_exact_when_sparse(self):
+        sketch = CountMinSketch()
+        sketch.add('#유기농', 5)
+        sketch.add('#탄소중립', 2)
+
+        assert sketch.estimate('#유기농') == 5
+        assert sketch.estimate('#없음') == 0
+
+
+class TestSpaceSaving:
+    """Test bounded heavy-hitter tracking"""
+
+    def test_heavy_hitters_survive_churn(self):
+        summary = SpaceSaving(capacity=10)
+        for i in range(500):
+            summary.add('#heavy')
+            summary.add(f'#noise{i}')
+
+        assert len(summary) == 10
+        key, count, error = summary.top(1)[0]
+        assert key == '#heavy'
+        assert count - error <= 500 <= count
+
+
+class TestSlidingWindowTopK:
+    """Test windowed top-k with bucket expiry"""
+
+    def test_old_buckets_expire(self):
+        clock = FakeClock()
+        window = SlidingWindowTopK(window_seconds=3 * 3600, bucket_seconds=3600, clock=clock)
+
+        window.add('#old', 10)
+        clock.advance_hours(1)
+        window.add('#new', 3)
+        assert [key for key, _ in window.top(2)] == ['#old', '#new']
+
+        clock.advance_hours(3)
+        assert window.estimate('#old') == 0
+        assert window.top(2) == [('#new', 3)]
+
+        clock.advance_hours(1)
+        assert window.top(2) == []
+        assert window.total() == 0
+
+
+class TestTrendSketch:
+    """Test per-region, per-range trending views"""
+
+    def test_top_by_time_range_and_region(self):
+        clock = FakeClock()
+        sketch = TrendSketch(top_cache_seconds=0, clock=clock)
+
+        sketch.add('#벼농사', region='전남', count=5)
+        clock.advance_hours(48)
+        sketch.add('#스마트팜', region='경기', count=2)
+
+        assert sketch.top(time_range='daily') == [('#스마트팜', 2)]
+        assert [key for key, _ in sketch.top(time_range='weekly')] == ['#벼농사', '#스마트팜']
+        assert sketch.top(region='전남', time_range='daily') == []
+        assert sketch.estimate('#벼농사', region='전남', time_range='monthly') == 5
+        assert sketch.top(region='제주') == []
+
+
+def db_topic(hashtag, mentions, promoted=False, trend_score=0.0):
+    return {'id': hash(hashtag) % 1000, 'hashtag': hashtag, 'region': None,
+            'current_mentions': mentions, 'is_promoted': promoted, 'trend_score': trend_score}
+
+
+class TestMergeLocalMentions:
+    """Test the database-first trending view with unflushed local deltas"""
+
+    def test_database_counts_are_the_baseline(self):
+        topics = [db_topic('#유기농', 40), db_topic('#스마트팜', 30)]
+
+        merged = merge_local_mentions(topics, {'#스마트팜': 15}, limit=10, min_mentions=5)
+
+        assert [(t['hashtag'], t['current_mentions']) for t in merged] == [
+            ('#스마트팜', 45), ('#유기농', 40)
+        ]
+        # Input rows are not mutated
+        assert topics[1]['current_mentions'] == 30
+
+    def test_local_only_hashtags_join_once_over_the_threshold(self):
+        merged = merge_local_mentions([db_topic('#유기농', 6)], {'#드론': 7, '#퇴비': 2},
+                                      limit=10, min_mentions=5, region='경기')
+
+        assert [t['hashtag'] for t in merged] == ['#드론', '#유기농']
+        assert merged[0]['id'] is None and merged[0]['region'] == '경기'
+
+    def test_local_delta_lifts_a_row_over_the_threshold(self):
+        topics = [db_topic('#벼농사', 3), db_topic('#텃밭', 4)]
+
+        merged = merge_local_mentions(topics, {'#텃밭': 1}, limit=10, min_mentions=5)
+
+        assert [(t['hashtag'], t['current_mentions']) for t in merged] == [('#텃밭', 5)]
+
+    def test_promoted_first_then_mentions_then_score_and_limit(self):
+        topics = [db_topic('#a', 50), db_topic('#b', 20, promoted=True),
+                  db_topic('#c', 30, trend_score=9.0), db_topic('#d', 30, trend_score=1.0)]
+
+        merged = merge_local_mentions(topics, {}, limit=3, min_mentions=5)
+
+        assert [t['hashtag'] for t in merged] == ['#b', '#a', '#c']
+
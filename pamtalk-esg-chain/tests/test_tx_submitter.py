@@ -0,0 +1,183 @@
+"""
+Unit Tests for the Rate-Limited Transaction Submitter
+Tests the token bucket, pipelined sign/submit/confirm against the algod simulator in test_helpers,
+adaptive backoff on node throttling and the verification service batch path built on it
+"""
+
+import asyncio
+import time
+import sys
+import os
+
+import pytest
+from algosdk import account
+from algosdk.error import AlgodHTTPError
+from algosdk.transaction import PaymentTxn
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.service.blockchain_verification_service import BlockchainVerificationService
+from app.utils.transaction_retry import RetryConfig
+from app.utils.tx_submitter import RateLimitedSubmitter, TokenBucket
+from tests.test_helpers import AlgodSimulator
+from tests.test_merkle_anchoring import make_result
+
+ASSET_ID = 12345
+
+
+class ThrottlingAlgod(AlgodSimulator):
+    """Simulator that answers some submissions with a node error instead of accepting them"""
+
+    def __init__(self, fail_every: int, error: AlgodHTTPError, **kwargs):
+        super().__init__(ASSET_ID, **kwargs)
+        self.fail_every = fail_every
+        self.error = error
+        self.attempts = 0
+
+    def send_transaction(self, signed_txn) -> str:
+        with self._lock:
+            self.attempts += 1
+            if self.attempts % self.fail_every == 0:
+                raise self.error
+        return super().send_transaction(signed_txn)
+
+
+def payment_jobs(count):
+    private_key, address = account.generate_account()
+    return [{
+        'key': i,
+        'build': lambda params, i=i: PaymentTxn(address, params, address, 0, note=f"job-{i}".encode()),
+        'private_key': private_key
+    } for i in range(count)]
+
+
+class TestTokenBucket:
+    """Test token bucket pacing"""
+
+    def test_burst_then_paced_by_rate(self):
+        bucket = TokenBucket(rate=100, burst=5)
+
+        async def take(count):
+            started = time.monotonic()
+            for _ in range(count):
+                await bucket.acquire()
+            return time.monotonic() - started
+
+        elapsed = asyncio.run(take(25))
+        assert 0.18 <= elapsed < 0.5  # 5 immediately, 20 more at 100/s
+
+    def test_pause_blocks_tokens(self):
+        bucket = TokenBucket(rate=1000, burst=10)
+        bucket.pause(0.2)
+
+        async def first_token():
+            started = time.monotonic()
+            await bucket.acquire()
+            return time.monotonic() - started
+
+        assert asyncio.run(first_token()) >= 0.19
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestRateLimitedSubmitter:
+    """Test concurrent submission against the algod simulator"""
+
+    def test_all_jobs_confirm_in_input_order(self):
+        client = AlgodSimulator(ASSET_ID, block_time=0.01)
+        submitter = RateLimitedSubmitter(client, rate=1000, concurrency=4)
+
+        results = submitter.submit_all(payment_jobs(120))
+        stats = submitter.get_stats()
+        submitter.shutdown()
+
+        assert [r['key'] for r in results] == list(range(120))
+        assert all(r['success'] and r['confirmed_round'] for r in results)
+        assert len({r['tx_id'] for r in results}) == 120
+        assert len(client.confirmed) == 120
+        assert (stats['submitted'], stats['confirmed'], stats['failed']) == (120, 120, 0)
+        # Confirmations overlap: far more jobs in flight than submit slots
+        assert stats['max_in_flight'] > 4
+        assert stats['throughput_per_second'] > 0
+        assert set(stats['latency']) == {'sign', 'submit', 'confirm', 'total'}
+        assert stats['latency']['total']['count'] == 120
+
+    def test_rate_limit_paces_submissions(self):
+        client = AlgodSimulator(ASSET_ID, block_time=0.01)
+        submitter = RateLimitedSubmitter(client, rate=50, burst=5, concurrency=8)
+
+        started = time.monotonic()
+        results = submitter.submit_all(payment_jobs(30))
+        elapsed = time.monotonic() - started
+        submitter.shutdown()
+
+        assert all(r['success'] for r in results)
+        assert elapsed >= (30 - 5) / 50 * 0.9
+
+    def test_throttling_backs_off_and_retries(self):
+        client = ThrottlingAlgod(3, AlgodHTTPError("rate limit exceeded", 429), block_time=0.01)
+        submitter = RateLimitedSubmitter(client, rate=200, concurrency=4,
+                                         retry_config=RetryConfig(max_attempts=5, initial_delay=0.01,
+                                                                  max_delay=0.05))
+
+        results = submitter.submit_all(payment_jobs(40))
+        stats = submitter.get_stats()
+        submitter.shutdown()
+
+        assert all(r['success'] for r in results)
+        assert stats['throttled'] == stats['retries'] > 0
+        assert max(r['attempts'] for r in results) > 1
+        assert stats['current_rate'] <= 200
+
+    def test_throttled_rate_recovers_after_successes(self):
+        client = AlgodSimulator(ASSET_ID)
+        submitter = RateLimitedSubmitter(client, rate=100)
+        submitter._throttle(0.0)
+        submitter._throttle(0.0)
+        assert submitter.bucket.rate == 25
+
+        for _ in range(30):
+            submitter._recover()
+        assert submitter.bucket.rate == 100
+        submitter.shutdown()
+
+    def test_non_retryable_errors_fail_without_retry(self):
+        client = ThrottlingAlgod(2, AlgodHTTPError("overspend", 400), block_time=0.01)
+        submitter = RateLimitedSubmitter(client, rate=1000, concurrency=1,
+                                         retry_config=RetryConfig(initial_delay=0.01))
+
+        results = submitter.submit_all(payment_jobs(10))
+        stats = submitter.get_stats()
+        submitter.shutdown()
+
+        failed = [r for r in results if not r['success']]
+        assert len(failed) == 5
+        assert all('overspend' in r['error'] and r['attempts'] == 1 for r in failed)
+        assert stats['retries'] == 0 and stats['failed'] == 5
+
+
+class TestVerificationBatchSubmission:
+    """Test the verification service batch path on top of the submitter"""
+
+    def test_batch_store_submits_each_verification(self):
+        client = AlgodSimulator(ASSET_ID, block_time=0.01)
+        submitter = RateLimitedSubmitter(client, rate=1000, concurrency=4)
+        service = BlockchainVerificationService(client=client, submitter=submitter)
+        private_key, _ = account.generate_account()
+        verifications = [make_result(i) for i in range(20)]
+
+        started = time.monotonic()
+        stored = service.batch_store_verifications(verifications, private_key)
+        elapsed = time.monotonic() - started
+
+        assert elapsed < 20 * 0.5  # no fixed per-record sleep
+        assert all(r['success'] for r in stored)
+        assert [v.blockchain_tx_id for v in verifications] == [r['tx_id'] for r in stored]
+
+        chain_data = service.retrieve_verification_from_chain(stored[3]['tx_id'])
+        assert chain_data['result_id'] == verifications[3].result_id
+        assert service.verify_data_integrity(chain_data)[0]
+        submitter.shutdown()